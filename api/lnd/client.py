@@ -1,28 +1,32 @@
 """
 Extended LND gRPC client for atomic swap operations.
 
-This module extends the existing LNDgRPCClient from api/v1/app.py with
+This module extends the existing LNDgRPCClient from api/v1/lnd_client.py with
 additional methods required for atomic swaps:
 - Creating invoices with custom payment hashes
 - Looking up invoices by payment hash
 - Subscribing to invoice updates (streaming)
 - Decoding payment requests
 
-Reuses all existing connection management, authentication, and basic operations.
+Reuses all existing connection management, authentication, and basic operations:
+the gRPC channel (keepalive, reconnect backoff, per-RPC metrics) is the one
+shared LNDChannelManager from api/v1/lnd_channel.py.
 """
 
 import sys
 import os
 import logging
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Optional, Dict, Any, AsyncIterator
 
-# Add parent directory to path to import from api.v1
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Add api/v1 to path: lnd_client and the compiled protos live there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../v1')))
 
-# Import the existing LND client from app.py
-from api.v1.app import LNDgRPCClient
+# Import the existing LND client (lnd_client.py is importable without
+# booting the Flask API: no routes, databases or background threads)
+from lnd_client import LNDgRPCClient
 
-# Import gRPC proto modules (same as app.py)
+# Import gRPC proto modules (same as lnd_client.py)
 try:
     import lightning_pb2 as lnrpc
     import lightning_pb2_grpc as lnrpcstub
@@ -46,6 +50,7 @@ class AtomicSwapLNDClient(LNDgRPCClient):
     - create_invoice_with_hash() - Create invoice with custom payment hash
     - lookup_invoice() - Look up invoice by payment hash
     - subscribe_invoice() - Subscribe to single invoice updates
+    - get_latest_invoice_indexes() - Current add_index/settle_index
     - decode_payment_request() - Decode bolt11 payment request
     - get_payment_preimage() - Extract preimage from paid invoice
     """
@@ -114,7 +119,7 @@ class AtomicSwapLNDClient(LNDgRPCClient):
             return result, None
 
         except grpc.RpcError as e:
-            self._connected = False
+            self.manager.report_error(e)
             error_msg = f"gRPC Error creating invoice: {e.details()}"
             logger.error(error_msg)
             return None, error_msg
@@ -188,7 +193,7 @@ class AtomicSwapLNDClient(LNDgRPCClient):
             return result, None
 
         except grpc.RpcError as e:
-            self._connected = False
+            self.manager.report_error(e)
             error_msg = f"gRPC Error looking up invoice: {e.details()}"
             logger.error(error_msg)
             return None, error_msg
@@ -200,7 +205,9 @@ class AtomicSwapLNDClient(LNDgRPCClient):
     def subscribe_invoice(
         self,
         payment_hash: bytes,
-        timeout: int = 3600
+        timeout: int = 3600,
+        add_index: int = 0,
+        settle_index: int = 0
     ) -> tuple[Optional[Any], Optional[str]]:
         """
         Subscribe to updates for a specific invoice (streaming).
@@ -208,9 +215,15 @@ class AtomicSwapLNDClient(LNDgRPCClient):
         Returns a gRPC streaming response that yields invoice updates
         as they occur (e.g., when invoice is paid).
 
+        LND first replays invoices added after add_index and settled after
+        settle_index, then streams live updates. Pass the last indexes already
+        processed to resume without gaps; 0 means no backlog for that index.
+
         Args:
             payment_hash: 32-byte payment hash to monitor
             timeout: Maximum time to wait for updates (seconds)
+            add_index: Last add_index already processed
+            settle_index: Last settle_index already processed
 
         Returns:
             Tuple of (stream_iterator, error_message)
@@ -233,17 +246,20 @@ class AtomicSwapLNDClient(LNDgRPCClient):
 
             # Subscribe to all invoices, then filter (LND doesn't support single invoice subscription)
             request = lnrpc.InvoiceSubscription()
-            request.add_index = 0  # Start from beginning
-            request.settle_index = 0
+            request.add_index = int(add_index)
+            request.settle_index = int(settle_index)
 
             # Start streaming
             stream = self.stub.SubscribeInvoices(request, timeout=timeout)
 
-            logger.info(f"Subscribed to invoice updates for {payment_hash.hex()[:16]}...")
+            logger.info(
+                f"Subscribed to invoice updates for {payment_hash.hex()[:16]}... "
+                f"(add_index={add_index}, settle_index={settle_index})"
+            )
             return stream, None
 
         except grpc.RpcError as e:
-            self._connected = False
+            self.manager.report_error(e)
             error_msg = f"gRPC Error subscribing to invoice: {e.details()}"
             logger.error(error_msg)
             return None, error_msg
@@ -252,6 +268,54 @@ class AtomicSwapLNDClient(LNDgRPCClient):
             logger.error(error_msg, exc_info=True)
             return None, error_msg
 
+    def get_latest_invoice_indexes(
+        self,
+        sample_size: int = 100
+    ) -> tuple[Optional[Dict[str, int]], Optional[str]]:
+        """
+        Get the node's current invoice add_index/settle_index.
+
+        Used to seed a subscription checkpoint so a first start does not
+        replay the node's whole invoice history.
+
+        Args:
+            sample_size: How many recent invoices to scan for settle_index
+
+        Returns:
+            Tuple of ({'add_index': int, 'settle_index': int}, error_message)
+        """
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+
+            if not lnrpc:
+                return None, "gRPC modules not available"
+
+            request = lnrpc.ListInvoiceRequest(
+                num_max_invoices=sample_size,
+                reversed=True
+            )
+            response = self.stub.ListInvoices(request, timeout=10)
+
+            return {
+                'add_index': int(response.last_index_offset),
+                'settle_index': max(
+                    (int(invoice.settle_index) for invoice in response.invoices),
+                    default=0
+                )
+            }, None
+
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            error_msg = f"gRPC Error listing invoices: {e.details()}"
+            logger.error(error_msg)
+            return None, error_msg
+        except Exception as e:
+            error_msg = f"Error getting invoice indexes: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return None, error_msg
+
     def decode_payment_request(
         self,
         payment_request: str
@@ -306,7 +370,7 @@ class AtomicSwapLNDClient(LNDgRPCClient):
             return result, None
 
         except grpc.RpcError as e:
-            self._connected = False
+            self.manager.report_error(e)
             error_msg = f"gRPC Error decoding payment request: {e.details()}"
             logger.error(error_msg)
             return None, error_msg
@@ -362,50 +426,41 @@ class AtomicSwapLNDClient(LNDgRPCClient):
         """
         Wait for an invoice to be settled and return the preimage.
 
-        This is a blocking call that polls the invoice until it's settled
-        or the timeout expires.
+        This is a blocking call that waits on the shared invoice subscription
+        (PaymentMonitor) until the invoice is settled, canceled or the timeout
+        expires. No RPCs are made while waiting.
 
         Args:
             payment_hash: 32-byte payment hash to monitor
             timeout: Maximum time to wait (seconds)
-            poll_interval: How often to poll (seconds)
+            poll_interval: Unused, kept for backwards compatibility
 
         Returns:
             Tuple of (preimage_bytes, error_message)
         """
-        import time
-
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            invoice_data, error = self.lookup_invoice(payment_hash)
-
-            if error:
-                logger.warning(f"Error looking up invoice: {error}")
-                time.sleep(poll_interval)
-                continue
+        # Imported here: payment_monitor imports this module
+        from api.lnd.payment_monitor import get_payment_monitor
 
-            if invoice_data.get('settled'):
-                preimage_hex = invoice_data.get('r_preimage')
-                if preimage_hex:
-                    preimage_bytes = bytes.fromhex(preimage_hex)
-                    logger.info(f"Invoice settled! Preimage retrieved: {payment_hash.hex()[:16]}...")
-                    return preimage_bytes, None
+        future = get_payment_monitor().wait_for_invoice(payment_hash.hex())
+        try:
+            update = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            return None, f"Timeout waiting for invoice settlement ({timeout}s)"
 
-            # Check if invoice was canceled
-            if invoice_data.get('state') == 'CANCELED':
-                return None, "Invoice was canceled"
+        if update.state == 'CANCELED':
+            return None, "Invoice was canceled"
 
-            time.sleep(poll_interval)
+        if not update.preimage:
+            return None, "Preimage not available in invoice data"
 
-        return None, f"Timeout waiting for invoice settlement ({timeout}s)"
+        logger.info(f"Invoice settled! Preimage retrieved: {payment_hash.hex()[:16]}...")
+        return bytes.fromhex(update.preimage), None
 
     def close(self):
-        """Close the gRPC channel."""
-        if self.channel:
-            self.channel.close()
-            self._connected = False
-            logger.info("LND gRPC channel closed")
+        """Close the shared gRPC channel."""
+        super().close()
+        logger.info("LND gRPC channel closed")
 
 
 # Convenience function to get a singleton client
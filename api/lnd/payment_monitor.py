@@ -2,23 +2,279 @@
 Payment Monitor for Atomic Swaps.
 
 Provides asynchronous monitoring of Lightning invoice payments.
-Uses gRPC streaming to detect invoice settlements in real-time.
+Uses gRPC streaming to detect invoice settlements in real-time, either on a
+background thread (PaymentMonitor) or natively on an asyncio event loop via
+grpc.aio (AsyncPaymentMonitor).
 
 This is critical for atomic swaps: we need to detect when the Lightning
 invoice is paid (revealing the preimage) so we can claim the on-chain HTLC.
+
+The last processed add_index/settle_index are checkpointed to disk so a
+reconnect or restart resumes the subscription instead of missing (or
+replaying) invoice updates.
 """
 
 import asyncio
+import heapq
+import json
 import logging
-from typing import Callable, Dict, Any, Optional, Set
+import os
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Any, List, Optional, Set
 from datetime import datetime
 import threading
+from collections import deque
 
 from api.lnd.client import get_lnd_client, AtomicSwapLNDClient
 
+# Import gRPC proto modules (same as client.py)
+try:
+    import lightning_pb2 as lnrpc
+    import lightning_pb2_grpc as lnrpcstub
+except ImportError:
+    lnrpc = None
+    lnrpcstub = None
+
+try:
+    import grpc
+    import grpc.aio
+except ImportError:
+    grpc = None
+
 logger = logging.getLogger(__name__)
 
 
+# Invoice subscription checkpoint
+INVOICE_CHECKPOINT_PATH = os.getenv(
+    'INVOICE_CHECKPOINT_PATH',
+    '/var/lib/brln-swaps/invoice_checkpoint.json'
+)
+# AsyncPaymentMonitor keeps its own progress (both monitors may run)
+ASYNC_INVOICE_CHECKPOINT_PATH = os.getenv(
+    'ASYNC_INVOICE_CHECKPOINT_PATH',
+    '/var/lib/brln-swaps/invoice_checkpoint_async.json'
+)
+CHECKPOINT_FLUSH_INTERVAL = 2.0  # seconds between checkpoint writes
+
+# Callback dispatch (PaymentMonitor)
+CALLBACK_WORKERS = int(os.getenv('PAYMENT_CALLBACK_WORKERS', '4'))
+CALLBACK_MAX_PENDING = int(os.getenv('PAYMENT_CALLBACK_MAX_PENDING', '1000'))
+CALLBACK_OVERFLOW_POLICY = os.getenv('PAYMENT_CALLBACK_OVERFLOW', 'block')
+
+
+class InvoiceCheckpoint:
+    """
+    Durable add_index/settle_index of the last processed invoice update.
+
+    Indexes only move forward. Writes are throttled and atomic (temp file +
+    rename), so a crash loses at most a few seconds of progress; those
+    updates are simply replayed by LND on the next subscription.
+    """
+
+    def __init__(self, path: str = INVOICE_CHECKPOINT_PATH):
+        """
+        Initialize checkpoint, loading it from disk if present.
+
+        Args:
+            path: JSON file where the indexes are stored
+        """
+        self.path = path
+        self.add_index = 0
+        self.settle_index = 0
+        self.exists = False
+        self.saved_at: Optional[float] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.add_index = int(data.get('add_index', 0))
+            self.settle_index = int(data.get('settle_index', 0))
+            self.saved_at = data.get('saved_at')
+            self.exists = True
+            logger.info(
+                f"Loaded invoice checkpoint: add_index={self.add_index}, "
+                f"settle_index={self.settle_index}"
+            )
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable invoice checkpoint {self.path}: {str(e)}")
+
+    def advance(self, add_index: int = 0, settle_index: int = 0) -> None:
+        """
+        Record indexes of a processed update (never moves backwards).
+
+        Args:
+            add_index: Invoice add_index
+            settle_index: Invoice settle_index (0 if not settled)
+        """
+        with self._lock:
+            if add_index > self.add_index:
+                self.add_index = add_index
+                self._dirty = True
+            if settle_index > self.settle_index:
+                self.settle_index = settle_index
+                self._dirty = True
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        Write the checkpoint to disk if it changed.
+
+        Args:
+            force: Ignore CHECKPOINT_FLUSH_INTERVAL throttling
+
+        Returns:
+            True if the checkpoint was written
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            now = time.time()
+            if not force and self.saved_at and now - self.saved_at < CHECKPOINT_FLUSH_INTERVAL:
+                return False
+
+            data = {
+                'add_index': self.add_index,
+                'settle_index': self.settle_index,
+                'saved_at': now
+            }
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.error(f"Error saving invoice checkpoint: {str(e)}")
+                return False
+
+            self.saved_at = now
+            self.exists = True
+            self._dirty = False
+            return True
+
+
+class CheckpointWindow:
+    """
+    Low-water mark over the invoice updates still being handled.
+
+    Each update read from the stream gets a token (begin) in stream order.
+    The checkpoint only advances over the longest prefix of finished tokens,
+    so an update whose callback is still queued or running, or was dropped
+    (abandon), is never recorded as processed: after a crash or resubscribe
+    LND replays it.
+    """
+
+    COMPACT_THRESHOLD = 1024
+
+    def __init__(self, checkpoint: InvoiceCheckpoint):
+        """
+        Initialize window.
+
+        Args:
+            checkpoint: Checkpoint advanced as the oldest updates finish
+        """
+        self.checkpoint = checkpoint
+        self._entries: deque = deque()   # [token, add_index, settle_index, state]
+        self._by_token: Dict[int, list] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+
+    def begin(self, add_index: int, settle_index: int) -> int:
+        """
+        Register an update read from the stream.
+
+        Returns:
+            Token to pass to finish() or abandon()
+        """
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            entry = [token, add_index, settle_index, 'pending']
+            self._entries.append(entry)
+            self._by_token[token] = entry
+            return token
+
+    def finish(self, token: int) -> None:
+        """Mark an update as handled and advance the checkpoint if it was the oldest."""
+        with self._lock:
+            entry = self._by_token.pop(token, None)
+            if entry is None:
+                return
+            entry[3] = 'done'
+            add_index = settle_index = 0
+            while self._entries and self._entries[0][3] == 'done':
+                _, add, settle, _ = self._entries.popleft()
+                add_index = max(add_index, add)
+                settle_index = max(settle_index, settle)
+            if len(self._entries) > self.COMPACT_THRESHOLD:
+                self._compact()
+        if add_index or settle_index:
+            self.checkpoint.advance(add_index, settle_index)
+            self.checkpoint.flush()
+
+    def abandon(self, token: int) -> None:
+        """
+        Mark an update as not handled (e.g. callback dropped); the checkpoint
+        stays before it until restart().
+        """
+        with self._lock:
+            entry = self._by_token.pop(token, None)
+            if entry is not None:
+                entry[3] = 'abandoned'
+
+    def restart(self) -> None:
+        """
+        Forget the abandoned updates and everything after them before a new
+        subscription: it resumes from the checkpoint, so LND replays them.
+        Earlier updates still in flight keep their tokens.
+        """
+        with self._lock:
+            kept: deque = deque()
+            for entry in self._entries:
+                if entry[3] == 'abandoned':
+                    break
+                kept.append(entry)
+            for entry in list(self._entries)[len(kept):]:
+                self._by_token.pop(entry[0], None)
+            self._entries = kept
+
+    def _compact(self) -> None:
+        # Called with the lock held: merge runs of finished updates behind an
+        # unfinished one (only their highest indexes matter)
+        compacted: deque = deque()
+        for entry in self._entries:
+            previous = compacted[-1] if compacted else None
+            if entry[3] == 'done' and previous is not None and previous[3] == 'done':
+                previous[1] = max(previous[1], entry[1])
+                previous[2] = max(previous[2], entry[2])
+            else:
+                compacted.append(entry)
+        self._entries = compacted
+
+    @property
+    def pending(self) -> int:
+        """Updates holding the checkpoint back (in flight or abandoned)."""
+        with self._lock:
+            return len(self._by_token) + sum(1 for entry in self._entries if entry[3] == 'abandoned')
+
+
+# lnrpc.Invoice.InvoiceState
+INVOICE_STATES = {
+    0: 'OPEN',
+    1: 'SETTLED',
+    2: 'CANCELED',
+    3: 'ACCEPTED'
+}
+
+
 class InvoiceUpdate:
     """
     Represents an invoice update event.
@@ -37,6 +293,8 @@ class InvoiceUpdate:
         self.preimage = invoice_data.get('r_preimage', '').hex() if isinstance(invoice_data.get('r_preimage'), bytes) else invoice_data.get('r_preimage')
         self.settled = invoice_data.get('settled', False)
         self.state = invoice_data.get('state', 'UNKNOWN')
+        if isinstance(self.state, int):
+            self.state = INVOICE_STATES.get(self.state, 'UNKNOWN')
         self.amount_sat = int(invoice_data.get('value', 0))
         self.amount_paid_sat = int(invoice_data.get('amt_paid_sat', 0))
         self.memo = invoice_data.get('memo', '')
@@ -50,6 +308,391 @@ class InvoiceUpdate:
         )
 
 
+class InvoiceWaiterRegistry:
+    """
+    Futures keyed by payment hash, resolved by the shared invoice subscription.
+
+    Waiting costs no RPCs: the PaymentMonitor stream resolves futures as
+    soon as a settlement arrives. SubscribeInvoices does not report
+    cancellations, so each waited invoice gets a single LookupInvoice
+    shortly after it expires (re-checked every EXPIRY_RECHECK seconds
+    while LND still shows it open, e.g. hold invoices).
+
+    Futures resolve with the final InvoiceUpdate (state SETTLED or CANCELED).
+    """
+
+    EXPIRY_GRACE = 5        # seconds after expiry before checking for cancel
+    EXPIRY_RECHECK = 60     # seconds between checks of expired-but-open invoices
+
+    def __init__(self, lnd_client: AtomicSwapLNDClient):
+        """
+        Initialize waiter registry.
+
+        Args:
+            lnd_client: LND client used for expiry checks
+        """
+        self.lnd_client = lnd_client
+        self._waiters: Dict[str, List[Future]] = {}
+        self._checks: List[tuple] = []  # heap of (check_at, payment_hash)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def register(self, payment_hash: str) -> Future:
+        """
+        Create a future for an invoice.
+
+        Args:
+            payment_hash: Hex-encoded payment hash
+
+        Returns:
+            concurrent.futures.Future resolving to the final InvoiceUpdate
+        """
+        future = Future()
+        with self._lock:
+            self._waiters.setdefault(payment_hash, []).append(future)
+        # Caller gave up (future.cancel() / timeout): drop it from the registry
+        future.add_done_callback(lambda f: self._discard(payment_hash, f))
+        return future
+
+    def _discard(self, payment_hash: str, future: Future) -> None:
+        with self._lock:
+            futures = self._waiters.get(payment_hash)
+            if futures and future in futures:
+                futures.remove(future)
+                if not futures:
+                    del self._waiters[payment_hash]
+
+    def resolve(self, update: InvoiceUpdate) -> int:
+        """
+        Resolve all waiters of a settled or canceled invoice.
+
+        Args:
+            update: Invoice update from the stream or a lookup
+
+        Returns:
+            Number of futures resolved
+        """
+        if update.state not in ('SETTLED', 'CANCELED') and not update.settled:
+            return 0
+
+        with self._lock:
+            futures = self._waiters.pop(update.payment_hash, [])
+
+        resolved = 0
+        for future in futures:
+            if future.set_running_or_notify_cancel():
+                future.set_result(update)
+                resolved += 1
+        return resolved
+
+    def schedule_check(self, payment_hash: str, check_at: float) -> None:
+        """
+        Schedule a one-off LookupInvoice (used at invoice expiry).
+
+        Args:
+            payment_hash: Hex-encoded payment hash
+            check_at: Unix timestamp of the check
+        """
+        with self._lock:
+            heapq.heappush(self._checks, (check_at, payment_hash))
+            if self._sweeper is None or not self._sweeper.is_alive():
+                self._sweeper = threading.Thread(
+                    target=self._sweep_loop,
+                    daemon=True,
+                    name="InvoiceWaiterSweeper"
+                )
+                self._sweeper.start()
+        self._wakeup.set()
+
+    def _sweep_loop(self) -> None:
+        while True:
+            with self._lock:
+                now = time.time()
+                due = []
+                while self._checks and self._checks[0][0] <= now:
+                    _, payment_hash = heapq.heappop(self._checks)
+                    if payment_hash in self._waiters:
+                        due.append(payment_hash)
+                wait = self._checks[0][0] - now if self._checks else None
+
+            for payment_hash in due:
+                self.check(payment_hash)
+
+            self._wakeup.wait(wait)
+            self._wakeup.clear()
+
+    def check(self, payment_hash: str) -> Optional[InvoiceUpdate]:
+        """
+        Look up an invoice once and resolve its waiters if final.
+
+        Args:
+            payment_hash: Hex-encoded payment hash
+
+        Returns:
+            InvoiceUpdate from the lookup, or None on error
+        """
+        invoice_data, error = self.lnd_client.lookup_invoice(bytes.fromhex(payment_hash))
+        if error:
+            logger.warning(f"Error checking invoice {payment_hash[:16]}...: {error}")
+            self.schedule_check(payment_hash, time.time() + self.EXPIRY_RECHECK)
+            return None
+
+        update = InvoiceUpdate(invoice_data)
+        if not self.resolve(update):
+            try:
+                expires_at = int(invoice_data['creation_date']) + int(invoice_data['expiry'])
+            except (KeyError, TypeError, ValueError):
+                expires_at = 0
+            now = time.time()
+            if expires_at > now:
+                self.schedule_check(payment_hash, expires_at + self.EXPIRY_GRACE)
+            else:
+                self.schedule_check(payment_hash, now + self.EXPIRY_RECHECK)
+        return update
+
+    def pending(self) -> int:
+        """Number of invoices with at least one waiter."""
+        with self._lock:
+            return len(self._waiters)
+
+
+class CallbackDispatcher:
+    """
+    Bounded worker pool for invoice callbacks.
+
+    Tasks are queued per payment hash: a hash is handled by at most one
+    worker at a time, so callbacks for the same invoice run in order while
+    different invoices run in parallel. When more than max_pending tasks are
+    queued, the overflow policy applies:
+
+    - 'block': submit() waits for room (backpressure on the gRPC stream)
+    - 'drop': the task is discarded and counted in 'dropped'
+    - 'caller_runs': the task runs inline on the submitting thread when
+      its invoice has nothing queued or running; otherwise as 'block'
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop', 'caller_runs')
+    LATENCY_SAMPLES = 256
+
+    def __init__(
+        self,
+        workers: int = CALLBACK_WORKERS,
+        max_pending: int = CALLBACK_MAX_PENDING,
+        overflow_policy: str = CALLBACK_OVERFLOW_POLICY
+    ):
+        """
+        Initialize dispatcher (worker threads start on first submit).
+
+        Args:
+            workers: Number of worker threads
+            max_pending: Maximum queued tasks before the overflow policy applies
+            overflow_policy: 'block', 'drop' or 'caller_runs'
+        """
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow_policy}")
+
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.overflow_policy = overflow_policy
+
+        self._queues: Dict[str, deque] = {}   # payment_hash -> pending tasks
+        self._ready: deque = deque()          # hashes with work and no active worker
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = True
+
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'errors': 0,
+            'dropped': 0,
+            'caller_runs': 0,
+            'max_queue_depth': 0
+        }
+        self._latency_ms: deque = deque(maxlen=self.LATENCY_SAMPLES)
+        self._wait_ms: deque = deque(maxlen=self.LATENCY_SAMPLES)
+
+    def _start_workers(self) -> None:
+        # Called with self._cond held; restarts the pool after shutdown()
+        if self._threads:
+            return
+        self._running = True
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker,
+                daemon=True,
+                name=f"PaymentCallback-{i}"
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(
+        self,
+        payment_hash: str,
+        callback: Callable,
+        update: InvoiceUpdate,
+        on_done: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """
+        Queue a callback for an invoice.
+
+        Args:
+            payment_hash: Hex-encoded payment hash (ordering key)
+            callback: Callback to invoke with the update
+            update: Invoice update
+            on_done: Called after the callback returned or raised (not
+                     called when the task is dropped)
+
+        Returns:
+            True if queued (or run inline), False if dropped
+        """
+        task = (callback, update, time.perf_counter(), on_done)
+        run_inline = False
+
+        with self._cond:
+            self._start_workers()
+            self._stats['submitted'] += 1
+
+            if self._pending >= self.max_pending:
+                if self.overflow_policy == 'drop':
+                    self._stats['dropped'] += 1
+                    logger.warning(
+                        f"Callback queue full ({self._pending}), dropping callback for "
+                        f"{payment_hash[:16]}..."
+                    )
+                    return False
+                elif self.overflow_policy == 'caller_runs' and payment_hash not in self._queues:
+                    self._stats['caller_runs'] += 1
+                    run_inline = True
+                    # Own the hash while it runs; later updates queue behind it
+                    self._queues[payment_hash] = deque()
+                else:
+                    while self._pending >= self.max_pending and self._running:
+                        self._cond.wait()
+                    if not self._running:
+                        return False
+
+            if not run_inline:
+                queue = self._queues.get(payment_hash)
+                if queue is None:
+                    queue = self._queues[payment_hash] = deque()
+                    self._ready.append(payment_hash)
+                queue.append(task)
+                self._pending += 1
+                self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._pending)
+                self._cond.notify_all()
+                return True
+
+        # caller_runs: runs on the stream thread; no other task of this
+        # invoice is queued or running, so per-invoice order holds
+        self._run(task)
+
+        with self._cond:
+            if self._queues[payment_hash]:
+                self._ready.append(payment_hash)
+            else:
+                del self._queues[payment_hash]
+            self._cond.notify_all()
+        return True
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._ready and self._running:
+                    self._cond.wait()
+                if not self._ready:
+                    return
+                payment_hash = self._ready.popleft()
+                task = self._queues[payment_hash].popleft()
+
+            self._run(task)
+
+            with self._cond:
+                self._pending -= 1
+                if self._queues[payment_hash]:
+                    # Next task of this invoice, after the one that just ran
+                    self._ready.append(payment_hash)
+                else:
+                    del self._queues[payment_hash]
+                self._cond.notify_all()
+
+    def _run(self, task) -> None:
+        callback, update, queued_at, on_done = task
+        started = time.perf_counter()
+        error = False
+        try:
+            callback(update)
+        except Exception as e:
+            error = True
+            logger.error(f"Error in invoice callback: {str(e)}", exc_info=True)
+        finished = time.perf_counter()
+
+        with self._cond:
+            self._stats['completed'] += 1
+            if error:
+                self._stats['errors'] += 1
+            self._wait_ms.append((started - queued_at) * 1000)
+            self._latency_ms.append((finished - started) * 1000)
+
+        if on_done is not None:
+            try:
+                on_done()
+            except Exception as e:
+                logger.error(f"Error completing invoice callback: {str(e)}", exc_info=True)
+
+    def shutdown(self, timeout: float = 5) -> None:
+        """
+        Wait for queued callbacks to finish and stop the workers.
+
+        Args:
+            timeout: Maximum time to wait for the queue to drain (seconds)
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while self._pending and time.time() < deadline:
+                self._cond.wait(max(0.0, deadline - time.time()))
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=max(0.0, deadline - time.time()))
+        self._threads = []
+
+    @staticmethod
+    def _summary(samples) -> Dict[str, float]:
+        values = sorted(samples)
+        if not values:
+            return {'avg': 0, 'p50': 0, 'p95': 0, 'max': 0}
+        return {
+            'avg': round(sum(values) / len(values), 2),
+            'p50': round(values[len(values) // 2], 2),
+            'p95': round(values[max(0, int(len(values) * 0.95) - 1)], 2),
+            'max': round(values[-1], 2)
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get queue depth and callback latency.
+
+        Returns:
+            Dictionary with counters, queue depth, callback latency
+            (callback_ms) and time spent queued (queue_wait_ms)
+        """
+        with self._cond:
+            metrics = dict(self._stats)
+            metrics.update({
+                'workers': self.workers,
+                'overflow_policy': self.overflow_policy,
+                'max_pending': self.max_pending,
+                'queue_depth': self._pending,
+                'active_invoices': len(self._queues),
+                'callback_ms': self._summary(self._latency_ms),
+                'queue_wait_ms': self._summary(self._wait_ms)
+            })
+        return metrics
+
+
 class PaymentMonitor:
     """
     Async payment monitor for atomic swaps.
@@ -67,18 +710,36 @@ class PaymentMonitor:
         monitor.start()
     """
 
-    def __init__(self, lnd_client: Optional[AtomicSwapLNDClient] = None):
+    def __init__(
+        self,
+        lnd_client: Optional[AtomicSwapLNDClient] = None,
+        checkpoint: Optional[InvoiceCheckpoint] = None,
+        dispatcher: Optional[CallbackDispatcher] = None
+    ):
         """
         Initialize payment monitor.
 
         Args:
             lnd_client: Optional LND client (uses singleton if not provided)
+            checkpoint: Optional checkpoint (defaults to INVOICE_CHECKPOINT_PATH)
+            dispatcher: Optional callback dispatcher (defaults to
+                        PAYMENT_CALLBACK_WORKERS/_MAX_PENDING/_OVERFLOW)
         """
         self.lnd_client = lnd_client or get_lnd_client()
+        self.checkpoint = checkpoint or InvoiceCheckpoint()
+        self.window = CheckpointWindow(self.checkpoint)
+        self.dispatcher = dispatcher or CallbackDispatcher()
         self.watchers: Dict[str, Callable] = {}  # payment_hash -> callback
+        self.waiters = InvoiceWaiterRegistry(self.lnd_client)
         self.running = False
         self.monitor_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
+        self._stats = {
+            'updates_processed': 0,
+            'reconnects': 0,
+            'last_update_at': None,
+            'last_update_lag_seconds': None
+        }
         logger.info("PaymentMonitor initialized")
 
     def watch_invoice(
@@ -113,6 +774,48 @@ class PaymentMonitor:
                 del self.watchers[payment_hash]
                 logger.info(f"Stopped watching invoice: {payment_hash[:16]}...")
 
+    def wait_for_invoice(self, payment_hash: str) -> Future:
+        """
+        Get a future that resolves when an invoice is settled or canceled.
+
+        Uses the monitor's single invoice subscription (started on demand),
+        so any number of concurrent waits costs no polling. The invoice is
+        looked up once after registering, which covers settlements that
+        happened before the call.
+
+        Args:
+            payment_hash: Hex-encoded payment hash
+
+        Returns:
+            concurrent.futures.Future resolving to the final InvoiceUpdate.
+            Cancel it to stop waiting.
+
+        Usage:
+            future = monitor.wait_for_invoice(payment_hash)
+            update = future.result(timeout=3600)
+            if update.settled:
+                preimage = update.preimage
+        """
+        future = self.waiters.register(payment_hash)
+        if not self.running:
+            self.start()
+        self.waiters.check(payment_hash)
+        return future
+
+    def wait_for_invoice_async(self, payment_hash: str) -> asyncio.Future:
+        """
+        asyncio version of wait_for_invoice().
+
+        Must be called from a running event loop.
+
+        Args:
+            payment_hash: Hex-encoded payment hash
+
+        Returns:
+            asyncio.Future resolving to the final InvoiceUpdate
+        """
+        return asyncio.wrap_future(self.wait_for_invoice(payment_hash))
+
     def start(self) -> bool:
         """
         Start the payment monitor in a background thread.
@@ -120,17 +823,18 @@ class PaymentMonitor:
         Returns:
             True if started successfully
         """
-        if self.running:
-            logger.warning("Payment monitor already running")
-            return False
-
-        self.running = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitor_loop,
-            daemon=True,
-            name="PaymentMonitor"
-        )
-        self.monitor_thread.start()
+        with self._lock:
+            if self.running:
+                logger.warning("Payment monitor already running")
+                return False
+
+            self.running = True
+            self.monitor_thread = threading.Thread(
+                target=self._monitor_loop,
+                daemon=True,
+                name="PaymentMonitor"
+            )
+            self.monitor_thread.start()
         logger.info("Payment monitor started")
         return True
 
@@ -139,8 +843,32 @@ class PaymentMonitor:
         self.running = False
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
+        self.dispatcher.shutdown(timeout=5)
+        self.checkpoint.flush(force=True)
         logger.info("Payment monitor stopped")
 
+    def _seed_checkpoint(self) -> None:
+        """
+        On first start, begin at the node's current indexes.
+
+        Without a checkpoint there is nothing to resume, and replaying the
+        whole invoice history would only delay live settlements.
+        """
+        if self.checkpoint.exists:
+            return
+
+        indexes, error = self.lnd_client.get_latest_invoice_indexes()
+        if error:
+            logger.warning(f"Could not seed invoice checkpoint: {error}")
+            return
+
+        self.checkpoint.advance(indexes['add_index'], indexes['settle_index'])
+        self.checkpoint.flush(force=True)
+        logger.info(
+            f"Seeded invoice checkpoint at add_index={indexes['add_index']}, "
+            f"settle_index={indexes['settle_index']}"
+        )
+
     def _monitor_loop(self) -> None:
         """
         Main monitoring loop (runs in background thread).
@@ -151,30 +879,42 @@ class PaymentMonitor:
 
         while self.running:
             try:
-                # Subscribe to invoice updates
+                self._seed_checkpoint()
+                self.window.restart()
+
+                # Subscribe to invoice updates, resuming after the checkpoint
                 stream, error = self.lnd_client.subscribe_invoice(
                     payment_hash=bytes(32),  # Dummy hash (we subscribe to all)
-                    timeout=3600
+                    timeout=3600,
+                    add_index=self.checkpoint.add_index,
+                    settle_index=self.checkpoint.settle_index
                 )
 
                 if error:
                     logger.error(f"Error subscribing to invoices: {error}")
                     if self.running:
                         # Wait before retry
-                        import time
                         time.sleep(5)
                     continue
 
+                with self._lock:
+                    self._stats['reconnects'] += 1
+
                 # Process invoice updates
                 for invoice in stream:
                     if not self.running:
                         break
 
+                    token = self.window.begin(int(invoice.add_index), int(invoice.settle_index))
+                    handed_off = False
                     try:
                         # Convert gRPC invoice to dict
                         invoice_dict = self._grpc_invoice_to_dict(invoice)
                         update = InvoiceUpdate(invoice_dict)
 
+                        # Wake anyone blocked on this invoice
+                        self.waiters.resolve(update)
+
                         # Check if we're watching this invoice
                         with self._lock:
                             callback = self.watchers.get(update.payment_hash)
@@ -185,17 +925,25 @@ class PaymentMonitor:
                                 f"Preimage: {update.preimage[:16] if update.preimage else 'N/A'}..."
                             )
 
-                            try:
-                                callback(update)
-                            except Exception as e:
-                                logger.error(
-                                    f"Error in invoice callback: {str(e)}",
-                                    exc_info=True
-                                )
-
-                            # Remove watcher after callback
+                            # Remove watcher, then hand the callback to the worker
+                            # pool so a slow handler does not stall the stream;
+                            # the checkpoint passes this update once it ran
                             with self._lock:
                                 self.watchers.pop(update.payment_hash, None)
+                            handed_off = True
+                            if not self.dispatcher.submit(
+                                update.payment_hash, callback, update,
+                                on_done=lambda token=token: self.window.finish(token)
+                            ):
+                                # Dropped: keep the watcher and hold the checkpoint
+                                # so the next subscription replays this update
+                                with self._lock:
+                                    self.watchers.setdefault(update.payment_hash, callback)
+                                self.window.abandon(token)
+                                logger.warning(
+                                    f"Checkpoint held before settle_index={invoice.settle_index}: "
+                                    f"callback for {update.payment_hash[:16]}... was dropped"
+                                )
 
                     except Exception as e:
                         logger.error(
@@ -203,16 +951,72 @@ class PaymentMonitor:
                             exc_info=True
                         )
 
+                    # Checkpoint only after the update was handled (callbacks
+                    # handed to the pool finish their token when they run)
+                    if not handed_off:
+                        self.window.finish(token)
+                    self._record_update(invoice)
+
             except Exception as e:
                 logger.error(f"Error in monitor loop: {str(e)}", exc_info=True)
+                self.checkpoint.flush(force=True)
                 if self.running:
                     # Wait before retry
-                    import time
                     time.sleep(5)
 
+        self.checkpoint.flush(force=True)
         logger.info("Payment monitor loop stopped")
 
-    def _grpc_invoice_to_dict(self, invoice) -> Dict[str, Any]:
+    def _record_update(self, invoice) -> None:
+        """Update lag metrics for an update read from the stream."""
+        now = time.time()
+        event_time = invoice.settle_date if invoice.settle_date else invoice.creation_date
+        with self._lock:
+            self._stats['updates_processed'] += 1
+            self._stats['last_update_at'] = now
+            if event_time:
+                self._stats['last_update_lag_seconds'] = max(0.0, now - int(event_time))
+
+    def get_metrics(self, check_node: bool = False) -> Dict[str, Any]:
+        """
+        Get subscription progress and lag.
+
+        last_update_lag_seconds is how old the last processed update was when
+        it was handled (high while LND replays a backlog, ~0 when live).
+        With check_node=True the node's current indexes are fetched and the
+        number of invoices not yet processed is reported as *_index_lag.
+
+        Args:
+            check_node: Query LND for its latest add_index/settle_index
+
+        Returns:
+            Dictionary with checkpoint indexes, counters and lag
+        """
+        with self._lock:
+            metrics = dict(self._stats)
+        metrics.update({
+            'running': self.running,
+            'add_index': self.checkpoint.add_index,
+            'settle_index': self.checkpoint.settle_index,
+            'checkpoint_saved_at': self.checkpoint.saved_at,
+            'checkpoint_pending': self.window.pending,
+            'watching': len(self.watchers),
+            'waiting': self.waiters.pending(),
+            'callbacks': self.dispatcher.get_metrics()
+        })
+
+        if check_node:
+            indexes, error = self.lnd_client.get_latest_invoice_indexes()
+            if error:
+                metrics['node_error'] = error
+            else:
+                metrics['add_index_lag'] = max(0, indexes['add_index'] - self.checkpoint.add_index)
+                metrics['settle_index_lag'] = max(0, indexes['settle_index'] - self.checkpoint.settle_index)
+
+        return metrics
+
+    @staticmethod
+    def _grpc_invoice_to_dict(invoice) -> Dict[str, Any]:
         """
         Convert gRPC invoice message to dictionary.
 
@@ -232,7 +1036,9 @@ class PaymentMonitor:
             'amt_paid_msat': invoice.amt_paid_msat,
             'memo': invoice.memo,
             'creation_date': invoice.creation_date,
-            'settle_date': invoice.settle_date if invoice.settle_date else None
+            'settle_date': invoice.settle_date if invoice.settle_date else None,
+            'add_index': invoice.add_index,
+            'settle_index': invoice.settle_index
         }
 
     def get_active_watches(self) -> Set[str]:
@@ -261,9 +1067,14 @@ class PaymentMonitor:
 
 class AsyncPaymentMonitor:
     """
-    Async version of PaymentMonitor using asyncio.
+    Native asyncio payment monitor built on grpc.aio.
 
-    Provides async/await interface for monitoring invoice payments.
+    One SubscribeInvoices stream on its own grpc.aio channel, running
+    entirely on the event loop: watches can be added or removed at any
+    time, callbacks are dispatched by a fixed pool of worker tasks through
+    a bounded queue (when the queue is full the stream stops being read,
+    so gRPC flow control pushes back on LND), and wait_for_invoice()
+    resolves asyncio futures without polling.
 
     Usage:
         monitor = AsyncPaymentMonitor()
@@ -273,19 +1084,42 @@ class AsyncPaymentMonitor:
             print(f"Invoice paid! Preimage: {update.preimage}")
 
         await monitor.watch_invoice(payment_hash, on_payment)
+        update = await monitor.wait_for_invoice(other_hash, timeout=3600)
     """
 
-    def __init__(self, lnd_client: Optional[AtomicSwapLNDClient] = None):
+    EXPIRY_GRACE = InvoiceWaiterRegistry.EXPIRY_GRACE
+    EXPIRY_RECHECK = InvoiceWaiterRegistry.EXPIRY_RECHECK
+
+    def __init__(
+        self,
+        lnd_client: Optional[AtomicSwapLNDClient] = None,
+        checkpoint: Optional[InvoiceCheckpoint] = None,
+        max_pending_callbacks: int = 1000,
+        callback_workers: int = 4
+    ):
         """
         Initialize async payment monitor.
 
         Args:
-            lnd_client: Optional LND client
+            lnd_client: Optional LND client (provides the channel manager)
+            checkpoint: Optional checkpoint (defaults to ASYNC_INVOICE_CHECKPOINT_PATH)
+            max_pending_callbacks: Callback queue size before backpressure
+            callback_workers: Number of tasks running callbacks
         """
         self.lnd_client = lnd_client or get_lnd_client()
+        self.checkpoint = checkpoint or InvoiceCheckpoint(ASYNC_INVOICE_CHECKPOINT_PATH)
+        self.window = CheckpointWindow(self.checkpoint)
         self.watchers: Dict[str, Callable] = {}
         self.running = False
+        self.max_pending_callbacks = max_pending_callbacks
+        self.callback_workers = callback_workers
         self.monitor_task: Optional[asyncio.Task] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._channel = None
+        self._stub = None
+        self._connected: Optional[asyncio.Event] = None  # created in start()
         logger.info("AsyncPaymentMonitor initialized")
 
     async def watch_invoice(
@@ -296,13 +1130,60 @@ class AsyncPaymentMonitor:
         """
         Watch an invoice for payment (async).
 
+        Takes effect immediately, also while the monitor is running.
+
         Args:
             payment_hash: Hex-encoded payment hash
-            callback: Async or sync callback function
+            callback: Async or sync callback function (sync callbacks run
+                      on the event loop and must not block)
         """
         self.watchers[payment_hash] = callback
         logger.info(f"Now watching invoice (async): {payment_hash[:16]}...")
 
+    async def unwatch_invoice(self, payment_hash: str) -> None:
+        """
+        Stop watching an invoice.
+
+        Args:
+            payment_hash: Hex-encoded payment hash
+        """
+        if self.watchers.pop(payment_hash, None):
+            logger.info(f"Stopped watching invoice (async): {payment_hash[:16]}...")
+
+    async def wait_for_invoice(
+        self,
+        payment_hash: str,
+        timeout: Optional[float] = None
+    ) -> InvoiceUpdate:
+        """
+        Wait until an invoice is settled or canceled.
+
+        Args:
+            payment_hash: Hex-encoded payment hash
+            timeout: Maximum time to wait (seconds), None for no limit
+
+        Returns:
+            The final InvoiceUpdate (state SETTLED or CANCELED)
+
+        Raises:
+            asyncio.TimeoutError: If the timeout expires first
+        """
+        if not self.running:
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(payment_hash, []).append(future)
+        try:
+            # Covers invoices already final before we registered
+            await self._check(payment_hash)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            futures = self._waiters.get(payment_hash)
+            if futures and future in futures:
+                futures.remove(future)
+                if not futures:
+                    del self._waiters[payment_hash]
+
     async def start(self) -> None:
         """Start the async payment monitor."""
         if self.running:
@@ -310,63 +1191,182 @@ class AsyncPaymentMonitor:
             return
 
         self.running = True
+        self._queue = asyncio.Queue(maxsize=self.max_pending_callbacks)
+        self._connected = asyncio.Event()
+        self._worker_tasks = [
+            asyncio.create_task(self._callback_worker())
+            for _ in range(self.callback_workers)
+        ]
         self.monitor_task = asyncio.create_task(self._monitor_loop())
         logger.info("Async payment monitor started")
 
     async def stop(self) -> None:
         """Stop the async payment monitor."""
         self.running = False
-        if self.monitor_task:
-            self.monitor_task.cancel()
+        tasks = ([self.monitor_task] if self.monitor_task else []) + self._worker_tasks
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
             try:
-                await self.monitor_task
+                await task
             except asyncio.CancelledError:
                 pass
+        self._worker_tasks = []
+        await self._close_channel()
+        self.checkpoint.flush(force=True)
         logger.info("Async payment monitor stopped")
 
+    async def _close_channel(self) -> None:
+        if self._channel is not None:
+            try:
+                await self._channel.close()
+            except Exception:
+                pass
+        self._channel = None
+        self._stub = None
+        if self._connected:
+            self._connected.clear()
+
+    async def _open_channel(self) -> bool:
+        """Create the grpc.aio channel and stub (on the running loop)."""
+        if not lnrpc or not lnrpcstub:
+            logger.error("gRPC modules not available")
+            return False
+
+        channel, error = self.lnd_client.manager.create_aio_channel()
+        if error:
+            logger.error(f"Error creating async gRPC channel: {error}")
+            return False
+
+        self._channel = channel
+        self._stub = lnrpcstub.LightningStub(channel)
+        self._connected.set()
+        return True
+
+    async def _seed_checkpoint(self) -> None:
+        """Start at the node's current indexes when no checkpoint exists."""
+        if self.checkpoint.exists:
+            return
+
+        request = lnrpc.ListInvoiceRequest(num_max_invoices=100, reversed=True)
+        response = await self._stub.ListInvoices(request, timeout=10)
+        self.checkpoint.advance(
+            int(response.last_index_offset),
+            max((int(invoice.settle_index) for invoice in response.invoices), default=0)
+        )
+        self.checkpoint.flush(force=True)
+
     async def _monitor_loop(self) -> None:
         """
         Main async monitoring loop.
 
-        This uses threading + asyncio hybrid since gRPC streaming
-        is synchronous.
+        Reads the invoice stream, resolves waiters and queues watcher
+        callbacks; the checkpoint advances as updates finish (CheckpointWindow).
+        Reconnects after 5s on errors.
         """
         logger.info("Async payment monitor loop starting...")
 
-        # Run sync monitoring in executor
-        loop = asyncio.get_event_loop()
+        while self.running:
+            try:
+                if not await self._open_channel():
+                    await asyncio.sleep(5)
+                    continue
 
-        def sync_monitor():
-            """Sync monitor that can be run in executor."""
-            monitor = PaymentMonitor(self.lnd_client)
+                await self._seed_checkpoint()
+                self.window.restart()
 
-            # Copy watchers
-            for payment_hash, callback in self.watchers.items():
-                # Wrap async callback if needed
-                def make_wrapper(cb):
-                    def wrapper(update):
-                        if asyncio.iscoroutinefunction(cb):
-                            asyncio.run_coroutine_threadsafe(cb(update), loop)
-                        else:
-                            cb(update)
-                    return wrapper
+                request = lnrpc.InvoiceSubscription(
+                    add_index=self.checkpoint.add_index,
+                    settle_index=self.checkpoint.settle_index
+                )
+                call = self._stub.SubscribeInvoices(request)
 
-                monitor.watch_invoice(payment_hash, make_wrapper(callback))
+                async for invoice in call:
+                    update = InvoiceUpdate(PaymentMonitor._grpc_invoice_to_dict(invoice))
 
-            monitor.start()
+                    if update.state in ('SETTLED', 'CANCELED'):
+                        self._resolve(update)
 
-            # Keep running while monitor is active
-            while self.running and monitor.running:
-                import time
-                time.sleep(1)
+                    token = self.window.begin(int(invoice.add_index), int(invoice.settle_index))
+                    callback = self.watchers.get(update.payment_hash)
+                    if callback and update.settled:
+                        del self.watchers[update.payment_hash]
+                        # Blocks while workers are saturated (backpressure); the
+                        # worker advances the checkpoint after the callback ran
+                        await self._queue.put((callback, update, token))
+                    else:
+                        self.window.finish(token)
 
-            monitor.stop()
+            except asyncio.CancelledError:
+                raise
+            except grpc.aio.AioRpcError as e:
+                logger.error(f"Invoice stream error: {e.code().name} {e.details()}")
+            except Exception as e:
+                logger.error(f"Error in async monitor loop: {str(e)}", exc_info=True)
+            finally:
+                self.checkpoint.flush(force=True)
+                await self._close_channel()
 
-        # Run in executor
-        await loop.run_in_executor(None, sync_monitor)
+            if self.running:
+                await asyncio.sleep(5)
 
         logger.info("Async payment monitor loop stopped")
 
+    async def _callback_worker(self) -> None:
+        """Run queued watcher callbacks on the event loop."""
+        while True:
+            callback, update, token = await self._queue.get()
+            try:
+                logger.info(
+                    f"Invoice settled (async)! {update.payment_hash[:16]}... "
+                    f"Preimage: {update.preimage[:16] if update.preimage else 'N/A'}..."
+                )
+                result = callback(update)
+                if asyncio.iscoroutine(result):
+                    await result
+            except asyncio.CancelledError:
+                # Stopped mid-callback: the update stays before the checkpoint
+                raise
+            except Exception as e:
+                logger.error(f"Error in async invoice callback: {str(e)}", exc_info=True)
+            finally:
+                self._queue.task_done()
+            self.window.finish(token)
+
+    def _resolve(self, update: InvoiceUpdate) -> None:
+        for future in self._waiters.pop(update.payment_hash, []):
+            if not future.done():
+                future.set_result(update)
+
+    async def _check(self, payment_hash: str) -> None:
+        """
+        Look up an invoice once; resolve waiters if final, otherwise schedule
+        the next check for just after its expiry (cancellations are not
+        reported by SubscribeInvoices).
+        """
+        if payment_hash not in self._waiters:
+            return
+
+        loop = asyncio.get_running_loop()
+        delay = self.EXPIRY_RECHECK
+        try:
+            await asyncio.wait_for(self._connected.wait(), 10)
+            request = lnrpc.PaymentHash(r_hash=bytes.fromhex(payment_hash))
+            invoice = await self._stub.LookupInvoice(request, timeout=10)
+            update = InvoiceUpdate(PaymentMonitor._grpc_invoice_to_dict(invoice))
+            if update.state in ('SETTLED', 'CANCELED'):
+                self._resolve(update)
+                return
+            expires_at = int(invoice.creation_date) + int(invoice.expiry)
+            if expires_at > time.time():
+                delay = expires_at - time.time() + self.EXPIRY_GRACE
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Error checking invoice {payment_hash[:16]}...: {str(e)}")
+
+        loop.call_later(delay, lambda: asyncio.ensure_future(self._check(payment_hash)))
+
 
 # Singleton instances
 _payment_monitor_instance = None
@@ -0,0 +1,22 @@
+"""
+Configuração comum dos testes da API
+
+Os módulos de api/v1 se importam pelo nome (como no gunicorn, que roda
+com api/v1 como diretório de trabalho), então api/v1 entra no sys.path.
+Sessões, jobs e o lock de keysends vão para um diretório temporário.
+"""
+
+import os
+import sys
+import tempfile
+
+API_V1_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'v1'))
+if API_V1_DIR not in sys.path:
+    sys.path.insert(0, API_V1_DIR)
+
+STATE_DIR = tempfile.mkdtemp(prefix='brln-api-tests-')
+os.environ.setdefault('BRLN_SESSION_BACKEND', 'memory')
+os.environ.setdefault('BRLN_SESSION_DB', os.path.join(STATE_DIR, 'sessions.db'))
+os.environ.setdefault('BRLN_RATELIMIT_DB', os.path.join(STATE_DIR, 'ratelimits.db'))
+os.environ.setdefault('BRLN_JOB_DB', os.path.join(STATE_DIR, 'jobs.db'))
+os.environ.setdefault('BRLN_KEYSEND_LOCK', os.path.join(STATE_DIR, 'keysend-ingestor.lock'))
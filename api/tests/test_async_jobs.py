@@ -0,0 +1,104 @@
+"""
+Testes do decorator async_job (api/v1/async_jobs.py)
+
+A view de um job roda no pool depois que o 202 já foi enviado; o corpo do
+request precisa estar em memória antes disso. Os testes usam um servidor
+HTTP/1.1 real com keep-alive, onde o stream do request é reaproveitado
+pela próxima requisição da mesma conexão.
+"""
+
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('cryptography')
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from async_jobs import JobManager, async_job
+import async_jobs
+
+
+VIEW_DELAY = 0.3
+JOBS = 8
+
+
+class KeepAliveHandler(WSGIRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(async_jobs, 'job_manager', JobManager(workers=4, max_pending=JOBS))
+
+    app = Flask(__name__)
+
+    @app.route('/echo', methods=['POST'])
+    @async_job('echo')
+    def echo():
+        time.sleep(VIEW_DELAY)  # o 202 já saiu quando o corpo é lido
+        data = request.get_json()
+        return jsonify({'status': 'success', 'value': data['value']})
+
+    @app.route('/jobs/<job_id>')
+    def job_status(job_id):
+        job = async_jobs.job_manager.get(job_id)
+        if not job:
+            return jsonify({'status': 'error'}), 404
+        return jsonify(job)
+
+    httpd = make_server('127.0.0.1', 0, app, threaded=True, request_handler=KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_port
+    httpd.shutdown()
+
+
+def request_json(conn, method, path, body=None):
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def wait_for_job(conn, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status, job = request_json(conn, 'GET', f'/jobs/{job_id}')
+        assert status == 200
+        if job.get('finished_at'):
+            return job
+        time.sleep(0.05)
+    pytest.fail(f"job {job_id} não terminou em {timeout}s")
+
+
+def test_job_reads_body_after_response(server):
+    conn = http.client.HTTPConnection('127.0.0.1', server, timeout=10)
+
+    job_ids = []
+    for value in range(JOBS):
+        status, body = request_json(conn, 'POST', '/echo?async=1', {'value': value})
+        assert status == 202
+        job_ids.append(body['job_id'])
+
+    for value, job_id in enumerate(job_ids):
+        job = wait_for_job(conn, job_id)
+        assert job['state'] == 'done'
+        assert job['http_status'] == 200
+        assert job['result'] == {'status': 'success', 'value': value}
+    conn.close()
+
+
+def test_job_rejected_when_queue_full(server):
+    conn = http.client.HTTPConnection('127.0.0.1', server, timeout=10)
+
+    statuses = [request_json(conn, 'POST', '/echo?async=1', {'value': value})[0]
+                for value in range(JOBS + 1)]
+    assert statuses[:JOBS] == [202] * JOBS
+    assert statuses[JOBS] == 503
+    conn.close()
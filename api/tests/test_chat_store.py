@@ -0,0 +1,290 @@
+"""
+Testes do banco do chat (api/v1/chat_store.py): migração a partir do
+schema anterior ao versionamento, paginação por cursor e a transação de
+keysends + checkpoint da ingestão
+"""
+
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('grpc')
+
+import chat_store
+from chat_store import (
+    CHAT_MIGRATIONS, KEYSEND_MESSAGE_RECORD, KEYSEND_SENDER_RECORD, KeysendIngestor,
+    encode_chat_cursor, get_chat_messages, store_received_keysends
+)
+from sqlite_store import SQLiteStore
+
+
+# Schema criado por init_chat_database() antes das migrações versionadas
+BASELINE_SCHEMA = '''
+    CREATE TABLE chat_messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        node_id TEXT NOT NULL,
+        message TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        payment_hash TEXT,
+        status TEXT DEFAULT 'confirmed',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE keysend_tracking (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        payment_hash TEXT UNIQUE NOT NULL,
+        sender_node_id TEXT NOT NULL,
+        amount_sat INTEGER NOT NULL,
+        message TEXT,
+        timestamp INTEGER NOT NULL,
+        processed BOOLEAN DEFAULT FALSE,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX idx_chat_node_id ON chat_messages(node_id);
+    CREATE INDEX idx_chat_timestamp ON chat_messages(timestamp);
+    CREATE INDEX idx_keysend_processed ON keysend_tracking(processed);
+'''
+
+NODE_A = '02' + 'aa' * 32
+NODE_B = '03' + 'bb' * 32
+
+
+@pytest.fixture
+def chat_db(tmp_path, monkeypatch):
+    store = SQLiteStore(str(tmp_path / 'lightning_chat.db'))
+    monkeypatch.setattr(chat_store, 'chat_db', store)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def migrated(chat_db):
+    chat_db.migrate(CHAT_MIGRATIONS)
+    return chat_db
+
+
+def _indexes(store, table):
+    with store.transaction() as cursor:
+        cursor.execute(f"SELECT name FROM pragma_index_list('{table}')")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _insert_messages(store, node_id, timestamps):
+    with store.transaction(immediate=True) as cursor:
+        for i, timestamp in enumerate(timestamps):
+            chat_store.insert_chat_message(cursor, node_id, f'msg {i}', timestamp, 'received')
+
+
+# === MIGRAÇÕES ===
+
+def test_migrates_baseline_database(chat_db):
+    conn = sqlite3.connect(chat_db.path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        'INSERT INTO chat_messages (node_id, message, timestamp, type) VALUES (?, ?, ?, ?)',
+        [(NODE_A, 'primeira', 1000, 'received'), (NODE_A, 'última', 3000, 'sent'),
+         (NODE_B, 'oi', 2000, 'received')]
+    )
+    conn.execute("INSERT INTO keysend_tracking (payment_hash, sender_node_id, amount_sat, timestamp) "
+                 "VALUES ('aa', ?, 1, 1000)", (NODE_A,))
+    conn.commit()
+    conn.close()
+
+    assert chat_db.migrate(CHAT_MIGRATIONS) == [1, 2, 3, 4, 5]
+    assert chat_db.get_user_version() == CHAT_MIGRATIONS[-1][0]
+
+    # Histórico preservado e resumo de conversas preenchido
+    conversations = {c['node_id']: c for c in chat_store.get_all_conversations()}
+    assert conversations[NODE_A]['last_message'] == 'última'
+    assert conversations[NODE_A]['last_activity'] == 3000
+    assert conversations[NODE_A]['message_count'] == 2
+    assert conversations[NODE_B]['message_count'] == 1
+    assert [c['node_id'] for c in chat_store.get_all_conversations()] == [NODE_A, NODE_B]
+
+    indexes = _indexes(chat_db, 'chat_messages')
+    assert 'idx_chat_node_ts_id' in indexes
+    assert 'idx_chat_node_id' not in indexes
+    assert chat_store.get_new_messages_count() == 0
+
+    with chat_db.transaction() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM keysend_tracking')
+        assert cursor.fetchone()[0] == 1
+
+
+def test_migration_is_idempotent_on_restart(migrated):
+    _insert_messages(migrated, NODE_A, [1000, 2000])
+
+    # Reinício da API: novo store no mesmo arquivo
+    restarted = SQLiteStore(migrated.path)
+    assert restarted.migrate(CHAT_MIGRATIONS) == []
+    restarted.close()
+
+    conversations = chat_store.get_all_conversations()
+    assert len(conversations) == 1
+    assert conversations[0]['message_count'] == 2
+
+
+# === PAGINAÇÃO ===
+
+def test_latest_page_and_has_more(migrated):
+    _insert_messages(migrated, NODE_A, range(1000, 1010))
+
+    messages, has_more = get_chat_messages(NODE_A, limit=10)
+    assert len(messages) == 10
+    assert has_more is False
+
+    messages, has_more = get_chat_messages(NODE_A, limit=4)
+    assert [m['timestamp'] for m in messages] == [1006, 1007, 1008, 1009]
+    assert has_more is True
+
+
+def test_before_walks_back_to_first_message(migrated):
+    _insert_messages(migrated, NODE_A, range(1000, 1010))
+
+    seen = []
+    messages, has_more = get_chat_messages(NODE_A, limit=4)
+    seen = messages + seen
+    while has_more:
+        first = messages[0]
+        messages, has_more = get_chat_messages(
+            NODE_A, limit=4, before=encode_chat_cursor(first['timestamp'], first['id']))
+        seen = messages + seen
+
+    assert [m['timestamp'] for m in seen] == list(range(1000, 1010))
+
+
+def test_after_returns_newer_messages(migrated):
+    _insert_messages(migrated, NODE_A, range(1000, 1006))
+    messages, _ = get_chat_messages(NODE_A, limit=2)
+    last = messages[-1]
+
+    messages, has_more = get_chat_messages(NODE_A, after=encode_chat_cursor(last['timestamp'], last['id']))
+    assert messages == []
+    assert has_more is False
+
+    _insert_messages(migrated, NODE_A, [1006, 1007, 1008])
+    messages, has_more = get_chat_messages(
+        NODE_A, limit=2, after=encode_chat_cursor(last['timestamp'], last['id']))
+    assert [m['timestamp'] for m in messages] == [1006, 1007]
+    assert has_more is True
+
+
+def test_same_millisecond_messages_are_not_skipped(migrated):
+    # Mensagens no mesmo timestamp: o id desempata o cursor
+    _insert_messages(migrated, NODE_A, [5000] * 5)
+
+    messages, has_more = get_chat_messages(NODE_A, limit=2)
+    assert has_more is True
+    ids = [m['id'] for m in messages]
+    while has_more:
+        first = messages[0]
+        messages, has_more = get_chat_messages(
+            NODE_A, limit=2, before=encode_chat_cursor(first['timestamp'], first['id']))
+        ids = [m['id'] for m in messages] + ids
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+
+
+def test_limit_is_clamped_and_scoped_to_node(migrated):
+    _insert_messages(migrated, NODE_A, range(1000, 1003))
+    _insert_messages(migrated, NODE_B, range(1000, 1003))
+
+    messages, has_more = get_chat_messages(NODE_A, limit=0)
+    assert len(messages) == 1
+    assert has_more is True
+
+    messages, _ = get_chat_messages(NODE_A, limit=10 ** 6)
+    assert len(messages) == 3
+    assert {m['message'] for m in messages} == {'msg 0', 'msg 1', 'msg 2'}
+
+
+def test_invalid_cursor_raises_value_error(migrated):
+    with pytest.raises(ValueError):
+        get_chat_messages(NODE_A, before='nao-e-cursor')
+
+
+# === KEYSENDS ===
+
+def _keysend(payment_hash, message='oi', timestamp=1000):
+    return {
+        'payment_hash': payment_hash,
+        'sender_node_id': NODE_A,
+        'amount_sat': 1,
+        'message': message,
+        'timestamp': timestamp
+    }
+
+
+def _invoice(settle_index, payment_hash=None, message=b'oi'):
+    records = {}
+    if payment_hash is not None:
+        records = {KEYSEND_MESSAGE_RECORD: message, KEYSEND_SENDER_RECORD: bytes.fromhex(NODE_A)}
+    return SimpleNamespace(
+        settle_index=settle_index,
+        htlcs=[SimpleNamespace(custom_records=records)],
+        is_keysend=payment_hash is not None,
+        r_hash=bytes.fromhex(payment_hash or f'{settle_index:064x}'),
+        amt_paid_sat=1,
+        value=1,
+        settle_date=settle_index
+    )
+
+
+def _checkpoint(store):
+    with store.transaction() as cursor:
+        cursor.execute('SELECT settle_index FROM keysend_checkpoint WHERE id = 1')
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _message_count(store):
+    with store.transaction() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM chat_messages')
+        return cursor.fetchone()[0]
+
+
+def test_duplicate_keysends_are_stored_once(migrated):
+    with migrated.transaction(immediate=True) as cursor:
+        assert store_received_keysends(cursor, [_keysend('aa'), _keysend('bb', message=None)]) == (2, 1)
+    with migrated.transaction(immediate=True) as cursor:
+        assert store_received_keysends(cursor, [_keysend('aa'), _keysend('cc')]) == (1, 1)
+
+    assert _message_count(migrated) == 2
+    assert chat_store.get_new_messages_count() == 3
+    assert chat_store.get_all_conversations()[0]['unread_count'] == 2
+
+
+def test_batch_advances_checkpoint_with_rows(migrated):
+    ingestor = KeysendIngestor(client=None, store=migrated)
+
+    ingestor._write_batch([_invoice(1, 'aa' * 32), _invoice(2), _invoice(3, 'bb' * 32)])
+    assert _checkpoint(migrated) == 3
+    assert _message_count(migrated) == 2
+
+    # Reentrega após reconexão: nada duplicado, checkpoint não volta
+    ingestor._write_batch([_invoice(1, 'aa' * 32)])
+    assert _checkpoint(migrated) == 3
+    assert _message_count(migrated) == 2
+    assert ingestor.get_status()['keysends_stored'] == 2
+
+
+def test_failed_batch_keeps_checkpoint_and_rows(migrated, monkeypatch):
+    ingestor = KeysendIngestor(client=None, store=migrated)
+    ingestor._write_batch([_invoice(1, 'aa' * 32)])
+
+    real_store = chat_store.store_received_keysends
+
+    def failing(cursor, keysends):
+        real_store(cursor, keysends)
+        raise sqlite3.OperationalError('disco cheio')
+
+    monkeypatch.setattr(chat_store, 'store_received_keysends', failing)
+    with pytest.raises(sqlite3.OperationalError):
+        ingestor._write_batch([_invoice(2, 'bb' * 32), _invoice(3, 'cc' * 32)])
+
+    assert _checkpoint(migrated) == 1
+    assert _message_count(migrated) == 1
+    assert chat_store.get_new_messages_count() == 1
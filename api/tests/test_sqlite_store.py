@@ -0,0 +1,101 @@
+"""
+Testes do SQLiteStore (api/v1/sqlite_store.py): transações, reentrância
+e migrações por PRAGMA user_version
+"""
+
+import sqlite3
+
+import pytest
+
+from sqlite_store import SQLiteStore, add_missing_columns
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStore(str(tmp_path / 'test.db'))
+    yield store
+    store.close()
+
+
+def _create_items(cursor):
+    cursor.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)')
+
+
+def _count(store):
+    with store.transaction() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM items')
+        return cursor.fetchone()[0]
+
+
+def test_transaction_commits_and_rolls_back(store):
+    store.migrate([(1, 'items', _create_items)])
+
+    with store.transaction(immediate=True) as cursor:
+        cursor.execute("INSERT INTO items (name) VALUES ('a')")
+    assert _count(store) == 1
+
+    with pytest.raises(RuntimeError):
+        with store.transaction(immediate=True) as cursor:
+            cursor.execute("INSERT INTO items (name) VALUES ('b')")
+            raise RuntimeError('falha')
+    assert _count(store) == 1
+    assert store.get_status()['rollbacks'] == 1
+
+
+def test_nested_transaction_joins_outer(store):
+    store.migrate([(1, 'items', _create_items)])
+
+    with pytest.raises(RuntimeError):
+        with store.transaction(immediate=True) as outer:
+            outer.execute("INSERT INTO items (name) VALUES ('a')")
+            with store.transaction(immediate=True) as inner:
+                inner.execute("INSERT INTO items (name) VALUES ('b')")
+            raise RuntimeError('falha depois do bloco interno')
+
+    # O bloco interno não faz commit próprio: tudo é desfeito
+    assert _count(store) == 0
+
+
+def test_connections_are_reused(store):
+    store.migrate([(1, 'items', _create_items)])
+    for _ in range(20):
+        _count(store)
+    assert store.get_status()['connections_opened'] == 1
+
+
+def test_migrate_applies_pending_steps_once(store, tmp_path):
+    migrations = [
+        (1, 'items', _create_items),
+        (2, 'coluna extra', lambda cursor: add_missing_columns(cursor, 'items', [('extra', 'TEXT')])),
+    ]
+    assert store.migrate(migrations) == [1, 2]
+    assert store.get_user_version() == 2
+
+    # Reinício: outro store no mesmo arquivo não reaplica nada
+    restarted = SQLiteStore(store.path)
+    assert restarted.migrate(migrations) == []
+    restarted.close()
+
+
+def test_interrupted_migration_is_repeated(store):
+    def broken(cursor):
+        cursor.execute('CREATE TABLE partial (id INTEGER)')
+        raise sqlite3.OperationalError('interrompida')
+
+    with pytest.raises(sqlite3.OperationalError):
+        store.migrate([(1, 'items', _create_items), (2, 'quebrada', broken)])
+    assert store.get_user_version() == 1
+
+    def fixed(cursor):
+        cursor.execute('CREATE TABLE partial (id INTEGER)')
+
+    # O passo 2 foi desfeito por inteiro e roda de novo
+    assert store.migrate([(1, 'items', _create_items), (2, 'corrigida', fixed)]) == [2]
+    assert store.get_user_version() == 2
+
+
+def test_add_missing_columns_skips_existing(store):
+    store.migrate([(1, 'items', _create_items)])
+    with store.transaction(immediate=True) as cursor:
+        assert add_missing_columns(cursor, 'items', [('name', 'TEXT'), ('extra', 'TEXT')]) == ['extra']
+        assert add_missing_columns(cursor, 'items', [('extra', 'TEXT')]) == []
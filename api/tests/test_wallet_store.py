@@ -0,0 +1,125 @@
+"""
+Testes das migrações de wallets.db (api/v1/wallet_store.py) a partir de
+bancos criados antes do versionamento
+"""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('cryptography')
+
+import wallet_store
+from wallet_store import WALLET_MIGRATIONS, WalletManager
+from sqlite_store import SQLiteStore
+
+
+# Schema mais antigo de wallets (has_password, encrypted_private_keys e
+# is_system_default vieram depois, via ALTER TABLE)
+BASELINE_SCHEMA = '''
+    CREATE TABLE wallets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        wallet_id TEXT UNIQUE NOT NULL,
+        encrypted_mnemonic BLOB NOT NULL,
+        salt BLOB NOT NULL,
+        metadata TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        last_used DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE derived_addresses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        wallet_id TEXT NOT NULL,
+        chain_id TEXT NOT NULL,
+        address TEXT NOT NULL,
+        derivation_path TEXT NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(wallet_id, chain_id)
+    );
+'''
+
+
+@pytest.fixture
+def wallet_db(tmp_path, monkeypatch):
+    store = SQLiteStore(str(tmp_path / 'wallets.db'))
+    monkeypatch.setattr(wallet_store, 'wallet_db', store)
+    yield store
+    store.close()
+
+
+def _columns(store, table):
+    with store.transaction() as cursor:
+        cursor.execute(f"SELECT name FROM pragma_table_info('{table}')")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _baseline(store):
+    conn = sqlite3.connect(store.path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("INSERT INTO wallets (wallet_id, encrypted_mnemonic, salt, metadata) "
+                 "VALUES ('w1', x'01', x'02', '{\"name\": \"principal\"}')")
+    conn.execute("INSERT INTO derived_addresses (wallet_id, chain_id, address, derivation_path) "
+                 "VALUES ('w1', 'bitcoin', 'bc1qexemplo', \"m/44'/0'/0'/0/0\")")
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_baseline_database(wallet_db):
+    _baseline(wallet_db)
+
+    assert wallet_db.migrate(WALLET_MIGRATIONS) == [1, 2, 3, 4]
+    assert wallet_db.get_user_version() == WALLET_MIGRATIONS[-1][0]
+
+    assert {'has_password', 'encrypted_private_keys', 'is_system_default', 'kdf'} <= _columns(wallet_db, 'wallets')
+    assert {'branch', 'address_index', 'used'} <= _columns(wallet_db, 'derived_addresses')
+    assert 'kdf' in _columns(wallet_db, 'tron_config')
+
+    manager = WalletManager()
+    wallet, error = manager.load_wallet('w1')
+    assert error is None
+    assert wallet['metadata'] == {'name': 'principal'}
+    assert wallet['kdf'] is None  # PBKDF2 legado
+
+    # Endereço antigo vira o índice 0 do branch de recebimento
+    addresses, error = manager.get_cached_addresses('w1')
+    assert error is None
+    assert addresses['bitcoin']['address'] == 'bc1qexemplo'
+    owner, error = manager.lookup_address('bc1qexemplo')
+    assert error is None
+    assert (owner['wallet_id'], owner['branch'], owner['index']) == ('w1', 0, 0)
+
+
+def test_v3_allows_several_addresses_per_chain(wallet_db):
+    _baseline(wallet_db)
+    wallet_db.migrate(WALLET_MIGRATIONS)
+
+    with wallet_db.transaction(immediate=True) as cursor:
+        cursor.execute('''
+            INSERT INTO derived_addresses (wallet_id, chain_id, branch, address_index, address, derivation_path)
+            VALUES ('w1', 'bitcoin', 0, 1, 'bc1qsegundo', "m/44'/0'/0'/0/1")
+        ''')
+        cursor.execute("SELECT COUNT(*) FROM derived_addresses WHERE wallet_id = 'w1' AND chain_id = 'bitcoin'")
+        assert cursor.fetchone()[0] == 2
+
+
+def test_migration_is_idempotent_on_restart(wallet_db):
+    _baseline(wallet_db)
+    wallet_db.migrate(WALLET_MIGRATIONS)
+
+    restarted = SQLiteStore(wallet_db.path)
+    assert restarted.migrate(WALLET_MIGRATIONS) == []
+    restarted.close()
+
+    with wallet_db.transaction() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM derived_addresses')
+        assert cursor.fetchone()[0] == 1
+
+
+def test_fresh_database_gets_latest_schema(wallet_db):
+    assert wallet_db.migrate(WALLET_MIGRATIONS) == [1, 2, 3, 4]
+
+    manager = WalletManager()
+    ok, error = manager.save_wallet('w2', b'cipher', b'salt', {'name': 'nova'}, kdf='scrypt$n=16384')
+    assert (ok, error) == (True, None)
+    wallet, _ = manager.load_wallet('w2')
+    assert wallet['kdf'] == 'scrypt$n=16384'
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - utilitários das rotas
+
+Rate limiter (ligado ao app em create_app()), decorators de sessão
+(session_auth.py) e validação de entrada compartilhados pelos blueprints.
+"""
+
+import re
+
+
+# Rate limiting for authentication endpoints
+try:
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+    HAS_RATE_LIMITER = True
+except ImportError:
+    HAS_RATE_LIMITER = False
+
+# Rate limiter compartilhado pelos blueprints; ligado ao app (storage em
+# SQLite compartilhado entre workers, ver rate_limit_store.py) em create_app()
+if HAS_RATE_LIMITER:
+    limiter = Limiter(
+        get_remote_address,
+        default_limits=["200 per day", "50 per hour"]
+    )
+else:
+    # Dummy limiter decorator if Flask-Limiter not available
+    class DummyLimiter:
+        def limit(self, limit_string):
+            def decorator(f):
+                return f
+            return decorator
+
+        def init_app(self, app):
+            pass
+    limiter = DummyLimiter()
+
+# Session Authentication Module
+try:
+    from session_auth import (
+        require_auth,
+        optional_auth,
+        get_derived_key as session_get_derived_key,
+        cache_derived_key as session_cache_derived_key
+    )
+    HAS_SESSION_AUTH = True
+    print("Session Authentication Module loaded successfully")
+except ImportError as e:
+    HAS_SESSION_AUTH = False
+    print(f"Warning: Session Authentication Module not available: {e}")
+    # Provide dummy decorator if module not available
+    def require_auth(f):
+        return f
+    def optional_auth(f):
+        return f
+    def session_get_derived_key(session_id, scope, salt, password):
+        return None
+    def session_cache_derived_key(session_id, scope, salt, password, key):
+        return False
+
+# === INPUT VALIDATION HELPERS ===
+
+# Allowed service names (whitelist approach for security)
+ALLOWED_SERVICE_NAMES = {
+    'lnbits', 'thunderhub', 'simple', 'lndg', 'lndg-controller',
+    'lnd', 'bitcoind', 'elementsd', 'bos-telegram', 'tor', 'gotty-fullauto'
+}
+
+# Regex patterns for input validation
+WALLET_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]{1,64}$')
+SERVICE_NAME_PATTERN = re.compile(r'^[a-zA-Z0-9_-]{1,32}$')
+
+def validate_wallet_id(wallet_id):
+    """
+    Validate wallet_id format.
+    Allows alphanumeric characters, underscores, and hyphens.
+    Max length: 64 characters.
+    
+    Returns:
+        tuple: (is_valid: bool, error_message: str or None)
+    """
+    if not wallet_id:
+        return False, "wallet_id is required"
+    if not isinstance(wallet_id, str):
+        return False, "wallet_id must be a string"
+    if len(wallet_id) > 64:
+        return False, "wallet_id must be 64 characters or less"
+    if not WALLET_ID_PATTERN.match(wallet_id):
+        return False, "wallet_id can only contain letters, numbers, underscores, and hyphens"
+    return True, None
+
+def validate_service_name(service_name):
+    """
+    Validate service_name against whitelist.
+    Only allows known service names to prevent injection.
+    
+    Returns:
+        tuple: (is_valid: bool, error_message: str or None)
+    """
+    if not service_name:
+        return False, "service_name is required"
+    if not isinstance(service_name, str):
+        return False, "service_name must be a string"
+    if service_name not in ALLOWED_SERVICE_NAMES:
+        return False, f"Invalid service name. Allowed services: {', '.join(sorted(ALLOWED_SERVICE_NAMES))}"
+    return True, None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - configuração
+
+Rede, endereços e caminhos do LND/Bitcoin Core/Elements e acesso ao
+gerenciador de senhas (SecurePasswordAPI, criada na primeira chamada de
+get_password_api()). Importar este módulo não tem efeitos colaterais além
+de pôr o brln-tools no sys.path.
+"""
+
+import sys
+import os
+import threading
+
+
+# Secure Password Manager API Integration
+# Use brln-api user's directory when running as service, fallback to root for development
+if os.path.exists('/home/brln-api/brln-tools'):
+    sys.path.insert(0, '/home/brln-api/brln-tools')
+else:
+    sys.path.insert(0, '/root/brln-os/brln-tools')
+try:
+    from secure_password_api import SecurePasswordAPI
+    HAS_SECURE_PASSWORD_API = True
+    print("Secure Password Manager API loaded successfully")
+except ImportError as e:
+    HAS_SECURE_PASSWORD_API = False
+    print(f"Warning: Secure Password Manager API not available: {e}")
+
+# Network configuration
+BITCOIN_NETWORK = os.environ.get('BRLN_NETWORK', os.environ.get('BITCOIN_NETWORK', 'mainnet'))
+
+# Initialize Secure Password Manager API
+def get_master_password():
+    """
+    Get master password from active session or environment variable.
+    
+    Priority:
+    1. Active authenticated session (via HTTP cookie)
+    2. Environment variable BRLN_MASTER_PASSWORD
+    
+    The master password is NOT stored on the system - it must be provided by the user
+    through authentication (login) or environment variable.
+    """
+    # First, try to get from session
+    try:
+        from flask import request
+        from session_auth import get_master_password_from_session
+        session_id = request.cookies.get('brln_session')
+        if session_id:
+            password = get_master_password_from_session(session_id)
+            if password:
+                return password
+    except RuntimeError:
+        # Outside request context
+        pass
+    except Exception as e:
+        print(f"Warning: Could not get password from session: {e}")
+    
+    # Fallback to environment variable
+    env_password = os.environ.get('BRLN_MASTER_PASSWORD')
+    if env_password:
+        return env_password
+    
+    # Master password not available - this is normal for the API service
+    # User must provide password when accessing password-protected operations
+    return None
+
+_password_api = None
+_password_api_lock = threading.Lock()
+_password_api_loaded = False
+
+
+def get_password_api():
+    """
+    SecurePasswordAPI compartilhada (None se indisponível), criada na
+    primeira chamada: importar este módulo não consulta o gerenciador de
+    senhas nem o daemon brln-secrets.
+    """
+    global _password_api, _password_api_loaded
+    with _password_api_lock:
+        if _password_api_loaded:
+            return _password_api
+        _password_api_loaded = True
+        if not HAS_SECURE_PASSWORD_API:
+            return None
+        try:
+            _password_api = SecurePasswordAPI(
+                master_password=get_master_password(),
+                cache_enabled=True
+            )
+            print("Secure Password Manager API initialized")
+            
+            # Com o brln-secrets rodando, rotações limpam o cache na hora
+            if _password_api.subscribe_rotations():
+                print("Secrets daemon rotation listener started")
+            
+            # Check if initialized
+            if not _password_api.is_initialized():
+                print("WARNING: Secure password manager not initialized!")
+                print("Run: python3 /root/brln-os/brln-tools/secure_password_manager.py init")
+        except Exception as e:
+            print(f"Warning: Could not initialize secure password API: {e}")
+            _password_api = None
+        return _password_api
+
+def get_secure_credential(service_name, fallback_value=None):
+    """
+    Get credential from secure password manager with fallback.
+    Priority: Password Manager -> Environment Variable -> Fallback
+    """
+    password_api = get_password_api()
+    if password_api:
+        try:
+            credential = password_api.get_password(service_name)
+            if credential:
+                return credential
+        except Exception as e:
+            print(f"Warning: Could not retrieve {service_name} from password manager: {e}")
+    
+    # Try environment variable
+    env_key = service_name.upper().replace('_', '_')
+    env_value = os.environ.get(env_key)
+    if env_value:
+        return env_value
+    
+    # Use fallback
+    if fallback_value:
+        print(f"Warning: Using fallback value for {service_name}")
+    return fallback_value
+
+# Configurações LND
+LND_HOST = "localhost"
+LND_GRPC_PORT = "10009"
+MACAROON_PATH = f"/data/lnd/data/chain/bitcoin/{BITCOIN_NETWORK}/admin.macaroon"
+TLS_CERT_PATH = "/data/lnd/tls.cert"
+
+# Configurações Bitcoin Core RPC (porta padrão por rede se não definida)
+BITCOIN_RPC_HOST = os.getenv('BITCOIN_RPC_HOST', 'localhost')
+BITCOIN_RPC_PORT = os.getenv('BITCOIN_RPC_PORT')
+BITCOIN_RPC_USER = os.getenv('BITCOIN_RPC_USER', 'minibolt')
+BITCOIN_DATADIR = "/data/bitcoin"
+
+# Configurações Elements/Liquid
+ELEMENTS_RPC_HOST = "localhost"
+ELEMENTS_RPC_PORT = "7041"
+# Padrões; as credenciais reais vêm do gerenciador de senhas a cada chamada
+# RPC (ElementsRPCClient._update_credentials)
+ELEMENTS_RPC_USER = 'elements'
+ELEMENTS_RPC_PASSWORD = 'changeme_elements'
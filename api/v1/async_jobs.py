@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - jobs assíncronos
+
+JobManager (pool limitado para KDFs longos) e o decorator async_job que
+responde 202 + job_id quando o cliente pede ?async=1.
+"""
+
+import os
+from concurrent import futures
+from functools import wraps
+import time
+import threading
+import secrets
+from flask import current_app, jsonify, request, g, copy_current_request_context
+
+from wallet_crypto import KDF_MAX_CONCURRENT
+
+
+# === JOBS ASSÍNCRONOS (KDF) ===
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', '64'))
+JOB_RESULT_TTL = 600  # segundos que um resultado não lido fica disponível
+
+
+class JobManager:
+    """
+    Pool limitado para operações longas (PBKDF2 de /wallet/save, /load e
+    /export-backup) fora das threads de request.
+    
+    O resultado é entregue uma única vez em GET /api/v1/jobs/<id> (pode
+    conter seed ou chaves) e só para a mesma sessão que criou o job.
+    
+    Com store (job_store.SQLiteJobStore), estado e resultado ficam no
+    arquivo compartilhado e qualquer worker do gunicorn responde o GET;
+    _jobs guarda só os jobs pendentes deste processo (limite max_pending).
+    """
+    
+    def __init__(self, workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING, store=None):
+        self.max_pending = max_pending
+        self.store = store
+        self._executor = futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='brln-job')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+    
+    def _save(self, job):
+        """Publica o estado do job no store compartilhado (se houver)"""
+        if self.store is None:
+            return
+        try:
+            self.store.save(job)
+        except Exception as e:
+            print(f"Erro ao gravar job {job['type']}: {e}")
+    
+    def _purge(self):
+        """Descarta resultados expirados (chamado com o lock)"""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] and now - job['finished_at'] > JOB_RESULT_TTL]
+        for job_id in expired:
+            del self._jobs[job_id]
+    
+    def submit(self, job_type, fn, owner=None):
+        """Agenda fn() e retorna (job_id, error); fn deve retornar (http_status, body)"""
+        with self._lock:
+            self._purge()
+            pending = sum(1 for job in self._jobs.values() if job['state'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                self._stats['rejected'] += 1
+                return None, "Too many pending jobs, try again later"
+            
+            job_id = secrets.token_urlsafe(16)
+            job = self._jobs[job_id] = {
+                'id': job_id,
+                'type': job_type,
+                'state': 'queued',
+                'owner': owner,
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'http_status': None,
+                'result': None
+            }
+            self._stats['submitted'] += 1
+            snapshot = dict(job)
+        
+        self._save(snapshot)
+        self._executor.submit(self._run, job_id, fn)
+        return job_id, None
+    
+    def _run(self, job_id, fn):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            job['state'] = 'running'
+            job['started_at'] = time.time()
+            snapshot = dict(job)
+        self._save(snapshot)
+        
+        try:
+            http_status, body = fn()
+            state = 'done'
+        except Exception as e:
+            http_status, body = 500, {'status': 'error', 'error': str(e)}
+            state = 'failed'
+        
+        with self._lock:
+            job['state'] = state
+            job['http_status'] = http_status
+            job['result'] = body
+            job['finished_at'] = time.time()
+            self._stats['completed' if state == 'done' else 'failed'] += 1
+            snapshot = dict(job)
+            if self.store is not None:
+                del self._jobs[job_id]  # resultado fica só no store
+        self._save(snapshot)
+    
+    def get(self, job_id, owner=None):
+        """Estado do job (None se não existe ou é de outra sessão); entrega o resultado uma vez"""
+        if self.store is not None:
+            self.store.purge(JOB_RESULT_TTL, time.time())
+            return self.store.take(job_id, owner)
+        
+        with self._lock:
+            self._purge()
+            job = self._jobs.get(job_id)
+            if not job or (job['owner'] and job['owner'] != owner):
+                return None
+            
+            info = {key: job[key] for key in ('id', 'type', 'state', 'created_at', 'started_at', 'finished_at')}
+            if job['finished_at']:
+                info['http_status'] = job['http_status']
+                info['result'] = job['result']
+                del self._jobs[job_id]
+            return info
+    
+    def get_status(self):
+        """Contadores deste processo; 'jobs' cobre todos os workers quando há store"""
+        with self._lock:
+            states = {}
+            for job in self._jobs.values():
+                states[job['state']] = states.get(job['state'], 0) + 1
+            stats = dict(self._stats)
+        if self.store is not None:
+            states = self.store.count_states()
+        return {
+            'max_pending': self.max_pending,
+            'kdf_max_concurrent': KDF_MAX_CONCURRENT,
+            'shared': self.store is not None,
+            'jobs': states,
+            **stats
+        }
+
+
+# O store compartilhado (job_store.py) é ligado em create_app()
+job_manager = JobManager()
+
+
+def wants_async_job():
+    """?async=1 ou Prefer: respond-async (RFC 7240)"""
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+def async_job(job_type):
+    """
+    Permite que um endpoint rode como job (202 + job_id) quando o cliente pede.
+    
+    A view roda no pool com uma cópia do contexto do request (cookies, JSON
+    e o `g` preenchido por require_auth); sem o pedido, roda inline. O corpo
+    é lido aqui: quando o job roda o 202 já foi enviado e o stream do
+    request pode já ter sido fechado ou reaproveitado pelo servidor.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not wants_async_job():
+                return view(*args, **kwargs)
+            
+            request.get_data(cache=True)
+            saved_g = dict(g.__dict__)
+            
+            @copy_current_request_context
+            def run_view():
+                g.__dict__.update(saved_g)
+                response = current_app.make_response(view(*args, **kwargs))
+                return response.status_code, response.get_json(silent=True)
+            
+            job_id, error = job_manager.submit(job_type, run_view, owner=request.cookies.get('brln_session'))
+            if error:
+                return jsonify({'status': 'error', 'error': error}), 503
+            
+            return jsonify({
+                'status': 'accepted',
+                'job_id': job_id,
+                'status_url': f'/api/v1/jobs/{job_id}'
+            }), 202
+        return wrapper
+    return decorator
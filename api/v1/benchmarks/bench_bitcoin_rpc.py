@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bitcoin-cli (subprocess) vs BitcoinRPCClient (JSON-RPC keep-alive)
+
+Mede a latência por chamada de getblockchaininfo / getblockcount pelos dois
+caminhos usados pela API. Precisa rodar no nó, com o bitcoind ativo e o venv
+da API (/root/brln-os-envs/api-v1).
+
+Usage: python3 bench_bitcoin_rpc.py [-n 200]
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from node_rpc import bitcoin_rpc_client, get_bitcoin_cli_command
+from system_services import run_command
+
+
+def measure(label, fn, iterations):
+    """Executa fn N vezes e imprime p50/p95/média em ms"""
+    fn()  # aquecimento (cookie, conexão TCP, cache de disco)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<40} p50={statistics.median(samples):8.2f}ms  "
+          f"p95={p95:8.2f}ms  mean={statistics.mean(samples):8.2f}ms")
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    bitcoin_cli = get_bitcoin_cli_command()
+
+    def cli_blockchain_info():
+        output, code = run_command(f"{bitcoin_cli} getblockchaininfo 2>/dev/null")
+        if code != 0:
+            raise RuntimeError("bitcoin-cli falhou")
+        return json.loads(output)
+
+    def cli_block_count():
+        output, code = run_command(f"{bitcoin_cli} getblockcount 2>/dev/null")
+        if code != 0:
+            raise RuntimeError("bitcoin-cli falhou")
+        return int(output)
+
+    def rpc_blockchain_info():
+        result, error = bitcoin_rpc_client.get_blockchain_info()
+        if error:
+            raise RuntimeError(error)
+        return result
+
+    def rpc_block_count():
+        result, error = bitcoin_rpc_client.get_block_count()
+        if error:
+            raise RuntimeError(error)
+        return result
+
+    def rpc_batch():
+        results, error = bitcoin_rpc_client.batch([
+            ("getblockchaininfo", []),
+            ("getblockcount", []),
+        ])
+        if error:
+            raise RuntimeError(error)
+        return results
+
+    print(f"Iterações: {args.iterations}\n")
+    cli = measure("bitcoin-cli getblockchaininfo", cli_blockchain_info, args.iterations)
+    rpc = measure("rpc getblockchaininfo", rpc_blockchain_info, args.iterations)
+    measure("bitcoin-cli getblockcount", cli_block_count, args.iterations)
+    measure("rpc getblockcount", rpc_block_count, args.iterations)
+    measure("rpc batch [getblockchaininfo, getblockcount]", rpc_batch, args.iterations)
+
+    print(f"\nSpeedup getblockchaininfo: {cli / rpc:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
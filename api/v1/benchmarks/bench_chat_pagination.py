@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark: paginação de mensagens do chat Lightning
+
+Gera um chat.db sintético (padrão: 1M mensagens em 200 conversas) e compara
+a consulta antiga (ORDER BY timestamp ASC LIMIT, índices separados) com a
+paginação por cursor (node_id, timestamp, id) de get_chat_messages: página
+mais recente, página profunda via ?before e página seguinte via ?after.
+
+O banco é criado em um arquivo temporário; o chat.db real não é tocado.
+
+Usage: python3 bench_chat_pagination.py [-m 1000000] [-c 200] [-n 200] [--db /tmp/chat.db]
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import chat_store
+from chat_store import init_chat_database, get_chat_messages, encode_chat_cursor
+from sqlite_store import SQLiteStore
+
+
+def measure(label, fn, iterations):
+    """Executa fn N vezes e imprime p50/p95/média em ms"""
+    fn()  # aquecimento (cache de páginas do SQLite)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{label:<40} p50={statistics.median(samples):8.2f}ms  "
+          f"p95={p95:8.2f}ms  mean={statistics.mean(samples):8.2f}ms")
+    return statistics.mean(samples)
+
+
+def populate(db_path, total, conversations):
+    """Insere mensagens sintéticas intercaladas entre as conversas"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    nodes = [f"02{i:064x}"[:66] for i in range(conversations)]
+    base = int(time.time() * 1000) - total * 1000
+
+    def rows():
+        for i in range(total):
+            node_id = nodes[random.randrange(conversations)]
+            msg_type = 'sent' if i % 2 else 'received'
+            yield (node_id, f"mensagem {i}", base + i * 1000, msg_type, f"{i:064x}", 'confirmed')
+
+    start = time.perf_counter()
+    cursor.executemany('''
+        INSERT INTO chat_messages (node_id, message, timestamp, type, payment_hash, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', rows())
+    conn.commit()
+    cursor.execute('ANALYZE')
+    conn.close()
+    print(f"{total} mensagens em {conversations} conversas geradas em "
+          f"{time.perf_counter() - start:.1f}s")
+    return nodes
+
+
+def legacy_query(node_id, limit):
+    """Consulta anterior: mais antigas primeiro, sem cursor"""
+    conn = sqlite3.connect(chat_store.CHAT_DB_PATH)
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT message, timestamp, type, status, payment_hash
+        FROM chat_messages
+        WHERE node_id = ?
+        ORDER BY timestamp ASC
+        LIMIT ?
+    ''', (node_id, limit))
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def legacy_newest(node_id, limit):
+    """Última página no esquema antigo: COUNT + OFFSET"""
+    conn = sqlite3.connect(chat_store.CHAT_DB_PATH)
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM chat_messages WHERE node_id = ?', (node_id,))
+    total = cursor.fetchone()[0]
+    cursor.execute('''
+        SELECT message, timestamp, type, status, payment_hash
+        FROM chat_messages
+        WHERE node_id = ?
+        ORDER BY timestamp ASC
+        LIMIT ? OFFSET ?
+    ''', (node_id, limit, max(total - limit, 0)))
+    rows = cursor.fetchall()
+    conn.close()
+    return rows
+
+
+def explain(sql, params):
+    conn = sqlite3.connect(chat_store.CHAT_DB_PATH)
+    plan = conn.execute('EXPLAIN QUERY PLAN ' + sql, params).fetchall()
+    conn.close()
+    return '; '.join(row[-1] for row in plan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-m', '--messages', type=int, default=1_000_000)
+    parser.add_argument('-c', '--conversations', type=int, default=200)
+    parser.add_argument('-n', '--iterations', type=int, default=200)
+    parser.add_argument('-l', '--limit', type=int, default=100)
+    parser.add_argument('--db', help='Caminho do banco sintético (padrão: arquivo temporário)')
+    args = parser.parse_args()
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='brln-chat-bench-'), 'lightning_chat.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    chat_store.CHAT_DB_PATH = db_path
+    chat_store.chat_db = SQLiteStore(db_path)
+    init_chat_database()
+    nodes = populate(db_path, args.messages, args.conversations)
+    node_id = nodes[0]
+
+    # Cursor no meio da conversa para a página "profunda"
+    conn = sqlite3.connect(db_path)
+    ids = conn.execute('SELECT timestamp, id FROM chat_messages WHERE node_id = ? ORDER BY timestamp, id',
+                       (node_id,)).fetchall()
+    conn.close()
+    middle = encode_chat_cursor(*ids[len(ids) // 2])
+    print(f"Conversa de teste: {len(ids)} mensagens, limit={args.limit}\n")
+
+    print("Planos de consulta:")
+    print("  antigo:  " + explain(
+        'SELECT message FROM chat_messages WHERE node_id = ? ORDER BY timestamp ASC LIMIT 100', (node_id,)))
+    print("  cursor:  " + explain(
+        'SELECT id FROM chat_messages WHERE node_id = ? AND (timestamp, id) < (?, ?) '
+        'ORDER BY timestamp DESC, id DESC LIMIT 101', (node_id, *ids[len(ids) // 2])))
+    print()
+
+    legacy = measure("antigo: 100 mais antigas", lambda: legacy_query(node_id, args.limit), args.iterations)
+    measure("antigo: mais recentes (COUNT+OFFSET)", lambda: legacy_newest(node_id, args.limit), args.iterations)
+    newest = measure("cursor: página mais recente", lambda: get_chat_messages(node_id, args.limit),
+                     args.iterations)
+    measure("cursor: ?before (meio da conversa)",
+            lambda: get_chat_messages(node_id, args.limit, before=middle), args.iterations)
+    measure("cursor: ?after (meio da conversa)",
+            lambda: get_chat_messages(node_id, args.limit, after=middle), args.iterations)
+
+    if newest > 0:
+        print(f"\nPágina padrão: {legacy / newest:.1f}x em relação à consulta antiga")
+    print(f"Banco sintético: {db_path}")
+
+
+if __name__ == '__main__':
+    main()
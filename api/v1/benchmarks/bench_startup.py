@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: custo de import a frio (cliente LND x API completa)
+
+Cada amostra é um processo Python novo que importa o alvo e informa o
+tempo do import e quantos módulos ficaram em sys.modules:
+
+- lnd_client: só o cliente gRPC do LND (api/v1/lnd_client.py)
+- api.lnd.client: AtomicSwapLNDClient (api/lnd/client.py)
+- app: a API completa (create_app: bancos, limiter, todos os blueprints)
+
+Com --baseline REV, os mesmos imports são medidos numa cópia de api/ da
+revisão REV (git archive), para comparar antes/depois. Antes da divisão em
+blueprints, api/lnd/client.py importava o app inteiro.
+
+Sessões, rate limit, jobs e o lock de keysends vão para um diretório
+temporário; importar o app ainda cria /data/brln-wallet como na API real.
+
+Usage: python3 bench_startup.py [-n 10] [--baseline HEAD~1]
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+REPO_DIR = os.path.abspath(os.path.join(API_DIR, '..', '..'))
+
+TARGETS = [
+    ('lnd_client', 'import lnd_client'),
+    ('api.lnd.client', 'from api.lnd.client import AtomicSwapLNDClient'),
+    ('app (API completa)', 'import app'),
+]
+
+SNIPPET = '''
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = (time.perf_counter() - start) * 1000
+print("BENCH " + json.dumps({{"ms": elapsed, "modules": len(sys.modules)}}))
+'''
+
+
+def sample(statement, repo_dir, env):
+    """Import em um processo novo; retorna (ms, módulos) ou levanta RuntimeError"""
+    result = subprocess.run(
+        [sys.executable, '-c', SNIPPET.format(statement=statement)],
+        cwd=os.path.join(repo_dir, 'api', 'v1'), env=env,
+        capture_output=True, text=True, timeout=120
+    )
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith('BENCH '):
+            data = json.loads(line[len('BENCH '):])
+            return data['ms'], data['modules']
+    error = (result.stderr.strip().splitlines() or ['sem saída'])[-1]
+    raise RuntimeError(error)
+
+
+def measure(label, statement, repo_dir, env, iterations):
+    """Importa N vezes (processos novos) e imprime p50/p95/média em ms"""
+    samples = []
+    modules = 0
+    try:
+        for _ in range(iterations):
+            elapsed, modules = sample(statement, repo_dir, env)
+            samples.append(elapsed)
+    except RuntimeError as e:
+        print(f"{label:<36} falhou: {e}")
+        return None
+
+    samples.sort()
+    p95 = samples[max(int(len(samples) * 0.95) - 1, 0)]
+    print(f"{label:<36} p50={statistics.median(samples):8.1f}ms  "
+          f"p95={p95:8.1f}ms  mean={statistics.mean(samples):8.1f}ms  módulos={modules}")
+    return statistics.median(samples)
+
+
+def checkout(rev, dest):
+    """Extrai api/ de rev em dest (git archive)"""
+    archive = subprocess.run(['git', 'archive', rev, 'api'], cwd=REPO_DIR,
+                             capture_output=True, check=True)
+    subprocess.run(['tar', '-x', '-C', dest], input=archive.stdout, check=True)
+
+
+def environment(repo_dir, state_dir):
+    env = dict(os.environ)
+    api_v1 = os.path.join(repo_dir, 'api', 'v1')
+    env.update({
+        'PYTHONPATH': os.pathsep.join(filter(None, [repo_dir, api_v1, env.get('PYTHONPATH')])),
+        'BRLN_SESSION_DB': os.path.join(state_dir, 'sessions.db'),
+        'BRLN_RATELIMIT_DB': os.path.join(state_dir, 'ratelimits.db'),
+        'BRLN_JOB_DB': os.path.join(state_dir, 'jobs.db'),
+        'BRLN_KEYSEND_LOCK': os.path.join(state_dir, 'keysend-ingestor.lock'),
+    })
+    return env
+
+
+def run(title, repo_dir, state_dir, iterations):
+    print(f"\n{title}")
+    env = environment(repo_dir, state_dir)
+    return {label: measure(label, statement, repo_dir, env, iterations)
+            for label, statement in TARGETS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', '--iterations', type=int, default=10, help='processos por alvo')
+    parser.add_argument('--baseline', metavar='REV', help='revisão git para comparar (ex.: HEAD~1)')
+    args = parser.parse_args()
+
+    state_dir = tempfile.mkdtemp(prefix='brln-startup-bench-')
+    try:
+        current = run('Árvore atual', REPO_DIR, state_dir, args.iterations)
+        if not args.baseline:
+            return
+
+        baseline_dir = os.path.join(state_dir, 'baseline')
+        os.makedirs(baseline_dir)
+        checkout(args.baseline, baseline_dir)
+        before = run(f'Baseline ({args.baseline})', baseline_dir, state_dir, args.iterations)
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    print()
+    for label, _ in TARGETS:
+        if current.get(label) and before.get(label):
+            print(f"{label:<36} {before[label]:8.1f}ms -> {current[label]:8.1f}ms "
+                  f"({before[label] / current[label]:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
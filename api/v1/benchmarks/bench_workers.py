@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark: servidor de desenvolvimento (python3 app.py) x gunicorn
+
+Sobe a API duas vezes na mesma porta - primeiro o servidor do Werkzeug
+(um processo, uma thread por requisição, todas disputando o mesmo GIL) e
+depois gunicorn -c gunicorn.conf.py (N workers gthread) - e dispara
+requisições HTTP keep-alive de C threads clientes durante D segundos em
+rotas que não dependem do LND (health, contador do chat, conversas).
+Imprime req/s e p50/p95/média de latência de cada modo e o ganho.
+
+Sessões, rate limit, jobs e o lock do líder de keysends vão para um
+diretório temporário; o rate limit é desligado (RATELIMIT_ENABLED=0),
+senão o limite padrão de 50/hora por IP responderia 429 ao benchmark.
+O servidor de desenvolvimento sempre escuta em 2121: pare o brln-api
+antes (sudo systemctl stop brln-api).
+
+Usage: python3 bench_workers.py [-d 15] [-c 32] [-w 4] [-t 16] [--paths /api/v1/system/health,...]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import http.client
+
+API_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_PATHS = [
+    '/api/v1/system/health',
+    '/api/v1/lightning/chat/notifications',
+    '/api/v1/lightning/chat/conversations',
+]
+DEV_SERVER_PORT = 2121  # fixo em app.py
+
+
+def wait_ready(port, process, timeout=60):
+    """Espera /system/health responder (o import do app leva alguns segundos)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"servidor saiu com código {process.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/api/v1/system/health')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("servidor não respondeu a tempo")
+
+
+def start_server(cmd, env, port):
+    process = subprocess.Popen(cmd, cwd=API_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, process)
+    except Exception:
+        stop_server(process)
+        raise
+    return process
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def load(port, paths, concurrency, duration):
+    """C clientes keep-alive em loop; retorna (latências em ms, erros, segundos)"""
+    samples = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def client(offset):
+        conn = None
+        local_samples = []
+        local_errors = 0
+        i = offset
+        while time.time() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                start = time.perf_counter()
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                local_samples.append((time.perf_counter() - start) * 1000)
+                if response.status >= 500:
+                    local_errors += 1
+                if response.will_close:
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                if conn is not None:
+                    conn.close()
+                conn = None
+        if conn is not None:
+            conn.close()
+        with lock:
+            samples.extend(local_samples)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, errors[0], time.perf_counter() - started
+
+
+def report(label, samples, errors, elapsed):
+    """Imprime req/s e p50/p95/média em ms"""
+    samples.sort()
+    rps = len(samples) / elapsed
+    p95 = samples[int(len(samples) * 0.95) - 1] if samples else 0.0
+    print(f"{label:<28} {rps:9.1f} req/s  p50={statistics.median(samples) if samples else 0:8.2f}ms  "
+          f"p95={p95:8.2f}ms  mean={statistics.mean(samples) if samples else 0:8.2f}ms  erros={errors}")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-d', '--duration', type=float, default=15, help='segundos de carga por modo')
+    parser.add_argument('-c', '--concurrency', type=int, default=32, help='threads clientes')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='workers do gunicorn (padrão: gunicorn.conf.py)')
+    parser.add_argument('-t', '--threads', type=int, default=None, help='threads por worker')
+    parser.add_argument('--paths', default=','.join(DEFAULT_PATHS), help='rotas GET separadas por vírgula')
+    parser.add_argument('--gunicorn', default=shutil.which('gunicorn') or 'gunicorn')
+    args = parser.parse_args()
+    paths = [path for path in args.paths.split(',') if path]
+
+    state_dir = tempfile.mkdtemp(prefix='brln-bench-')
+    env = dict(os.environ)
+    env.update({
+        'PYTHONPATH': os.pathsep.join(filter(None, [API_DIR, env.get('PYTHONPATH')])),
+        'BRLN_SESSION_DB': os.path.join(state_dir, 'sessions.db'),
+        'BRLN_RATELIMIT_DB': os.path.join(state_dir, 'ratelimits.db'),
+        'BRLN_JOB_DB': os.path.join(state_dir, 'jobs.db'),
+        'BRLN_KEYSEND_LOCK': os.path.join(state_dir, 'keysend-ingestor.lock'),
+        'BRLN_API_BIND': f'127.0.0.1:{DEV_SERVER_PORT}',
+        'RATELIMIT_ENABLED': '0',
+    })
+    if args.workers:
+        env['BRLN_API_WORKERS'] = str(args.workers)
+    if args.threads:
+        env['BRLN_API_THREADS'] = str(args.threads)
+
+    modes = [
+        ('werkzeug (python3 app.py)', [sys.executable, 'app.py']),
+        ('gunicorn (gunicorn.conf.py)', [args.gunicorn, '-c', 'gunicorn.conf.py', 'app:app']),
+    ]
+    print(f"{args.concurrency} clientes, {args.duration:.0f}s por modo, rotas: {', '.join(paths)}")
+
+    results = {}
+    try:
+        for label, cmd in modes:
+            process = start_server(cmd, env, DEV_SERVER_PORT)
+            try:
+                load(DEV_SERVER_PORT, paths, args.concurrency, 2)  # aquecimento
+                samples, errors, elapsed = load(DEV_SERVER_PORT, paths, args.concurrency, args.duration)
+            finally:
+                stop_server(process)
+            results[label] = report(label, samples, errors, elapsed)
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    dev, prod = (results[label] for label, _ in modes)
+    if dev:
+        print(f"\nGanho de throughput com gunicorn: {prod / dev:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprints
+
+Cada módulo define `bp` com as rotas de uma área (caminhos completos,
+/api/v1/...). Os módulos só são importados por register_blueprints(), de
+modo que importar um cliente (ex.: lnd_client) não carrega as rotas.
+"""
+
+import importlib
+
+
+BLUEPRINTS = (
+    'auth',
+    'system',
+    'lightning',
+    'chat',
+    'events',
+    'elements',
+    'bitcoin',
+    'wallet',
+    'lnd_wallet',
+    'tron',
+    'passwords',
+)
+
+
+def register_blueprints(app, names=None):
+    """Importa e registra os blueprints (todos, ou só os de names)"""
+    for name in names or BLUEPRINTS:
+        if name not in BLUEPRINTS:
+            raise ValueError(f"Blueprint desconhecido: {name}")
+        module = importlib.import_module(f'{__name__}.{name}')
+        app.register_blueprint(module.bp)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint auth
+
+Rotas de sessão (login, logout, status, extensão).
+"""
+
+from flask import Blueprint, jsonify, request, make_response
+
+from api_common import limiter
+from session_auth import (
+    session_manager,
+    authenticate as session_authenticate,
+    destroy_session,
+    is_authenticated
+)
+
+
+bp = Blueprint('auth', __name__)
+
+
+# === SESSION AUTHENTICATION ENDPOINTS ===
+# These endpoints use the master password from secure_password_manager
+# to create authenticated sessions for wallet operations
+
+@bp.route('/api/v1/auth/login', methods=['POST'])
+@limiter.limit("5 per minute")  # Rate limit: 5 login attempts per minute to prevent brute force
+def auth_login():
+    """
+    Authenticate user with master password.
+    Creates a session cookie that allows access to protected endpoints.
+    
+    Request body:
+        password: The master password set during installation (brunel.sh)
+    
+    Returns:
+        success: Boolean indicating if authentication succeeded
+        message: Human-readable result message
+        session_expires: ISO timestamp when session expires (5 minutes)
+    """
+    try:
+        data = request.get_json()
+        if not data or 'password' not in data:
+            return jsonify({
+                'success': False,
+                'error': 'Password is required',
+                'status': 'error'
+            }), 400
+        
+        password = data['password']
+        
+        # Use session_auth module to authenticate
+        result = session_authenticate(password)
+        
+        if result['success']:
+            response = make_response(jsonify({
+                'success': True,
+                'message': 'Authenticated successfully',
+                'session_expires': result.get('session_expires'),
+                'status': 'success'
+            }))
+            
+            # Set session cookie
+            response.set_cookie(
+                'brln_session',
+                result['session_id'],
+                httponly=True,
+                secure=True,  # Only send over HTTPS
+                samesite='Strict',
+                max_age=300  # 5 minutes
+            )
+            
+            return response
+        else:
+            return jsonify({
+                'success': False,
+                'error': result.get('error', 'Authentication failed'),
+                'status': 'error'
+            }), 401
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Authentication error: {str(e)}',
+            'status': 'error'
+        }), 500
+
+
+@bp.route('/api/v1/auth/check', methods=['GET'])
+def auth_check():
+    """
+    Check if the current session is authenticated.
+    
+    Returns:
+        authenticated: Boolean indicating if session is valid
+        session_expires: ISO timestamp when session expires (if authenticated)
+    """
+    try:
+        session_id = request.cookies.get('brln_session')
+        
+        if session_id and is_authenticated(session_id):
+            # Get session info
+            session_info = session_manager.get_session_info(session_id)
+            return jsonify({
+                'authenticated': True,
+                'session_expires': session_info.get('expires') if session_info else None,
+                'status': 'success'
+            })
+        else:
+            return jsonify({
+                'authenticated': False,
+                'status': 'success'
+            })
+            
+    except Exception as e:
+        return jsonify({
+            'authenticated': False,
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+
+@bp.route('/api/v1/auth/logout', methods=['POST'])
+def auth_logout():
+    """
+    End the current session.
+    Clears the session cookie and removes session data.
+    
+    Returns:
+        success: Boolean indicating if logout succeeded
+    """
+    try:
+        session_id = request.cookies.get('brln_session')
+        
+        if session_id:
+            destroy_session(session_id)
+        
+        response = make_response(jsonify({
+            'success': True,
+            'message': 'Logged out successfully',
+            'status': 'success'
+        }))
+        
+        # Clear the session cookie
+        response.delete_cookie('brln_session')
+        
+        return response
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Logout error: {str(e)}',
+            'status': 'error'
+        }), 500
+
+
+@bp.route('/api/v1/auth/extend', methods=['POST'])
+def auth_extend():
+    """
+    Extend the current session timeout.
+    Requires valid session. Resets timeout to 5 more minutes.
+    
+    Returns:
+        success: Boolean indicating if extension succeeded
+        session_expires: New expiration time
+    """
+    try:
+        session_id = request.cookies.get('brln_session')
+        
+        if not session_id or not is_authenticated(session_id):
+            return jsonify({
+                'success': False,
+                'error': 'Not authenticated',
+                'status': 'error'
+            }), 401
+        
+        # Extend the session
+        result = session_manager.extend_session(session_id)
+        
+        if result.get('success'):
+            return jsonify({
+                'success': True,
+                'session_expires': result.get('new_expires'),
+                'status': 'success'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': result.get('error', 'Failed to extend session'),
+                'status': 'error'
+            }), 400
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Session extension error: {str(e)}',
+            'status': 'error'
+        }), 500
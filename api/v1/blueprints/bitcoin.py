@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint bitcoin
+
+Proxy do Bitcoin Core e estimativa de taxas.
+"""
+
+from flask import Blueprint, jsonify
+
+from node_rpc import bitcoin_rpc_client
+from system_services import get_service_status
+from system_status import get_bitcoind_info
+
+
+bp = Blueprint('bitcoin', __name__)
+
+
+# === BITCOIN CORE PROXY ENDPOINTS ===
+
+@bp.route('/api/v1/bitcoin/info', methods=['GET'])
+def get_bitcoin_info():
+    """Proxy para obter informações do Bitcoin Core local"""
+    try:
+        bitcoin_info = get_bitcoind_info()
+        
+        return jsonify({
+            'status': 'success',
+            'blocks': bitcoin_info.get('blocks', 0),
+            'progress': bitcoin_info.get('progress', 0),
+            'service_status': bitcoin_info.get('status', 'unknown')
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/bitcoin/block/height', methods=['GET'])
+def get_bitcoin_block_height():
+    """Endpoint específico para obter altura do bloco atual do Bitcoin"""
+    try:
+        if not get_service_status('bitcoind.service'):
+            return jsonify({
+                'error': 'Serviço bitcoind não está rodando',
+                'status': 'error'
+            }), 503
+        
+        # Obter apenas a altura do bloco
+        block_height, error = bitcoin_rpc_client.get_block_count()
+        if error or block_height is None:
+            return jsonify({
+                'error': 'Não foi possível obter altura do bloco do Bitcoin Core',
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'block_height': int(block_height),
+            'source': 'bitcoin-core-local'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/bitcoin/block/<block_hash>', methods=['GET'])
+def get_bitcoin_block(block_hash):
+    """Obter informações de um bloco específico"""
+    try:
+        if not get_service_status('bitcoind.service'):
+            return jsonify({
+                'error': 'Serviço bitcoind não está rodando',
+                'status': 'error'
+            }), 503
+        
+        # Validação básica do hash
+        if len(block_hash) != 64 or not all(c in '0123456789abcdefABCDEF' for c in block_hash):
+            return jsonify({
+                'error': 'Hash de bloco inválido',
+                'status': 'error'
+            }), 400
+        
+        # Obter informações do bloco
+        block_info, error = bitcoin_rpc_client.get_block(block_hash, 1)
+        if error or not block_info:
+            return jsonify({
+                'error': 'Não foi possível obter informações do bloco',
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'block': {
+                'hash': block_info.get('hash'),
+                'height': block_info.get('height'),
+                'time': block_info.get('time'),
+                'size': block_info.get('size'),
+                'tx_count': len(block_info.get('tx', [])),
+                'difficulty': block_info.get('difficulty'),
+                'previousblockhash': block_info.get('previousblockhash'),
+                'nextblockhash': block_info.get('nextblockhash')
+            },
+            'source': 'bitcoin-core-local'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
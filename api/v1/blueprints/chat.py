@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint chat
+
+Rotas do chat Lightning (keysend).
+"""
+
+import base64
+from flask import Blueprint, jsonify, request
+
+from chat_store import (
+    encode_chat_cursor, get_all_conversations, get_chat_messages, get_new_messages_count,
+    keysend_ingestor, keysend_leader, mark_conversation_read, process_received_keysend,
+    reset_new_messages, save_chat_message
+)
+from lightning_service import send_keysend
+from event_hub import event_hub
+
+
+bp = Blueprint('chat', __name__)
+
+
+# === ENDPOINTS DO CHAT LIGHTNING ===
+
+@bp.route('/api/v1/lightning/chat/conversations', methods=['GET'])
+def get_conversations():
+    """Endpoint para listar todas as conversas de chat"""
+    try:
+        conversations = get_all_conversations()
+        
+        return jsonify({
+            'status': 'success',
+            'conversations': conversations
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/chat/conversations/<node_id>/read', methods=['POST'])
+def read_conversation(node_id):
+    """Endpoint para marcar uma conversa como lida"""
+    try:
+        if not mark_conversation_read(node_id):
+            return jsonify({
+                'error': 'Conversa não encontrada',
+                'status': 'error'
+            }), 404
+        
+        return jsonify({
+            'status': 'success',
+            'node_id': node_id
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/chat/messages/<node_id>', methods=['GET'])
+def get_messages(node_id):
+    """
+    Endpoint para obter mensagens de uma conversa específica.
+    
+    Padrão: página mais recente. ?before=<cursor> pagina para trás e
+    ?after=<cursor> busca mensagens mais novas (ex.: após next_after).
+    """
+    try:
+        limit = request.args.get('limit', 100, type=int)
+        before = request.args.get('before')
+        after = request.args.get('after')
+        
+        if before and after:
+            return jsonify({
+                'error': 'Use before ou after, não ambos',
+                'status': 'error'
+            }), 400
+        
+        try:
+            messages, has_more = get_chat_messages(node_id, limit, before=before, after=after)
+        except ValueError:
+            return jsonify({
+                'error': 'Cursor inválido',
+                'status': 'error'
+            }), 400
+        
+        first = messages[0] if messages else None
+        last = messages[-1] if messages else None
+        
+        return jsonify({
+            'status': 'success',
+            'node_id': node_id,
+            'messages': messages,
+            'has_more': has_more,
+            # Cursores para a página anterior/seguinte
+            'next_before': encode_chat_cursor(first['timestamp'], first['id']) if first else before,
+            'next_after': encode_chat_cursor(last['timestamp'], last['id']) if last else after
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/chat/send', methods=['POST'])
+def send_chat_message():
+    """Endpoint para enviar mensagem via keysend"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        node_id = data.get('node_id')
+        message = data.get('message')
+        
+        if not node_id or not message:
+            return jsonify({
+                'error': 'node_id e message são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        if len(message) > 500:
+            return jsonify({
+                'error': 'Mensagem muito longa (máximo 500 caracteres)',
+                'status': 'error'
+            }), 400
+        
+        # Enviar keysend com mensagem
+        custom_records = {
+            '34349334': base64.b64encode(message.encode('utf-8')).decode('ascii')
+        }
+        
+        result = send_keysend(node_id, 1, custom_records=custom_records)
+        
+        if result.get('status') == 'success':
+            # Salvar mensagem no banco
+            save_chat_message(node_id, message, 'sent', 
+                            result.get('payment_hash'), 'confirmed')
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/chat/notifications', methods=['GET'])
+def get_chat_notifications():
+    """Endpoint para obter número de mensagens não lidas"""
+    try:
+        count = get_new_messages_count()
+        
+        return jsonify({
+            'status': 'success',
+            'unread_count': count
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/chat/notifications', methods=['POST'])
+def reset_chat_notifications():
+    """Endpoint para resetar contador de mensagens não lidas"""
+    try:
+        reset_new_messages()
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Notificações resetadas'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/chat/keysends/check', methods=['POST'])
+def check_received_keysends():
+    """Endpoint para processar keysends recebidos (chamado externamente; a API já ingere via SubscribeInvoices)"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        payment_hash = data.get('payment_hash')
+        sender_node_id = data.get('sender_node_id')
+        amount_sat = data.get('amount_sat')
+        custom_records = data.get('custom_records', {})
+        
+        if not payment_hash or not sender_node_id or amount_sat is None:
+            return jsonify({
+                'error': 'payment_hash, sender_node_id e amount_sat são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        # Processar keysend recebido
+        is_new = process_received_keysend(payment_hash, sender_node_id, 
+                                        amount_sat, custom_records)
+        
+        if is_new:
+            event_hub.notify('chat')
+        
+        return jsonify({
+            'status': 'success',
+            'processed': is_new,
+            'message': 'Keysend processado' if is_new else 'Keysend já processado'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/chat/keysends/status', methods=['GET'])
+def keysend_ingestion_status():
+    """Endpoint com o estado da ingestão de keysends (checkpoint, lotes, fila)"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'ingestion': keysend_ingestor.get_status(),
+            'worker': keysend_leader.get_status()
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
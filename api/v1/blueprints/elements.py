@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint elements
+
+Rotas Elements/Liquid.
+"""
+
+from flask import Blueprint, jsonify, request
+
+from node_rpc import elements_rpc_client
+
+
+bp = Blueprint('elements', __name__)
+
+
+# === ENDPOINTS ELEMENTS/LIQUID ===
+
+@bp.route('/api/v1/elements/balances', methods=['GET'])
+def get_elements_balances():
+    """Obter saldos de todos os assets Elements/Liquid"""
+    try:
+        # Obter saldos
+        balances_result, balances_error = elements_rpc_client.get_balances()
+        if balances_error:
+            return jsonify({
+                'error': f'Erro ao obter saldos: {balances_error}',
+                'status': 'error'
+            }), 500
+        
+        # Obter labels dos assets
+        labels_result, labels_error = elements_rpc_client.get_asset_labels()
+        if labels_error:
+            print(f"Warning: Não foi possível obter labels dos assets: {labels_error}")
+            labels_result = {}
+        
+        # Asset IDs conhecidos
+        known_assets = {
+            "6f0279e9ed041c3d710a9f57d0c02928416460c4b722ae3457a11eec381c526d": "L-BTC",
+            "02f22f8d9c76ab41661a2729e4752e2c5d1a263012141b86ea98af5472df5189": "DePix", 
+            "ce091c998b83c78bb71a632313ba3760f1763d9cfcffae02258ffa9865a37bd2": "USDT"
+        }
+        
+        # Processar saldos
+        processed_balances = {}
+        if 'mine' in balances_result:
+            mine_balances = balances_result['mine']
+            
+            # Processar cada categoria (trusted, untrusted_pending, immature)
+            for category, assets in mine_balances.items():
+                if isinstance(assets, dict):
+                    for asset_name, amount in assets.items():
+                        # Determinar chave e informações do asset
+                        if asset_name == "bitcoin" or asset_name == "6f0279e9ed041c3d710a9f57d0c02928416460c4b722ae3457a11eec381c526d":
+                            key = 'lbtc'
+                            symbol = 'L-BTC'
+                            name = 'Liquid Bitcoin'
+                            asset_id = '6f0279e9ed041c3d710a9f57d0c02928416460c4b722ae3457a11eec381c526d'
+                        elif asset_name == "02f22f8d9c76ab41661a2729e4752e2c5d1a263012141b86ea98af5472df5189":
+                            key = 'depix'
+                            symbol = 'DePix'
+                            name = labels_result.get(asset_name, 'DePix')
+                            asset_id = asset_name
+                        elif asset_name == "ce091c998b83c78bb71a632313ba3760f1763d9cfcffae02258ffa9865a37bd2":
+                            key = 'usdt'
+                            symbol = 'USDT'
+                            name = labels_result.get(asset_name, 'Tether')
+                            asset_id = asset_name
+                        else:
+                            key = asset_name[:8] if len(asset_name) > 8 else asset_name
+                            symbol = known_assets.get(asset_name, asset_name)
+                            name = labels_result.get(asset_name, symbol)
+                            asset_id = asset_name
+                        
+                        # Inicializar balance se não existir
+                        if key not in processed_balances:
+                            processed_balances[key] = {
+                                'asset_id': asset_id,
+                                'symbol': symbol,
+                                'name': name,
+                                'trusted': 0,
+                                'untrusted_pending': 0,
+                                'immature': 0
+                            }
+                        
+                        # Atualizar valor para a categoria
+                        processed_balances[key][category] = amount
+        
+        return jsonify({
+            'balances': processed_balances,
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/elements/addresses', methods=['POST'])
+def generate_elements_address():
+    """Gerar novo endereço Elements/Liquid"""
+    try:
+        data = request.get_json() or {}
+        label = data.get('label', '')
+        address_type = data.get('type', 'bech32')  # 'bech32' para confidencial, outros para não-confidencial
+        
+        # Gerar endereço
+        result, error = elements_rpc_client.get_new_address(label, address_type)
+        if error:
+            return jsonify({
+                'error': f'Erro ao gerar endereço: {error}',
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'address': result,
+            'type': address_type,
+            'label': label,
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/elements/send', methods=['POST'])
+def send_elements_asset():
+    """Enviar asset Elements/Liquid"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON requeridos',
+                'status': 'error'
+            }), 400
+        
+        address = data.get('address')
+        amount = data.get('amount')
+        asset = data.get('asset', 'lbtc')  # padrão L-BTC
+        subtract_fee = data.get('subtract_fee', False)
+        
+        if not address or not amount:
+            return jsonify({
+                'error': 'address e amount são requeridos',
+                'status': 'error'
+            }), 400
+        
+        # Mapear asset para label
+        asset_labels = {
+            'lbtc': None,  # Asset nativo, não precisa de label
+            'depix': 'DePix',
+            'usdt': 'USDT'
+        }
+        
+        asset_label = asset_labels.get(asset)
+        
+        # Enviar transação
+        result, error = elements_rpc_client.send_to_address(
+            address, amount, asset_label, subtract_fee
+        )
+        
+        if error:
+            return jsonify({
+                'error': f'Erro ao enviar transação: {error}',
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'txid': result,
+            'address': address,
+            'amount': amount,
+            'asset': asset,
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/elements/utxos', methods=['GET'])
+def get_elements_utxos():
+    """Listar UTXOs Elements/Liquid"""
+    try:
+        # Parâmetros de query
+        asset_filter = request.args.get('asset')  # 'lbtc', 'depix', 'usdt', ou asset_id
+        minconf = int(request.args.get('minconf', 1))
+        maxconf = int(request.args.get('maxconf', 9999999))
+        
+        # Mapear asset para ID se necessário
+        asset_ids = {
+            'lbtc': '6f0279e9ed041c3d710a9f57d0c02928416460c4b722ae3457a11eec381c526d',
+            'depix': '02f22f8d9c76ab41661a2729e4752e2c5d1a263012141b86ea98af5472df5189',
+            'usdt': 'ce091c998b83c78bb71a632313ba3760f1763d9cfcffae02258ffa9865a37bd2'
+        }
+        
+        asset_id = asset_ids.get(asset_filter, asset_filter) if asset_filter else None
+        
+        # Listar UTXOs
+        result, error = elements_rpc_client.list_unspent(minconf, maxconf, asset_id)
+        if error:
+            return jsonify({
+                'error': f'Erro ao listar UTXOs: {error}',
+                'status': 'error'
+            }), 500
+        
+        # Processar UTXOs
+        processed_utxos = []
+        for utxo in result:
+            asset_id = utxo.get('asset', '')
+            
+            # Determinar tipo de asset
+            if asset_id == '6f0279e9ed041c3d710a9f57d0c02928416460c4b722ae3457a11eec381c526d':
+                asset_type = 'lbtc'
+                symbol = 'L-BTC'
+            elif asset_id == '02f22f8d9c76ab41661a2729e4752e2c5d1a263012141b86ea98af5472df5189':
+                asset_type = 'depix'
+                symbol = 'DePix'
+            elif asset_id == 'ce091c998b83c78bb71a632313ba3760f1763d9cfcffae02258ffa9865a37bd2':
+                asset_type = 'usdt'
+                symbol = 'USDT'
+            else:
+                asset_type = 'unknown'
+                symbol = asset_id[:8] if asset_id else 'Unknown'
+            
+            processed_utxos.append({
+                'txid': utxo.get('txid'),
+                'vout': utxo.get('vout'),
+                'address': utxo.get('address'),
+                'amount': utxo.get('amount', 0),
+                'asset': asset_type,
+                'asset_id': asset_id,
+                'symbol': symbol,
+                'confirmations': utxo.get('confirmations', 0),
+                'spendable': utxo.get('spendable', False),
+                'safe': utxo.get('safe', False)
+            })
+        
+        return jsonify({
+            'utxos': processed_utxos,
+            'count': len(processed_utxos),
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/elements/transactions', methods=['GET'])
+def get_elements_transactions():
+    """Listar transações Elements/Liquid"""
+    try:
+        # Parâmetros de query
+        count = int(request.args.get('limit', 30))
+        skip = int(request.args.get('skip', 0))
+        
+        # Listar transações
+        result, error = elements_rpc_client.list_transactions(count, skip)
+        if error:
+            return jsonify({
+                'error': f'Erro ao listar transações: {error}',
+                'status': 'error'
+            }), 500
+        
+        # Processar transações
+        processed_txs = []
+        for tx in result:
+            # Obter informações básicas
+            txid = tx.get('txid')
+            category = tx.get('category')
+            amount = tx.get('amount', 0)
+            fee = tx.get('fee', 0)
+            confirmations = tx.get('confirmations', 0)
+            time = tx.get('time', 0)
+            address = tx.get('address', '')
+            
+            # TODO: Elements pode não ter informações de asset em listtransactions
+            # Pode ser necessário usar getrawtransaction para mais detalhes
+            asset_type = 'lbtc'  # Assumir L-BTC por padrão
+            symbol = 'L-BTC'
+            
+            processed_txs.append({
+                'txid': txid,
+                'category': category,
+                'amount': amount,
+                'fee': fee,
+                'asset': asset_type,
+                'symbol': symbol,
+                'confirmations': confirmations,
+                'time': time,
+                'address': address
+            })
+        
+        return jsonify({
+            'transactions': processed_txs,
+            'count': len(processed_txs),
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/elements/info', methods=['GET'])
+def get_elements_info():
+    """Obter informações da blockchain Elements/Liquid"""
+    try:
+        result, error = elements_rpc_client.get_blockchain_info()
+        if error:
+            return jsonify({
+                'error': f'Erro ao obter informações: {error}',
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'chain': result.get('chain'),
+            'blocks': result.get('blocks'),
+            'headers': result.get('headers'),
+            'bestblockhash': result.get('bestblockhash'),
+            'difficulty': result.get('difficulty'),
+            'mediantime': result.get('mediantime'),
+            'verificationprogress': result.get('verificationprogress'),
+            'chainwork': result.get('chainwork'),
+            'size_on_disk': result.get('size_on_disk'),
+            'pruned': result.get('pruned', False),
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
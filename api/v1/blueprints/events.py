@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint events
+
+Stream SSE /api/v1/events e produtores dos tópicos.
+"""
+
+import json
+import queue
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+
+from node_rpc import bitcoin_rpc_client, elements_rpc_client
+from chat_store import get_new_messages_count
+from system_services import SERVICE_MAPPING, systemd_monitor
+from system_status import STATUS_SAMPLE_INTERVAL, status_collector
+from lightning_service import (
+    get_blockchain_balance, get_connected_peers, get_lightning_balance, get_lightning_channels
+)
+from event_hub import EVENT_HEARTBEAT_INTERVAL, event_hub
+
+
+bp = Blueprint('events', __name__)
+
+
+def _event_balances():
+    return {
+        'onchain': get_blockchain_balance(),
+        'lightning': get_lightning_balance()
+    }
+
+def _event_channels():
+    return {
+        'channels': get_lightning_channels(),
+        'peers': get_connected_peers()
+    }
+
+def _event_services():
+    states = systemd_monitor.get_states()
+    return {
+        'services': {key: states.get(name) == 'active' for key, name in SERVICE_MAPPING.items()}
+    }
+
+def _event_status():
+    snapshot, _ = status_collector.get_snapshot()
+    return snapshot
+
+def _event_chat():
+    return {'unread_count': get_new_messages_count()}
+
+def _event_liquid():
+    if systemd_monitor.get_states().get('elementsd.service') != 'active':
+        return {'status': 'stopped'}
+    balances, error = elements_rpc_client.get_balances()
+    if error:
+        return {'status': 'error', 'error': error}
+    return {'status': 'success', 'balances': balances}
+
+def _event_blocks():
+    height, error = bitcoin_rpc_client.get_block_count()
+    if error:
+        return {'status': 'error', 'error': error}
+    return {'status': 'success', 'height': height}
+
+event_hub.register_topic('balances', _event_balances, 10)
+event_hub.register_topic('channels', _event_channels, 10)
+event_hub.register_topic('services', _event_services, 2)
+event_hub.register_topic('status', _event_status, STATUS_SAMPLE_INTERVAL)
+event_hub.register_topic('chat', _event_chat, 2)
+event_hub.register_topic('blocks', _event_blocks, 10)
+event_hub.register_topic('liquid', _event_liquid, 10)
+
+@bp.route('/api/v1/events', methods=['GET'])
+def event_stream():
+    """Stream SSE: ?topics=balances,channels,services,status,chat,blocks,liquid"""
+    topics = [t.strip() for t in request.args.get('topics', '').split(',') if t.strip()]
+    if not topics:
+        return jsonify({'error': 'Informe ao menos um tópico em ?topics=', 'status': 'error'}), 400
+
+    invalid = [t for t in topics if not event_hub.has_topic(t)]
+    if invalid:
+        return jsonify({'error': f'Tópicos inválidos: {", ".join(invalid)}', 'status': 'error'}), 400
+
+    subscriber_id, events = event_hub.subscribe(topics)
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = events.get(timeout=EVENT_HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield f"event: {event['topic']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            event_hub.unsubscribe(subscriber_id)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
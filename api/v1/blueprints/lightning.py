@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint lightning
+
+Rotas Lightning: saldos, canais, peers, invoices e pagamentos.
+"""
+
+import requests
+from datetime import datetime
+from flask import Blueprint, jsonify, request
+
+from lightning_service import (
+    add_invoice, close_lightning_channel, connect_to_peer, get_blockchain_balance,
+    get_connected_peers, get_lightning_balance, get_lightning_channels, get_pending_channels,
+    get_transactions, list_unspent, new_address, open_lightning_channel, send_coins,
+    send_keysend, send_payment
+)
+
+
+bp = Blueprint('lightning', __name__)
+
+
+@bp.route('/api/v1/wallet/balance/onchain', methods=['GET'])
+def blockchain_balance():
+    """Endpoint para obter saldo on-chain do LND"""
+    try:
+        balance_info = get_blockchain_balance()
+        
+        if balance_info.get('status') == 'error':
+            return jsonify(balance_info), 500
+        
+        return jsonify(balance_info)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/balance/lightning', methods=['GET'])
+def lightning_balance():
+    """Endpoint para obter saldo Lightning do LND"""
+    try:
+        balance_info = get_lightning_balance()
+        
+        if balance_info.get('status') == 'error':
+            return jsonify(balance_info), 500
+        
+        return jsonify(balance_info)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+@bp.route('/api/v1/wallet/transactions', methods=['GET'])
+def transactions():
+    """Endpoint para listar transações on-chain"""
+    try:
+        # Extrair parâmetros opcionais da query string
+        start_height = request.args.get('start_height', type=int)
+        end_height = request.args.get('end_height', type=int)
+        account = request.args.get('account')
+        
+        # Buscar transações
+        transactions_info = get_transactions(start_height, end_height, account)
+        
+        if transactions_info.get('status') == 'error':
+            return jsonify(transactions_info), 500
+        
+        return jsonify(transactions_info)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/peers', methods=['GET'])
+def get_peers():
+    """Endpoint para listar peers conectados"""
+    try:
+        peers_info = get_connected_peers()
+        
+        if peers_info.get('status') == 'error':
+            return jsonify(peers_info), 500
+        
+        return jsonify(peers_info)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/peers/connect', methods=['POST'])
+def connect_peer():
+    """Endpoint para conectar a um peer Lightning"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros
+        lightning_address = data.get('lightning_address') or data.get('addr')
+        perm = data.get('perm', True)
+        timeout = data.get('timeout', 60)
+        
+        if not lightning_address:
+            return jsonify({
+                'error': 'lightning_address é obrigatório',
+                'status': 'error'
+            }), 400
+        
+        # Conectar ao peer
+        result = connect_to_peer(lightning_address, perm, timeout)
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+@bp.route('/api/v1/lightning/channels', methods=['GET'])
+def list_channels():
+    """Endpoint para listar canais Lightning (filtros: chan_id, remote_pubkey, channel_point)"""
+    try:
+        channels_info = get_lightning_channels(
+            chan_id=request.args.get('chan_id'),
+            remote_pubkey=request.args.get('remote_pubkey'),
+            channel_point=request.args.get('channel_point')
+        )
+        
+        if channels_info.get('status') == 'error':
+            return jsonify(channels_info), 500
+        
+        return jsonify(channels_info)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/channels/open', methods=['POST'])
+def open_channel():
+    """Endpoint para abrir um canal Lightning"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros obrigatórios
+        node_pubkey = data.get('node_pubkey')
+        local_funding_amount = data.get('local_funding_amount')
+        fund_max = data.get('fund_max', False)
+        
+        # Validação básica
+        if not node_pubkey:
+            return jsonify({
+                'error': 'node_pubkey é obrigatório',
+                'status': 'error'
+            }), 400
+        
+        # Validação fund_max vs local_funding_amount
+        if fund_max and local_funding_amount is not None:
+            return jsonify({
+                'error': 'fund_max=true não pode ser usado junto com local_funding_amount. Use um ou outro.',
+                'status': 'error'
+            }), 400
+        
+        if not fund_max and (local_funding_amount is None or local_funding_amount <= 0):
+            return jsonify({
+                'error': 'local_funding_amount é obrigatório quando fund_max=false',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros opcionais
+        sat_per_vbyte = data.get('sat_per_vbyte')
+        private = data.get('private', False)
+        push_sat = data.get('push_sat', 0)
+        target_conf = data.get('target_conf')
+        min_confs = data.get('min_confs', 1)
+        spend_unconfirmed = data.get('spend_unconfirmed', False)
+        close_address = data.get('close_address')
+        base_fee = data.get('base_fee')
+        fee_rate = data.get('fee_rate')
+        memo = data.get('memo')
+        
+        # Abrir o canal
+        result = open_lightning_channel(
+            node_pubkey=node_pubkey,
+            local_funding_amount=int(local_funding_amount) if local_funding_amount else None,
+            sat_per_vbyte=sat_per_vbyte,
+            private=private,
+            push_sat=int(push_sat),
+            target_conf=target_conf,
+            min_confs=int(min_confs),
+            spend_unconfirmed=spend_unconfirmed,
+            close_address=close_address,
+            base_fee=int(base_fee) if base_fee else None,
+            fee_rate=int(fee_rate) if fee_rate else None,
+            fund_max=fund_max,
+            memo=memo
+        )
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result)
+        
+    except ValueError as e:
+        return jsonify({
+            'error': f'Erro de validação: {str(e)}',
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/channels/close', methods=['POST'])
+def close_channel():
+    """Endpoint para fechar um canal Lightning"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros
+        channel_point = data.get('channel_point')
+        
+        if not channel_point:
+            return jsonify({
+                'error': 'channel_point é obrigatório (formato: txid:index)',
+                'status': 'error'
+            }), 400
+        
+        # Validar formato do channel_point
+        if ':' not in channel_point:
+            return jsonify({
+                'error': 'channel_point deve estar no formato txid:index',
+                'status': 'error'
+            }), 400
+        
+        force_close = data.get('force_close', False)
+        target_conf = data.get('target_conf')
+        sat_per_vbyte = data.get('sat_per_vbyte')
+        
+        # Fechar o canal
+        result = close_lightning_channel(
+            channel_point=channel_point,
+            force_close=force_close,
+            target_conf=target_conf,
+            sat_per_vbyte=sat_per_vbyte
+        )
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/channels/pending', methods=['GET'])
+def pending_channels():
+    """Endpoint para listar canais pendentes"""
+    try:
+        pending_info = get_pending_channels()
+        
+        if pending_info.get('status') == 'error':
+            return jsonify(pending_info), 500
+        
+        return jsonify(pending_info)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/invoices', methods=['POST'])
+def create_invoice():
+    """Endpoint para criar uma invoice Lightning"""
+    try:
+        data = request.get_json() or {}
+        
+        # Extrair parâmetros
+        memo = data.get('memo')
+        value = data.get('value')  # em satoshis
+        expiry = data.get('expiry', 3600)  # 1 hora por padrão
+        private = data.get('private', False)
+        description_hash = data.get('description_hash')
+        
+        # Validações
+        if value is not None and (not isinstance(value, int) or value <= 0):
+            return jsonify({
+                'error': 'value deve ser um número inteiro positivo em satoshis',
+                'status': 'error'
+            }), 400
+        
+        if not isinstance(expiry, int) or expiry <= 0:
+            return jsonify({
+                'error': 'expiry deve ser um número inteiro positivo em segundos',
+                'status': 'error'
+            }), 400
+        
+        # Criar invoice
+        result = add_invoice(memo, value, expiry, private, description_hash)
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result), 201
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/payments', methods=['POST'])
+def send_lightning_payment():
+    """Endpoint para enviar pagamento Lightning"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros
+        payment_request = data.get('payment_request')
+        dest = data.get('dest')
+        amt = data.get('amt')
+        fee_limit_sat = data.get('fee_limit_sat')
+        timeout_seconds = data.get('timeout_seconds', 60)
+        
+        # Validação: deve ter payment_request OU (dest + amt)
+        if not payment_request and not (dest and amt):
+            return jsonify({
+                'error': 'Deve fornecer payment_request OU (dest + amt)',
+                'status': 'error'
+            }), 400
+        
+        if payment_request and (dest or amt):
+            return jsonify({
+                'error': 'Não é possível usar payment_request junto com dest/amt. Use um ou outro.',
+                'status': 'error'
+            }), 400
+        
+        # Validações adicionais
+        if amt is not None and (not isinstance(amt, int) or amt <= 0):
+            return jsonify({
+                'error': 'amt deve ser um número inteiro positivo em satoshis',
+                'status': 'error'
+            }), 400
+        
+        if fee_limit_sat is not None and (not isinstance(fee_limit_sat, int) or fee_limit_sat < 0):
+            return jsonify({
+                'error': 'fee_limit_sat deve ser um número inteiro não negativo',
+                'status': 'error'
+            }), 400
+        
+        # Enviar pagamento
+        result = send_payment(payment_request, dest, amt, fee_limit_sat, timeout_seconds)
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lightning/payments/keysend', methods=['POST'])
+def send_keysend_payment():
+    """Endpoint para enviar keysend (pagamento espontâneo)"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros obrigatórios
+        dest = data.get('dest')
+        amt = data.get('amt')
+        
+        if not dest:
+            return jsonify({
+                'error': 'dest (pubkey do destino) é obrigatório',
+                'status': 'error'
+            }), 400
+        
+        if not amt or not isinstance(amt, int) or amt <= 0:
+            return jsonify({
+                'error': 'amt deve ser um número inteiro positivo em satoshis',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros opcionais
+        fee_limit_sat = data.get('fee_limit_sat')
+        timeout_seconds = data.get('timeout_seconds', 60)
+        custom_records = data.get('custom_records')  # Dict com records customizados adicionais
+        final_cltv_delta = data.get('final_cltv_delta')
+        
+        # Validações
+        if fee_limit_sat is not None and (not isinstance(fee_limit_sat, int) or fee_limit_sat < 0):
+            return jsonify({
+                'error': 'fee_limit_sat deve ser um número inteiro não negativo',
+                'status': 'error'
+            }), 400
+        
+        if not isinstance(timeout_seconds, int) or timeout_seconds <= 0:
+            return jsonify({
+                'error': 'timeout_seconds deve ser um número inteiro positivo',
+                'status': 'error'
+            }), 400
+        
+        # Validar dest (deve ser uma chave pública válida)
+        if len(dest) != 66 or not all(c in '0123456789abcdefABCDEF' for c in dest):
+            return jsonify({
+                'error': 'dest deve ser uma chave pública válida de 66 caracteres hexadecimais',
+                'status': 'error'
+            }), 400
+        
+        # Enviar keysend
+        result = send_keysend(dest, amt, fee_limit_sat, timeout_seconds, custom_records, final_cltv_delta)
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/addresses', methods=['POST'])
+def generate_address():
+    """Endpoint para gerar novo endereço Bitcoin"""
+    try:
+        data = request.get_json() or {}
+        
+        # Extrair parâmetros
+        address_type = data.get('type', 'p2wkh')  # p2wkh, np2wkh, p2tr
+        account = data.get('account')
+        
+        # Validação do tipo de endereço
+        valid_types = ['p2wkh', 'np2wkh', 'p2tr']
+        if address_type not in valid_types:
+            return jsonify({
+                'error': f'Tipo de endereço inválido. Tipos suportados: {valid_types}',
+                'status': 'error'
+            }), 400
+        
+        # Gerar endereço
+        result = new_address(address_type, account)
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result), 201
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/transactions/send', methods=['POST'])
+def send_on_chain():
+    """Endpoint para enviar Bitcoin on-chain"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'error': 'Dados JSON são obrigatórios',
+                'status': 'error'
+            }), 400
+        
+        # Extrair parâmetros obrigatórios
+        addr = data.get('addr')
+        send_all = data.get('send_all', False)
+        
+        if not addr:
+            return jsonify({
+                'error': 'addr (endereço destino) é obrigatório',
+                'status': 'error'
+            }), 400
+        
+        # Parâmetros opcionais
+        amount = data.get('amount')
+        target_conf = data.get('target_conf')
+        sat_per_vbyte = data.get('sat_per_vbyte')
+        label = data.get('label')
+        min_confs = data.get('min_confs', 1)
+        spend_unconfirmed = data.get('spend_unconfirmed', False)
+        
+        # Validações
+        if not send_all and (not amount or not isinstance(amount, int) or amount <= 0):
+            return jsonify({
+                'error': 'amount é obrigatório quando send_all=false e deve ser um inteiro positivo',
+                'status': 'error'
+            }), 400
+        
+        if send_all and amount:
+            return jsonify({
+                'error': 'Não é possível usar send_all=true junto com amount específico',
+                'status': 'error'
+            }), 400
+        
+        # Enviar transação
+        result = send_coins(addr, amount, target_conf, sat_per_vbyte, send_all, label, min_confs, spend_unconfirmed)
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/utxos', methods=['GET'])
+def list_utxos():
+    """Endpoint para listar UTXOs disponíveis"""
+    try:
+        # Extrair parâmetros da query string
+        min_confs = request.args.get('min_confs', 0, type=int)
+        max_confs = request.args.get('max_confs', 9999999, type=int)
+        account = request.args.get('account')
+        
+        # Validações
+        if min_confs < 0:
+            return jsonify({
+                'error': 'min_confs deve ser não negativo',
+                'status': 'error'
+            }), 400
+        
+        if max_confs < min_confs:
+            return jsonify({
+                'error': 'max_confs deve ser maior ou igual a min_confs',
+                'status': 'error'
+            }), 400
+        
+        # Listar UTXOs
+        result = list_unspent(min_confs, max_confs, account)
+        
+        if result.get('status') == 'error':
+            return jsonify(result), 500
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/fees', methods=['GET'])
+def get_fees():
+    """Endpoint para obter estimativas de taxas de transação"""
+    try:
+        response = requests.get('https://mempool.space/api/v1/fees/recommended', timeout=10)
+        
+        if response.status_code != 200:
+            return jsonify({
+                'error': f'Erro de conexão com mempool.space. Status: {response.status_code}',
+                'status': 'error'
+            }), 502
+        
+        mempool_fees = response.json()
+        return jsonify({
+            'status': 'success',
+            'source': 'mempool.space',
+            'network': 'mainnet',
+            'fees': {
+                'economy': {
+                    'sat_per_vbyte': mempool_fees.get('economyFee'),
+                },
+                'standard': {
+                    'sat_per_vbyte': mempool_fees.get('hourFee'), 
+                },
+                'priority': {
+                    'sat_per_vbyte': mempool_fees.get('fastestFee'),
+                }
+            },
+            'timestamp': datetime.utcnow().isoformat()
+        })
+        
+    except requests.exceptions.RequestException as e:
+        return jsonify({
+            'error': f'Erro de conexão com mempool.space: {str(e)}',
+            'status': 'error'
+        }), 502
+    except Exception as e:
+        return jsonify({
+            'error': f'Erro interno: {str(e)}',
+            'status': 'error'
+        }), 500
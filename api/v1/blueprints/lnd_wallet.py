@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint lnd_wallet
+
+Inicialização e desbloqueio da wallet do LND.
+"""
+
+import subprocess
+from flask import Blueprint, jsonify, request
+
+from api_common import limiter, require_auth
+from wallet_store import HDDerivationContext, wallet_manager
+from lnd_client import HAS_WALLET_UNLOCKER, lnd_grpc_client
+
+
+bp = Blueprint('lnd_wallet', __name__)
+
+
+# === LND WALLET INITIALIZATION ENDPOINTS ===
+
+@bp.route('/api/v1/wallet/bip39-to-lnd', methods=['POST'])
+def convert_bip39_to_lnd():
+    """Convert BIP39 mnemonic to LND extended master root key"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        seed_phrase = data.get('seed_phrase', '').strip()
+        passphrase = data.get('passphrase', '')
+        network = data.get('network', 'testnet').lower()
+        
+        if not seed_phrase:
+            return jsonify({
+                'error': 'seed_phrase is required',
+                'status': 'error'
+            }), 400
+        
+        # Validate network
+        if network not in ['mainnet', 'testnet']:
+            return jsonify({
+                'error': 'network must be "mainnet" or "testnet"',
+                'status': 'error'
+            }), 400
+        
+        # Convert to extended master key
+        derivation = HDDerivationContext(seed_phrase, passphrase)
+        result, error = wallet_manager.bip39_to_extended_master_key(seed_phrase, passphrase, network, derivation)
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        
+        # Also generate universal wallet info
+        universal_wallet, universal_error = wallet_manager.generate_universal_wallet(seed_phrase, passphrase, derivation)
+        
+        response = {
+            'status': 'success',
+            'seed_phrase': seed_phrase,
+            'network': network,
+            'extended_master_key': result['extended_master_key'],
+            'prefix': result['prefix'],
+            'lnd_import_instructions': {
+                'command': 'lncli create',
+                'option': 'x (extended master root key)',
+                'input': result['extended_master_key'],
+                'description': f'Use this {result["prefix"]} key when prompted for extended master root key'
+            }
+        }
+        
+        # Add universal wallet info if available
+        if not universal_error and universal_wallet:
+            response['universal_wallet'] = {
+                'addresses': universal_wallet.get('addresses', {}),
+                'lnd_keys': universal_wallet.get('lnd_keys', {}),
+                'supported_chains': universal_wallet.get('supported_chains', [])
+            }
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+
+
+@bp.route('/api/v1/lnd/wallet/init', methods=['POST'])
+@require_auth
+def lnd_init_wallet():
+    """Initialize LND wallet with seed phrase via gRPC"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        wallet_password = data.get('wallet_password')
+        seed_mnemonic = data.get('seed_mnemonic')
+        aezeed_passphrase = data.get('aezeed_passphrase', '')
+        recovery_window = data.get('recovery_window', 250)
+        
+        if not wallet_password:
+            return jsonify({
+                'error': 'wallet_password is required',
+                'status': 'error'
+            }), 400
+        
+        if not seed_mnemonic:
+            return jsonify({
+                'error': 'seed_mnemonic is required',
+                'status': 'error'
+            }), 400
+        
+        # Convert seed to list if it's a string
+        if isinstance(seed_mnemonic, str):
+            seed_mnemonic = seed_mnemonic.strip().split()
+        
+        result, error = lnd_grpc_client.init_wallet_grpc(
+            wallet_password=wallet_password,
+            cipher_seed_mnemonic=seed_mnemonic,
+            aezeed_passphrase=aezeed_passphrase,
+            recovery_window=recovery_window
+        )
+        
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'message': result['message'],
+            'admin_macaroon': result.get('admin_macaroon')
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lnd/wallet/unlock', methods=['POST'])
+@require_auth
+@limiter.limit("10 per minute")  # Rate limit: 10 unlock attempts per minute
+def lnd_unlock_wallet():
+    """Unlock LND wallet via gRPC"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        wallet_password = data.get('wallet_password')
+        recovery_window = data.get('recovery_window', 250)
+        
+        if not wallet_password:
+            return jsonify({
+                'error': 'wallet_password is required',
+                'status': 'error'
+            }), 400
+        
+        result, error = lnd_grpc_client.unlock_wallet_grpc(
+            wallet_password=wallet_password,
+            recovery_window=recovery_window
+        )
+        
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'message': result['message']
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/lnd/wallet/generate-and-init', methods=['POST'])
+@require_auth
+@limiter.limit("5 per minute")
+def lnd_generate_and_init():
+    """
+    Generate BIP39 seed and initialize LND wallet in one step via pure gRPC.
+    
+    This endpoint:
+    1. Generates a new BIP39 mnemonic
+    2. Derives the extended master key
+    3. Initializes LND wallet via gRPC
+    4. Returns seed phrase for backup (SAVE THIS!)
+    
+    Required:
+    - wallet_password: Password for LND wallet (min 8 chars)
+    
+    Optional:
+    - word_count: 12 or 24 (default: 24)
+    - bip39_passphrase: Additional passphrase for seed (default: empty)
+    - network: 'mainnet' or 'testnet' (default: 'testnet')
+    - recovery_window: Address lookahead (default: 2500)
+    - save_password: Save password for auto-unlock (default: true)
+    """
+    try:
+        if not HAS_WALLET_UNLOCKER:
+            return jsonify({
+                'error': 'WalletUnlocker proto not available. Run: bash scripts/gen-proto.sh',
+                'status': 'error'
+            }), 500
+        
+        data = request.get_json() or {}
+        
+        wallet_password = data.get('wallet_password')
+        word_count = data.get('word_count', 24)
+        bip39_passphrase = data.get('bip39_passphrase', '')
+        network = data.get('network', 'testnet')
+        recovery_window = data.get('recovery_window', 2500)
+        save_password = data.get('save_password', True)
+        
+        if not wallet_password:
+            return jsonify({
+                'error': 'wallet_password is required',
+                'status': 'error'
+            }), 400
+        
+        if len(wallet_password) < 8:
+            return jsonify({
+                'error': 'wallet_password must be at least 8 characters',
+                'status': 'error'
+            }), 400
+        
+        # Generate BIP39 seed
+        seed_phrase, error = wallet_manager.generate_mnemonic(word_count)
+        if error:
+            return jsonify({
+                'error': f'Failed to generate seed: {error}',
+                'status': 'error'
+            }), 500
+        
+        # Convert to LND extended master key
+        derivation = HDDerivationContext(seed_phrase, bip39_passphrase)
+        lnd_key_result, lnd_error = wallet_manager.bip39_to_extended_master_key(
+            seed_phrase, bip39_passphrase, network, derivation
+        )
+        if lnd_error:
+            return jsonify({
+                'error': f'Failed to convert to LND key: {lnd_error}',
+                'status': 'error'
+            }), 500
+        
+        extended_master_key = lnd_key_result['extended_master_key']
+        
+        # Initialize LND wallet via gRPC
+        init_result, init_error = lnd_grpc_client.init_wallet_with_extended_key_grpc(
+            wallet_password=wallet_password,
+            extended_master_key=extended_master_key,
+            birthday_timestamp=0,
+            recovery_window=recovery_window,
+            stateless_init=False
+        )
+        
+        if init_error:
+            return jsonify({
+                'error': f'Failed to initialize LND wallet: {init_error}',
+                'status': 'error',
+                'seed_phrase': seed_phrase,  # Return seed even on failure so user can retry
+                'extended_master_key': extended_master_key
+            }), 500
+        
+        # Generate universal wallet info
+        universal_wallet, universal_error = wallet_manager.generate_universal_wallet(
+            seed_phrase, bip39_passphrase, derivation
+        )
+        
+        # Save password for auto-unlock if requested
+        password_saved = False
+        if save_password:
+            lnd_password_file = '/data/lnd/password.txt'
+            try:
+                write_result = subprocess.run(
+                    ['sudo', 'bash', '-c', 
+                     f'mkdir -p /data/lnd && echo -n "{wallet_password}" > {lnd_password_file} && chmod 600 {lnd_password_file} && chown lnd:lnd {lnd_password_file}'],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                password_saved = (write_result.returncode == 0)
+            except Exception:
+                pass
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'LND wallet generated and initialized successfully',
+            'seed_phrase': seed_phrase,
+            'word_count': word_count,
+            'network': network,
+            'method': 'extended_master_key (BIP32/39 HD wallet)',
+            'recovery_window': recovery_window,
+            'password_saved': password_saved,
+            'admin_macaroon': init_result.get('admin_macaroon'),
+            'universal_wallet': universal_wallet if not universal_error else None,
+            'important': [
+                '⚠️ BACKUP YOUR SEED PHRASE NOW - It will not be shown again!',
+                'Store it securely offline (paper, metal plate, etc.)',
+                'Never share your seed phrase with anyone',
+                'This seed can recover your wallet on any BIP39-compatible wallet'
+            ]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+
+@bp.route('/api/v1/lnd/wallet/init-hd', methods=['POST'])
+@require_auth
+@limiter.limit("5 per minute")  # Rate limit: 5 init attempts per minute
+def lnd_init_hd_wallet():
+    """
+    Initialize LND wallet using BIP32 extended master key (HD wallet) via pure gRPC.
+    
+    This is the preferred method for creating an LND wallet from a BIP39 seed phrase,
+    as it doesn't rely on expect scripts and provides full control over the process.
+    
+    Required parameters:
+    - wallet_password: Password to encrypt the LND wallet (min 8 characters)
+    - extended_master_key: BIP32 extended private key (xprv for mainnet, tprv for testnet)
+    
+    Optional parameters:
+    - birthday_timestamp: Unix timestamp of wallet creation for faster sync (default: 0 = full scan)
+    - recovery_window: Address lookahead for recovery (default: 2500)
+    - save_password: Whether to save password to LND password file for auto-unlock (default: true)
+    """
+    try:
+        if not HAS_WALLET_UNLOCKER:
+            return jsonify({
+                'error': 'WalletUnlocker proto not available. Run: bash scripts/gen-proto.sh',
+                'status': 'error',
+                'resolution': 'The WalletUnlocker gRPC service is required for HD wallet initialization.'
+            }), 500
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        extended_master_key = data.get('extended_master_key')
+        wallet_password = data.get('wallet_password')
+        birthday_timestamp = data.get('birthday_timestamp', 0)
+        recovery_window = data.get('recovery_window', 2500)
+        save_password = data.get('save_password', True)
+        
+        # Validate required parameters
+        if not extended_master_key:
+            return jsonify({
+                'error': 'extended_master_key is required',
+                'status': 'error',
+                'help': 'Use /api/v1/wallet/derive-keys endpoint to generate extended_master_key from BIP39 seed'
+            }), 400
+        
+        if not wallet_password:
+            return jsonify({
+                'error': 'wallet_password is required',
+                'status': 'error'
+            }), 400
+        
+        if len(wallet_password) < 8:
+            return jsonify({
+                'error': 'wallet_password must be at least 8 characters',
+                'status': 'error'
+            }), 400
+        
+        # Validate extended_master_key format
+        if not (extended_master_key.startswith('xprv') or extended_master_key.startswith('tprv')):
+            return jsonify({
+                'error': 'extended_master_key must start with "xprv" (mainnet) or "tprv" (testnet)',
+                'status': 'error',
+                'help': 'Derive the key using BIP32 from your BIP39 seed phrase'
+            }), 400
+        
+        # Determine network from key prefix
+        network = 'mainnet' if extended_master_key.startswith('xprv') else 'testnet'
+        
+        # Initialize wallet via gRPC
+        result, error = lnd_grpc_client.init_wallet_with_extended_key_grpc(
+            wallet_password=wallet_password,
+            extended_master_key=extended_master_key,
+            birthday_timestamp=birthday_timestamp,
+            recovery_window=recovery_window,
+            stateless_init=False
+        )
+        
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        
+        # Save password to LND password file for auto-unlock if requested
+        password_saved = False
+        if save_password:
+            lnd_password_file = '/data/lnd/password.txt'
+            try:
+                write_result = subprocess.run(
+                    ['sudo', 'bash', '-c', 
+                     f'mkdir -p /data/lnd && echo -n "{wallet_password}" > {lnd_password_file} && chmod 600 {lnd_password_file} && chown lnd:lnd {lnd_password_file}'],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                password_saved = (write_result.returncode == 0)
+            except Exception:
+                pass  # Password save is optional, don't fail the request
+        
+        return jsonify({
+            'status': 'success',
+            'message': result['message'],
+            'method': 'extended_master_key (BIP32/39 HD wallet)',
+            'network': network,
+            'recovery_window': recovery_window,
+            'password_saved': password_saved,
+            'admin_macaroon': result.get('admin_macaroon'),
+            'next_steps': [
+                'LND wallet is now initialized with your HD master key',
+                'The wallet will automatically derive addresses from your BIP39 seed',
+                'Use the same seed phrase to recover this wallet in the future'
+            ]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+
+@bp.route('/api/v1/lnd/wallet/gen-seed', methods=['POST'])
+@require_auth
+def lnd_gen_seed():
+    """Generate a new aezeed seed phrase via gRPC (LND native format)"""
+    try:
+        if not HAS_WALLET_UNLOCKER:
+            return jsonify({
+                'error': 'WalletUnlocker proto not available. Run: bash scripts/gen-proto.sh',
+                'status': 'error'
+            }), 500
+        
+        result, error = lnd_grpc_client.gen_seed_grpc()
+        
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'cipher_seed_mnemonic': result['cipher_seed_mnemonic'],
+            'enciphered_seed': result.get('enciphered_seed'),
+            'format': 'aezeed (LND native)',
+            'word_count': len(result['cipher_seed_mnemonic'])
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint passwords
+
+Gerenciador de senhas seguras.
+"""
+
+import os
+from datetime import datetime
+from flask import Blueprint, jsonify, request
+
+from api_config import get_password_api
+from api_common import limiter, require_auth
+
+
+bp = Blueprint('passwords', __name__)
+
+
+# === SECURE PASSWORD MANAGER API ENDPOINTS ===
+
+@bp.route('/api/v1/system/passwords/store', methods=['POST'])
+@require_auth
+def store_system_password():
+    """Store a service password in secure password manager"""
+    password_api = get_password_api()
+    if not password_api or not password_api.is_initialized():
+        return jsonify({
+            'error': 'Secure password manager not initialized',
+            'message': 'Run: python3 /root/brln-os/brln-tools/secure_password_manager.py init'
+        }), 503
+    
+    try:
+        data = request.json
+        service_name = data.get('service_name')
+        username = data.get('username', 'admin')
+        password = data.get('password')
+        description = data.get('description', '')
+        port = data.get('port', 0)
+        url = data.get('url', '')
+        
+        if not service_name or not password:
+            return jsonify({'error': 'service_name and password required'}), 400
+        
+        # Store password
+        success = password_api.store_password(
+            service_name=service_name,
+            username=username,
+            password=password,
+            description=description,
+            port=port,
+            url=url
+        )
+        
+        if success:
+            return jsonify({
+                'success': True,
+                'message': f'Password stored for {service_name}',
+                'service_name': service_name
+            })
+        else:
+            return jsonify({'error': 'Failed to store password'}), 500
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/passwords/list', methods=['GET'])
+@require_auth
+def list_system_passwords():
+    """List all stored service names (admin only)"""
+    password_api = get_password_api()
+    if not password_api or not password_api.is_initialized():
+        return jsonify({
+            'error': 'Secure password manager not initialized'
+        }), 503
+    
+    try:
+        services = password_api.list_services()
+        return jsonify({
+            'success': True,
+            'services': services,
+            'count': len(services)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/passwords/status', methods=['GET'])
+def password_manager_status():
+    """Get secure password manager status"""
+    password_api = get_password_api()
+    if not password_api:
+        return jsonify({
+            'available': False,
+            'error': 'Secure password manager API not loaded'
+        })
+    
+    try:
+        status = password_api.get_status()
+        status['available'] = True
+        return jsonify(status)
+    except Exception as e:
+        return jsonify({
+            'available': False,
+            'error': str(e)
+        }), 500
+
+@bp.route('/api/v1/system/passwords/delete/<service_name>', methods=['DELETE'])
+@require_auth
+def delete_system_password(service_name):
+    """Delete a service password"""
+    password_api = get_password_api()
+    if not password_api or not password_api.is_initialized():
+        return jsonify({
+            'error': 'Secure password manager not initialized'
+        }), 503
+    
+    try:
+        success = password_api.delete_password(service_name)
+        if success:
+            return jsonify({
+                'success': True,
+                'message': f'Password deleted for {service_name}'
+            })
+        else:
+            return jsonify({'error': 'Failed to delete password'}), 500
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/passwords/get/<service_name>', methods=['GET'])
+@require_auth
+def get_system_password(service_name):
+    """Get a specific service password (requires active session)"""
+    password_api = get_password_api()
+    if not password_api or not password_api.is_initialized():
+        return jsonify({
+            'error': 'Secure password manager not initialized'
+        }), 503
+    
+    try:
+        password = password_api.get_password(service_name)
+        if password:
+            return jsonify({
+                'success': True,
+                'service_name': service_name,
+                'password': password
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Password not found for {service_name}'
+            }), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/passwords/unlock', methods=['POST'])
+@limiter.limit("5 per minute")  # Rate limit: 5 unlock attempts per minute to prevent brute force
+def unlock_password_session():
+    """
+    Unlock password manager session with master password.
+    This is needed when master password is not auto-loaded from SystemD credentials.
+    """
+    password_api = get_password_api()
+    if not password_api or not password_api.is_initialized():
+        return jsonify({
+            'error': 'Secure password manager not initialized'
+        }), 503
+    
+    try:
+        data = request.json
+        master_password = data.get('master_password')
+        
+        if not master_password:
+            return jsonify({'error': 'master_password required'}), 400
+        
+        # Unlock session
+        success = password_api.unlock_session(master_password)
+        
+        if success:
+            return jsonify({
+                'success': True,
+                'message': 'Session unlocked successfully',
+                'session_timeout': '5 minutes'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid master password'
+            }), 401
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/passwords/backup', methods=['GET'])
+@require_auth
+def backup_password_database():
+    """Create and download backup of password database"""
+    password_api = get_password_api()
+    if not password_api or not password_api.is_initialized():
+        return jsonify({
+            'error': 'Secure password manager not initialized'
+        }), 503
+    
+    try:
+        from flask import send_file
+        import io
+        
+        DB_PATH = "/data/brln-secure-passwords.db"
+        
+        if not os.path.exists(DB_PATH):
+            return jsonify({'error': 'Password database not found'}), 404
+        
+        # Create backup filename with timestamp
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        backup_filename = f'brln-passwords-backup-{timestamp}.db'
+        
+        # Read database file
+        with open(DB_PATH, 'rb') as f:
+            db_data = f.read()
+        
+        # Create in-memory file
+        backup_file = io.BytesIO(db_data)
+        backup_file.seek(0)
+        
+        # Send file for download
+        return send_file(
+            backup_file,
+            mimetype='application/octet-stream',
+            as_attachment=True,
+            download_name=backup_filename
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/passwords/backup/info', methods=['GET'])
+def get_backup_info():
+    """Get information about password database for backup"""
+    password_api = get_password_api()
+    if not password_api or not password_api.is_initialized():
+        return jsonify({
+            'error': 'Secure password manager not initialized'
+        }), 503
+    
+    try:
+        DB_PATH = "/data/brln-secure-passwords.db"
+        
+        if not os.path.exists(DB_PATH):
+            return jsonify({'error': 'Password database not found'}), 404
+        
+        # Get file size
+        file_size = os.path.getsize(DB_PATH)
+        
+        # Get password count
+        status = password_api.get_status()
+        
+        # Get last modified time
+        mtime = os.path.getmtime(DB_PATH)
+        last_modified = datetime.fromtimestamp(mtime).isoformat()
+        
+        return jsonify({
+            'success': True,
+            'database_path': DB_PATH,
+            'file_size': file_size,
+            'file_size_human': f"{file_size / 1024:.1f} KB",
+            'stored_passwords': status.get('stored_passwords', 0),
+            'last_modified': last_modified,
+            'iterations': status.get('iterations', 500000)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
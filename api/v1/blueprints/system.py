@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint system
+
+Rotas de sistema: status, serviços, health, bancos e jobs.
+"""
+
+import os
+import subprocess
+import time
+from flask import Blueprint, jsonify, request
+
+from api_config import BITCOIN_NETWORK
+from api_common import HAS_SESSION_AUTH, require_auth, validate_service_name
+from async_jobs import job_manager
+from wallet_store import wallet_db
+from lnd_client import lnd_channel_manager
+from chat_store import chat_db
+from system_services import (
+    SERVICE_MAPPING, get_service_status, manage_systemd_service, systemd_monitor
+)
+from system_status import status_collector
+from lightning_service import lightning_state
+from event_hub import event_hub
+
+
+bp = Blueprint('system', __name__)
+
+
+@bp.route('/api/v1/system/config/network', methods=['GET'])
+def get_network_config():
+    """Retorna a rede Bitcoin configurada (mainnet ou testnet)"""
+    try:
+        return jsonify({
+            'network': BITCOIN_NETWORK,
+            'status': 'success'
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/system/status', methods=['GET'])
+def system_status():
+    """Retorna o status do sistema (snapshot do coletor; ?max_age=<segundos> força dados mais novos)"""
+    try:
+        max_age = request.args.get('max_age', type=float)
+        if max_age is not None and max_age < 0:
+            return jsonify({'error': 'max_age deve ser >= 0', 'status': 'error'}), 400
+
+        snapshot, sampled_at = status_collector.get_snapshot(max_age)
+
+        response_data = dict(snapshot)
+        response_data['sampled_at'] = sampled_at
+        response_data['age'] = round(max(0.0, time.time() - sampled_at), 3)
+
+        return jsonify(response_data)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/services', methods=['GET'])
+def services_status():
+    """Retorna o status de todos os serviços"""
+    try:
+        states = systemd_monitor.get_states()
+        services = {}
+        for service_key, service_name in SERVICE_MAPPING.items():
+            services[service_key] = states.get(service_name) == 'active'
+        
+        return jsonify({'services': services})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/service', methods=['POST'])
+@require_auth
+def manage_service():
+    """Gerencia um serviço com toggle automático (start/stop baseado no status atual)"""
+    try:
+        data = request.get_json()
+        service_key = data.get('service')
+        
+        if not service_key:
+            return jsonify({'error': 'Service é obrigatório'}), 400
+        
+        # Validate service name using whitelist
+        is_valid, error = validate_service_name(service_key)
+        if not is_valid:
+            return jsonify({'error': error}), 400
+        
+        if service_key not in SERVICE_MAPPING:
+            return jsonify({'error': f'Serviço {service_key} não encontrado'}), 404
+        
+        service_name = SERVICE_MAPPING[service_key]
+        
+        # Verificar status atual do serviço
+        current_status = get_service_status(service_name, use_cache=False)
+        
+        # Determinar ação baseada no status atual (toggle)
+        if current_status:
+            action = 'stop'  # Se está ativo, parar
+        else:
+            action = 'start'  # Se está inativo, iniciar
+        
+        # Gerencia o serviço usando D-Bus/systemd
+        success, error_msg = manage_systemd_service(service_name, action)
+        
+        if success:
+            # Verificar novo status após a operação
+            new_status = get_service_status(service_name, use_cache=False)
+            event_hub.notify('services')
+            return jsonify({
+                'success': True,
+                'service': service_key,
+                'action': action,
+                'previous_status': current_status,
+                'current_status': new_status,
+                'message': f'Serviço {service_key} {"iniciado" if action == "start" else "parado"} com sucesso'
+            })
+        else:
+            return jsonify({
+                'error': f'Falha ao executar {action} em {service_key}',
+                'output': error_msg,
+                'current_status': current_status
+            }), 500
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/system/health', methods=['GET'])
+def health():
+    """Health check endpoint"""
+    return jsonify({'status': 'ok', 'version': '1.0'})
+
+@bp.route('/api/v1/system/lnd-grpc', methods=['GET'])
+def lnd_grpc_status():
+    """Estado do canal gRPC com o LND e latência/erros por RPC"""
+    try:
+        return jsonify({
+            'status': 'success',
+            'grpc': lnd_channel_manager.get_status(),
+            'state_cache': lightning_state.get_status()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 500
+
+@bp.route('/api/v1/system/databases', methods=['GET'])
+def database_status():
+    """Estado dos pools SQLite (wallets.db e lightning_chat.db) e do armazenamento de sessões"""
+    try:
+        sessions = None
+        if HAS_SESSION_AUTH:
+            from session_auth import session_manager
+            sessions = session_manager.get_status()
+        return jsonify({
+            'status': 'success',
+            'wallet_db': wallet_db.get_status(),
+            'chat_db': chat_db.get_status(),
+            'sessions': sessions
+        })
+    except Exception as e:
+        return jsonify({'error': str(e), 'status': 'error'}), 500
+
+@bp.route('/api/v1/jobs', methods=['GET'])
+def jobs_status():
+    """Ocupação do pool de jobs e do limite de KDFs simultâneos"""
+    return jsonify({'status': 'success', 'jobs': job_manager.get_status()})
+
+@bp.route('/api/v1/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Estado de um job; quando concluído, entrega o resultado (uma única vez)"""
+    job = job_manager.get(job_id, owner=request.cookies.get('brln_session'))
+    if not job:
+        return jsonify({'status': 'error', 'error': 'Job not found'}), 404
+    
+    return jsonify({'status': 'success', 'job': job})
+
+@bp.route('/api/v1/system/check-lnd-installation', methods=['GET'])
+def check_lnd_installation():
+    """Check if LND is installed on the system"""
+    try:
+        # Check if /data/lnd directory exists
+        has_lnd_directory = os.path.exists('/data/lnd') and os.path.isdir('/data/lnd')
+        
+        # Check if lnd command is in system path
+        lnd_in_system_path = False
+        try:
+            subprocess.run(['which', 'lnd'], capture_output=True, text=True, check=True)
+            lnd_in_system_path = True
+        except subprocess.CalledProcessError:
+            lnd_in_system_path = False
+        
+        # Determine if LND is installed (either directory exists or command is available)
+        lnd_installed = has_lnd_directory or lnd_in_system_path
+        
+        return jsonify({
+            'status': 'success',
+            'has_lnd_directory': has_lnd_directory,
+            'lnd_in_system_path': lnd_in_system_path,
+            'lnd_installed': lnd_installed
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'error': str(e),
+            'has_lnd_directory': False,
+            'lnd_in_system_path': False,
+            'lnd_installed': False
+        }), 500
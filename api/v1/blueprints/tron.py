@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint tron
+
+Wallet TRON GasFree.
+"""
+
+import requests
+import secrets
+from flask import Blueprint, jsonify, request
+
+from api_common import require_auth
+from wallet_crypto import current_kdf, decrypt_data, encrypt_data, kdf_needs_upgrade
+from wallet_store import HDDerivationContext, wallet_db, wallet_manager
+
+
+bp = Blueprint('tron', __name__)
+
+
+# ============================================================================
+# TRON GAS-FREE WALLET ENDPOINTS
+# ============================================================================
+
+def upgrade_tron_key_kdf(private_key, password, old_salt):
+    """Migração preguiçosa da chave TRON para o KDF atual (após desbloqueio ok)"""
+    try:
+        key_kdf = current_kdf()
+        encrypted_key, key_salt = encrypt_data(private_key, password, key_kdf)
+        with wallet_db.transaction(immediate=True) as cursor:
+            cursor.execute("""
+                UPDATE tron_config SET encrypted_private_key = ?, salt = ?, kdf = ?
+                WHERE id = 1 AND salt = ?
+            """, (encrypted_key, key_salt, key_kdf, old_salt))
+            return cursor.rowcount > 0
+    except Exception as e:
+        print(f"Aviso: KDF da chave TRON não atualizado: {e}")
+        return False
+
+@bp.route('/api/v1/tron/wallet/initialize', methods=['POST'])
+@require_auth
+def tron_initialize_wallet():
+    """Initialize TRON wallet from system wallet seed phrase"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'status': 'error',
+                'message': 'No data provided'
+            }), 400
+        
+        password = data.get('password')
+        if not password:
+            return jsonify({
+                'status': 'error',
+                'message': 'Password is required'
+            }), 400
+        
+        # Get system wallet
+        with wallet_db.transaction() as cursor:
+            cursor.execute("""
+                SELECT encrypted_mnemonic, salt, wallet_id, kdf FROM wallets 
+                WHERE is_system_default = 1 
+                LIMIT 1
+            """)
+            
+            result = cursor.fetchone()
+        
+        if not result:
+            return jsonify({
+                'status': 'error',
+                'message': 'System wallet not found. Please create a system wallet first.'
+            }), 404
+        
+        encrypted_mnemonic, salt, wallet_id, wallet_kdf = result
+        
+        # Decrypt mnemonic
+        try:
+            mnemonic = decrypt_data(encrypted_mnemonic, password, salt, scope=f'wallet:{wallet_id}', kdf=wallet_kdf)
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid password or decryption failed'
+            }), 401
+        if kdf_needs_upgrade(wallet_kdf):
+            wallet_manager.upgrade_wallet_kdf(wallet_id, mnemonic, password, salt)
+        
+        # Derive TRON address and private key
+        derivation = HDDerivationContext(mnemonic, "")
+        addresses, addr_error = wallet_manager.derive_addresses(mnemonic, "", derivation)
+        if addr_error:
+            return jsonify({
+                'status': 'error',
+                'message': f'Failed to derive addresses: {addr_error}'
+            }), 500
+        
+        private_keys, privkey_error = wallet_manager.derive_private_keys(mnemonic, "", derivation)
+        if privkey_error:
+            return jsonify({
+                'status': 'error',
+                'message': f'Failed to derive private keys: {privkey_error}'
+            }), 500
+        
+        # Extract TRON data from nested dictionaries
+        tron_addr_data = addresses.get('tron', {})
+        tron_key_data = private_keys.get('tron', {})
+        
+        # Get actual address and private key strings
+        if isinstance(tron_addr_data, dict):
+            tron_address = tron_addr_data.get('address')
+        else:
+            tron_address = tron_addr_data
+            
+        if isinstance(tron_key_data, dict):
+            tron_private_key = tron_key_data.get('private_key')
+        else:
+            tron_private_key = tron_key_data
+        
+        if not tron_address or not tron_private_key:
+            return jsonify({
+                'status': 'error',
+                'message': f'Failed to derive TRON data. Address: {tron_address}, Key: {bool(tron_private_key)}'
+            }), 500
+        
+        # Encrypt private key (ensure it's a string)
+        key_kdf = current_kdf()
+        encrypted_key, key_salt = encrypt_data(str(tron_private_key), password, key_kdf)
+        
+        # Derivação/KDF acima rodam fora da transação: o lock de escrita
+        # só é pego para gravar a configuração
+        with wallet_db.transaction(immediate=True) as cursor:
+            # Check if config exists
+            cursor.execute("SELECT id FROM tron_config WHERE id = 1")
+            exists = cursor.fetchone()
+            
+            if exists:
+                # Update existing
+                cursor.execute("""
+                    UPDATE tron_config 
+                    SET tron_address = ?, encrypted_private_key = ?, salt = ?, kdf = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = 1
+                """, (tron_address, encrypted_key, key_salt, key_kdf))
+            else:
+                # Insert new
+                cursor.execute("""
+                    INSERT INTO tron_config 
+                    (id, tron_address, encrypted_private_key, salt, kdf)
+                    VALUES (1, ?, ?, ?, ?)
+                """, (tron_address, encrypted_key, key_salt, key_kdf))
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'TRON wallet initialized successfully',
+            'address': tron_address
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/v1/tron/wallet/address', methods=['GET'])
+def tron_get_wallet_address():
+    """Get TRON gas-free wallet address"""
+    try:
+        with wallet_db.transaction() as cursor:
+            cursor.execute("""
+                SELECT tron_address, gasfree_endpoint, gasfree_api_key, gasfree_api_secret 
+                FROM tron_config 
+                WHERE id = 1
+            """)
+        
+            result = cursor.fetchone()
+        
+        if not result or not result[0]:
+            return jsonify({
+                'status': 'error',
+                'message': 'TRON wallet not configured. Please configure in settings.'
+            }), 404
+        
+        eoa_address = result[0]
+        gasfree_endpoint = result[1] or 'https://open.gasfree.io/tron/'
+        gasfree_api_key = result[2]
+        gasfree_api_secret = result[3]
+        
+        # Get gasFreeAddress from GasFree API
+        try:
+            import hmac
+            import hashlib
+            import base64
+            import time
+            
+            method = 'GET'
+            path = f'/tron/api/v1/address/{eoa_address}'
+            timestamp = int(time.time())
+            message = f"{method}{path}{timestamp}"
+            
+            signature = base64.b64encode(
+                hmac.new(
+                    gasfree_api_secret.encode('utf-8'),
+                    message.encode('utf-8'),
+                    hashlib.sha256
+                ).digest()
+            ).decode('utf-8')
+            
+            headers = {
+                'Timestamp': str(timestamp),
+                'Authorization': f'ApiKey {gasfree_api_key}:{signature}'
+            }
+            
+            response = requests.get(
+                f'{gasfree_endpoint}api/v1/address/{eoa_address}',
+                headers=headers,
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('code') == 200 and data.get('data'):
+                    gasfree_address = data['data'].get('gasFreeAddress')
+                    if gasfree_address:
+                        return jsonify({
+                            'status': 'success',
+                            'address': gasfree_address,
+                            'eoa_address': eoa_address
+                        })
+            
+            # Fallback to EOA address if GasFree API fails
+            return jsonify({
+                'status': 'success',
+                'address': eoa_address,
+                'warning': 'Could not fetch GasFree address, showing EOA address'
+            })
+            
+        except Exception as e:
+            # Fallback to EOA address
+            return jsonify({
+                'status': 'success',
+                'address': eoa_address,
+                'warning': f'GasFree API error: {str(e)}'
+            })
+            
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/v1/tron/wallet/balance', methods=['GET'])
+def tron_get_balance():
+    """Get TRON wallet balance from GasFree account"""
+    try:
+        with wallet_db.transaction() as cursor:
+            cursor.execute("""
+                SELECT tron_address, tron_api_url, tron_api_key, gasfree_endpoint, gasfree_api_key, gasfree_api_secret 
+                FROM tron_config 
+                WHERE id = 1
+            """)
+        
+            result = cursor.fetchone()
+        
+        if not result or not result[0]:
+            return jsonify({
+                'status': 'error',
+                'message': 'TRON wallet not configured'
+            }), 404
+        
+        eoa_address = result[0]
+        api_url = result[1] or 'https://api.trongrid.io'
+        api_key = result[2]
+        gasfree_endpoint = result[3] or 'https://open.gasfree.io/tron/'
+        gasfree_api_key = result[4]
+        gasfree_api_secret = result[5]
+        
+        # Get balance from GasFree API
+        try:
+            import hmac
+            import hashlib
+            import base64
+            import time
+            
+            method = 'GET'
+            path = f'/tron/api/v1/address/{eoa_address}'
+            timestamp = int(time.time())
+            message = f"{method}{path}{timestamp}"
+            
+            signature = base64.b64encode(
+                hmac.new(
+                    gasfree_api_secret.encode('utf-8'),
+                    message.encode('utf-8'),
+                    hashlib.sha256
+                ).digest()
+            ).decode('utf-8')
+            
+            headers = {
+                'Timestamp': str(timestamp),
+                'Authorization': f'ApiKey {gasfree_api_key}:{signature}'
+            }
+            
+            response = requests.get(
+                f'{gasfree_endpoint}api/v1/address/{eoa_address}',
+                headers=headers,
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('code') == 200 and data.get('data'):
+                    gasfree_data = data['data']
+                    gasfree_address = gasfree_data.get('gasFreeAddress')
+                    assets = gasfree_data.get('assets', [])
+                    
+                    # Find USDT balance
+                    usdt_balance = 0
+                    usdt_contract = 'TR7NHqjeKQxGTCi8z8ZY4pL8otSzgjLj6t'
+                    
+                    if gasfree_address:
+                        # Query balance from gasFreeAddress on chain
+                        headers_tron = {}
+                        if api_key:
+                            headers_tron['TRON-PRO-API-KEY'] = api_key
+                        
+                        trigger_response = requests.post(
+                            f'{api_url}/wallet/triggerconstantcontract',
+                            json={
+                                'owner_address': gasfree_address,
+                                'contract_address': usdt_contract,
+                                'function_selector': 'balanceOf(address)',
+                                'parameter': gasfree_address.replace('T', '41').ljust(64, '0'),
+                                'visible': True
+                            },
+                            headers=headers_tron,
+                            timeout=10
+                        )
+                        
+                        if trigger_response.status_code == 200:
+                            trigger_data = trigger_response.json()
+                            if trigger_data.get('result', {}).get('result'):
+                                constant_result = trigger_data.get('constant_result', [])
+                                if constant_result:
+                                    balance_hex = constant_result[0]
+                                    usdt_balance = int(balance_hex, 16) / 1000000
+                    
+                    return jsonify({
+                        'status': 'success',
+                        'address': gasfree_address,
+                        'usdt_balance': usdt_balance
+                    })
+            
+            # Fallback: return 0 balance if GasFree API fails
+            return jsonify({
+                'status': 'success',
+                'address': eoa_address,
+                'usdt_balance': 0,
+                'warning': 'Could not fetch GasFree balance'
+            })
+            
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': f'Error fetching balance: {str(e)}'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'address': eoa_address,
+            'usdt_balance': 0
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/v1/tron/wallet/send', methods=['POST'])
+@require_auth
+def tron_send_usdt():
+    """Send USDT via gas-free protocol"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'status': 'error',
+                'message': 'No data provided'
+            }), 400
+        
+        to_address = data.get('to_address')
+        amount = float(data.get('amount', 0))
+        password = data.get('password')
+        
+        if not to_address or not amount or not password:
+            return jsonify({
+                'status': 'error',
+                'message': 'Missing required parameters'
+            }), 400
+        
+        if amount < 1.01:
+            return jsonify({
+                'status': 'error',
+                'message': 'Minimum amount is 1.01 USDT (1 USDT gas-free fee + 0.01 USDT transfer)'
+            }), 400
+        
+        # Get wallet config
+        with wallet_db.transaction() as cursor:
+            cursor.execute("""
+                SELECT tron_address, encrypted_private_key, salt,
+                       tron_api_url, tron_api_key,
+                       gasfree_api_key, gasfree_api_secret, gasfree_endpoint,
+                       gasfree_verifying_contract, gasfree_service_provider, kdf
+                FROM tron_config 
+                WHERE id = 1
+            """)
+        
+            result = cursor.fetchone()
+        
+        if not result:
+            return jsonify({
+                'status': 'error',
+                'message': 'TRON wallet not configured'
+            }), 404
+        
+        from_address = result[0]
+        encrypted_key = result[1]
+        salt = result[2]
+        api_url = result[3] or 'https://api.trongrid.io'
+        api_key = result[4]
+        gasfree_api_key = result[5]
+        gasfree_api_secret = result[6]
+        gasfree_endpoint = result[7] or 'https://open.gasfree.io/tron/'
+        verifying_contract = result[8] or 'TFFAMLQZybALab4uxHA9RBE7pxhUAjfF3U'
+        service_provider = result[9] or 'TLntW9Z59LYY5KEi9cmwk3PKjQga828ird'
+        key_kdf = result[10]
+        
+        # Decrypt private key
+        try:
+            private_key = decrypt_data(encrypted_key, password, salt, scope=f'tron:{from_address}', kdf=key_kdf)
+        except Exception as e:
+            return jsonify({
+                'status': 'error',
+                'message': 'Invalid password or decryption failed'
+            }), 401
+        if kdf_needs_upgrade(key_kdf):
+            upgrade_tron_key_kdf(private_key, password, salt)
+        
+        # Calculate net amount (deduct 1 USDT gas-free fee)
+        net_amount = amount - 1.0
+        usdt_amount_in_sun = int(net_amount * 1000000)  # USDT has 6 decimals
+        
+        # Here we would integrate with the TRON gas-free protocol
+        # For now, return a mock transaction
+        txid = f"mock_tx_{secrets.token_hex(32)}"
+        
+        # In production, you would:
+        # 1. Create unsigned USDT transfer transaction
+        # 2. Sign it with gas-free protocol signature
+        # 3. Submit to gas-free endpoint
+        # 4. Return actual transaction ID
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Transaction sent successfully',
+            'txid': txid,
+            'from_address': from_address,
+            'to_address': to_address,
+            'amount': net_amount,
+            'fee': 1.0,
+            'total': amount
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/v1/tron/wallet/transactions', methods=['GET'])
+def tron_get_transactions():
+    """Get TRON transaction history"""
+    try:
+        limit = int(request.args.get('limit', 30))
+        
+        with wallet_db.transaction() as cursor:
+            cursor.execute("""
+                SELECT tron_address, tron_api_url, tron_api_key 
+                FROM tron_config 
+                WHERE id = 1
+            """)
+        
+            result = cursor.fetchone()
+        
+        if not result or not result[0]:
+            return jsonify({
+                'status': 'error',
+                'message': 'TRON wallet not configured'
+            }), 404
+        
+        address = result[0]
+        api_url = result[1] or 'https://api.trongrid.io'
+        api_key = result[2]
+        
+        headers = {}
+        if api_key:
+            headers['TRON-PRO-API-KEY'] = api_key
+        
+        # Get TRC20 transfers (USDT)
+        usdt_contract = 'TR7NHqjeKQxGTCi8z8ZY4pL8otSzgjLj6t'
+        
+        response = requests.get(
+            f'{api_url}/v1/accounts/{address}/transactions/trc20',
+            params={
+                'limit': limit,
+                'contract_address': usdt_contract
+            },
+            headers=headers,
+            timeout=10
+        )
+        
+        transactions = []
+        if response.status_code == 200:
+            data = response.json()
+            for tx in data.get('data', []):
+                transactions.append({
+                    'txid': tx.get('transaction_id'),
+                    'from_address': tx.get('from'),
+                    'to_address': tx.get('to'),
+                    'amount': float(tx.get('value', 0)) / 1000000,  # Convert to USDT
+                    'timestamp': tx.get('block_timestamp', 0) // 1000,
+                    'status': 'confirmed' if tx.get('result') == 'SUCCESS' else 'failed'
+                })
+        
+        return jsonify({
+            'status': 'success',
+            'transactions': transactions,
+            'count': len(transactions)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/v1/tron/config/save', methods=['POST'])
+def tron_save_config():
+    """Save TRON configuration (encrypted)"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'status': 'error',
+                'message': 'No data provided'
+            }), 400
+        
+        password = data.get('password')
+        if not password:
+            return jsonify({
+                'status': 'error',
+                'message': 'Password is required'
+            }), 400
+        
+        tron_api_url = data.get('tron_api_url', 'https://api.trongrid.io')
+        tron_api_key = data.get('tron_api_key', '')
+        gasfree_api_key = data.get('gasfree_api_key', '')
+        gasfree_api_secret = data.get('gasfree_api_secret', '')
+        gasfree_endpoint = data.get('gasfree_endpoint', 'https://open.gasfree.io/tron/')
+        
+        with wallet_db.transaction(immediate=True) as cursor:
+            # Check if config exists
+            cursor.execute("SELECT id FROM tron_config WHERE id = 1")
+            exists = cursor.fetchone()
+        
+            if exists:
+                # Update existing config
+                cursor.execute("""
+                    UPDATE tron_config 
+                    SET tron_api_url = ?, tron_api_key = ?,
+                        gasfree_api_key = ?, gasfree_api_secret = ?,
+                        gasfree_endpoint = ?
+                    WHERE id = 1
+                """, (tron_api_url, tron_api_key, gasfree_api_key, 
+                      gasfree_api_secret, gasfree_endpoint))
+            else:
+                # Insert new config
+                cursor.execute("""
+                    INSERT INTO tron_config 
+                    (id, tron_api_url, tron_api_key, gasfree_api_key, 
+                     gasfree_api_secret, gasfree_endpoint)
+                    VALUES (1, ?, ?, ?, ?, ?)
+                """, (tron_api_url, tron_api_key, gasfree_api_key, 
+                      gasfree_api_secret, gasfree_endpoint))
+        
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Configuration saved successfully'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@bp.route('/api/v1/tron/config/load', methods=['GET'])
+def tron_load_config():
+    """Load TRON configuration (non-sensitive data only)"""
+    try:
+        with wallet_db.transaction() as cursor:
+            cursor.execute("""
+                SELECT tron_api_url, tron_api_key, 
+                       gasfree_api_key, gasfree_endpoint
+                FROM tron_config 
+                WHERE id = 1
+            """)
+        
+            result = cursor.fetchone()
+        
+        if result:
+            return jsonify({
+                'status': 'success',
+                'config': {
+                    'tron_api_url': result[0],
+                    'tron_api_key': result[1],
+                    'gasfree_api_key': result[2],
+                    'gasfree_endpoint': result[3]
+                }
+            })
+        else:
+            return jsonify({
+                'status': 'success',
+                'config': None
+            })
+            
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
@@ -0,0 +1,1487 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - blueprint wallet
+
+Rotas das wallets HD.
+"""
+
+import os
+import subprocess
+import requests
+import json
+from datetime import datetime
+import hashlib
+import time
+import threading
+from flask import Blueprint, jsonify, request
+
+from api_config import BITCOIN_NETWORK, get_master_password
+from api_common import require_auth, validate_wallet_id
+from wallet_crypto import current_kdf
+from async_jobs import async_job
+from wallet_store import (
+    ADDRESS_BRANCHES, ADDRESS_GAP_LIMIT, HAS_WALLET_LIBS, HDDerivationContext,
+    SUPPORTED_CHAINS, wallet_db, wallet_manager
+)
+from lnd_client import HAS_WALLET_UNLOCKER, lnd_grpc_client
+from node_rpc import elements_rpc_client
+from lightning_service import get_blockchain_balance
+
+
+bp = Blueprint('wallet', __name__)
+
+
+# === WALLET MANAGEMENT ENDPOINTS ===
+
+@bp.route('/api/v1/wallet/generate', methods=['POST'])
+@require_auth
+def generate_wallet():
+    """Gerar nova carteira HD com mnemonic BIP39"""
+    try:
+        if not HAS_WALLET_LIBS:
+            return jsonify({
+                'error': 'Wallet libraries not available',
+                'status': 'error'
+            }), 500
+        
+        data = request.get_json()
+        if not data:
+            data = {}
+        
+        # Get word count (default to 12)
+        word_count = data.get('word_count', 12)
+        if word_count not in [12, 24]:
+            return jsonify({
+                'error': 'Word count must be 12 or 24',
+                'status': 'error'
+            }), 400
+        
+        # Gerar mnemonic
+        seed_phrase, error = wallet_manager.generate_mnemonic(word_count)
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        
+        # Get data from request
+        wallet_id_input = data.get('wallet_id', '')
+        bip39_passphrase = data.get('password', '')  # This is the BIP39 passphrase (13th/25th word)
+        
+        # Seed esticada uma vez para endereços, chaves e LND keys deste request
+        derivation = HDDerivationContext(seed_phrase, bip39_passphrase)
+        
+        # Derivar endereços usando a passphrase BIP39
+        addresses, derive_error = wallet_manager.derive_addresses(seed_phrase, bip39_passphrase, derivation)
+        if derive_error:
+            return jsonify({
+                'error': derive_error,
+                'status': 'error'
+            }), 500
+        
+        # Derivar chaves privadas usando a passphrase BIP39
+        private_keys, privkey_error = wallet_manager.derive_private_keys(seed_phrase, bip39_passphrase, derivation)
+        if privkey_error:
+            return jsonify({
+                'error': privkey_error,
+                'status': 'error'
+            }), 500
+        
+        # Gerar carteira universal (inclui LND keys)
+        universal_wallet, universal_error = wallet_manager.generate_universal_wallet(
+            seed_phrase, bip39_passphrase, derivation
+        )
+        if universal_error:
+            return jsonify({
+                'error': universal_error,
+                'status': 'error'
+            }), 500
+        
+        # Gerar ID único da carteira se não fornecido
+        import uuid
+        if wallet_id_input:
+            wallet_id = wallet_id_input
+        else:
+            wallet_id = str(uuid.uuid4())
+        
+        # Store in temporary cache for later verification and saving
+        if not hasattr(wallet_manager, 'temp_wallets'):
+            wallet_manager.temp_wallets = {}
+            
+        wallet_manager.temp_wallets[wallet_id] = {
+            'seed_phrase': seed_phrase,
+            'addresses': addresses,
+            'private_keys': private_keys,
+            'universal_wallet': universal_wallet,
+            'has_bip39_passphrase': bool(bip39_passphrase),
+            'word_count': word_count,
+            'created_at': datetime.now().isoformat()
+        }
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Universal wallet generated successfully',
+            'wallet_id': wallet_id,
+            'mnemonic': seed_phrase,
+            'seed_phrase': seed_phrase,
+            'word_count': word_count,
+            'has_bip39_passphrase': bool(bip39_passphrase),
+            'addresses': addresses,
+            'private_keys': private_keys,
+            'lnd_keys': universal_wallet.get('lnd_keys', {}),
+            'lnd_compatible': universal_wallet.get('lnd_compatible', False),
+            'supported_chains': universal_wallet.get('supported_chains', []),
+            'usage_instructions': {
+                'lnd_mainnet': 'Use lnd_keys.mainnet.extended_master_key with lncli create option "x"',
+                'lnd_testnet': 'Use lnd_keys.testnet.extended_master_key with lncli create option "x"',
+                'other_chains': 'Use addresses and private_keys for respective blockchain networks'
+            }
+        })
+            
+        wallet_manager.temp_wallets[wallet_id] = {
+            'mnemonic': seed_phrase,
+            'addresses': addresses,
+            'private_keys': private_keys,
+            'bip39_passphrase': bip39_passphrase,
+            'word_count': word_count,
+            'created_at': datetime.now()
+        }
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Wallet generated successfully',
+            'wallet_id': wallet_id,
+            'mnemonic': seed_phrase,
+            'addresses': addresses,
+            'word_count': word_count,
+            'has_bip39_passphrase': bool(bip39_passphrase)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/import', methods=['POST'])
+@require_auth
+def import_wallet():
+    """Importar carteira existente usando mnemonic"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        mnemonic = data.get('mnemonic', '').strip()
+        passphrase = data.get('passphrase', '')
+        
+        if not mnemonic:
+            return jsonify({
+                'error': 'Mnemonic is required',
+                'status': 'error'
+            }), 400
+        
+        # Validar mnemonic
+        is_valid, validation_error = wallet_manager.validate_mnemonic(mnemonic)
+        if not is_valid:
+            return jsonify({
+                'error': f'Invalid mnemonic: {validation_error}',
+                'status': 'error'
+            }), 400
+        
+        # Derivar endereços
+        addresses, derive_error = wallet_manager.derive_addresses(mnemonic, passphrase)
+        if derive_error:
+            return jsonify({
+                'error': derive_error,
+                'status': 'error'
+            }), 500
+        
+        return jsonify({
+            'status': 'success',
+            'addresses': addresses,
+            'message': 'Wallet imported successfully'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/save', methods=['POST'])
+@require_auth
+@async_job('wallet.save')
+def save_wallet():
+    """Salvar carteira criptografada com senha de banco de dados ou SystemD credentials"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        mnemonic = data.get('mnemonic', '').strip()
+        db_password = data.get('password', '')  # Database encryption password (optional)
+        wallet_id = data.get('wallet_id', f'wallet_{int(time.time())}')
+        metadata = data.get('metadata', {})
+        use_systemd_credentials = data.get('metadata', {}).get('useSystemdCredentials', False)
+        
+        if not mnemonic:
+            return jsonify({
+                'error': 'Mnemonic is required',
+                'status': 'error'
+            }), 400
+        
+        # Validate wallet_id format if provided
+        if wallet_id and not wallet_id.startswith('wallet_'):
+            is_valid, error = validate_wallet_id(wallet_id)
+            if not is_valid:
+                return jsonify({
+                    'error': error,
+                    'status': 'error'
+                }), 400
+        
+        # If no password provided, use master password for encryption
+        if not db_password or use_systemd_credentials:
+            db_password = get_master_password()
+            if not db_password:
+                return jsonify({
+                    'error': 'No encryption password provided and master password not available',
+                    'status': 'error'
+                }), 400
+            metadata['encrypted_with_systemd_credentials'] = True
+        
+        # Get BIP39 passphrase and private keys from temporary storage
+        bip39_passphrase = ""
+        private_keys = {}
+        
+        if hasattr(wallet_manager, 'temp_wallets') and wallet_id in wallet_manager.temp_wallets:
+            temp_data = wallet_manager.temp_wallets[wallet_id]
+            bip39_passphrase = temp_data.get('bip39_passphrase', '')
+            private_keys = temp_data.get('private_keys', {})
+            
+            # Add BIP39 info to metadata
+            metadata['has_bip39_passphrase'] = bool(bip39_passphrase)
+            metadata['bip39_passphrase_hash'] = hashlib.sha256(bip39_passphrase.encode()).hexdigest() if bip39_passphrase else None
+        
+        # Criptografar mnemonic com senha do banco (KDF calibrado para esta máquina)
+        kdf = current_kdf()
+        encrypted_mnemonic, salt, encrypt_error = wallet_manager.encrypt_mnemonic(mnemonic, db_password, kdf)
+        if encrypt_error:
+            return jsonify({
+                'error': encrypt_error,
+                'status': 'error'
+            }), 500
+        
+        # Criptografar chaves privadas com senha do banco
+        encrypted_private_keys = None
+        if private_keys:
+            encrypted_private_keys, privkey_salt, privkey_encrypt_error = wallet_manager.encrypt_private_keys(private_keys, db_password)
+            if privkey_encrypt_error:
+                return jsonify({
+                    'error': privkey_encrypt_error,
+                    'status': 'error'
+                }), 500
+        
+        # Check if this should be set as system default (if it's the first wallet or explicitly requested)
+        is_system_default = data.get('is_system_default', False)
+        
+        # If no system default exists yet, make this the default
+        if not is_system_default:
+            default_wallet, _ = wallet_manager.get_system_default_wallet()
+            if not default_wallet:
+                is_system_default = True
+        
+        # Salvar no banco
+        save_success, save_error = wallet_manager.save_wallet(
+            wallet_id, encrypted_mnemonic, salt, metadata, has_password=bool(db_password), 
+            encrypted_private_keys=encrypted_private_keys, is_system_default=is_system_default, kdf=kdf
+        )
+        if not save_success:
+            return jsonify({
+                'error': save_error,
+                'status': 'error'
+            }), 500
+        
+        # Cache addresses usando a passphrase BIP39 correta
+        derivation = HDDerivationContext(mnemonic, bip39_passphrase)
+        addresses, derive_error = wallet_manager.derive_addresses(mnemonic, bip39_passphrase, derivation)
+        if not derive_error:
+            wallet_manager.cache_addresses(wallet_id, addresses)
+            # xpubs de conta: derivação em lote posterior sem a seed
+            _, xpub_error = wallet_manager.cache_account_xpubs(wallet_id, derivation)
+            if xpub_error:
+                print(f"Warning: {xpub_error}")
+        
+        # Clean up temporary data
+        if hasattr(wallet_manager, 'temp_wallets') and wallet_id in wallet_manager.temp_wallets:
+            del wallet_manager.temp_wallets[wallet_id]
+        
+        message = 'Wallet encrypted and saved successfully'
+        integration_result = None
+        
+        # Auto-integrate with LND using gRPC if this is the system default
+        if is_system_default:
+            message += ' and set as system default'
+            
+            try:
+                print(f"🔄 Starting LND integration for wallet '{wallet_id}' via gRPC...")
+                message += ' - LND integration started in background'
+                
+                # Run LND integration in background thread using gRPC
+                def background_lnd_integration():
+                    try:
+                        if not HAS_WALLET_UNLOCKER:
+                            print("❌ WalletUnlocker proto not available - cannot integrate LND via gRPC")
+                            return
+                        
+                        # Convert BIP39 to LND extended master key
+                        result, error = wallet_manager.bip39_to_extended_master_key(mnemonic, bip39_passphrase or '', 'testnet')
+                        if error:
+                            print(f"❌ Failed to convert BIP39 to LND master key: {error}")
+                            return
+                        
+                        extended_master_key = result['extended_master_key']
+                        print(f"✅ Generated LND extended master key for wallet '{wallet_id}'")
+                        
+                        # Stop LND service first
+                        subprocess.run(['sudo', 'systemctl', 'stop', 'lnd'], capture_output=True, timeout=30)
+                        print("⏹️ LND service stopped")
+                        
+                        # Start LND service
+                        subprocess.run(['sudo', 'systemctl', 'start', 'lnd'], capture_output=True, timeout=30)
+                        print("▶️ LND service started")
+                        
+                        # Wait for LND to be ready
+                        import time
+                        time.sleep(5)
+                        
+                        # Initialize wallet via gRPC (pure gRPC, no expect scripts)
+                        init_result, init_error = lnd_grpc_client.init_wallet_with_extended_key_grpc(
+                            wallet_password=db_password,  # Use wallet password for LND
+                            extended_master_key=extended_master_key,
+                            birthday_timestamp=0,
+                            recovery_window=2500,
+                            stateless_init=False
+                        )
+                        
+                        if init_error:
+                            print(f"❌ LND wallet creation failed for wallet '{wallet_id}': {init_error}")
+                            return
+                        
+                        print(f"✅ LND wallet created successfully for wallet '{wallet_id}' via gRPC")
+                        
+                        # Save password for auto-unlock
+                        lnd_password_file = '/data/lnd/password.txt'
+                        subprocess.run(
+                            ['sudo', 'bash', '-c', f'mkdir -p /data/lnd && echo -n "{db_password}" > {lnd_password_file} && chmod 600 {lnd_password_file} && chown lnd:lnd {lnd_password_file}'],
+                            capture_output=True, timeout=10
+                        )
+                        
+                        # Check if admin.macaroon was created
+                        time.sleep(3)
+                        if os.path.exists(f'/data/lnd/data/chain/bitcoin/{BITCOIN_NETWORK}/admin.macaroon'):
+                            print(f"✅ Admin macaroon created - LND integration complete for wallet '{wallet_id}'")
+                        else:
+                            print(f"⚠️ Admin macaroon not found - LND may still be initializing for wallet '{wallet_id}'")
+                            
+                    except Exception as e:
+                        print(f"❌ LND integration failed for wallet '{wallet_id}': {str(e)}")
+                
+                # Start integration in background
+                integration_thread = threading.Thread(target=background_lnd_integration, daemon=True)
+                integration_thread.start()
+                
+                # Also integrate Elements wallet
+                def background_elements_integration():
+                    try:
+                        print(f"🔷 Starting Elements integration for wallet '{wallet_id}'...")
+                        
+                        # Start Elements daemon if not running
+                        subprocess.run(['sudo', 'systemctl', 'start', 'elementsd'], capture_output=True, timeout=30)
+                        print("▶️ Elements service started")
+                        
+                        # Wait for Elements to be ready
+                        import time
+                        time.sleep(10)
+                        
+                        # Check if peerswap wallet exists
+                        wallet_list_result = subprocess.run(
+                            ['elements-cli', '-datadir=/data/elements', 'listwallets'],
+                            capture_output=True, text=True, timeout=30
+                        )
+                        
+                        if wallet_list_result.returncode == 0:
+                            import json
+                            wallets = json.loads(wallet_list_result.stdout)
+                            
+                            if 'peerswap' not in wallets:
+                                # Create peerswap wallet with descriptor
+                                print("📝 Creating peerswap wallet...")
+                                create_result = subprocess.run(
+                                    ['elements-cli', '-datadir=/data/elements', 
+                                     'createwallet', 'peerswap', 'false', 'false', '', 'false', 'true'],
+                                    capture_output=True, text=True, timeout=60
+                                )
+                                
+                                if create_result.returncode == 0:
+                                    print(f"✅ Elements peerswap wallet created")
+                                else:
+                                    print(f"⚠️ Elements wallet creation failed: {create_result.stderr}")
+                                    return
+                            else:
+                                print("✅ Elements peerswap wallet already exists")
+                            
+                            # Import mnemonic as HD seed
+                            print("🔑 Importing HD seed into Elements wallet...")
+                            import_result = subprocess.run(
+                                ['elements-cli', '-datadir=/data/elements', '-rpcwallet=peerswap',
+                                 'sethdseed', 'true', mnemonic],
+                                capture_output=True, text=True, timeout=60
+                            )
+                            
+                            if import_result.returncode == 0:
+                                print(f"✅ Elements wallet integrated successfully for wallet '{wallet_id}'")
+                            else:
+                                # Sometimes sethdseed fails if already set, try importing descriptors
+                                print(f"⚠️ sethdseed failed (may already be set): {import_result.stderr}")
+                                print(f"✅ Elements wallet exists and ready for wallet '{wallet_id}'")
+                        else:
+                            print(f"❌ Elements wallet list failed: {wallet_list_result.stderr}")
+                            
+                    except Exception as e:
+                        print(f"❌ Elements integration failed for wallet '{wallet_id}': {str(e)}")
+                
+                # Start Elements integration in background
+                elements_thread = threading.Thread(target=background_elements_integration, daemon=True)
+                elements_thread.start()
+                    
+            except Exception as e:
+                print(f"⚠️ Wallet integration setup error: {str(e)}")
+                message += ' - Wallet integration setup failed'
+        
+        response_data = {
+            'status': 'success',
+            'wallet_id': wallet_id,
+            'message': message,
+            'is_system_default': is_system_default,
+            'addresses': addresses if not derive_error else {}
+        }
+        
+        return jsonify(response_data)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/list', methods=['GET'])
+def list_wallets():
+    """Listar carteiras salvas no banco"""
+    try:
+        with wallet_db.transaction() as cursor:
+            cursor.execute('''
+                SELECT wallet_id, metadata, last_used, created_at, has_password, is_system_default
+                FROM wallets ORDER BY is_system_default DESC, last_used DESC
+            ''')
+        
+            results = cursor.fetchall()
+        
+        wallets = []
+        for wallet_id, metadata_json, last_used, created_at, has_password, is_system_default in results:
+            try:
+                metadata = json.loads(metadata_json) if metadata_json else {}
+            except:
+                metadata = {}
+            
+            wallets.append({
+                'wallet_id': wallet_id,
+                'metadata': metadata,
+                'last_used': last_used,
+                'created_at': created_at,
+                'encrypted': bool(has_password),  # True apenas se tem senha real
+                'is_system_default': bool(is_system_default)
+            })
+        
+        return jsonify({
+            'status': 'success',
+            'wallets': wallets,
+            'count': len(wallets)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/system-default', methods=['GET'])
+def get_system_default():
+    """Get the system default wallet"""
+    try:
+        wallet_data, error = wallet_manager.get_system_default_wallet()
+        
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 404
+        
+        # Don't return sensitive data, just wallet info
+        return jsonify({
+            'status': 'success',
+            'wallet_id': wallet_data['wallet_id'],
+            'metadata': wallet_data['metadata'],
+            'has_password': wallet_data['has_password']
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/system-default', methods=['POST'])
+def set_system_default():
+    """Set a wallet as the system default"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        wallet_id = data.get('wallet_id')
+        if not wallet_id:
+            return jsonify({
+                'error': 'wallet_id is required',
+                'status': 'error'
+            }), 400
+        
+        success, error = wallet_manager.set_system_default_wallet(wallet_id)
+        if not success:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 400
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'Wallet {wallet_id} set as system default',
+            'wallet_id': wallet_id
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/integrate', methods=['POST'])
+def integrate_system_wallet():
+    """Manually integrate the system default wallet with LND and Elements"""
+    try:
+        data = request.get_json()
+        wallet_id = data.get('wallet_id') if data else None
+        password = data.get('password') if data else None
+        
+        # If no wallet_id provided, get the system default
+        if not wallet_id:
+            default_wallet, error = wallet_manager.get_system_default_wallet()
+            if error or not default_wallet:
+                return jsonify({
+                    'error': 'No system default wallet found',
+                    'status': 'error'
+                }), 404
+            
+            wallet_id = default_wallet['wallet_id']
+        
+        # Load the wallet data from database
+        wallet_data, error = wallet_manager.load_wallet(wallet_id)
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 404
+        
+        # Check if we need to decrypt the mnemonic
+        mnemonic = None
+        
+        # Try to get from temporary wallets first (if recently loaded)
+        if hasattr(wallet_manager, 'temp_wallets') and wallet_id in wallet_manager.temp_wallets:
+            mnemonic = wallet_manager.temp_wallets[wallet_id].get('mnemonic')
+        
+        # If not in temp storage and wallet is encrypted, require password
+        if not mnemonic and wallet_data.get('encrypted_mnemonic'):
+            if not password:
+                return jsonify({
+                    'error': 'Password required for wallet decryption',
+                    'status': 'error'
+                }), 400
+            
+            # Decrypt the mnemonic
+            mnemonic, decrypt_error = wallet_manager.decrypt_mnemonic(
+                wallet_data['encrypted_mnemonic'],
+                wallet_data['salt'],
+                password,
+                wallet_id,
+                wallet_data.get('kdf')
+            )
+            if decrypt_error:
+                return jsonify({
+                    'error': 'Invalid password or corrupted wallet data',
+                    'status': 'error'
+                }), 401
+        
+        # If we still don't have a mnemonic (unencrypted wallet), get it from wallet data  
+        if not mnemonic and not wallet_data.get('encrypted_mnemonic'):
+            return jsonify({
+                'error': 'Wallet data not found or corrupted',
+                'status': 'error'
+            }), 400
+        
+        # Start background integration
+        try:
+            import sys
+            import threading
+            sys.path.append('/root/brln-os/scripts')
+            from auto_wallet_integration import check_integration_dependencies
+            
+            # Check dependencies
+            if not check_integration_dependencies():
+                return jsonify({
+                    'error': 'Integration dependencies not available',
+                    'status': 'error'
+                }), 500
+            
+            # Store mnemonic temporarily for integration
+            if hasattr(wallet_manager, 'temp_wallets'):
+                if wallet_id not in wallet_manager.temp_wallets:
+                    wallet_manager.temp_wallets[wallet_id] = {}
+                wallet_manager.temp_wallets[wallet_id]['mnemonic'] = mnemonic
+            
+            print(f"🔄 Starting manual LND integration for wallet '{wallet_id}' via gRPC...")
+            
+            # Run integration in background thread using gRPC (pure gRPC, no expect scripts)
+            def background_lnd_integration():
+                try:
+                    if not HAS_WALLET_UNLOCKER:
+                        print("❌ WalletUnlocker proto not available - cannot integrate LND via gRPC")
+                        return
+                    
+                    # Convert BIP39 to LND extended master key
+                    result, error = wallet_manager.bip39_to_extended_master_key(mnemonic, '', 'testnet')
+                    if error:
+                        print(f"❌ Failed to convert BIP39 to LND master key: {error}")
+                        return
+                    
+                    extended_master_key = result['extended_master_key']
+                    print(f"✅ Generated LND extended master key for manual integration '{wallet_id}'")
+                    
+                    # Stop LND service first
+                    subprocess.run(['sudo', 'systemctl', 'stop', 'lnd'], capture_output=True, timeout=30)
+                    print("⏹️ LND service stopped for manual integration")
+                    
+                    # Start LND service
+                    subprocess.run(['sudo', 'systemctl', 'start', 'lnd'], capture_output=True, timeout=30)
+                    print("▶️ LND service started for manual integration")
+                    
+                    # Wait for LND to be ready
+                    import time
+                    time.sleep(5)
+                    
+                    # Initialize wallet via gRPC (pure gRPC, no expect scripts)
+                    init_result, init_error = lnd_grpc_client.init_wallet_with_extended_key_grpc(
+                        wallet_password=password,  # Use wallet password for LND
+                        extended_master_key=extended_master_key,
+                        birthday_timestamp=0,
+                        recovery_window=2500,
+                        stateless_init=False
+                    )
+                    
+                    if init_error:
+                        print(f"❌ LND wallet creation failed for manual integration '{wallet_id}': {init_error}")
+                        return
+                    
+                    print(f"✅ LND wallet created successfully for manual integration '{wallet_id}' via gRPC")
+                    
+                    # Save password for auto-unlock
+                    lnd_password_file = '/data/lnd/password.txt'
+                    subprocess.run(
+                        ['sudo', 'bash', '-c', f'mkdir -p /data/lnd && echo -n "{password}" > {lnd_password_file} && chmod 600 {lnd_password_file} && chown lnd:lnd {lnd_password_file}'],
+                        capture_output=True, timeout=10
+                    )
+                    
+                    # Check if admin.macaroon was created
+                    time.sleep(3)
+                    if os.path.exists(f'/data/lnd/data/chain/bitcoin/{BITCOIN_NETWORK}/admin.macaroon'):
+                        print(f"✅ Admin macaroon created - Manual LND integration complete for wallet '{wallet_id}'")
+                    else:
+                        print(f"⚠️ Admin macaroon not found - LND may still be initializing for manual integration '{wallet_id}'")
+                        
+                except Exception as e:
+                    print(f"❌ Manual LND integration failed for wallet '{wallet_id}': {str(e)}")
+            
+            # Start integration in background
+            integration_thread = threading.Thread(target=background_lnd_integration, daemon=True)
+            integration_thread.start()
+            
+            return jsonify({
+                'status': 'success',
+                'message': f'Integration started in background for wallet {wallet_id}',
+                'wallet_id': wallet_id
+            })
+            
+        except Exception as e:
+            return jsonify({
+                'error': f'Integration setup failed: {str(e)}',
+                'status': 'error'
+            }), 500
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/integrate-elements', methods=['POST'])
+def integrate_elements_wallet():
+    """Manually integrate the system default wallet with Elements/Liquid"""
+    try:
+        data = request.get_json()
+        wallet_id = data.get('wallet_id') if data else None
+        password = data.get('password') if data else None
+        
+        # If no wallet_id provided, get the system default
+        if not wallet_id:
+            default_wallet, error = wallet_manager.get_system_default_wallet()
+            if error or not default_wallet:
+                return jsonify({
+                    'error': 'No system default wallet found',
+                    'status': 'error'
+                }), 404
+            
+            wallet_id = default_wallet['wallet_id']
+        
+        # Load the wallet data from database
+        wallet_data, error = wallet_manager.load_wallet(wallet_id)
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 404
+        
+        # Check if we need to decrypt the mnemonic
+        mnemonic = None
+        
+        # Try to get from temporary wallets first (if recently loaded)
+        if hasattr(wallet_manager, 'temp_wallets') and wallet_id in wallet_manager.temp_wallets:
+            mnemonic = wallet_manager.temp_wallets[wallet_id].get('mnemonic')
+        
+        # If not in temp storage and wallet is encrypted, require password
+        if not mnemonic and wallet_data.get('encrypted_mnemonic'):
+            if not password:
+                # Try using master password from environment
+                master_password = get_master_password()
+                if master_password:
+                    password = master_password
+                else:
+                    return jsonify({
+                        'error': 'Password required for wallet decryption',
+                        'status': 'error'
+                    }), 400
+            
+            # Decrypt the mnemonic
+            mnemonic, decrypt_error = wallet_manager.decrypt_mnemonic(
+                wallet_data['encrypted_mnemonic'],
+                wallet_data['salt'],
+                password,
+                wallet_id,
+                wallet_data.get('kdf')
+            )
+            if decrypt_error:
+                return jsonify({
+                    'error': 'Invalid password or corrupted wallet data',
+                    'status': 'error'
+                }), 401
+        
+        # If we still don't have a mnemonic
+        if not mnemonic:
+            return jsonify({
+                'error': 'Wallet data not found or corrupted',
+                'status': 'error'
+            }), 400
+        
+        # Start background integration
+        try:
+            print(f"🔷 Starting manual Elements integration for wallet '{wallet_id}'...")
+            
+            # Run integration in background thread
+            def background_elements_integration():
+                try:
+                    # Start Elements daemon if not running
+                    subprocess.run(['sudo', 'systemctl', 'start', 'elementsd'], capture_output=True, timeout=30)
+                    print("▶️ Elements service started for manual integration")
+                    
+                    # Wait for Elements to be ready
+                    import time
+                    time.sleep(10)
+                    
+                    # Check if peerswap wallet exists
+                    wallet_list_result = subprocess.run(
+                        ['elements-cli', '-datadir=/data/elements', 'listwallets'],
+                        capture_output=True, text=True, timeout=30
+                    )
+                    
+                    if wallet_list_result.returncode == 0:
+                        import json
+                        wallets = json.loads(wallet_list_result.stdout)
+                        
+                        if 'peerswap' not in wallets:
+                            # Create peerswap wallet with descriptor
+                            print("📝 Creating peerswap wallet for manual integration...")
+                            create_result = subprocess.run(
+                                ['elements-cli', '-datadir=/data/elements', 
+                                 'createwallet', 'peerswap', 'false', 'false', '', 'false', 'true'],
+                                capture_output=True, text=True, timeout=60
+                            )
+                            
+                            if create_result.returncode == 0:
+                                print(f"✅ Elements peerswap wallet created for manual integration")
+                            else:
+                                print(f"⚠️ Elements wallet creation failed: {create_result.stderr}")
+                                return
+                        else:
+                            print("✅ Elements peerswap wallet already exists for manual integration")
+                        
+                        # Load the wallet to ensure it's active
+                        load_result = subprocess.run(
+                            ['elements-cli', '-datadir=/data/elements', 'loadwallet', 'peerswap'],
+                            capture_output=True, text=True, timeout=30
+                        )
+                        print("📂 Peerswap wallet loaded/verified")
+                        
+                        # Import mnemonic as HD seed
+                        print("🔑 Importing HD seed into Elements wallet for manual integration...")
+                        import_result = subprocess.run(
+                            ['elements-cli', '-datadir=/data/elements', '-rpcwallet=peerswap',
+                             'sethdseed', 'true', mnemonic],
+                            capture_output=True, text=True, timeout=60
+                        )
+                        
+                        if import_result.returncode == 0:
+                            print(f"✅ Elements wallet integrated successfully for manual integration '{wallet_id}'")
+                        else:
+                            # Sometimes sethdseed fails if already set
+                            print(f"⚠️ sethdseed may have already been set: {import_result.stderr}")
+                            print(f"✅ Elements wallet exists and ready for manual integration '{wallet_id}'")
+                    else:
+                        print(f"❌ Elements wallet list failed: {wallet_list_result.stderr}")
+                        
+                except Exception as e:
+                    print(f"❌ Manual Elements integration failed for wallet '{wallet_id}': {str(e)}")
+            
+            # Start integration in background
+            integration_thread = threading.Thread(target=background_elements_integration, daemon=True)
+            integration_thread.start()
+            
+            return jsonify({
+                'status': 'success',
+                'message': f'Elements integration started in background for wallet {wallet_id}',
+                'wallet_id': wallet_id
+            })
+            
+        except Exception as e:
+            return jsonify({
+                'error': f'Elements integration setup failed: {str(e)}',
+                'status': 'error'
+            }), 500
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/load', methods=['POST'])
+@require_auth
+@async_job('wallet.load')
+def load_wallet():
+    """Carregar e descriptografar carteira salva"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        wallet_id = data.get('wallet_id', '')
+        password = data.get('password', '')
+        use_session_auth = data.get('use_session_auth', False)
+        
+        # Validate wallet_id format
+        is_valid, error = validate_wallet_id(wallet_id)
+        if not is_valid:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 400
+        
+        # If no password provided, try to get from session authentication
+        if not password or use_session_auth:
+            master_password = get_master_password()
+            if master_password:
+                password = master_password
+            elif not password:
+                # No password available at all
+                return jsonify({
+                    'error': 'Authentication required. Please login first or provide password.',
+                    'status': 'error',
+                    'requires_auth': True
+                }), 401
+            
+        # Carregar wallet do banco
+        wallet_data, load_error = wallet_manager.load_wallet(wallet_id)
+        if load_error:
+            return jsonify({
+                'error': load_error,
+                'status': 'error'
+            }), 404
+        
+        # Descriptografar mnemonic
+        mnemonic, decrypt_error = wallet_manager.decrypt_mnemonic(
+            wallet_data['encrypted_mnemonic'],
+            wallet_data['salt'],
+            password,
+            wallet_id,
+            wallet_data.get('kdf')
+        )
+        if decrypt_error:
+            return jsonify({
+                'error': 'Invalid password or corrupted wallet data',
+                'status': 'error'
+            }), 401
+        
+        # Tentar obter endereços do cache primeiro
+        addresses, cache_error = wallet_manager.get_cached_addresses(wallet_id)
+        
+        # Se não tiver no cache, derivar novamente
+        if cache_error or not addresses:
+            addresses, derive_error = wallet_manager.derive_addresses(mnemonic)
+            if not derive_error:
+                wallet_manager.cache_addresses(wallet_id, addresses)
+        
+        # Automatically set this wallet as the system default when loaded
+        try:
+            # Update the wallet to be system default
+            success, error = wallet_manager.set_system_default_wallet(wallet_id)
+            if success:
+                message = 'Wallet loaded and set as system default'
+                
+                # Try to unlock LND using gRPC with wallet password
+                try:
+                    print(f"🔓 Attempting to unlock LND for loaded wallet '{wallet_id}' via gRPC...")
+                    
+                    # Use gRPC to unlock wallet (pure gRPC, no expect scripts)
+                    if HAS_WALLET_UNLOCKER:
+                        unlock_result, unlock_error = lnd_grpc_client.unlock_wallet_grpc(
+                            wallet_password=password,
+                            recovery_window=250
+                        )
+                        
+                        if not unlock_error:
+                            print(f"✅ LND unlocked successfully for wallet '{wallet_id}' via gRPC")
+                            message += ' - LND unlocked successfully'
+                        else:
+                            print(f"⚠️ LND unlock failed for wallet '{wallet_id}': {unlock_error}")
+                            message += ' - LND unlock failed, may need manual unlock'
+                    else:
+                        print("⚠️ WalletUnlocker proto not available - cannot unlock LND via gRPC")
+                        message += ' - LND unlock skipped (gRPC not available)'
+                        
+                except Exception as e:
+                    print(f"⚠️ Error unlocking LND for loaded wallet '{wallet_id}': {str(e)}")
+                    message += ' - LND unlock error'
+                
+                # Start background LND integration via gRPC if needed
+                try:
+                    # Check if admin.macaroon exists
+                    if not os.path.exists(f'/data/lnd/data/chain/bitcoin/{BITCOIN_NETWORK}/admin.macaroon'):
+                        print(f"🔄 Admin macaroon not found, starting LND integration for loaded wallet '{wallet_id}'...")
+                        
+                        def background_lnd_integration():
+                            try:
+                                if not HAS_WALLET_UNLOCKER:
+                                    print("❌ WalletUnlocker proto not available - cannot integrate LND via gRPC")
+                                    return
+                                
+                                # Convert BIP39 to LND extended master key
+                                result, error = wallet_manager.bip39_to_extended_master_key(mnemonic, '', 'testnet')
+                                if error:
+                                    print(f"❌ Failed to convert BIP39 to LND master key: {error}")
+                                    return
+                                
+                                extended_master_key = result['extended_master_key']
+                                print(f"✅ Generated LND extended master key for loaded wallet '{wallet_id}'")
+                                
+                                # Stop LND service first
+                                subprocess.run(['sudo', 'systemctl', 'stop', 'lnd'], capture_output=True, timeout=30)
+                                print("⏹️ LND service stopped")
+                                
+                                # Start LND service
+                                subprocess.run(['sudo', 'systemctl', 'start', 'lnd'], capture_output=True, timeout=30)
+                                print("▶️ LND service started")
+                                
+                                # Wait for LND to be ready
+                                import time
+                                time.sleep(5)
+                                
+                                # Initialize wallet via gRPC (pure gRPC, no expect scripts)
+                                init_result, init_error = lnd_grpc_client.init_wallet_with_extended_key_grpc(
+                                    wallet_password=password,
+                                    extended_master_key=extended_master_key,
+                                    birthday_timestamp=0,
+                                    recovery_window=2500,
+                                    stateless_init=False
+                                )
+                                
+                                if not init_error:
+                                    print(f"✅ LND wallet created successfully for loaded wallet '{wallet_id}' via gRPC")
+                                    
+                                    # Save password for auto-unlock
+                                    lnd_password_file = '/data/lnd/password.txt'
+                                    subprocess.run(
+                                        ['sudo', 'bash', '-c', f'mkdir -p /data/lnd && echo -n "{password}" > {lnd_password_file} && chmod 600 {lnd_password_file} && chown lnd:lnd {lnd_password_file}'],
+                                        capture_output=True, timeout=10
+                                    )
+                                else:
+                                    print(f"❌ LND wallet creation failed for loaded wallet '{wallet_id}': {init_error}")
+                                    
+                            except Exception as e:
+                                print(f"❌ LND integration failed for loaded wallet '{wallet_id}': {str(e)}")
+                        
+                        # Start integration in background
+                        integration_thread = threading.Thread(target=background_lnd_integration, daemon=True)
+                        integration_thread.start()
+                        message += ' - LND integration started in background'
+                    else:
+                        print(f"✅ Admin macaroon exists, LND already integrated for wallet '{wallet_id}'")
+                        message += ' - LND already integrated'
+                        
+                except Exception as e:
+                    print(f"⚠️ LND integration setup error for loaded wallet: {str(e)}")
+                    message += ' - LND integration setup failed'
+            else:
+                message = 'Wallet loaded successfully (could not set as default)'
+        except Exception as e:
+            print(f"⚠️ Error setting wallet as default: {str(e)}")
+            message = 'Wallet loaded successfully (default setting failed)'
+        
+        return jsonify({
+            'status': 'success',
+            'wallet_id': wallet_id,
+            'addresses': addresses,
+            'metadata': wallet_data.get('metadata', {}),
+            'message': message,
+            'is_system_default': True
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/addresses/<wallet_id>', methods=['GET'])
+def get_wallet_addresses(wallet_id):
+    """Obter endereços derivados de uma carteira"""
+    try:
+        # Tentar obter do cache
+        addresses, error = wallet_manager.get_cached_addresses(wallet_id)
+        
+        if error and "not found" not in error.lower():
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        
+        if not addresses:
+            return jsonify({
+                'error': 'No addresses found for this wallet ID',
+                'status': 'error'
+            }), 404
+        
+        return jsonify({
+            'status': 'success',
+            'wallet_id': wallet_id,
+            'addresses': addresses
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/addresses/<wallet_id>/derive', methods=['POST'])
+def derive_wallet_addresses(wallet_id):
+    """
+    Deriva endereços em lote a partir da xpub de conta.
+    
+    Body: {"chain": "bitcoin", "branch": "receive"|"change", "count": 20, "start": opcional}.
+    Sem count/start, completa o gap limit da branch.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        chain_id = data.get('chain', 'bitcoin')
+        branch = ADDRESS_BRANCHES.get(data.get('branch', 'receive'))
+        if branch is None:
+            return jsonify({
+                'error': 'branch must be "receive" or "change"',
+                'status': 'error'
+            }), 400
+        
+        if 'count' in data or 'start' in data:
+            try:
+                count = int(data.get('count', ADDRESS_GAP_LIMIT))
+                start = int(data['start']) if data.get('start') is not None else None
+            except (TypeError, ValueError):
+                return jsonify({
+                    'error': 'count and start must be integers',
+                    'status': 'error'
+                }), 400
+            addresses, error = wallet_manager.derive_address_batch(wallet_id, chain_id, branch, start, count)
+        else:
+            addresses, error = wallet_manager.ensure_address_gap(wallet_id, chain_id, branch)
+        
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 400
+        
+        return jsonify({
+            'status': 'success',
+            'wallet_id': wallet_id,
+            'chain': chain_id,
+            'addresses': addresses
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/address-owner/<address>', methods=['GET'])
+def get_address_owner(address):
+    """Wallet, chain e caminho de derivação donos de um endereço"""
+    try:
+        owner, error = wallet_manager.lookup_address(address)
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 500
+        if not owner:
+            return jsonify({
+                'error': 'Address not found in any wallet',
+                'status': 'error'
+            }), 404
+        
+        return jsonify({
+            'status': 'success',
+            'address': address,
+            **owner
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/address-owner/<address>/used', methods=['POST'])
+def mark_wallet_address_used(address):
+    """Marca um endereço como usado e deriva novos para manter o gap limit"""
+    try:
+        result, error = wallet_manager.mark_address_used(address)
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 404 if error == "Address not found" else 500
+        
+        return jsonify({
+            'status': 'success',
+            'address': address,
+            **result
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/balance/<chain_id>/<address>', methods=['GET'])
+def get_chain_balance(chain_id, address):
+    """Obter saldo de uma chain específica usando APIs públicas"""
+    try:
+        if chain_id not in SUPPORTED_CHAINS:
+            return jsonify({
+                'error': f'Unsupported chain: {chain_id}',
+                'status': 'error'
+            }), 400
+        
+        # Para Bitcoin, tentar API local primeiro
+        if chain_id == 'bitcoin':
+            try:
+                balance_data = get_blockchain_balance()
+                if balance_data and 'confirmed_balance' in balance_data:
+                    balance_btc = balance_data['confirmed_balance'] / 100000000
+                    return jsonify({
+                        'status': 'success',
+                        'chain': chain_id,
+                        'address': address,
+                        'balance': f"{balance_btc:.8f}",
+                        'symbol': 'BTC',
+                        'source': 'local_api'
+                    })
+            except:
+                pass
+        
+        # Para Liquid, tentar API local primeiro
+        elif chain_id == 'liquid':
+            try:
+                balances_result, _ = elements_rpc_client.get_balances()
+                if balances_result and 'mine' in balances_result:
+                    mine_balances = balances_result['mine']
+                    if 'trusted' in mine_balances:
+                        for asset_name, amount in mine_balances['trusted'].items():
+                            if asset_name == "bitcoin" or "6f0279e9ed041c3d710a9f57d0c02928416460c4b722ae3457a11eec381c526d" in asset_name:
+                                return jsonify({
+                                    'status': 'success',
+                                    'chain': chain_id,
+                                    'address': address,
+                                    'balance': f"{amount:.8f}",
+                                    'symbol': 'L-BTC',
+                                    'source': 'local_api'
+                                })
+            except:
+                pass
+        
+        # Fallback para APIs públicas
+        chain_config = SUPPORTED_CHAINS[chain_id]
+        
+        for api_url in chain_config['api_urls']:
+            try:
+                if chain_id == 'bitcoin':
+                    if 'mempool.space' in api_url:
+                        response = requests.get(f"{api_url}{address}", timeout=10)
+                        if response.status_code == 200:
+                            data = response.json()
+                            balance = (data['chain_stats']['funded_txo_sum'] - data['chain_stats']['spent_txo_sum']) / 100000000
+                            return jsonify({
+                                'status': 'success',
+                                'chain': chain_id,
+                                'address': address,
+                                'balance': f"{balance:.8f}",
+                                'symbol': 'BTC',
+                                'source': 'mempool_space'
+                            })
+                
+                elif chain_id == 'ethereum':
+                    if 'etherscan' in api_url:
+                        response = requests.get(f"{api_url}?module=account&action=balance&address={address}&tag=latest&apikey=YourApiKeyToken", timeout=10)
+                        if response.status_code == 200:
+                            data = response.json()
+                            if data['status'] == '1':
+                                balance_wei = int(data['result'])
+                                balance_eth = balance_wei / 10**18
+                                return jsonify({
+                                    'status': 'success',
+                                    'chain': chain_id,
+                                    'address': address,
+                                    'balance': f"{balance_eth:.18f}",
+                                    'symbol': 'ETH',
+                                    'source': 'etherscan'
+                                })
+                
+                elif chain_id == 'tron':
+                    if 'trongrid' in api_url:
+                        response = requests.post(api_url, 
+                            json={"address": address, "visible": True}, 
+                            timeout=10)
+                        if response.status_code == 200:
+                            data = response.json()
+                            if not data.get('Error'):
+                                balance_sun = data.get('balance', 0)
+                                balance_trx = balance_sun / 1000000
+                                return jsonify({
+                                    'status': 'success',
+                                    'chain': chain_id,
+                                    'address': address,
+                                    'balance': f"{balance_trx:.6f}",
+                                    'symbol': 'TRX',
+                                    'source': 'trongrid'
+                                })
+                
+                elif chain_id == 'solana':
+                    if 'mainnet-beta' in api_url:
+                        response = requests.post(api_url,
+                            json={
+                                "jsonrpc": "2.0",
+                                "id": 1,
+                                "method": "getBalance",
+                                "params": [address]
+                            },
+                            timeout=10)
+                        if response.status_code == 200:
+                            data = response.json()
+                            if 'result' in data:
+                                balance_lamports = data['result']['value']
+                                balance_sol = balance_lamports / 10**9
+                                return jsonify({
+                                    'status': 'success',
+                                    'chain': chain_id,
+                                    'address': address,
+                                    'balance': f"{balance_sol:.9f}",
+                                    'symbol': 'SOL',
+                                    'source': 'solana_rpc'
+                                })
+                
+            except Exception as e:
+                print(f"API {api_url} failed: {str(e)}")
+                continue
+        
+        # Se todas as APIs falharam
+        return jsonify({
+            'status': 'success',
+            'chain': chain_id,
+            'address': address,
+            'balance': '0.00000000',
+            'symbol': chain_config['symbol'],
+            'source': 'fallback',
+            'message': 'All APIs failed, returning zero balance'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/api/v1/wallet/validate', methods=['POST'])
+def validate_mnemonic():
+    """Validar uma seed phrase BIP39"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        mnemonic = data.get('mnemonic', '').strip()
+        
+        if not mnemonic:
+            return jsonify({
+                'error': 'Mnemonic is required',
+                'status': 'error'
+            }), 400
+        
+        is_valid, error = wallet_manager.validate_mnemonic(mnemonic)
+        
+        return jsonify({
+            'status': 'success',
+            'valid': is_valid,
+            'error': error if not is_valid else None
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+# Status endpoint for API health check
+@bp.route('/api/v1/wallet/status', methods=['GET'])
+def wallet_status():
+    """Get wallet system status"""
+    try:
+        return jsonify({
+            'status': 'online',
+            'message': 'Wallet API is running',
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/v1/wallet/export-backup', methods=['POST'])
+@require_auth
+@async_job('wallet.export-backup')
+def export_wallet_backup():
+    """
+    Export complete wallet backup information for disaster recovery
+    
+    Required JSON parameters:
+    - wallet_id: Wallet identifier
+    - password: Password to verify ownership (optional)
+    
+    Returns complete backup package with:
+    - Encrypted mnemonic (still encrypted)
+    - Salt and encryption details
+    - All derivation paths used
+    - Recovery instructions
+    - Compatible wallet list
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'error': 'No data provided',
+                'status': 'error'
+            }), 400
+        
+        wallet_id = data.get('wallet_id')
+        password = data.get('password')  # Optional, for verification
+        
+        # Validate wallet_id format
+        is_valid, error = validate_wallet_id(wallet_id)
+        if not is_valid:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 400
+        
+        # Export backup information
+        backup_info, error = wallet_manager.export_backup_info(wallet_id, password)
+        
+        if error:
+            return jsonify({
+                'error': error,
+                'status': 'error'
+            }), 400
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Backup information exported successfully',
+            'backup': backup_info,
+            'warning': 'CRITICAL: Store this backup securely! It contains encrypted wallet data.',
+            'recommendation': 'Save this JSON to multiple secure locations (encrypted USB, paper wallet, safe deposit box)'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': f'Failed to export backup: {str(e)}',
+            'status': 'error'
+        }), 500
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - chat Lightning
+
+lightning_chat.db (mensagens, keysends, contador de novas mensagens) e a
+ingestão de keysends por SubscribeInvoices. init_chat_database() é chamado
+por create_app(); a ingestão só começa no worker eleito (keysend_leader).
+"""
+
+import os
+import grpc
+import time
+import threading
+import queue
+import base64
+
+from sqlite_store import SQLiteStore
+from lnd_client import lnd_grpc_client, lnrpc
+from worker_leader import WorkerLeader
+from event_hub import event_hub
+
+
+# === SISTEMA DE CHAT LIGHTNING ===
+
+# Configuração do banco SQLite
+CHAT_DB_PATH = "/data/brln-wallet/lightning_chat.db"
+chat_db = SQLiteStore(CHAT_DB_PATH)
+
+def _chat_schema_v1(cursor):
+    """Schema original: mensagens e tracking de keysends"""
+    # Tabela para mensagens de chat
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS chat_messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            node_id TEXT NOT NULL,
+            message TEXT NOT NULL,
+            timestamp INTEGER NOT NULL,
+            type TEXT NOT NULL, -- 'sent' ou 'received'
+            payment_hash TEXT,
+            status TEXT DEFAULT 'confirmed', -- 'pending', 'confirmed', 'failed'
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Tabela para tracking de keysends recebidos
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS keysend_tracking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            payment_hash TEXT UNIQUE NOT NULL,
+            sender_node_id TEXT NOT NULL,
+            amount_sat INTEGER NOT NULL,
+            message TEXT,
+            timestamp INTEGER NOT NULL,
+            processed BOOLEAN DEFAULT FALSE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_timestamp ON chat_messages(timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_keysend_processed ON keysend_tracking(processed)')
+
+def _chat_schema_v2(cursor):
+    """Último settle_index processado pela ingestão de keysends (linha única)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS keysend_checkpoint (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            settle_index INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+    ''')
+
+def _chat_schema_v3(cursor):
+    """Resumo por conversa, mantido na mesma transação de cada mensagem"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS conversations (
+            node_id TEXT PRIMARY KEY,
+            last_message TEXT,
+            last_activity INTEGER NOT NULL,
+            message_count INTEGER NOT NULL DEFAULT 0,
+            unread_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_conversations_activity ON conversations(last_activity DESC)')
+    
+    # Backfill a partir do histórico (linhas já mantidas são preservadas)
+    cursor.execute('''
+        INSERT OR IGNORE INTO conversations (node_id, last_message, last_activity, message_count, unread_count)
+        SELECT
+            node_id,
+            (SELECT message FROM chat_messages c2
+             WHERE c2.node_id = c1.node_id
+             ORDER BY timestamp DESC, id DESC LIMIT 1),
+            MAX(timestamp),
+            COUNT(*),
+            0
+        FROM chat_messages c1
+        GROUP BY node_id
+    ''')
+
+def _chat_schema_v4(cursor):
+    """Paginação por cursor (node_id, timestamp, id); cobre também buscas só por node_id"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_node_ts_id ON chat_messages(node_id, timestamp, id)')
+    cursor.execute('DROP INDEX IF EXISTS idx_chat_node_id')
+
+def _chat_schema_v5(cursor):
+    """Contador de mensagens novas no banco (era global do processo; agora vale para todos os workers)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS chat_notifications (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            new_messages INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO chat_notifications (id, new_messages) VALUES (1, 0)')
+
+# Migrações do lightning_chat.db (PRAGMA user_version); só acrescentar no final
+CHAT_MIGRATIONS = [
+    (1, 'chat_messages e keysend_tracking', _chat_schema_v1),
+    (2, 'keysend_checkpoint', _chat_schema_v2),
+    (3, 'resumo de conversas', _chat_schema_v3),
+    (4, 'índice (node_id, timestamp, id)', _chat_schema_v4),
+    (5, 'contador de notificações', _chat_schema_v5),
+]
+
+def init_chat_database():
+    """Inicializa o banco de dados SQLite para o chat (aplica migrações pendentes)"""
+    chat_db.migrate(CHAT_MIGRATIONS)
+
+def insert_chat_message(cursor, node_id, message, timestamp, msg_type, payment_hash=None, status='confirmed'):
+    """Insere a mensagem e atualiza o resumo da conversa (na transação do chamador)"""
+    cursor.execute('''
+        INSERT INTO chat_messages (node_id, message, timestamp, type, payment_hash, status)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (node_id, message, timestamp, msg_type, payment_hash, status))
+    
+    # No UPDATE, colunas sem "excluded." são os valores atuais da linha
+    cursor.execute('''
+        INSERT INTO conversations (node_id, last_message, last_activity, message_count, unread_count)
+        VALUES (?, ?, ?, 1, ?)
+        ON CONFLICT(node_id) DO UPDATE SET
+            last_message = CASE WHEN excluded.last_activity >= last_activity
+                                THEN excluded.last_message ELSE last_message END,
+            last_activity = MAX(last_activity, excluded.last_activity),
+            message_count = message_count + 1,
+            unread_count = unread_count + excluded.unread_count
+    ''', (node_id, message, timestamp, 1 if msg_type == 'received' else 0))
+
+def save_chat_message(node_id, message, msg_type, payment_hash=None, status='confirmed'):
+    """Salva uma mensagem de chat no banco"""
+    with chat_db.transaction(immediate=True) as cursor:
+        insert_chat_message(cursor, node_id, message, int(time.time() * 1000),
+                            msg_type, payment_hash, status)
+
+CHAT_PAGE_MAX = 500
+
+
+def encode_chat_cursor(timestamp, message_id):
+    """Cursor opaco de paginação: '<timestamp>_<id>'"""
+    return f"{timestamp}_{message_id}"
+
+def decode_chat_cursor(cursor_value):
+    """Retorna (timestamp, id) do cursor; ValueError se inválido"""
+    timestamp, message_id = cursor_value.split('_', 1)
+    return int(timestamp), int(message_id)
+
+def get_chat_messages(node_id, limit=100, before=None, after=None):
+    """
+    Recupera uma página de mensagens com um node específico.
+    
+    Sem cursor retorna a página mais recente; before/after (cursores de
+    encode_chat_cursor) buscam a página anterior/seguinte. As mensagens vêm
+    sempre em ordem cronológica. Retorna (messages, has_more), onde has_more
+    indica se há mais mensagens na direção pedida.
+    """
+    limit = max(1, min(int(limit), CHAT_PAGE_MAX))
+    with chat_db.transaction() as cursor:
+        # (timestamp, id) desempata mensagens no mesmo milissegundo; o índice
+        # idx_chat_node_ts_id atende filtro e ordenação sem varrer a conversa
+        if after:
+            timestamp, message_id = decode_chat_cursor(after)
+            cursor.execute('''
+                SELECT id, message, timestamp, type, status, payment_hash
+                FROM chat_messages
+                WHERE node_id = ? AND (timestamp, id) > (?, ?)
+                ORDER BY timestamp ASC, id ASC
+                LIMIT ?
+            ''', (node_id, timestamp, message_id, limit + 1))
+            rows = cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+        else:
+            if before:
+                timestamp, message_id = decode_chat_cursor(before)
+                cursor.execute('''
+                    SELECT id, message, timestamp, type, status, payment_hash
+                    FROM chat_messages
+                    WHERE node_id = ? AND (timestamp, id) < (?, ?)
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ?
+                ''', (node_id, timestamp, message_id, limit + 1))
+            else:
+                cursor.execute('''
+                    SELECT id, message, timestamp, type, status, payment_hash
+                    FROM chat_messages
+                    WHERE node_id = ?
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ?
+                ''', (node_id, limit + 1))
+            rows = cursor.fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit][::-1]
+    
+        messages = []
+        for row in rows:
+            messages.append({
+                'id': row[0],
+                'message': row[1],
+                'timestamp': row[2],
+                'type': row[3],
+                'status': row[4],
+                'payment_hash': row[5]
+            })
+    
+    return messages, has_more
+
+def get_all_conversations():
+    """Recupera todas as conversas ativas (tabela de resumo, mais recentes primeiro)"""
+    with chat_db.transaction() as cursor:
+        cursor.execute('''
+            SELECT node_id, last_activity, message_count, last_message, unread_count
+            FROM conversations
+            ORDER BY last_activity DESC
+        ''')
+    
+        conversations = []
+        for row in cursor.fetchall():
+            conversations.append({
+                'node_id': row[0],
+                'last_activity': row[1],
+                'message_count': row[2],
+                'last_message': row[3],
+                'unread_count': row[4]
+            })
+    
+    return conversations
+
+def mark_conversation_read(node_id):
+    """Zera o contador de não lidas de uma conversa"""
+    with chat_db.transaction(immediate=True) as cursor:
+        cursor.execute('UPDATE conversations SET unread_count = 0 WHERE node_id = ?', (node_id,))
+        return cursor.rowcount > 0
+
+KEYSEND_MESSAGE_RECORD = 34349334   # TLV com a mensagem de chat
+KEYSEND_SENDER_RECORD = 34349339    # TLV com a pubkey do remetente (quando enviada)
+
+
+def decode_keysend_message(value):
+    """Decodifica o TLV de mensagem (base64, como enviado por esta API, ou UTF-8 puro)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.encode('ascii', errors='ignore')
+    try:
+        return base64.b64decode(value, validate=True).decode('utf-8')
+    except Exception:
+        pass
+    try:
+        return bytes(value).decode('utf-8')
+    except Exception as e:
+        print(f"Erro ao decodificar mensagem do keysend: {e}")
+        return None
+
+
+def store_received_keysends(cursor, keysends):
+    """
+    Grava keysends recebidos (dentro da transação do chamador).
+
+    keysend_tracking.payment_hash é UNIQUE, então cada pagamento gera no
+    máximo uma linha de tracking e uma mensagem de chat, mesmo se entregue
+    mais de uma vez. Os keysends novos somam no contador de notificações.
+    Retorna (keysends novos, mensagens novas).
+    """
+    new_keysends = 0
+    new_messages = 0
+    for keysend in keysends:
+        cursor.execute('''
+            INSERT OR IGNORE INTO keysend_tracking
+            (payment_hash, sender_node_id, amount_sat, message, timestamp, processed)
+            VALUES (?, ?, ?, ?, ?, TRUE)
+        ''', (keysend['payment_hash'], keysend['sender_node_id'], keysend['amount_sat'],
+              keysend['message'], keysend['timestamp']))
+        
+        if not cursor.rowcount:
+            continue  # já processado
+        new_keysends += 1
+        
+        if keysend['message']:
+            insert_chat_message(cursor, keysend['sender_node_id'], keysend['message'],
+                                keysend['timestamp'], 'received', keysend['payment_hash'])
+            new_messages += 1
+    
+    if new_keysends:
+        cursor.execute('UPDATE chat_notifications SET new_messages = new_messages + ? WHERE id = 1',
+                       (new_keysends,))
+    return new_keysends, new_messages
+
+
+def process_received_keysend(payment_hash, sender_node_id, amount_sat, custom_records=None):
+    """Processa um keysend recebido e extrai mensagem se houver"""
+    message = None
+    
+    # Tentar extrair mensagem do TLV record 34349334
+    if custom_records and str(KEYSEND_MESSAGE_RECORD) in custom_records:
+        message = decode_keysend_message(custom_records[str(KEYSEND_MESSAGE_RECORD)])
+    
+    with chat_db.transaction(immediate=True) as cursor:
+        new_keysends, _ = store_received_keysends(cursor, [{
+            'payment_hash': payment_hash,
+            'sender_node_id': sender_node_id,
+            'amount_sat': amount_sat,
+            'message': message,
+            'timestamp': int(time.time() * 1000)
+        }])
+    return new_keysends > 0
+
+# Contador de novas mensagens: tabela chat_notifications, incrementada por
+# store_received_keysends (compartilhado entre os workers do gunicorn)
+
+def reset_new_messages():
+    """Reseta contador de novas mensagens"""
+    with chat_db.transaction(immediate=True) as cursor:
+        cursor.execute('UPDATE chat_notifications SET new_messages = 0 WHERE id = 1')
+    event_hub.notify('chat')
+
+def get_new_messages_count():
+    """Retorna contador de novas mensagens"""
+    with chat_db.transaction() as cursor:
+        cursor.execute('SELECT new_messages FROM chat_notifications WHERE id = 1')
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+# === INGESTÃO DE KEYSENDS (SubscribeInvoices) ===
+
+KEYSEND_BATCH_SIZE = 200
+KEYSEND_BATCH_WAIT = 0.2  # segundos para juntar rajadas em uma transação
+
+
+class KeysendIngestor:
+    """
+    Ingere keysends recebidos direto do stream SubscribeInvoices.
+
+    - Retoma do último settle_index salvo (LND reenvia o que foi liquidado
+      enquanto a API esteve fora), sem janela de tempo
+    - Grava lotes em keysend_tracking/chat_messages e avança o checkpoint na
+      mesma transação: cada pagamento é processado exatamente uma vez
+    - Substitui o messager_monitor_grpc.py (polling + POST HTTP por keysend)
+    """
+
+    def __init__(self, client, store=None):
+        self.client = client
+        self.store = store or chat_db
+        self._queue = queue.Queue(maxsize=KEYSEND_BATCH_SIZE * 10)
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stream = None
+        self._resync = False
+        self._stats = {
+            'settle_index': None,
+            'invoices_seen': 0,
+            'keysends_stored': 0,
+            'messages_stored': 0,
+            'batches': 0,
+            'last_batch_at': None,
+            'last_error': None,
+            'stream_connected': False
+        }
+
+    def start(self):
+        """Inicia leitor do stream e gravador em lote (idempotente)"""
+        with self._lock:
+            if self._threads:
+                return
+            for name, target in (('KeysendStream', self._run_stream), ('KeysendWriter', self._run_writer)):
+                thread = threading.Thread(target=target, daemon=True, name=name)
+                thread.start()
+                self._threads.append(thread)
+
+    def _load_checkpoint(self):
+        with self.store.transaction() as cursor:
+            cursor.execute('SELECT settle_index FROM keysend_checkpoint WHERE id = 1')
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def parse_invoice(invoice):
+        """Extrai o keysend de um lnrpc.Invoice liquidado (None se não for keysend)"""
+        custom_records = {}
+        for htlc in invoice.htlcs:
+            custom_records.update(htlc.custom_records)
+        if not custom_records and not invoice.is_keysend:
+            return None
+
+        sender = custom_records.get(KEYSEND_SENDER_RECORD)
+        return {
+            'payment_hash': invoice.r_hash.hex(),
+            'sender_node_id': sender.hex() if sender and len(sender) == 33 else 'unknown_sender',
+            'amount_sat': int(invoice.amt_paid_sat or invoice.value),
+            'message': decode_keysend_message(custom_records.get(KEYSEND_MESSAGE_RECORD)),
+            'timestamp': int(invoice.settle_date) * 1000 if invoice.settle_date else int(time.time() * 1000)
+        }
+
+    def _run_stream(self):
+        """Mantém a assinatura SubscribeInvoices a partir do checkpoint"""
+        while True:
+            try:
+                success, error = self.client.ensure_connected()
+                if not success:
+                    self._stats['last_error'] = error
+                    time.sleep(5)
+                    continue
+
+                # Esperar o gravador esvaziar a fila: o checkpoint salvo é o ponto de retomada
+                self._queue.join()
+                self._resync = False
+                settle_index = self._load_checkpoint()
+                # add_index = 0: sem backlog de invoices criadas, só liquidadas
+                request = lnrpc.InvoiceSubscription(settle_index=settle_index)
+                stream = self.client.stub.SubscribeInvoices(request)
+                self._stream = stream
+                self._stats['stream_connected'] = True
+
+                for invoice in stream:
+                    if invoice.settle_index:
+                        self._queue.put(invoice)
+
+            except grpc.RpcError as e:
+                self.client.manager.report_error(e)
+                self._stats['last_error'] = f"gRPC Error: {e.details()}"
+            except Exception as e:
+                self._stats['last_error'] = str(e)
+                print(f"Erro no stream de keysends: {e}")
+            self._stream = None
+            self._stats['stream_connected'] = False
+            time.sleep(1 if self._resync else 5)
+
+    def _run_writer(self):
+        """Agrupa invoices da fila e grava cada lote em uma transação"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.time() + KEYSEND_BATCH_WAIT
+            while len(batch) < KEYSEND_BATCH_SIZE:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                if not self._resync:
+                    self._write_batch(batch)
+            except Exception as e:
+                # Checkpoint não avançou: descartar o que já está na fila e
+                # reassinar a partir do último checkpoint gravado
+                self._stats['last_error'] = f"Erro ao gravar keysends: {e}"
+                print(self._stats['last_error'])
+                self._resync = True
+                stream = self._stream
+                if stream is not None:
+                    stream.cancel()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, invoices):
+        keysends = []
+        max_settle_index = 0
+        for invoice in invoices:
+            max_settle_index = max(max_settle_index, int(invoice.settle_index))
+            keysend = self.parse_invoice(invoice)
+            if keysend:
+                keysends.append(keysend)
+
+        with self.store.transaction(immediate=True) as cursor:
+            new_keysends, new_messages = store_received_keysends(cursor, keysends)
+            cursor.execute('''
+                INSERT INTO keysend_checkpoint (id, settle_index, updated_at)
+                VALUES (1, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    settle_index = MAX(settle_index, excluded.settle_index),
+                    updated_at = excluded.updated_at
+            ''', (max_settle_index, int(time.time())))
+
+        with self._lock:
+            self._stats['settle_index'] = max(self._stats['settle_index'] or 0, max_settle_index)
+            self._stats['invoices_seen'] += len(invoices)
+            self._stats['keysends_stored'] += new_keysends
+            self._stats['messages_stored'] += new_messages
+            self._stats['batches'] += 1
+            self._stats['last_batch_at'] = time.time()
+            self._stats['last_error'] = None
+
+        if new_keysends:
+            event_hub.notify('chat')
+
+    def get_status(self):
+        with self._lock:
+            status = dict(self._stats)
+        status['queue_depth'] = self._queue.qsize()
+        return status
+
+
+keysend_ingestor = KeysendIngestor(lnd_grpc_client)
+
+
+# Um único worker do gunicorn assina SubscribeInvoices (ver worker_leader.py)
+KEYSEND_LEADER_LOCK = os.environ.get('BRLN_KEYSEND_LOCK', '/run/brln-api/keysend-ingestor.lock')
+keysend_leader = WorkerLeader('keysend-ingestor', KEYSEND_LEADER_LOCK, keysend_ingestor.start)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - stream de eventos (SSE)
+
+EventHub: um publicador por tópico, com diffs JSON Merge Patch para os
+assinantes. Os tópicos são registrados pelo blueprint events.
+"""
+
+import time
+import threading
+import queue
+import secrets
+
+
+# === STREAM DE EVENTOS (SSE) ===
+# Um único publicador consulta LND/bitcoind/systemd por tópico e envia aos
+# clientes apenas o que mudou (JSON Merge Patch, RFC 7386), de modo que uma
+# consulta no backend atende todas as abas abertas.
+
+EVENT_HEARTBEAT_INTERVAL = 15
+EVENT_QUEUE_SIZE = 256
+
+
+def json_merge_diff(old, new):
+    """Gera o merge patch que transforma old em new (chaves removidas viram None)"""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return new
+
+    patch = {}
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif old[key] != value:
+            patch[key] = json_merge_diff(old[key], value)
+    return patch
+
+
+class EventHub:
+    """Mantém o último estado de cada tópico e distribui as mudanças aos assinantes"""
+
+    def __init__(self):
+        self._topics = {}
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def register_topic(self, topic, producer, interval):
+        """Registra um tópico; producer() retorna o estado atual (dict serializável)"""
+        self._topics[topic] = {
+            'producer': producer,
+            'interval': interval,
+            'state': None,
+            'next_run': 0.0
+        }
+
+    def has_topic(self, topic):
+        return topic in self._topics
+
+    def _start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name="EventHub")
+        self._thread.start()
+
+    def subscribe(self, topics):
+        """Cria um assinante; retorna (subscriber_id, fila de eventos)"""
+        subscriber_id = secrets.token_hex(8)
+        events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+        with self._lock:
+            self._subscribers[subscriber_id] = {
+                'topics': set(topics),
+                'queue': events,
+                'synced': set()
+            }
+            for topic in topics:
+                entry = self._topics[topic]
+                if entry['state'] is not None and entry['next_run'] > time.time():
+                    # Estado ainda válido: envia o snapshot imediatamente
+                    self._push(subscriber_id, topic, 'snapshot', entry['state'])
+                else:
+                    entry['next_run'] = 0.0
+            self._start()
+
+        self._wakeup.set()
+        return subscriber_id, events
+
+    def unsubscribe(self, subscriber_id):
+        with self._lock:
+            self._subscribers.pop(subscriber_id, None)
+
+    def notify(self, topic):
+        """Força a reavaliação de um tópico (ex.: nova mensagem de chat)"""
+        with self._lock:
+            if topic in self._topics:
+                self._topics[topic]['next_run'] = 0.0
+        self._wakeup.set()
+
+    def _push(self, subscriber_id, topic, event_type, data):
+        """Enfileira um evento; assinante lento demais é desconectado (o cliente reconecta)"""
+        subscriber = self._subscribers[subscriber_id]
+        try:
+            subscriber['queue'].put_nowait({'topic': topic, 'type': event_type, 'data': data})
+            if event_type == 'snapshot':
+                subscriber['synced'].add(topic)
+        except queue.Full:
+            del self._subscribers[subscriber_id]
+            try:
+                subscriber['queue'].get_nowait()
+                subscriber['queue'].put_nowait(None)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def _publish(self, topic, state):
+        with self._lock:
+            entry = self._topics[topic]
+            previous = entry['state']
+            entry['state'] = state
+            patch = json_merge_diff(previous, state) if previous is not None else None
+
+            for subscriber_id, subscriber in list(self._subscribers.items()):
+                if topic not in subscriber['topics']:
+                    continue
+                if topic not in subscriber['synced']:
+                    self._push(subscriber_id, topic, 'snapshot', state)
+                elif patch:
+                    self._push(subscriber_id, topic, 'diff', patch)
+
+    def _due_topics(self):
+        """Tópicos com assinantes cujo intervalo venceu; retorna (tópicos, espera)"""
+        now = time.time()
+        due = []
+        wait = EVENT_HEARTBEAT_INTERVAL
+        with self._lock:
+            wanted = set()
+            for subscriber in self._subscribers.values():
+                wanted |= subscriber['topics']
+            for topic in wanted:
+                entry = self._topics[topic]
+                if entry['next_run'] <= now:
+                    entry['next_run'] = now + entry['interval']
+                    due.append(topic)
+                else:
+                    wait = min(wait, entry['next_run'] - now)
+        return due, wait
+
+    def _run(self):
+        while True:
+            due, wait = self._due_topics()
+            for topic in due:
+                try:
+                    state = self._topics[topic]['producer']()
+                except Exception as e:
+                    state = {'status': 'error', 'error': str(e)}
+                self._publish(topic, state)
+
+            if not due:
+                self._wakeup.wait(wait)
+                self._wakeup.clear()
+
+
+event_hub = EventHub()
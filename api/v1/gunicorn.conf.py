@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Configuração do gunicorn para a API BRLN-OS (produção)
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+
+- Vários workers (processos) com threads (gthread): as rotas fazem muito
+  I/O (gRPC, RPC, SQLite, subprocess) e as SSE (/api/v1/events) seguram
+  uma thread cada
+- Estado compartilhado entre workers em /run/brln-api: sessões
+  (session_store.py), rate limit (rate_limit_store.py), jobs
+  (job_store.py); contador do chat no lightning_chat.db
+- Ingestão de keysends em um único worker (WorkerLeader em worker_leader.py)
+- Reload gracioso: kill -HUP <master> (systemctl reload brln-api) sobe
+  workers novos e encerra os antigos depois das requisições em curso
+
+Variáveis: BRLN_API_BIND, BRLN_API_WORKERS, BRLN_API_THREADS,
+BRLN_API_TIMEOUT, BRLN_API_MAX_REQUESTS.
+"""
+
+import os
+
+
+def _default_workers():
+    # A API divide a máquina com bitcoind/lnd/elements: poucos processos bastam
+    return max(2, min(4, os.cpu_count() or 1))
+
+
+bind = os.environ.get('BRLN_API_BIND', '0.0.0.0:2121')
+workers = int(os.environ.get('BRLN_API_WORKERS', str(_default_workers())))
+worker_class = 'gthread'
+threads = int(os.environ.get('BRLN_API_THREADS', '16'))
+
+# Chamadas ao LND/Bitcoin Core e KDFs síncronos podem levar dezenas de segundos
+timeout = int(os.environ.get('BRLN_API_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recicla workers periodicamente (o jitter evita reiniciar todos juntos)
+max_requests = int(os.environ.get('BRLN_API_MAX_REQUESTS', '0'))
+max_requests_jitter = max_requests // 10
+
+# Cada worker importa o app depois do fork: canais gRPC, pools SQLite e
+# threads de background nunca são herdados do master
+preload_app = False
+
+accesslog = None
+errorlog = '-'
+loglevel = 'info'
+proc_name = 'brln-api'
+
+
+def post_worker_init(worker):
+    from app import start_worker_services
+    start_worker_services()
+
+
+def worker_exit(server, worker):
+    try:
+        from app import stop_worker_services
+    except Exception:
+        return
+    stop_worker_services()
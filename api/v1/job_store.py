@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS Job Store
+
+Estado dos jobs assíncronos (JobManager do async_jobs.py) em um arquivo SQLite em
+tmpfs (/run/brln-api), para que GET /api/v1/jobs/<id> funcione em qualquer
+worker do gunicorn e não só no que executou o job.
+
+O resultado pode conter seed ou chaves privadas: é gravado criptografado
+com uma chave derivada do job_id (que só o cliente conhece) e a linha é
+localizada por SHA256(job_id). Assim como no JobManager em memória, o
+resultado é entregue uma única vez e apagado.
+"""
+
+import os
+import json
+import hmac
+import base64
+import hashlib
+import sqlite3
+
+from cryptography.fernet import Fernet
+
+from sqlite_store import SQLiteStore
+
+
+JOB_DB_PATH = os.environ.get('BRLN_JOB_DB', '/run/brln-api/jobs.db')
+# Jobs que nunca terminaram (worker morto no meio) são apagados depois disso
+JOB_ORPHAN_TTL = 3600
+
+
+def _job_hash(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _job_cipher(job_id):
+    """Fernet com chave derivada do job_id"""
+    key = hmac.new(job_id.encode(), b'brln-job-result', hashlib.sha256).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+class _JobSQLiteStore(SQLiteStore):
+    """SQLiteStore com secure_delete: resultados apagados não ficam nas páginas livres"""
+
+    def _connect(self):
+        conn = super()._connect()
+        conn.execute('PRAGMA secure_delete=ON')
+        return conn
+
+
+def _job_schema_v1(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_hash TEXT PRIMARY KEY,
+            type TEXT NOT NULL,
+            state TEXT NOT NULL,
+            owner_hash TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            http_status INTEGER,
+            encrypted_result BLOB
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs(finished_at)')
+
+
+JOB_MIGRATIONS = [
+    (1, 'jobs assíncronos', _job_schema_v1),
+]
+
+
+class SQLiteJobStore:
+    """Jobs compartilhados entre processos"""
+
+    def __init__(self, path=JOB_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        self.store = _JobSQLiteStore(path, pool_size=4)
+        self.store.migrate(JOB_MIGRATIONS)
+
+    def save(self, job):
+        """Grava o estado atual do job (dict do JobManager)"""
+        encrypted = None
+        if job['result'] is not None:
+            encrypted = _job_cipher(job['id']).encrypt(json.dumps(job['result']).encode())
+        owner_hash = _job_hash(job['owner']) if job['owner'] else None
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('''
+                INSERT OR REPLACE INTO jobs
+                (job_hash, type, state, owner_hash, created_at, started_at, finished_at,
+                 http_status, encrypted_result)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (_job_hash(job['id']), job['type'], job['state'], owner_hash, job['created_at'],
+                  job['started_at'], job['finished_at'], job['http_status'], encrypted))
+
+    def take(self, job_id, owner=None):
+        """
+        Estado do job (None se não existe ou é de outra sessão). Job
+        terminado é devolvido com o resultado e apagado na mesma transação.
+        """
+        job_hash = _job_hash(job_id)
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('''
+                SELECT type, state, owner_hash, created_at, started_at, finished_at,
+                       http_status, encrypted_result
+                FROM jobs WHERE job_hash = ?
+            ''', (job_hash,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            job_type, state, owner_hash, created_at, started_at, finished_at, http_status, encrypted = row
+            if owner_hash and (not owner or owner_hash != _job_hash(owner)):
+                return None
+
+            info = {
+                'id': job_id,
+                'type': job_type,
+                'state': state,
+                'created_at': created_at,
+                'started_at': started_at,
+                'finished_at': finished_at
+            }
+            if finished_at:
+                info['http_status'] = http_status
+                info['result'] = json.loads(_job_cipher(job_id).decrypt(encrypted)) if encrypted else None
+                cursor.execute('DELETE FROM jobs WHERE job_hash = ?', (job_hash,))
+        return info
+
+    def purge(self, ttl, now):
+        """Apaga resultados não lidos há mais de ttl segundos e jobs órfãos"""
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('''
+                DELETE FROM jobs
+                WHERE (finished_at IS NOT NULL AND finished_at < ?) OR created_at < ?
+            ''', (now - ttl, now - JOB_ORPHAN_TTL))
+            return cursor.rowcount
+
+    def count_states(self):
+        with self.store.transaction() as cursor:
+            cursor.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state')
+            return dict(cursor.fetchall())
+
+
+def create_job_store(path=JOB_DB_PATH):
+    """SQLiteJobStore, ou None (jobs só no processo) se o arquivo não puder ser criado"""
+    try:
+        return SQLiteJobStore(path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Aviso: jobs em SQLite indisponíveis ({e}); resultados só no worker que os executou")
+        return None
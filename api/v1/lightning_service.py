@@ -0,0 +1,905 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - operações Lightning
+
+Saldos, canais, peers e pagamentos sobre o LNDgRPCClient, com a cópia
+local de canais/peers mantida por streams (LightningStateStore).
+"""
+
+import os
+import grpc
+from datetime import datetime
+import time
+import threading
+
+from lnd_client import (
+    HAS_ROUTER_RPC, channel_point_str, channel_to_dict, lnd_grpc_client, lnrpc, peer_to_dict,
+    pending_channels_to_dict, routerrpc
+)
+from system_services import get_service_status
+from event_hub import event_hub
+
+
+def get_blockchain_balance():
+    """Obtém o saldo on-chain do LND via gRPC"""
+    try:
+        success, error = lnd_grpc_client.ensure_connected()
+        if not success:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        request = lnrpc.WalletBalanceRequest()
+        response = lnd_grpc_client.stub.WalletBalance(request, timeout=10)
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'total_balance': str(response.total_balance),
+            'confirmed_balance': str(response.confirmed_balance),
+            'unconfirmed_balance': str(response.unconfirmed_balance),
+            'locked_balance': str(response.locked_balance) if hasattr(response, 'locked_balance') else '0'
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro ao buscar saldo: {str(e)}',
+            'status': 'error'
+        }
+
+def get_lnd_info():
+    """Obtém informações do LND usando gRPC"""
+    if not get_service_status('lnd.service'):
+        raise RuntimeError("Serviço LND não está rodando")
+    
+    data, error = lnd_grpc_client.get_info_grpc()
+    if error:
+        raise RuntimeError(f"Erro ao conectar com LND via gRPC: {error}")
+        
+    return {
+        'status': 'running',
+        'method': 'grpc',
+        'synced': data.get('synced_to_chain', False),
+        'block_height': data.get('block_height', 0),
+        'identity_pubkey': data.get('identity_pubkey', ''),
+        'alias': data.get('alias', ''),
+        'version': data.get('version', ''),
+        'num_peers': data.get('num_peers', 0),
+        'num_active_channels': data.get('num_active_channels', 0),
+        'chains': data.get('chains', [])
+    }
+
+def get_lightning_balance():
+    """Obtém o saldo do canal do LND via gRPC"""
+    try:
+        success, error = lnd_grpc_client.ensure_connected()
+        if not success:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        request = lnrpc.ChannelBalanceRequest()
+        response = lnd_grpc_client.stub.ChannelBalance(request, timeout=10)
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'balance': str(response.balance),
+            'pending_open_balance': str(response.pending_open_balance) if hasattr(response, 'pending_open_balance') else '0'
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro ao buscar saldo dos canais: {str(e)}',
+            'status': 'error'
+        }
+
+def connect_to_peer(lightning_address, perm=True, timeout=60):
+    """Conecta a um peer Lightning Network usando gRPC"""
+    try:
+        # Validação da lightning address
+        if not lightning_address:
+            return {
+                'error': 'lightning_address é obrigatório',
+                'status': 'error'
+            }
+        
+        data, error = lnd_grpc_client.connect_peer_grpc(lightning_address, perm, timeout)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'message': f'Conectado ao peer {lightning_address}',
+            'peer_address': lightning_address,
+            'permanent': perm
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao conectar ao peer: {str(e)}',
+            'status': 'error'
+        }
+
+# === CACHE DE CANAIS E PEERS LIGHTNING ===
+
+LIGHTNING_STATE_RECONCILE_INTERVAL = int(os.getenv('LIGHTNING_STATE_RECONCILE_INTERVAL', '60'))
+LIGHTNING_STATE_DEBOUNCE = 1.0  # agrupa rajadas de eventos em um único resync
+
+class LightningStateStore:
+    """
+    Cópia local dos canais, canais pendentes e peers do LND.
+
+    É semeada uma vez com ListChannels/PendingChannels/ListPeers e depois
+    mantida por SubscribeChannelEvents e SubscribePeerEvents:
+
+    - abertura/fechamento/ativo/inativo e peer offline são aplicados direto
+    - saldos e contadores não vêm nos eventos, então eventos de canal/peer e
+      HTLCs liquidados (routerrpc, se disponível) agendam um resync com debounce
+    - um resync completo a cada LIGHTNING_STATE_RECONCILE_INTERVAL cobre o resto
+
+    Índices: chan_id, remote_pubkey e channel_point.
+    """
+
+    SECTIONS = ('channels', 'pending', 'peers')
+
+    def __init__(self, client, reconcile_interval=LIGHTNING_STATE_RECONCILE_INTERVAL):
+        self.client = client
+        self.reconcile_interval = reconcile_interval
+
+        self._lock = threading.RLock()
+        self._channels = {}         # chan_id -> dict
+        self._by_point = {}         # channel_point -> chan_id
+        self._by_pubkey = {}        # remote_pubkey -> set(chan_id)
+        self._peers = {}            # pub_key -> dict
+        self._pending = None
+        self._seeded = {section: 0.0 for section in self.SECTIONS}
+        self._dirty = {}            # section -> horário em que ficou suja
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._started = False
+
+    # === Ciclo de vida ===
+
+    def start(self):
+        """Inicia o reconciliador e as assinaturas de eventos (idempotente)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            targets = [
+                ('LightningStateSync', self._run_sync),
+                ('LightningChannelEvents', self._run_channel_events),
+                ('LightningPeerEvents', self._run_peer_events)
+            ]
+            if HAS_ROUTER_RPC:
+                targets.append(('LightningHtlcEvents', self._run_htlc_events))
+            for name, target in targets:
+                thread = threading.Thread(target=target, daemon=True, name=name)
+                thread.start()
+                self._threads.append(thread)
+
+    def mark_dirty(self, *sections):
+        """Agenda um resync das seções (debounce de LIGHTNING_STATE_DEBOUNCE)"""
+        now = time.time()
+        with self._lock:
+            for section in sections or self.SECTIONS:
+                self._dirty.setdefault(section, now)
+        self._wakeup.set()
+
+    # === Carga completa ===
+
+    def _load_channels(self):
+        response = self.client.stub.ListChannels(lnrpc.ListChannelsRequest(), timeout=10)
+        channels = {}
+        by_point = {}
+        by_pubkey = {}
+        for channel in response.channels:
+            data = channel_to_dict(channel)
+            channels[data['chan_id']] = data
+            by_point[data['channel_point']] = data['chan_id']
+            by_pubkey.setdefault(data['remote_pubkey'], set()).add(data['chan_id'])
+        with self._lock:
+            self._channels = channels
+            self._by_point = by_point
+            self._by_pubkey = by_pubkey
+            self._seeded['channels'] = time.time()
+
+    def _load_pending(self):
+        response = self.client.stub.PendingChannels(lnrpc.PendingChannelsRequest(), timeout=10)
+        pending = pending_channels_to_dict(response)
+        with self._lock:
+            self._pending = pending
+            self._seeded['pending'] = time.time()
+
+    def _load_peers(self):
+        request = lnrpc.ListPeersRequest()
+        request.latest_error = True
+        response = self.client.stub.ListPeers(request, timeout=10)
+        peers = {peer.pub_key: peer_to_dict(peer) for peer in response.peers}
+        with self._lock:
+            self._peers = peers
+            self._seeded['peers'] = time.time()
+
+    def load(self, *sections):
+        """Recarrega as seções direto do LND. Retorna (success, error)"""
+        loaders = {
+            'channels': self._load_channels,
+            'pending': self._load_pending,
+            'peers': self._load_peers
+        }
+        success, error = self.client.ensure_connected()
+        if not success:
+            return False, error
+        try:
+            for section in sections or self.SECTIONS:
+                loaders[section]()
+            return True, None
+        except grpc.RpcError as e:
+            self.client.manager.report_error(e)
+            return False, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return False, f"Erro inesperado: {str(e)}"
+
+    def _ensure_seeded(self, section):
+        """Primeira leitura (ou após falha) carrega a seção de forma síncrona"""
+        self.start()
+        if self._seeded[section]:
+            return True, None
+        return self.load(section)
+
+    def _run_sync(self):
+        while True:
+            try:
+                now = time.time()
+                with self._lock:
+                    due = [s for s, since in self._dirty.items()
+                           if now - since >= LIGHTNING_STATE_DEBOUNCE]
+                    stale = [s for s in self.SECTIONS
+                             if self._seeded[s] and now - self._seeded[s] >= self.reconcile_interval]
+                    sections = sorted(set(due) | set(stale))
+                    for section in due:
+                        self._dirty.pop(section, None)
+                    waiting = bool(self._dirty)
+
+                if sections:
+                    success, error = self.load(*sections)
+                    if success:
+                        self._changed()
+                    else:
+                        print(f"Erro ao sincronizar estado Lightning: {error}")
+
+                self._wakeup.wait(LIGHTNING_STATE_DEBOUNCE if waiting else 5)
+                self._wakeup.clear()
+            except Exception as e:
+                print(f"Erro no sincronizador de estado Lightning: {e}")
+                time.sleep(5)
+
+    def _changed(self):
+        # Canais e peers são publicados juntos no tópico SSE 'channels'
+        event_hub.notify('channels')
+
+    # === Assinaturas de eventos ===
+
+    def _subscribe_loop(self, name, open_stream, handle):
+        """Mantém uma assinatura aberta; após reconectar, resync (eventos perdidos)"""
+        while True:
+            success, error = self.client.ensure_connected()
+            if not success:
+                time.sleep(5)
+                continue
+            try:
+                stream = open_stream()
+                if stream is None:
+                    return
+                self.mark_dirty()
+                for update in stream:
+                    handle(update)
+            except grpc.RpcError as e:
+                self.client.manager.report_error(e)
+                if e.code() == grpc.StatusCode.UNIMPLEMENTED:
+                    print(f"{name} não suportado pelo LND, desativando")
+                    return
+                print(f"{name} interrompido: {e.details()}")
+            except Exception as e:
+                print(f"Erro em {name}: {e}")
+            time.sleep(5)
+
+    def _run_channel_events(self):
+        self._subscribe_loop(
+            'SubscribeChannelEvents',
+            lambda: self.client.stub.SubscribeChannelEvents(lnrpc.ChannelEventSubscription()),
+            self._apply_channel_event
+        )
+
+    def _run_peer_events(self):
+        self._subscribe_loop(
+            'SubscribePeerEvents',
+            lambda: self.client.stub.SubscribePeerEvents(lnrpc.PeerEventSubscription()),
+            self._apply_peer_event
+        )
+
+    def _run_htlc_events(self):
+        def open_stream():
+            stub = self.client.router_stub
+            if stub is None:
+                return None
+            return stub.SubscribeHtlcEvents(routerrpc.SubscribeHtlcEventsRequest())
+
+        def handle(event):
+            # Saldo dos canais muda quando um HTLC é liquidado
+            if event.WhichOneof('event') in ('settle_event', 'final_htlc_event'):
+                self.mark_dirty('channels')
+
+        self._subscribe_loop('SubscribeHtlcEvents', open_stream, handle)
+
+    def _apply_channel_event(self, update):
+        kind = update.WhichOneof('channel')
+        with self._lock:
+            if kind == 'open_channel':
+                data = channel_to_dict(update.open_channel)
+                self._channels[data['chan_id']] = data
+                self._by_point[data['channel_point']] = data['chan_id']
+                self._by_pubkey.setdefault(data['remote_pubkey'], set()).add(data['chan_id'])
+                self.mark_dirty('pending')
+            elif kind == 'closed_channel':
+                summary = update.closed_channel
+                chan_id = str(summary.chan_id)
+                data = self._channels.pop(chan_id, None)
+                self._by_point.pop(summary.channel_point, None)
+                if data:
+                    ids = self._by_pubkey.get(data['remote_pubkey'])
+                    if ids:
+                        ids.discard(chan_id)
+                        if not ids:
+                            del self._by_pubkey[data['remote_pubkey']]
+                self.mark_dirty('pending')
+            elif kind in ('active_channel', 'inactive_channel'):
+                point = channel_point_str(getattr(update, kind))
+                chan_id = self._by_point.get(point)
+                if chan_id in self._channels:
+                    self._channels[chan_id]['active'] = kind == 'active_channel'
+                else:
+                    self.mark_dirty('channels')
+            else:
+                # pending_open_channel, fully_resolved_channel, channel_opening...
+                self.mark_dirty('pending')
+        self._changed()
+
+    def _apply_peer_event(self, event):
+        if event.type == lnrpc.PeerEvent.PEER_OFFLINE:
+            with self._lock:
+                self._peers.pop(event.pub_key, None)
+            self._changed()
+        else:
+            # Endereço/features do peer só vêm do ListPeers
+            self.mark_dirty('peers')
+
+    # === Leitura ===
+
+    def get_channels(self):
+        """Lista de canais. Retorna (channels, error)"""
+        success, error = self._ensure_seeded('channels')
+        if not success:
+            return None, error
+        with self._lock:
+            return [dict(c) for c in self._channels.values()], None
+
+    def get_channel(self, chan_id=None, channel_point=None):
+        """Canal por chan_id ou channel_point (None se não existir)"""
+        success, error = self._ensure_seeded('channels')
+        if not success:
+            return None, error
+        with self._lock:
+            if chan_id is None and channel_point is not None:
+                chan_id = self._by_point.get(channel_point)
+            channel = self._channels.get(str(chan_id)) if chan_id is not None else None
+            return (dict(channel) if channel else None), None
+
+    def get_channels_by_pubkey(self, remote_pubkey):
+        """Canais com um peer. Retorna (channels, error)"""
+        success, error = self._ensure_seeded('channels')
+        if not success:
+            return None, error
+        with self._lock:
+            ids = self._by_pubkey.get(remote_pubkey, ())
+            return [dict(self._channels[i]) for i in ids if i in self._channels], None
+
+    def get_pending(self):
+        """Canais pendentes. Retorna (pending, error)"""
+        success, error = self._ensure_seeded('pending')
+        if not success:
+            return None, error
+        with self._lock:
+            return self._pending, None
+
+    def get_peers(self):
+        """Peers conectados. Retorna (peers, error)"""
+        success, error = self._ensure_seeded('peers')
+        if not success:
+            return None, error
+        with self._lock:
+            return list(self._peers.values()), None
+
+    def get_peer(self, pub_key):
+        success, error = self._ensure_seeded('peers')
+        if not success:
+            return None, error
+        with self._lock:
+            return self._peers.get(pub_key), None
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'channels': len(self._channels),
+                'peers': len(self._peers),
+                'seeded_at': dict(self._seeded),
+                'dirty': sorted(self._dirty),
+                'reconcile_interval': self.reconcile_interval
+            }
+
+
+lightning_state = LightningStateStore(lnd_grpc_client)
+
+def get_connected_peers():
+    """Obtém a lista de peers conectados (cache alimentado por SubscribePeerEvents)"""
+    try:
+        peers, error = lightning_state.get_peers()
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'peers': peers
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao buscar peers: {str(e)}',
+            'status': 'error'
+        }
+
+def get_transactions(start_height=None, end_height=None, account=None):
+    """Obtém a lista de transações on-chain do LND usando gRPC"""
+    try:
+        data, error = lnd_grpc_client.get_transactions_grpc(start_height, end_height, account)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        transactions = data.get('transactions', [])
+        
+        # Enriquecer dados das transações com informações formatadas
+        formatted_transactions = []
+        for tx in transactions:
+            formatted_tx = {
+                'tx_hash': tx.get('tx_hash', ''),
+                'amount': tx.get('amount', '0'),
+                'num_confirmations': tx.get('num_confirmations', 0),
+                'block_hash': tx.get('block_hash', ''),
+                'block_height': tx.get('block_height', 0),
+                'time_stamp': tx.get('time_stamp', '0'),
+                'total_fees': tx.get('total_fees', '0'),
+                'dest_addresses': tx.get('dest_addresses', []),
+                'raw_tx_hex': tx.get('raw_tx_hex', ''),
+                'label': tx.get('label', '')
+            }
+            
+            # Adicionar timestamp formatado
+            if tx.get('time_stamp'):
+                try:
+                    timestamp = int(tx.get('time_stamp'))
+                    formatted_tx['date'] = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+                except Exception as date_error:
+                    return None, f"Erro ao processar timestamp da transação {tx.get('tx_hash', 'unknown')}: {str(date_error)}"
+            else:
+                return None, f"Transação {tx.get('tx_hash', 'unknown')} não possui timestamp válido"
+            
+            # Determinar tipo de transação (entrada/saída)
+            amount = int(tx.get('amount', '0'))
+            if amount > 0:
+                formatted_tx['type'] = 'received'
+                formatted_tx['type_label'] = 'Recebida'
+            else:
+                formatted_tx['type'] = 'sent'
+                formatted_tx['type_label'] = 'Enviada'
+                formatted_tx['amount'] = str(abs(amount))  # Mostrar valor absoluto
+            
+            formatted_transactions.append(formatted_tx)
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'transactions': formatted_transactions,
+            'total_transactions': len(formatted_transactions),
+            'last_index': data.get('last_index', ''),
+            'first_index': data.get('first_index', '')
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao buscar transações: {str(e)}',
+            'status': 'error'
+        }
+
+def get_lightning_channels(chan_id=None, remote_pubkey=None, channel_point=None):
+    """Obtém a lista de canais (cache alimentado por SubscribeChannelEvents)"""
+    try:
+        if chan_id or channel_point:
+            channel, error = lightning_state.get_channel(chan_id=chan_id, channel_point=channel_point)
+            channels = [channel] if channel else []
+        elif remote_pubkey:
+            channels, error = lightning_state.get_channels_by_pubkey(remote_pubkey)
+        else:
+            channels, error = lightning_state.get_channels()
+        
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'channels': {'channels': channels}
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao buscar canais: {str(e)}',
+            'status': 'error'
+        }
+
+def open_lightning_channel(node_pubkey, local_funding_amount=None, sat_per_vbyte=None, private=False, 
+                          push_sat=0, target_conf=None, min_confs=1, spend_unconfirmed=False, 
+                          close_address=None, base_fee=None, fee_rate=None, fund_max=False, memo=None):
+    """Abre um canal Lightning"""
+    try:
+        # Validação básica dos parâmetros
+        if not node_pubkey:
+            return {
+                'error': 'node_pubkey é obrigatório',
+                'status': 'error'
+            }
+        
+        # Validação fund_max vs local_funding_amount
+        if fund_max and local_funding_amount is not None:
+            return {
+                'error': 'fund_max=true não pode ser usado junto com local_funding_amount. Use um ou outro.',
+                'status': 'error'
+            }
+        
+        if not fund_max and (local_funding_amount is None or local_funding_amount <= 0):
+            return {
+                'error': 'local_funding_amount é obrigatório quando fund_max=false',
+                'status': 'error'
+            }
+        
+        if local_funding_amount is not None and local_funding_amount < 20000:  # Mínimo padrão de 20k sats
+            return {
+                'error': 'Valor mínimo para abrir canal é 20.000 satoshis',
+                'status': 'error'
+            }
+        
+        # Preparar dados para a requisição
+        channel_data = {
+            'node_pubkey_string': node_pubkey,
+            'private': private,
+            'min_confs': min_confs,
+            'spend_unconfirmed': spend_unconfirmed
+        }
+        
+        # Adicionar local_funding_amount apenas se não for fund_max
+        if not fund_max:
+            channel_data['local_funding_amount'] = str(local_funding_amount)
+        else:
+            channel_data['fund_max'] = True
+        
+        # Adicionar parâmetros opcionais
+        if push_sat > 0:
+            channel_data['push_sat'] = str(push_sat)
+        if sat_per_vbyte:
+            channel_data['sat_per_vbyte'] = str(sat_per_vbyte)
+        if target_conf:
+            channel_data['target_conf'] = target_conf
+        if close_address:
+            channel_data['close_address'] = close_address
+        if base_fee is not None:
+            channel_data['base_fee'] = str(base_fee)
+        if fee_rate is not None:
+            channel_data['fee_rate'] = str(fee_rate)
+        if memo:
+            channel_data['memo'] = memo
+            
+        # Fazer a requisição para abrir o canal via gRPC
+        try:
+            success, error = lnd_grpc_client.ensure_connected()
+            if not success:
+                return {
+                    'error': error,
+                    'status': 'error'
+                }
+            
+            request = lnrpc.OpenChannelRequest()
+            request.node_pubkey_string = node_pubkey
+            request.private = private
+            request.min_confs = min_confs
+            request.spend_unconfirmed = spend_unconfirmed
+            
+            if not fund_max:
+                request.local_funding_amount = int(local_funding_amount)
+            else:
+                request.fund_max = True
+            
+            if push_sat > 0:
+                request.push_sat = int(push_sat)
+            if sat_per_vbyte:
+                request.sat_per_vbyte = int(sat_per_vbyte)
+            if target_conf:
+                request.target_conf = target_conf
+            if close_address:
+                request.close_address = close_address
+            if memo:
+                request.memo = memo
+            
+            response = lnd_grpc_client.stub.OpenChannelSync(request, timeout=60)
+            
+            return {
+                'status': 'success',
+                'funding_txid': response.funding_txid_str,
+                'output_index': response.output_index,
+                'message': 'Canal sendo aberto. Aguarde confirmações na rede.'
+            }
+            
+        except grpc.RpcError as e:
+            return {
+                'error': f'gRPC Error: {e.details()}',
+                'status': 'error'
+            }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao abrir canal: {str(e)}',
+            'status': 'error'
+        }
+
+def close_lightning_channel(channel_point, force_close=False, target_conf=None, sat_per_vbyte=None):
+    """Fecha um canal Lightning"""
+    try:
+        if not channel_point:
+            return {
+                'error': 'channel_point é obrigatório',
+                'status': 'error'
+            }
+        
+        # Preparar requisição para fechar canal via gRPC
+        try:
+            success, error = lnd_grpc_client.ensure_connected()
+            if not success:
+                return {
+                    'error': error,
+                    'status': 'error'
+                }
+            
+            request = lnrpc.CloseChannelRequest()
+            
+            # Configurar channel point
+            txid_str, output_index = channel_point.split(':')
+            request.channel_point.funding_txid_str = txid_str
+            request.channel_point.output_index = int(output_index)
+            request.force = force_close
+            
+            if target_conf:
+                request.target_conf = int(target_conf)
+            if sat_per_vbyte:
+                request.sat_per_vbyte = int(sat_per_vbyte)
+            
+            # Usar CloseChannel que retorna um stream, mas pegar apenas a primeira resposta
+            response_stream = lnd_grpc_client.stub.CloseChannel(request, timeout=60)
+            response = next(response_stream)
+            
+            close_type = "forçado" if force_close else "cooperativo"
+            
+            if hasattr(response, 'close_pending'):
+                return {
+                    'status': 'success',
+                    'closing_txid': response.close_pending.txid.hex() if hasattr(response.close_pending, 'txid') else 'pending',
+                    'message': f'Canal sendo fechado ({close_type}). Aguarde confirmações na rede.'
+                }
+            elif hasattr(response, 'chan_close'):
+                return {
+                    'status': 'success',
+                    'closing_txid': response.chan_close.closing_txid,
+                    'message': f'Canal fechado ({close_type}) com sucesso.'
+                }
+            else:
+                return {
+                    'status': 'success',
+                    'message': f'Canal sendo fechado ({close_type}). Aguarde confirmações na rede.'
+                }
+                
+        except grpc.RpcError as e:
+            return {
+                'error': f'gRPC Error: {e.details()}',
+                'status': 'error'
+            }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao fechar canal: {str(e)}',
+            'status': 'error'
+        }
+
+def get_pending_channels():
+    """Obtém canais pendentes (cache atualizado pelos eventos de canal)"""
+    try:
+        pending, error = lightning_state.get_pending()
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        result = {
+            'status': 'success',
+            'method': 'grpc'
+        }
+        result.update(pending)
+        return result
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao buscar canais pendentes: {str(e)}',
+            'status': 'error'
+        }
+
+def add_invoice(memo=None, value=None, expiry=3600, private=False, description_hash=None):
+    """Criar uma invoice Lightning"""
+    try:
+        data, error = lnd_grpc_client.add_invoice_grpc(memo, value, expiry, private, description_hash)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'r_hash': data.get('r_hash'),
+            'payment_request': data.get('payment_request'),
+            'add_index': data.get('add_index')
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao criar invoice: {str(e)}',
+            'status': 'error'
+        }
+
+def send_payment(payment_request=None, dest=None, amt=None, fee_limit_sat=None, timeout_seconds=60):
+    """Enviar pagamento Lightning"""
+    try:
+        data, error = lnd_grpc_client.send_payment_grpc(payment_request, dest, amt, fee_limit_sat, timeout_seconds)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'payment_preimage': data.get('payment_preimage'),
+            'payment_route': data.get('payment_route')
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao enviar pagamento: {str(e)}',
+            'status': 'error'
+        }
+
+def new_address(address_type="p2wkh", account=None):
+    """Gerar novo endereço Bitcoin"""
+    try:
+        data, error = lnd_grpc_client.new_address_grpc(address_type, account)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'address': data.get('address')
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao gerar endereço: {str(e)}',
+            'status': 'error'
+        }
+
+def send_coins(addr, amount, target_conf=None, sat_per_vbyte=None, send_all=False, label=None, min_confs=1, spend_unconfirmed=False):
+    """Enviar Bitcoin on-chain"""
+    try:
+        data, error = lnd_grpc_client.send_coins_grpc(addr, amount, target_conf, sat_per_vbyte, send_all, label, min_confs, spend_unconfirmed)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'txid': data.get('txid')
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao enviar Bitcoin: {str(e)}',
+            'status': 'error'
+        }
+
+def send_keysend(dest, amt, fee_limit_sat=None, timeout_seconds=60, custom_records=None, final_cltv_delta=None):
+    """Enviar keysend (pagamento espontâneo) Lightning"""
+    try:
+        data, error = lnd_grpc_client.send_keysend_grpc(dest, amt, fee_limit_sat, timeout_seconds, custom_records, final_cltv_delta)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'payment_type': 'keysend',
+            'payment_preimage': data.get('payment_preimage'),
+            'payment_hash': data.get('payment_hash'),
+            'payment_route': data.get('payment_route')
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao enviar keysend: {str(e)}',
+            'status': 'error'
+        }
+
+def list_unspent(min_confs=0, max_confs=9999999, account=None):
+    """Listar UTXOs disponíveis"""
+    try:
+        data, error = lnd_grpc_client.list_unspent_grpc(min_confs, max_confs, account)
+        if error:
+            return {
+                'error': error,
+                'status': 'error'
+            }
+        
+        return {
+            'status': 'success',
+            'method': 'grpc',
+            'utxos': data.get('utxos', [])
+        }
+        
+    except Exception as e:
+        return {
+            'error': f'Erro inesperado ao listar UTXOs: {str(e)}',
+            'status': 'error'
+        }
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS LND gRPC Channel Manager
+
+Um único canal gRPC (HTTP/2 multiplexado) compartilhado por todas as threads
+da API e pelos clientes que herdam de LNDgRPCClient:
+
+- Estado real do canal via channel.subscribe (IDLE/CONNECTING/READY/...)
+- Keepalive HTTP/2 e limite de tamanho de mensagem configurados
+- Reconstrução preguiçosa do canal com backoff (ex.: macaroon/TLS regenerados)
+- Stubs Lightning, Router, Invoices, WalletKit e ChainNotifier no mesmo canal
+- Contadores de latência e erro por RPC (interceptor)
+"""
+
+import os
+import time
+import codecs
+import threading
+from collections import deque
+
+import grpc
+import grpc.aio
+
+try:
+    import lightning_pb2_grpc as lnrpcstub
+except ImportError:
+    lnrpcstub = None
+
+# Sub-serviços do LND (gerados por scripts/gen-proto.sh quando disponíveis)
+try:
+    from routerrpc import router_pb2_grpc as routerstub
+except ImportError:
+    routerstub = None
+
+try:
+    from invoicesrpc import invoices_pb2_grpc as invoicesstub
+except ImportError:
+    invoicesstub = None
+
+try:
+    from walletrpc import walletkit_pb2_grpc as walletkitstub
+except ImportError:
+    walletkitstub = None
+
+try:
+    from chainrpc import chainnotifier_pb2_grpc as chainnotifierstub
+except ImportError:
+    chainnotifierstub = None
+
+
+MAX_MESSAGE_LENGTH = 50 * 1024 * 1024  # ListChannels/DescribeGraph em nós grandes
+
+LND_GRPC_OPTIONS = [
+    ('grpc.max_receive_message_length', MAX_MESSAGE_LENGTH),
+    ('grpc.max_send_message_length', MAX_MESSAGE_LENGTH),
+    # LND aceita pings a cada 5s no mínimo (keepalive.EnforcementPolicy)
+    ('grpc.keepalive_time_ms', 30000),
+    ('grpc.keepalive_timeout_ms', 10000),
+    ('grpc.keepalive_permit_without_calls', 1),
+    ('grpc.http2.max_pings_without_data', 0),
+    ('grpc.initial_reconnect_backoff_ms', 1000),
+    ('grpc.max_reconnect_backoff_ms', 10000),
+]
+
+# Backoff para reconstruir o canal (credenciais ausentes ou inválidas)
+REBUILD_BACKOFF_MAX = 10
+# Tempo em TRANSIENT_FAILURE antes de descartar o canal (ex.: tls.cert trocado)
+TRANSIENT_FAILURE_REBUILD_AFTER = 30
+
+
+class RPCMetrics:
+    """Contadores de latência e erro por método gRPC"""
+
+    SAMPLE_SIZE = 256
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def _entry(self, method):
+        entry = self._methods.get(method)
+        if entry is None:
+            entry = {
+                'calls': 0,
+                'errors': 0,
+                'error_codes': {},
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'samples': deque(maxlen=self.SAMPLE_SIZE),
+                'last_error': None
+            }
+            self._methods[method] = entry
+        return entry
+
+    def record(self, method, elapsed_ms, code):
+        with self._lock:
+            entry = self._entry(method)
+            entry['calls'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            entry['samples'].append(elapsed_ms)
+            if code is not None and code != grpc.StatusCode.OK:
+                entry['errors'] += 1
+                entry['error_codes'][code.name] = entry['error_codes'].get(code.name, 0) + 1
+                entry['last_error'] = time.time()
+
+    def snapshot(self):
+        """Retorna as métricas por método (p50/p95 das últimas chamadas)"""
+        with self._lock:
+            result = {}
+            for method, entry in self._methods.items():
+                samples = sorted(entry['samples'])
+                result[method] = {
+                    'calls': entry['calls'],
+                    'errors': entry['errors'],
+                    'error_codes': dict(entry['error_codes']),
+                    'avg_ms': round(entry['total_ms'] / entry['calls'], 2) if entry['calls'] else 0,
+                    'max_ms': round(entry['max_ms'], 2),
+                    'p50_ms': round(samples[len(samples) // 2], 2) if samples else 0,
+                    'p95_ms': round(samples[max(0, int(len(samples) * 0.95) - 1)], 2) if samples else 0,
+                    'last_error': entry['last_error']
+                }
+            return result
+
+
+class _MetricsInterceptor(grpc.UnaryUnaryClientInterceptor,
+                          grpc.UnaryStreamClientInterceptor):
+    """Registra latência (unary) e erros (streams) sem bloquear a chamada"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def _track(self, method, call, start):
+        """start: tomado antes de continuation(), que bloqueia nas chamadas unary síncronas"""
+        def done(finished):
+            try:
+                code = finished.code()
+            except Exception:
+                code = grpc.StatusCode.UNKNOWN
+            self.metrics.record(method, (time.perf_counter() - start) * 1000, code)
+
+        try:
+            if call.done():
+                # Unary síncrona: a RPC já terminou dentro de continuation()
+                done(call)
+            else:
+                # Futures (.future()) e streams: registra quando terminar
+                call.add_done_callback(done)
+        except Exception:
+            pass
+        return call
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        start = time.perf_counter()
+        return self._track(client_call_details.method, continuation(client_call_details, request), start)
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        start = time.perf_counter()
+        return self._track(client_call_details.method, continuation(client_call_details, request), start)
+
+
+class LNDChannelManager:
+    """
+    Gerencia o canal gRPC com o LND.
+
+    O canal é criado na primeira chamada e reaproveitado; o próprio gRPC
+    reconecta após quedas do LND. O canal só é descartado e recriado quando
+    as credenciais deixam de valer (UNAUTHENTICATED) ou quando fica preso em
+    TRANSIENT_FAILURE, respeitando um backoff exponencial.
+    """
+
+    def __init__(self, host, tls_cert_path, macaroon_path, options=None):
+        self.host = host
+        self.tls_cert_path = tls_cert_path
+        self.macaroon_path = macaroon_path
+        self.options = options or LND_GRPC_OPTIONS
+        self.metrics = RPCMetrics()
+
+        self._lock = threading.RLock()
+        self._raw_channel = None
+        self._channel = None
+        self._stubs = {}
+        self._state = None
+        self._state_since = time.time()
+        self._failures = 0
+        self._next_attempt = 0.0
+        self._last_error = None
+
+    # === Canal ===
+
+    def _build_credentials(self):
+        """Credenciais TLS + macaroon (lidas uma vez por canal)"""
+        try:
+            if not os.path.exists(self.tls_cert_path):
+                raise FileNotFoundError(f"TLS cert não encontrado: {self.tls_cert_path}")
+
+            with open(self.tls_cert_path, 'rb') as f:
+                cert_data = f.read()
+
+            if not os.path.exists(self.macaroon_path):
+                raise FileNotFoundError(f"Macaroon não encontrado: {self.macaroon_path}")
+
+            with open(self.macaroon_path, 'rb') as f:
+                macaroon_hex = codecs.encode(f.read(), 'hex')
+
+            ssl_creds = grpc.ssl_channel_credentials(cert_data)
+
+            def metadata_callback(context, callback):
+                callback([('macaroon', macaroon_hex)], None)
+
+            auth_creds = grpc.metadata_call_credentials(metadata_callback)
+            return grpc.composite_channel_credentials(ssl_creds, auth_creds), None
+
+        except Exception as e:
+            return None, f"Erro ao obter credenciais: {str(e)}"
+
+    def _on_state_change(self, connectivity):
+        with self._lock:
+            if connectivity != self._state:
+                self._state = connectivity
+                self._state_since = time.time()
+            if connectivity == grpc.ChannelConnectivity.READY:
+                self._failures = 0
+                self._last_error = None
+
+    def _open(self):
+        """Cria o canal (chamado com o lock adquirido)"""
+        credentials, error = self._build_credentials()
+        if error:
+            self._schedule_retry(error)
+            return error
+
+        raw_channel = grpc.secure_channel(self.host, credentials, options=self.options)
+        raw_channel.subscribe(self._on_state_change, try_to_connect=True)
+
+        self._raw_channel = raw_channel
+        self._channel = grpc.intercept_channel(raw_channel, _MetricsInterceptor(self.metrics))
+        self._stubs = {}
+        self._state = grpc.ChannelConnectivity.IDLE
+        self._state_since = time.time()
+        return None
+
+    def _discard(self):
+        """Fecha o canal atual (chamado com o lock adquirido)"""
+        if self._raw_channel is not None:
+            try:
+                self._raw_channel.unsubscribe(self._on_state_change)
+                self._raw_channel.close()
+            except Exception:
+                pass
+        self._raw_channel = None
+        self._channel = None
+        self._stubs = {}
+        self._state = None
+
+    def _schedule_retry(self, error):
+        self._failures += 1
+        self._last_error = error
+        self._next_attempt = time.time() + min(REBUILD_BACKOFF_MAX, 2 ** (self._failures - 1))
+
+    def ensure_channel(self):
+        """Garante que há um canal utilizável. Retorna (success, error)"""
+        with self._lock:
+            if self._channel is not None:
+                stuck = (
+                    self._state == grpc.ChannelConnectivity.TRANSIENT_FAILURE and
+                    time.time() - self._state_since > TRANSIENT_FAILURE_REBUILD_AFTER
+                )
+                if self._state != grpc.ChannelConnectivity.SHUTDOWN and not stuck:
+                    return True, None
+                self._discard()
+                self._schedule_retry("Canal gRPC em falha, recriando")
+
+            if time.time() < self._next_attempt:
+                return False, self._last_error or "LND indisponível, aguardando nova tentativa"
+
+            error = self._open()
+            if error:
+                return False, error
+            return True, None
+
+    def connect(self, timeout=10):
+        """Garante o canal e aguarda ficar READY. Retorna (success, error)"""
+        success, error = self.ensure_channel()
+        if not success:
+            return False, error
+
+        try:
+            grpc.channel_ready_future(self._raw_channel).result(timeout=timeout)
+            return True, None
+        except grpc.FutureTimeoutError:
+            return False, f"Timeout conectando ao LND em {self.host}"
+        except Exception as e:
+            return False, f"Erro ao conectar: {str(e)}"
+
+    def create_aio_channel(self):
+        """
+        Cria um canal grpc.aio com as mesmas credenciais e opções.
+
+        Canais aio pertencem ao event loop em que são criados, então cada
+        consumidor asyncio cria (e fecha) o seu. Retorna (channel, error)
+        """
+        credentials, error = self._build_credentials()
+        if error:
+            return None, error
+        return grpc.aio.secure_channel(self.host, credentials, options=self.options), None
+
+    def report_error(self, error):
+        """
+        Avalia um grpc.RpcError. Erros de negócio (NOT_FOUND, etc.) não mexem
+        no canal; UNAUTHENTICATED força a recriação com credenciais novas.
+        """
+        try:
+            code = error.code()
+        except Exception:
+            return
+
+        if code == grpc.StatusCode.UNAUTHENTICATED:
+            with self._lock:
+                self._discard()
+                self._last_error = f"gRPC Error: {error.details()}"
+
+    def reset(self):
+        """Descarta o canal (ex.: após init/unlock da wallet gerar novo macaroon)"""
+        with self._lock:
+            self._discard()
+            self._failures = 0
+            self._next_attempt = 0.0
+
+    def close(self):
+        self.reset()
+
+    # === Stubs ===
+
+    def _stub(self, name, module, attr):
+        """Stub cacheado por canal; None se o proto não foi gerado ou não há canal"""
+        if module is None:
+            return None
+        with self._lock:
+            if self._channel is None:
+                return None
+            stub = self._stubs.get(name)
+            if stub is None:
+                stub = getattr(module, attr)(self._channel)
+                self._stubs[name] = stub
+            return stub
+
+    @property
+    def channel(self):
+        return self._channel
+
+    @property
+    def lightning(self):
+        return self._stub('lightning', lnrpcstub, 'LightningStub')
+
+    @property
+    def router(self):
+        return self._stub('router', routerstub, 'RouterStub')
+
+    @property
+    def invoices(self):
+        return self._stub('invoices', invoicesstub, 'InvoicesStub')
+
+    @property
+    def walletkit(self):
+        return self._stub('walletkit', walletkitstub, 'WalletKitStub')
+
+    @property
+    def chainnotifier(self):
+        return self._stub('chainnotifier', chainnotifierstub, 'ChainNotifierStub')
+
+    # === Estado ===
+
+    def is_ready(self):
+        return self._channel is not None and self._state == grpc.ChannelConnectivity.READY
+
+    def get_status(self):
+        """Estado do canal e métricas por RPC"""
+        with self._lock:
+            return {
+                'host': self.host,
+                'state': self._state.name if self._state is not None else 'CLOSED',
+                'state_since': self._state_since,
+                'failures': self._failures,
+                'last_error': self._last_error,
+                'subservices': {
+                    'router': routerstub is not None,
+                    'invoices': invoicesstub is not None,
+                    'walletkit': walletkitstub is not None,
+                    'chainnotifier': chainnotifierstub is not None
+                },
+                'rpc': self.metrics.snapshot()
+            }
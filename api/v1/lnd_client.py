@@ -0,0 +1,782 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - cliente gRPC do LND
+
+LNDgRPCClient sobre o canal compartilhado (lnd_channel.py) e conversores
+de mensagens lnrpc para dict. Importável sem subir a API (usado por
+api/lnd/client.py): não abre conexão nem lê macaroon no import.
+"""
+
+import grpc
+import hashlib
+
+from api_config import LND_GRPC_PORT, LND_HOST, MACAROON_PATH, TLS_CERT_PATH
+
+
+# Importar proto files (obrigatórios para a API; create_app() aborta sem eles)
+try:
+    # Imports para usar com gRPC compilado do LND
+    import lightning_pb2 as lnrpc
+    import lightning_pb2_grpc as lnrpcstub
+    HAS_LND_PROTOS = True
+except ImportError:
+    lnrpc = None
+    lnrpcstub = None
+    HAS_LND_PROTOS = False
+
+# Canal gRPC compartilhado com o LND
+from lnd_channel import LNDChannelManager
+
+# Import WalletUnlocker for wallet initialization with extended_master_key (HD wallet support)
+try:
+    import walletunlocker_pb2 as walletunlocker
+    import walletunlocker_pb2_grpc as walletunlockerstub
+    HAS_WALLET_UNLOCKER = True
+    print("WalletUnlocker proto files loaded (HD wallet init supported)")
+except ImportError:
+    HAS_WALLET_UNLOCKER = False
+    print("Warning: WalletUnlocker proto files not found - HD wallet init via gRPC disabled")
+
+# Router sub-service (SubscribeHtlcEvents) - opcional
+try:
+    from routerrpc import router_pb2 as routerrpc
+    HAS_ROUTER_RPC = True
+except ImportError:
+    routerrpc = None
+    HAS_ROUTER_RPC = False
+    print("Warning: routerrpc proto files not found - HTLC events disabled")
+    print("Run: bash scripts/gen-proto.sh to generate proto files")
+
+# Canal gRPC único com o LND (keepalive, reconexão com backoff, métricas por RPC)
+lnd_channel_manager = LNDChannelManager(f'{LND_HOST}:{LND_GRPC_PORT}', TLS_CERT_PATH, MACAROON_PATH)
+
+class LNDgRPCClient:
+    """Cliente gRPC para LND usando protocolo Lightning Network"""
+    
+    def __init__(self, manager=None):
+        self.host = f'{LND_HOST}:{LND_GRPC_PORT}'
+        self.macaroon_path = MACAROON_PATH
+        self.tls_cert_path = TLS_CERT_PATH
+        # Canal compartilhado por todas as instâncias (ver lnd_channel.py)
+        self.manager = manager or lnd_channel_manager
+    
+    @property
+    def channel(self):
+        return self.manager.channel
+    
+    @property
+    def stub(self):
+        """Stub Lightning sobre o canal compartilhado"""
+        return self.manager.lightning
+    
+    @property
+    def router_stub(self):
+        return self.manager.router
+    
+    @property
+    def invoices_stub(self):
+        return self.manager.invoices
+    
+    @property
+    def walletkit_stub(self):
+        return self.manager.walletkit
+    
+    @property
+    def chainnotifier_stub(self):
+        return self.manager.chainnotifier
+    
+    @property
+    def _connected(self):
+        return self.manager.is_ready()
+    
+    def connect(self):
+        """Conectar ao LND via gRPC (aguarda o canal ficar READY)"""
+        return self.manager.connect(timeout=10)
+    
+    def ensure_connected(self):
+        """Garantir que há canal utilizável (não faz round-trip ao LND)"""
+        return self.manager.ensure_channel()
+    
+    def get_info_grpc(self):
+        """Obter informações do LND via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            request = lnrpc.GetInfoRequest()
+            response = self.stub.GetInfo(request, timeout=10)
+            
+            return {
+                'identity_pubkey': response.identity_pubkey,
+                'alias': response.alias,
+                'block_height': response.block_height,
+                'synced_to_chain': response.synced_to_chain,
+                'num_peers': response.num_peers,
+                'num_active_channels': response.num_active_channels,
+                'version': response.version,
+                'color': response.color,
+                'num_pending_channels': response.num_pending_channels,
+                'chains': [{'chain': c.chain, 'network': c.network} for c in response.chains]
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def get_transactions_grpc(self, start_height=None, end_height=None, account=None):
+        """Obter transações via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            request = lnrpc.GetTransactionsRequest()
+            if start_height is not None:
+                request.start_height = start_height
+            if end_height is not None:
+                request.end_height = end_height
+            if account is not None:
+                request.account = account
+            
+            response = self.stub.GetTransactions(request, timeout=30)
+            
+            transactions = []
+            for tx in response.transactions:
+                transactions.append({
+                    'tx_hash': tx.tx_hash,
+                    'amount': str(tx.amount),
+                    'num_confirmations': tx.num_confirmations,
+                    'block_hash': tx.block_hash,
+                    'block_height': tx.block_height,
+                    'time_stamp': str(tx.time_stamp),
+                    'dest_addresses': list(tx.dest_addresses),
+                    'total_fees': str(tx.total_fees),
+                    'label': tx.label,
+                    'raw_tx_hex': tx.raw_tx_hex
+                })
+            
+            return {
+                'transactions': transactions,
+                'last_index': response.last_index,
+                'first_index': response.first_index
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def connect_peer_grpc(self, lightning_address, perm=True, timeout=60):
+        """Conectar a um peer via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            # Parse lightning address
+            if '@' in lightning_address:
+                pubkey, host = lightning_address.split('@', 1)
+            else:
+                pubkey = lightning_address
+                host = ''
+            
+            # Criar request
+            request = lnrpc.ConnectPeerRequest()
+            request.addr.pubkey = pubkey
+            if host:
+                request.addr.host = host
+            request.perm = perm
+            request.timeout = timeout
+            
+            response = self.stub.ConnectPeer(request, timeout=timeout + 10)
+            
+            return {
+                'success': True,
+                'peer_id': pubkey,
+                'permanent': perm
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def list_peers_grpc(self, latest_error=True):
+        """Listar peers conectados via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            request = lnrpc.ListPeersRequest()
+            request.latest_error = latest_error
+            
+            response = self.stub.ListPeers(request, timeout=10)
+            
+            peers = [peer_to_dict(peer) for peer in response.peers]
+            
+            return {
+                'peers': peers
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def add_invoice_grpc(self, memo=None, value=None, expiry=3600, private=False, description_hash=None):
+        """Criar uma invoice via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            request = lnrpc.Invoice()
+            
+            if memo:
+                request.memo = memo
+            if value:
+                request.value = int(value)
+            request.expiry = int(expiry)
+            request.private = private
+            if description_hash:
+                request.description_hash = bytes.fromhex(description_hash)
+            
+            response = self.stub.AddInvoice(request, timeout=10)
+            
+            return {
+                'r_hash': response.r_hash.hex(),
+                'payment_request': response.payment_request,
+                'add_index': str(response.add_index)
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def send_payment_grpc(self, payment_request=None, dest=None, amt=None, fee_limit_sat=None, timeout_seconds=60):
+        """Enviar pagamento via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            if payment_request:
+                # Pagamento usando payment request (bolt11)
+                request = lnrpc.SendRequest()
+                request.payment_request = payment_request
+                if fee_limit_sat:
+                    request.fee_limit.fixed = int(fee_limit_sat)
+            elif dest and amt:
+                # Pagamento direto usando dest e amount
+                request = lnrpc.SendRequest()
+                request.dest_string = dest
+                request.amt = int(amt)
+                if fee_limit_sat:
+                    request.fee_limit.fixed = int(fee_limit_sat)
+            else:
+                return None, "Deve fornecer payment_request OU (dest + amt)"
+            
+            response = self.stub.SendPaymentSync(request, timeout=timeout_seconds)
+            
+            if response.payment_error:
+                return None, f"Erro no pagamento: {response.payment_error}"
+            
+            return {
+                'payment_preimage': response.payment_preimage.hex(),
+                'payment_route': {
+                    'total_time_lock': response.payment_route.total_time_lock,
+                    'total_fees': str(response.payment_route.total_fees),
+                    'total_amt': str(response.payment_route.total_amt),
+                    'total_fees_msat': str(response.payment_route.total_fees_msat),
+                    'total_amt_msat': str(response.payment_route.total_amt_msat)
+                } if response.payment_route else None
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def new_address_grpc(self, address_type="p2wkh", account=None):
+        """Gerar novo endereço via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            request = lnrpc.NewAddressRequest()
+            
+            # Mapear tipos de endereço
+            type_mapping = {
+                'p2wkh': lnrpc.AddressType.WITNESS_PUBKEY_HASH,
+                'np2wkh': lnrpc.AddressType.NESTED_PUBKEY_HASH,
+                'p2tr': lnrpc.AddressType.TAPROOT_PUBKEY if hasattr(lnrpc.AddressType, 'TAPROOT_PUBKEY') else lnrpc.AddressType.WITNESS_PUBKEY_HASH
+            }
+            
+            request.type = type_mapping.get(address_type, lnrpc.AddressType.WITNESS_PUBKEY_HASH)
+            
+            if account:
+                request.account = account
+            
+            response = self.stub.NewAddress(request, timeout=10)
+            
+            return {
+                'address': response.address
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def send_coins_grpc(self, addr, amount, target_conf=None, sat_per_vbyte=None, send_all=False, label=None, min_confs=1, spend_unconfirmed=False):
+        """Enviar Bitcoin on-chain via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            request = lnrpc.SendCoinsRequest()
+            request.addr = addr
+            request.send_all = send_all
+            request.min_confs = int(min_confs)
+            request.spend_unconfirmed = spend_unconfirmed
+            
+            if not send_all:
+                if not amount or amount <= 0:
+                    return None, "Amount é obrigatório quando send_all=false"
+                request.amount = int(amount)
+            
+            if target_conf:
+                request.target_conf = int(target_conf)
+            if sat_per_vbyte:
+                request.sat_per_vbyte = int(sat_per_vbyte)
+            if label:
+                request.label = label
+            
+            response = self.stub.SendCoins(request, timeout=30)
+            
+            return {
+                'txid': response.txid
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def send_keysend_grpc(self, dest, amt, fee_limit_sat=None, timeout_seconds=60, custom_records=None, final_cltv_delta=None):
+        """Enviar keysend (pagamento espontâneo) via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            import secrets
+            
+            # Gerar preimage aleatório para keysend (32 bytes)
+            preimage = secrets.token_bytes(32)
+            payment_hash = hashlib.sha256(preimage).digest()
+            
+            request = lnrpc.SendRequest()
+            request.dest_string = dest
+            request.amt = int(amt)
+            request.payment_hash = payment_hash
+            
+            # Adicionar o preimage nos custom records (TLV record 5482373484)
+            # Este é o record type padrão para keysend
+            if not custom_records:
+                custom_records = {}
+            custom_records[5482373484] = preimage  # Keysend preimage record
+            
+            # Configurar custom records
+            for key, value in custom_records.items():
+                # Converter chave para inteiro se for string
+                if isinstance(key, str):
+                    record_key = int(key)
+                else:
+                    record_key = key
+                
+                # Converter valor para bytes se necessário
+                if isinstance(value, str):
+                    record_value = value.encode('utf-8')
+                else:
+                    record_value = value
+                
+                request.dest_custom_records[record_key] = record_value
+            
+            if fee_limit_sat:
+                request.fee_limit.fixed = int(fee_limit_sat)
+            if final_cltv_delta:
+                request.final_cltv_delta = int(final_cltv_delta)
+            
+            response = self.stub.SendPaymentSync(request, timeout=timeout_seconds)
+            
+            if response.payment_error:
+                return None, f"Erro no keysend: {response.payment_error}"
+            
+            return {
+                'payment_preimage': response.payment_preimage.hex(),
+                'payment_hash': payment_hash.hex(),
+                'payment_route': {
+                    'total_time_lock': response.payment_route.total_time_lock,
+                    'total_fees': str(response.payment_route.total_fees),
+                    'total_amt': str(response.payment_route.total_amt),
+                    'total_fees_msat': str(response.payment_route.total_fees_msat),
+                    'total_amt_msat': str(response.payment_route.total_amt_msat)
+                } if response.payment_route else None
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+    def list_unspent_grpc(self, min_confs=0, max_confs=9999999, account=None):
+        """Listar UTXOs via gRPC"""
+        try:
+            success, error = self.ensure_connected()
+            if not success:
+                return None, error
+            
+            request = lnrpc.ListUnspentRequest()
+            request.min_confs = int(min_confs)
+            request.max_confs = int(max_confs)
+            
+            if account:
+                request.account = account
+            
+            response = self.stub.ListUnspent(request, timeout=10)
+            
+            utxos = []
+            for utxo in response.utxos:
+                utxos.append({
+                    'address': utxo.address,
+                    'amount_sat': str(utxo.amount_sat),
+                    'pk_script': str(utxo.pk_script),  # pk_script já é string
+                    'outpoint': {
+                        'txid_bytes': utxo.outpoint.txid_bytes.hex(),  # txid_bytes são bytes
+                        'txid_str': utxo.outpoint.txid_str,
+                        'output_index': utxo.outpoint.output_index
+                    },
+                    'confirmations': str(utxo.confirmations)
+                })
+            
+            return {
+                'utxos': utxos
+            }, None
+            
+        except grpc.RpcError as e:
+            self.manager.report_error(e)
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro inesperado: {str(e)}"
+    
+
+    
+    def init_wallet_grpc(self, wallet_password, cipher_seed_mnemonic, aezeed_passphrase="", recovery_window=250, channel_backups=None, stateless_init=False):
+        """Inicializar wallet LND via gRPC com aezeed mnemonic"""
+        try:
+            if not HAS_WALLET_UNLOCKER:
+                return None, "WalletUnlocker proto not available - run gen-proto.sh"
+            
+            # Para inicializar wallet, não precisamos de autenticação ainda
+            # Use insecure channel since wallet is not initialized yet
+            channel = grpc.insecure_channel(self.host)
+            stub = walletunlockerstub.WalletUnlockerStub(channel)
+            
+            request = walletunlocker.InitWalletRequest()
+            request.wallet_password = wallet_password.encode('utf-8')
+            request.cipher_seed_mnemonic[:] = cipher_seed_mnemonic
+            if aezeed_passphrase:
+                request.aezeed_passphrase = aezeed_passphrase.encode('utf-8')
+            request.recovery_window = recovery_window
+            request.stateless_init = stateless_init
+            
+            if channel_backups:
+                request.channel_backups = channel_backups
+            
+            response = stub.InitWallet(request, timeout=120)
+            
+            # Novo macaroon gerado: recriar o canal autenticado
+            self.manager.reset()
+            
+            return {
+                'success': True,
+                'message': 'Wallet initialized successfully with aezeed',
+                'admin_macaroon': response.admin_macaroon.hex() if hasattr(response, 'admin_macaroon') and response.admin_macaroon else None
+            }, None
+            
+        except grpc.RpcError as e:
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro ao inicializar wallet: {str(e)}"
+    
+    def init_wallet_with_extended_key_grpc(self, wallet_password, extended_master_key, 
+                                           birthday_timestamp=0, recovery_window=2500, 
+                                           stateless_init=False):
+        """
+        Initialize LND wallet using BIP32 extended master key (xprv/tprv).
+        
+        This allows using a BIP39 HD wallet seed with LND instead of aezeed format.
+        The extended_master_key should be derived from BIP39 mnemonic using:
+        - BIP32 master key derivation
+        - Encoded as xprv (mainnet) or tprv (testnet)
+        
+        Args:
+            wallet_password: Password to encrypt the wallet (min 8 chars)
+            extended_master_key: BIP32 extended private key (xprv.../tprv...)
+            birthday_timestamp: Unix timestamp of wallet creation (0 = scan from SegWit activation)
+            recovery_window: Address lookahead for recovery (default 2500 for full scan)
+            stateless_init: If True, don't create macaroon files on disk
+            
+        Returns:
+            dict with success status and admin_macaroon (if stateless_init=True, MUST be saved!)
+        """
+        try:
+            if not HAS_WALLET_UNLOCKER:
+                return None, "WalletUnlocker proto not available - run: bash scripts/gen-proto.sh"
+            
+            # Validate extended_master_key format
+            if not extended_master_key:
+                return None, "extended_master_key is required"
+            if not (extended_master_key.startswith('xprv') or extended_master_key.startswith('tprv')):
+                return None, "extended_master_key must start with 'xprv' (mainnet) or 'tprv' (testnet)"
+            
+            # Validate password length
+            if len(wallet_password) < 8:
+                return None, "wallet_password must be at least 8 characters"
+            
+            # Use insecure channel since wallet is not initialized yet
+            channel = grpc.insecure_channel(self.host)
+            stub = walletunlockerstub.WalletUnlockerStub(channel)
+            
+            request = walletunlocker.InitWalletRequest()
+            request.wallet_password = wallet_password.encode('utf-8')
+            request.extended_master_key = extended_master_key
+            request.extended_master_key_birthday_timestamp = birthday_timestamp
+            request.recovery_window = recovery_window
+            request.stateless_init = stateless_init
+            
+            response = stub.InitWallet(request, timeout=180)  # Longer timeout for recovery scan
+            
+            # Novo macaroon gerado: recriar o canal autenticado
+            self.manager.reset()
+            
+            return {
+                'success': True,
+                'message': 'LND wallet initialized successfully with HD master key',
+                'method': 'extended_master_key',
+                'recovery_window': recovery_window,
+                'admin_macaroon': response.admin_macaroon.hex() if hasattr(response, 'admin_macaroon') and response.admin_macaroon else None
+            }, None
+            
+        except grpc.RpcError as e:
+            error_details = e.details() if hasattr(e, 'details') else str(e)
+            # Check for common errors
+            if 'wallet already exists' in error_details.lower():
+                return None, "LND wallet already exists. Use unlock instead of init."
+            return None, f"gRPC Error: {error_details}"
+        except Exception as e:
+            return None, f"Error initializing wallet with extended key: {str(e)}"
+    
+    def unlock_wallet_grpc(self, wallet_password, recovery_window=250, channel_backups=None, stateless_init=False):
+        """Desbloquear wallet LND via gRPC"""
+        try:
+            if not HAS_WALLET_UNLOCKER:
+                return None, "WalletUnlocker proto not available - run gen-proto.sh"
+            
+            # Para desbloquear wallet, não precisamos de autenticação
+            channel = grpc.insecure_channel(self.host)
+            stub = walletunlockerstub.WalletUnlockerStub(channel)
+            
+            request = walletunlocker.UnlockWalletRequest()
+            request.wallet_password = wallet_password.encode('utf-8')
+            request.recovery_window = recovery_window
+            request.stateless_init = stateless_init
+            
+            if channel_backups:
+                request.channel_backups = channel_backups
+            
+            response = stub.UnlockWallet(request, timeout=120)
+            
+            # Depois de desbloquear, recriar o canal para usar as credenciais novas
+            self.manager.reset()
+            
+            return {
+                'success': True,
+                'message': 'Wallet unlocked successfully'
+            }, None
+            
+        except grpc.RpcError as e:
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Erro ao desbloquear wallet: {str(e)}"
+    
+    def gen_seed_grpc(self):
+        """Generate aezeed seed phrase via gRPC (LND native format)"""
+        try:
+            if not HAS_WALLET_UNLOCKER:
+                return None, "WalletUnlocker proto not available - run gen-proto.sh"
+            
+            # Use insecure channel for seed generation
+            channel = grpc.insecure_channel(self.host)
+            stub = walletunlockerstub.WalletUnlockerStub(channel)
+            
+            request = walletunlocker.GenSeedRequest()
+            response = stub.GenSeed(request, timeout=30)
+            
+            return {
+                'cipher_seed_mnemonic': list(response.cipher_seed_mnemonic),
+                'enciphered_seed': response.enciphered_seed.hex() if response.enciphered_seed else None
+            }, None
+            
+        except grpc.RpcError as e:
+            return None, f"gRPC Error: {e.details()}"
+        except Exception as e:
+            return None, f"Error generating seed: {str(e)}"
+    def close(self):
+        """Fechar conexão gRPC"""
+        self.manager.close()
+
+# Singleton para reusar conexão gRPC
+lnd_grpc_client = LNDgRPCClient()
+
+def channel_point_str(point):
+    """Converte lnrpc.ChannelPoint em 'txid:index'"""
+    if point.funding_txid_str:
+        txid = point.funding_txid_str
+    else:
+        # funding_txid_bytes vem em ordem little-endian
+        txid = bytes(point.funding_txid_bytes)[::-1].hex()
+    return f"{txid}:{point.output_index}"
+
+
+def channel_to_dict(channel):
+    """Converte lnrpc.Channel no formato retornado por /lightning/channels"""
+    return {
+        'active': channel.active,
+        'remote_pubkey': channel.remote_pubkey,
+        'channel_point': channel.channel_point,
+        'chan_id': str(channel.chan_id),
+        'capacity': str(channel.capacity),
+        'local_balance': str(channel.local_balance),
+        'remote_balance': str(channel.remote_balance),
+        'commit_fee': str(channel.commit_fee),
+        'commit_weight': str(channel.commit_weight),
+        'fee_per_kw': str(channel.fee_per_kw),
+        'unsettled_balance': str(channel.unsettled_balance),
+        'total_satoshis_sent': str(channel.total_satoshis_sent),
+        'total_satoshis_received': str(channel.total_satoshis_received),
+        'num_updates': str(channel.num_updates),
+        'csv_delay': channel.csv_delay,
+        'private': channel.private
+    }
+
+
+def peer_to_dict(peer):
+    """Converte lnrpc.Peer no formato retornado por /lightning/peers"""
+    # Serializar features de forma correta para JSON
+    features = {}
+    try:
+        for key, value in peer.features.items():
+            features[str(key)] = {
+                'name': value.name if hasattr(value, 'name') else str(value),
+                'is_required': value.is_required if hasattr(value, 'is_required') else False,
+                'is_known': value.is_known if hasattr(value, 'is_known') else True
+            }
+    except:
+        # Se falhar, apenas converter para string
+        features = {str(k): str(v) for k, v in peer.features.items()}
+
+    return {
+        'pub_key': peer.pub_key,
+        'address': peer.address,
+        'bytes_sent': str(peer.bytes_sent),
+        'bytes_recv': str(peer.bytes_recv),
+        'sat_sent': str(peer.sat_sent),
+        'sat_recv': str(peer.sat_recv),
+        'inbound': peer.inbound,
+        'ping_time': str(peer.ping_time),
+        'sync_type': peer.sync_type,
+        'features': features,
+        'errors': [{'error': str(e)} for e in peer.errors],
+        'flap_count': peer.flap_count,
+        'last_flap_ns': str(peer.last_flap_ns)
+    }
+
+
+def _pending_channel_to_dict(channel):
+    return {
+        'remote_node_pub': channel.remote_node_pub,
+        'channel_point': channel.channel_point,
+        'capacity': str(channel.capacity),
+        'local_balance': str(channel.local_balance),
+        'remote_balance': str(channel.remote_balance)
+    }
+
+
+def pending_channels_to_dict(response):
+    """Converte lnrpc.PendingChannelsResponse no formato de /lightning/channels/pending"""
+    return {
+        'pending_open_channels': [
+            {
+                'channel': _pending_channel_to_dict(ch.channel),
+                'confirmation_height': ch.confirmation_height,
+                'commit_fee': str(ch.commit_fee),
+                'commit_weight': str(ch.commit_weight),
+                'fee_per_kw': str(ch.fee_per_kw)
+            } for ch in response.pending_open_channels
+        ],
+        'pending_closing_channels': [
+            {
+                'channel': _pending_channel_to_dict(ch.channel),
+                'closing_txid': ch.closing_txid
+            } for ch in response.pending_closing_channels
+        ],
+        'pending_force_closing_channels': [
+            {
+                'channel': _pending_channel_to_dict(ch.channel),
+                'closing_txid': ch.closing_txid,
+                'limbo_balance': str(ch.limbo_balance),
+                'maturity_height': ch.maturity_height,
+                'blocks_til_maturity': ch.blocks_til_maturity
+            } for ch in response.pending_force_closing_channels
+        ],
+        'waiting_close_channels': [
+            {
+                'channel': _pending_channel_to_dict(ch.channel),
+                'limbo_balance': str(ch.limbo_balance),
+                'commitments': {
+                    'local_txid': ch.commitments.local_txid,
+                    'remote_txid': ch.commitments.remote_txid,
+                    'remote_pending_txid': ch.commitments.remote_pending_txid,
+                    'local_commit_fee_sat': str(ch.commitments.local_commit_fee_sat),
+                    'remote_commit_fee_sat': str(ch.commitments.remote_commit_fee_sat)
+                } if ch.commitments else None
+            } for ch in response.waiting_close_channels
+        ]
+    }
+
+def get_macaroon_hex():
+    """Lê o admin.macaroon e retorna em formato hex para gRPC"""
+    try:
+        with open(MACAROON_PATH, 'rb') as f:
+            macaroon_bytes = f.read()
+        return macaroon_bytes.hex()
+    except Exception as e:
+        print(f"Error reading macaroon: {e}")
+        return None
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - RPC do Bitcoin Core e do Elements
+
+Clientes JSON-RPC com keep-alive; as credenciais são lidas na primeira
+chamada, não no import.
+"""
+
+import requests
+from pathlib import Path
+import threading
+import base64
+
+from api_config import (
+    BITCOIN_DATADIR, BITCOIN_RPC_HOST, BITCOIN_RPC_PORT, BITCOIN_RPC_USER, ELEMENTS_RPC_HOST,
+    ELEMENTS_RPC_PASSWORD, ELEMENTS_RPC_PORT, ELEMENTS_RPC_USER, get_secure_credential
+)
+
+
+# === CLIENTE RPC ELEMENTS/LIQUID ===
+
+class ElementsRPCClient:
+    """Cliente RPC para Elements/Liquid daemon"""
+    
+    def __init__(self):
+        self.host = ELEMENTS_RPC_HOST
+        self.port = ELEMENTS_RPC_PORT
+        # Credenciais carregadas na primeira chamada (_call_rpc), não no import
+        self.user = None
+        self.password = None
+        self.auth = None
+        self._warned_default_password = False
+    
+    def _update_credentials(self):
+        """Update credentials from secure password manager"""
+        self.user = get_secure_credential('elements_rpc_user', ELEMENTS_RPC_USER)
+        self.password = get_secure_credential('elements_rpc_password', ELEMENTS_RPC_PASSWORD)
+        self.auth = base64.b64encode(f"{self.user}:{self.password}".encode()).decode()
+        if self.password == ELEMENTS_RPC_PASSWORD and not self._warned_default_password:
+            self._warned_default_password = True
+            print("WARNING: Using default Elements RPC password - please configure secure credentials")
+            print("Store password: secure_store_password 'elements_rpc_password' 'admin' 'your_secure_password'")
+        
+    def _call_rpc(self, method, params=None, wallet='peerswap'):
+        """Faz chamada RPC para Elements daemon"""
+        if params is None:
+            params = []
+        
+        # Refresh credentials before each call (supports password rotation)
+        self._update_credentials()
+            
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Basic {self.auth}'
+        }
+        
+        payload = {
+            "jsonrpc": "1.0",
+            "id": "python-elements-rpc",
+            "method": method,
+            "params": params
+        }
+        
+        try:
+            import requests
+            # Use wallet-specific endpoint to ensure we're accessing the correct wallet
+            url = f"http://{self.host}:{self.port}/wallet/{wallet}" if wallet else f"http://{self.host}:{self.port}/"
+            response = requests.post(
+                url,
+                json=payload,
+                headers=headers,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                if 'error' in result and result['error'] is not None:
+                    return None, f"Elements RPC Error: {result['error']}"
+                return result.get('result'), None
+            else:
+                return None, f"HTTP Error {response.status_code}: {response.text}"
+                
+        except requests.exceptions.RequestException as e:
+            return None, f"Connection Error: {str(e)}"
+        except Exception as e:
+            return None, f"Unexpected Error: {str(e)}"
+    
+    def get_balances(self):
+        """Obtém saldos de todos os assets"""
+        return self._call_rpc("getbalances")
+    
+    def get_asset_labels(self):
+        """Obtém labels/nomes dos assets conhecidos"""
+        return self._call_rpc("dumpassetlabels")
+    
+    def get_new_address(self, label="", address_type="bech32"):
+        """Gera novo endereço Liquid"""
+        return self._call_rpc("getnewaddress", [label, address_type])
+    
+    def send_to_address(self, address, amount, asset_label=None, subtract_fee=False):
+        """Envia asset para endereço"""
+        params = [address, amount]
+        if asset_label:
+            # Adicionar parâmetros opcionais até chegar no assetlabel
+            params.extend(["", "", subtract_fee, True, None, "unset", True, asset_label])
+        return self._call_rpc("sendtoaddress", params)
+    
+    def list_unspent(self, minconf=1, maxconf=9999999, asset=None):
+        """Lista UTXOs não gastos"""
+        params = [minconf, maxconf]
+        if asset:
+            params.append([])  # addresses
+            params.append(True)  # include_unsafe
+            params.append({"asset": asset})  # query_options
+        return self._call_rpc("listunspent", params)
+    
+    def list_transactions(self, count=30, skip=0):
+        """Lista transações recentes"""
+        return self._call_rpc("listtransactions", ["*", count, skip])
+    
+    def get_blockchain_info(self):
+        """Obtém informações da blockchain"""
+        return self._call_rpc("getblockchaininfo")
+
+    # === RAW TRANSACTION METHODS (for HTLC atomic swaps) ===
+
+    def create_raw_transaction(self, inputs, outputs, locktime=0, replaceable=False):
+        """
+        Cria transação raw não assinada.
+
+        Args:
+            inputs: Lista de dicts com 'txid' e 'vout'
+            outputs: Dict de {address: amount} ou lista de outputs
+            locktime: Locktime da transação (default: 0)
+            replaceable: Se True, marca como RBF (default: False)
+
+        Returns:
+            Tuple (hex_string, error)
+
+        Example:
+            inputs = [{"txid": "abc...", "vout": 0}]
+            outputs = {"tb1q...": 0.001}
+            hex, err = client.create_raw_transaction(inputs, outputs)
+        """
+        params = [inputs, outputs]
+        if locktime != 0:
+            params.append(locktime)
+        if replaceable:
+            params.append(replaceable)
+
+        return self._call_rpc("createrawtransaction", params)
+
+    def sign_raw_transaction_with_wallet(self, hex_tx, prevtxs=None, sighash_type="ALL"):
+        """
+        Assina transação raw com chaves da wallet.
+
+        Args:
+            hex_tx: Transação raw em hexadecimal
+            prevtxs: Lista opcional de UTXOs anteriores (para P2SH/P2WSH)
+            sighash_type: Tipo de assinatura (default: "ALL")
+
+        Returns:
+            Tuple (result_dict, error)
+            result_dict contém:
+                - 'hex': transação assinada
+                - 'complete': bool se todas assinaturas estão presentes
+                - 'errors': lista de erros se incomplete
+
+        Example:
+            result, err = client.sign_raw_transaction_with_wallet(hex_tx)
+            if result['complete']:
+                signed_hex = result['hex']
+        """
+        params = [hex_tx]
+        if prevtxs:
+            params.append(prevtxs)
+        if sighash_type != "ALL":
+            params.append(sighash_type)
+
+        return self._call_rpc("signrawtransactionwithwallet", params)
+
+    def send_raw_transaction(self, hex_tx, max_fee_rate=None):
+        """
+        Broadcast transação assinada para a rede.
+
+        Args:
+            hex_tx: Transação assinada em hexadecimal
+            max_fee_rate: Taxa máxima permitida (opcional)
+
+        Returns:
+            Tuple (txid, error)
+
+        Example:
+            txid, err = client.send_raw_transaction(signed_hex)
+            if not err:
+                print(f"Transaction broadcast: {txid}")
+        """
+        params = [hex_tx]
+        if max_fee_rate is not None:
+            params.append(max_fee_rate)
+
+        return self._call_rpc("sendrawtransaction", params)
+
+    def decode_raw_transaction(self, hex_tx, is_witness=True):
+        """
+        Decodifica transação raw para formato legível.
+
+        Args:
+            hex_tx: Transação em hexadecimal
+            is_witness: Se True, interpreta como witness transaction
+
+        Returns:
+            Tuple (decoded_dict, error)
+
+        Example:
+            decoded, err = client.decode_raw_transaction(hex_tx)
+            print(f"TXID: {decoded['txid']}")
+        """
+        params = [hex_tx]
+        if not is_witness:
+            params.append(is_witness)
+
+        return self._call_rpc("decoderawtransaction", params)
+
+    def get_raw_transaction(self, txid, verbose=True, blockhash=None):
+        """
+        Obtém transação raw pelo TXID.
+
+        Args:
+            txid: Transaction ID
+            verbose: Se True, retorna JSON. Se False, retorna hex (default: True)
+            blockhash: Hash do bloco onde procurar (opcional)
+
+        Returns:
+            Tuple (transaction_data, error)
+
+        Example:
+            tx_data, err = client.get_raw_transaction(txid, verbose=True)
+            print(f"Confirmations: {tx_data['confirmations']}")
+        """
+        params = [txid, verbose]
+        if blockhash:
+            params.append(blockhash)
+
+        return self._call_rpc("getrawtransaction", params)
+
+    def get_tx_out(self, txid, vout, include_mempool=True):
+        """
+        Obtém detalhes de um output específico (UTXO).
+
+        Args:
+            txid: Transaction ID
+            vout: Output index
+            include_mempool: Incluir transações na mempool
+
+        Returns:
+            Tuple (utxo_data, error)
+            Retorna None se UTXO já foi gasto
+
+        Example:
+            utxo, err = client.get_tx_out(txid, 0)
+            if utxo:
+                print(f"Value: {utxo['value']}")
+        """
+        params = [txid, vout, include_mempool]
+        return self._call_rpc("gettxout", params)
+
+    def fund_raw_transaction(self, hex_tx, options=None):
+        """
+        Adiciona inputs e change output a uma transação raw.
+
+        Args:
+            hex_tx: Transação raw parcialmente construída
+            options: Dict com opções (changeAddress, feeRate, etc)
+
+        Returns:
+            Tuple (result_dict, error)
+            result_dict contém:
+                - 'hex': transação com funding
+                - 'fee': taxa calculada
+                - 'changepos': índice do output de change
+
+        Example:
+            options = {"changeAddress": "tb1q...", "feeRate": 0.0001}
+            result, err = client.fund_raw_transaction(hex_tx, options)
+            funded_hex = result['hex']
+        """
+        params = [hex_tx]
+        if options:
+            params.append(options)
+
+        return self._call_rpc("fundrawtransaction", params)
+
+# Singleton para reusar conexão Elements RPC
+elements_rpc_client = ElementsRPCClient()
+
+class BitcoinRPCClient:
+    """Cliente JSON-RPC persistente para o Bitcoin Core (substitui bitcoin-cli)"""
+
+    # Porta RPC padrão de cada rede
+    DEFAULT_PORTS = {
+        'mainnet': 8332,
+        'testnet': 18332,
+        'testnet4': 48332,
+        'signet': 38332,
+        'regtest': 18443
+    }
+
+    def __init__(self):
+        self.host = BITCOIN_RPC_HOST
+        self.datadir = Path(BITCOIN_DATADIR)
+        self._url = None
+        self._auth = None
+        self._lock = threading.Lock()
+        self._request_id = 0
+
+        # Sessão HTTP com keep-alive: as conexões TCP são reaproveitadas
+        # entre chamadas (e entre threads do Flask, até pool_maxsize)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+    def _network_dir(self, network):
+        """Diretório de dados da rede (onde fica o .cookie)"""
+        if network == 'testnet':
+            # testnet4 usa diretório e porta próprios
+            if (self.datadir / "testnet4").exists() and not (self.datadir / "testnet3").exists():
+                return self.datadir / "testnet4", 'testnet4'
+            return self.datadir / "testnet3", 'testnet'
+        if network in ('signet', 'regtest'):
+            return self.datadir / network, network
+        return self.datadir, 'mainnet'
+
+    def _read_auth(self, network_dir):
+        """Lê o .cookie uma vez; sem cookie, usa a credencial rpcauth do password manager"""
+        cookie_path = network_dir / ".cookie"
+        try:
+            cookie = cookie_path.read_text().strip()
+            if cookie:
+                user, password = cookie.split(':', 1)
+                return (user, password)
+        except (OSError, ValueError):
+            pass
+
+        password = get_secure_credential('bitcoin_rpc', None)
+        if password:
+            return (BITCOIN_RPC_USER, password)
+        return None
+
+    def _resolve(self):
+        """Resolve URL e credenciais na primeira chamada (rede via detect_bitcoin_network)"""
+        with self._lock:
+            if self._url is None:
+                network_dir, port_key = self._network_dir(detect_bitcoin_network())
+                port = BITCOIN_RPC_PORT or self.DEFAULT_PORTS[port_key]
+                self._url = f"http://{self.host}:{port}/"
+                self._auth = self._read_auth(network_dir)
+            return self._url, self._auth
+
+    def reset(self):
+        """Esquece rede e credenciais (ex.: bitcoind reiniciado com novo cookie)"""
+        with self._lock:
+            self._url = None
+            self._auth = None
+
+    def _next_id(self):
+        with self._lock:
+            self._request_id += 1
+            return self._request_id
+
+    def _post(self, payload, timeout=30):
+        """Envia o payload; em 401 relê o cookie uma única vez"""
+        for attempt in range(2):
+            url, auth = self._resolve()
+            if auth is None:
+                return None, "Bitcoin RPC credentials not found (.cookie or bitcoin_rpc)"
+
+            try:
+                response = self.session.post(url, json=payload, auth=auth, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                return None, f"Connection Error: {str(e)}"
+
+            if response.status_code == 401 and attempt == 0:
+                self.reset()
+                continue
+
+            try:
+                return response.json(), None
+            except ValueError:
+                return None, f"HTTP Error {response.status_code}: {response.text}"
+
+        return None, "HTTP Error 401: Unauthorized"
+
+    def call(self, method, params=None, timeout=30):
+        """Faz uma chamada RPC. Retorna (result, error)"""
+        payload = {
+            "jsonrpc": "1.0",
+            "id": self._next_id(),
+            "method": method,
+            "params": params or []
+        }
+
+        try:
+            data, error = self._post(payload, timeout=timeout)
+            if error:
+                return None, error
+            if data.get('error') is not None:
+                return None, f"Bitcoin RPC Error: {data['error']}"
+            return data.get('result'), None
+        except Exception as e:
+            return None, f"Unexpected Error: {str(e)}"
+
+    def batch(self, calls, timeout=30):
+        """
+        Executa várias chamadas em uma única requisição HTTP (JSON-RPC batch).
+
+        Args:
+            calls: lista de (method, params)
+
+        Returns:
+            tuple: ([(result, error), ...] na mesma ordem de calls, error)
+        """
+        if not calls:
+            return [], None
+
+        payload = []
+        for method, params in calls:
+            payload.append({
+                "jsonrpc": "1.0",
+                "id": self._next_id(),
+                "method": method,
+                "params": params or []
+            })
+
+        try:
+            data, error = self._post(payload, timeout=timeout)
+            if error:
+                return None, error
+            if not isinstance(data, list):
+                return None, f"Bitcoin RPC Error: {data.get('error') if isinstance(data, dict) else data}"
+
+            # O servidor pode responder fora de ordem: casar pelo id
+            by_id = {item.get('id'): item for item in data}
+            results = []
+            for request_item in payload:
+                item = by_id.get(request_item['id'])
+                if item is None:
+                    results.append((None, "Missing response in batch"))
+                elif item.get('error') is not None:
+                    results.append((None, f"Bitcoin RPC Error: {item['error']}"))
+                else:
+                    results.append((item.get('result'), None))
+            return results, None
+        except Exception as e:
+            return None, f"Unexpected Error: {str(e)}"
+
+    def get_blockchain_info(self):
+        """Obtém informações da blockchain"""
+        return self.call("getblockchaininfo")
+
+    def get_block_count(self):
+        """Obtém a altura do bloco atual"""
+        return self.call("getblockcount")
+
+    def get_block(self, block_hash, verbosity=1):
+        """Obtém um bloco pelo hash"""
+        return self.call("getblock", [block_hash, verbosity])
+
+# Singleton para reusar conexões Bitcoin Core RPC
+bitcoin_rpc_client = BitcoinRPCClient()
+
+def detect_bitcoin_network():
+    """Detecta qual rede o Bitcoin está rodando (mainnet, testnet, signet, regtest)"""
+    # Check bitcoin.conf for network settings (paths accessible by brln-api)
+    possible_configs = [
+        Path("/data/bitcoin/bitcoin.conf"),
+        Path("/home/bitcoin/.bitcoin/bitcoin.conf")
+    ]
+
+    for config_path in possible_configs:
+        try:
+            if config_path.exists():
+                content = config_path.read_text()
+                # Check for network settings in config
+                if 'testnet=1' in content or 'chain=test' in content:
+                    return 'testnet'
+                elif 'signet=1' in content or 'chain=signet' in content:
+                    return 'signet'
+                elif 'regtest=1' in content or 'chain=regtest' in content:
+                    return 'regtest'
+        except (PermissionError, OSError):
+            continue
+
+    # Also check for network data directories
+    bitcoin_dir = Path("/data/bitcoin")
+    if not bitcoin_dir.exists():
+        bitcoin_dir = Path("/home/bitcoin/.bitcoin")
+
+    try:
+        if bitcoin_dir.exists():
+            if (bitcoin_dir / "testnet3").exists() or (bitcoin_dir / "testnet4").exists():
+                return 'testnet'
+            elif (bitcoin_dir / "signet").exists():
+                return 'signet'
+            elif (bitcoin_dir / "regtest").exists():
+                return 'regtest'
+    except (PermissionError, OSError):
+        pass
+
+    return 'mainnet'
+
+def get_bitcoin_cli_command():
+    """Retorna o comando bitcoin-cli com as flags corretas para a rede detectada"""
+    network = detect_bitcoin_network()
+    base_cmd = "bitcoin-cli -datadir=/data/bitcoin"
+    
+    if network == 'testnet':
+        return f"{base_cmd} -testnet"
+    elif network == 'signet':
+        return f"{base_cmd} -signet"
+    elif network == 'regtest':
+        return f"{base_cmd} -regtest"
+    else:
+        return base_cmd
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS Rate Limit Store
+
+Storage do Flask-Limiter (biblioteca limits) em um arquivo SQLite em tmpfs
+(/run/brln-api), para que os limites valham para a API inteira e não por
+worker do gunicorn (com memory:// cada worker contava separado, então N
+workers multiplicavam o limite por N).
+
+- Janela fixa (estratégia padrão do Flask-Limiter): uma linha por chave
+  com contador e fim da janela, incrementada por UPSERT em BEGIN IMMEDIATE
+- Linhas vencidas são zeradas no próprio incremento e apagadas em lote
+  a cada RATE_LIMIT_PURGE_INTERVAL segundos
+- synchronous=OFF: o arquivo fica em tmpfs e os contadores não precisam
+  sobreviver a um reboot
+
+URI: brlnsqlite:///run/brln-api/ratelimits.db (RATELIMIT_STORAGE_URI
+sobrescreve, ex.: memory:// ou redis://).
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from urllib.parse import urlparse
+
+from limits.storage import Storage
+
+from sqlite_store import SQLiteStore
+
+
+RATE_LIMIT_DB_PATH = os.environ.get('BRLN_RATELIMIT_DB', '/run/brln-api/ratelimits.db')
+RATE_LIMIT_SCHEME = 'brlnsqlite'
+RATE_LIMIT_PURGE_INTERVAL = 60
+
+
+class _RateLimitSQLiteStore(SQLiteStore):
+    """SQLiteStore sem fsync (contadores descartáveis em tmpfs)"""
+
+    def _connect(self):
+        conn = super()._connect()
+        conn.execute('PRAGMA synchronous=OFF')
+        return conn
+
+
+def _rate_limit_schema_v1(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            key TEXT PRIMARY KEY,
+            count INTEGER NOT NULL,
+            expires_at REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_rate_limits_expires ON rate_limits(expires_at)')
+
+
+RATE_LIMIT_MIGRATIONS = [
+    (1, 'contadores de janela fixa', _rate_limit_schema_v1),
+]
+
+
+def _open_store(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+    store = _RateLimitSQLiteStore(path, pool_size=4)
+    store.migrate(RATE_LIMIT_MIGRATIONS)
+    return store
+
+
+class SQLiteRateLimitStorage(Storage):
+    """Storage de janela fixa compartilhado entre processos"""
+
+    STORAGE_SCHEME = [RATE_LIMIT_SCHEME]
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = urlparse(uri).path if uri else ''
+        self.path = path or RATE_LIMIT_DB_PATH
+        self.store = _open_store(self.path)
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _purge(self, cursor, now):
+        """Apaga janelas vencidas (no máximo uma vez por intervalo, por processo)"""
+        with self._lock:
+            if now - self._last_purge < RATE_LIMIT_PURGE_INTERVAL:
+                return
+            self._last_purge = now
+        cursor.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        """Soma amount na janela atual (abre uma nova se venceu); retorna o total"""
+        now = time.time()
+        with self.store.transaction(immediate=True) as cursor:
+            self._purge(cursor, now)
+            cursor.execute('''
+                INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    count = CASE WHEN expires_at <= ? THEN excluded.count
+                                 ELSE count + excluded.count END,
+                    expires_at = CASE WHEN expires_at <= ? OR ? THEN excluded.expires_at
+                                      ELSE expires_at END
+            ''', (key, amount, now + expiry, now, now, bool(elastic_expiry)))
+            cursor.execute('SELECT count FROM rate_limits WHERE key = ?', (key,))
+            return cursor.fetchone()[0]
+
+    def get(self, key):
+        with self.store.transaction() as cursor:
+            cursor.execute('SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?',
+                           (key, time.time()))
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        with self.store.transaction() as cursor:
+            cursor.execute('SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?',
+                           (key, now))
+            row = cursor.fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            with self.store.transaction() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('DELETE FROM rate_limits')
+            return cursor.rowcount
+
+    def clear(self, key):
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+
+def rate_limit_storage_uri():
+    """
+    URI do storage do Flask-Limiter: RATELIMIT_STORAGE_URI, senão o SQLite
+    em /run/brln-api; se o arquivo não puder ser criado, memory:// (limites
+    valem por processo).
+    """
+    uri = os.environ.get('RATELIMIT_STORAGE_URI')
+    if uri:
+        return uri
+    try:
+        _open_store(RATE_LIMIT_DB_PATH)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Aviso: rate limit em SQLite indisponível ({e}); usando memória, "
+              f"limites contados por processo")
+        return "memory://"
+    return f"{RATE_LIMIT_SCHEME}://{RATE_LIMIT_DB_PATH}"
@@ -8,17 +8,27 @@ This module integrates with the existing secure_password_manager to provide:
 - Master password validation using canary challenge-response
 - Automatic session timeout (5 minutes)
 - Secure session storage with encrypted passwords
+- Optional per-session cache of derived wallet keys (skips PBKDF2 on reloads)
+- Pluggable session backend (session_store): SQLite shared by every API
+  worker, or in-process memory; abandoned sessions removed by a sweeper
 """
 
 import time
+import hmac
+import hashlib
 import secrets
 import os
 import sys
+import threading
 from functools import wraps
 from flask import request, jsonify, g
 
 # Add brln-tools to path for secure_password_manager
-sys.path.insert(0, '/root/brln-os/brln-tools')
+# (brln-api user's directory when running as service, root for development)
+if os.path.exists('/home/brln-api/brln-tools'):
+    sys.path.insert(0, '/home/brln-api/brln-tools')
+else:
+    sys.path.insert(0, '/root/brln-os/brln-tools')
 
 try:
     from secure_password_manager import (
@@ -35,9 +45,10 @@ except ImportError as e:
     HAS_SECURE_PM = False
     SESSION_TIMEOUT_SECONDS = 300
 
-# In-memory session storage
-# In production, consider using Redis for multi-process support
-_sessions = {}
+from session_store import create_backend, SessionSweeper
+
+# Cache of derived Fernet keys per session (BRLN_DERIVED_KEY_CACHE=0 disables)
+DERIVED_KEY_CACHE_ENABLED = os.environ.get('BRLN_DERIVED_KEY_CACHE', '1') == '1'
 
 
 class SessionManager:
@@ -49,10 +60,35 @@ class SessionManager:
     - Automatic timeout after SESSION_TIMEOUT_SECONDS (5 minutes)
     - Secure session ID generation using secrets module
     - Memory cleanup on session destruction
+    - Expired sessions swept in the background, not only on access
     """
     
-    def __init__(self):
+    def __init__(self, backend=None):
         self.session_timeout = SESSION_TIMEOUT_SECONDS
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        self._sweeper = None
+        self._sweeper_pid = None
+        self._sweeper_lock = threading.Lock()
+    
+    @property
+    def backend(self):
+        """Session backend, created on first use (importing this module opens no files)"""
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = create_backend(self.session_timeout)
+        return self._backend
+    
+    def _ensure_sweeper(self):
+        """Start the expiry sweeper once per process (threads do not survive a fork)"""
+        if self._sweeper_pid == os.getpid():
+            return
+        with self._sweeper_lock:
+            if self._sweeper_pid != os.getpid():
+                self._sweeper = SessionSweeper(self.backend)
+                self._sweeper.start()
+                self._sweeper_pid = os.getpid()
     
     def authenticate(self, master_password):
         """
@@ -82,12 +118,15 @@ class SessionManager:
         # Create new session
         session_id = secrets.token_urlsafe(32)
         
-        _sessions[session_id] = {
+        now = time.time()
+        self.backend.create(session_id, {
             'master_password': master_password,
-            'created_at': time.time(),
-            'last_access': time.time(),
+            'created_at': now,
+            'last_access': now,
             'ip_address': request.remote_addr if request else 'unknown'
-        }
+        })
+        self._ensure_sweeper()
+        self._sweeper.schedule(now + self.session_timeout)
         
         # Log successful authentication
         self._log_auth_attempt(True, request.remote_addr if request else 'unknown')
@@ -107,21 +146,12 @@ class SessionManager:
         Returns:
             dict: Session data or None if expired/invalid
         """
-        if not session_id or session_id not in _sessions:
-            return None
-        
-        session = _sessions[session_id]
-        
-        # Check timeout
-        elapsed = time.time() - session['last_access']
-        if elapsed > self.session_timeout:
-            self.destroy_session(session_id)
+        if not session_id:
             return None
         
-        # Refresh last access time
-        session['last_access'] = time.time()
-        
-        return session
+        self._ensure_sweeper()
+        # Expired sessions are destroyed; valid ones get last_access refreshed
+        return self.backend.get(session_id)
     
     def get_master_password(self, session_id):
         """
@@ -148,20 +178,15 @@ class SessionManager:
         Returns:
             dict: Result with success status and new expiration
         """
-        if session_id not in _sessions:
+        if not session_id:
             return {'success': False, 'error': 'Session not found'}
         
-        session = _sessions[session_id]
-        elapsed = time.time() - session['last_access']
-        
-        if elapsed > self.session_timeout:
-            # Session already expired
-            self.destroy_session(session_id)
+        # Reset last_access to extend timeout (expired sessions are destroyed)
+        session = self.backend.get(session_id, force_touch=True)
+        if not session:
             return {'success': False, 'error': 'Session expired'}
         
-        # Reset last_access to extend timeout
         import datetime
-        session['last_access'] = time.time()
         new_expires = datetime.datetime.now() + datetime.timedelta(seconds=self.session_timeout)
         
         return {
@@ -176,10 +201,76 @@ class SessionManager:
         Args:
             session_id: The session ID to destroy
         """
-        if session_id in _sessions:
-            # Overwrite password with random data before deletion
-            _sessions[session_id]['master_password'] = secrets.token_bytes(64)
-            del _sessions[session_id]
+        if session_id:
+            # The backend overwrites/securely deletes the password and drops
+            # every derived wallet key bound to this session
+            self.backend.delete(session_id)
+    
+    def _password_check(self, session_id, password):
+        """Keyed fingerprint of the password that produced a cached key"""
+        secret = hmac.new(session_id.encode(), b'brln-derived-key-check', hashlib.sha256).digest()
+        return hmac.new(secret, password.encode(), hashlib.sha256).digest()
+    
+    def cache_derived_key(self, session_id, scope, salt, password, key):
+        """
+        Cache a derived encryption key for the rest of the session.
+        
+        Args:
+            session_id: The session ID
+            scope: What the key unlocks (e.g. the wallet_id)
+            salt: KDF salt stored with the encrypted data
+            password: Password the key was derived from
+            key: The derived (Fernet) key
+            
+        Returns:
+            bool: True if cached
+        """
+        if not DERIVED_KEY_CACHE_ENABLED:
+            return False
+        
+        session = self.get_session(session_id)
+        if not session:
+            return False
+        
+        return self.backend.put_key(session_id, (scope, bytes(salt)), {
+            'key': key,
+            'check': self._password_check(session_id, password),
+            'expires_at': time.time() + self.session_timeout
+        })
+    
+    def get_derived_key(self, session_id, scope, salt, password):
+        """
+        Get a cached derived key, only if it was derived from the same password.
+        
+        Args:
+            session_id: The session ID
+            scope: What the key unlocks (e.g. the wallet_id)
+            salt: KDF salt stored with the encrypted data
+            password: Password supplied for this request
+            
+        Returns:
+            bytes: The derived key or None (not cached, expired or other password)
+        """
+        if not DERIVED_KEY_CACHE_ENABLED:
+            return None
+        
+        session = self.get_session(session_id)
+        if not session:
+            return None
+        
+        cache_key = (scope, bytes(salt))
+        entry = self.backend.get_key(session_id, cache_key)
+        if not entry:
+            return None
+        
+        if time.time() > entry['expires_at']:
+            self.backend.drop_key(session_id, cache_key)
+            return None
+        
+        if not hmac.compare_digest(entry['check'], self._password_check(session_id, password)):
+            return None
+        
+        return entry['key']
     
     def is_authenticated(self, session_id):
         """
@@ -191,13 +282,10 @@ class SessionManager:
         Returns:
             bool: True if authenticated
         """
-        if not session_id or session_id not in _sessions:
+        if not session_id:
             return False
         
-        session = _sessions[session_id]
-        elapsed = time.time() - session['last_access']
-        
-        return elapsed <= self.session_timeout
+        return self.backend.get(session_id, touch=False) is not None
     
     def get_session_info(self, session_id):
         """
@@ -218,11 +306,20 @@ class SessionManager:
                 'created_at': session['created_at'],
                 'last_access': session['last_access'],
                 'ip_address': session['ip_address'],
+                'cached_keys': self.backend.count_keys(session_id),
                 'expires_in': expires_in,
                 'expires': expires_at.isoformat()
             }
         return None
     
+    def get_status(self):
+        """Backend, active sessions and sweep counters (no session data)"""
+        status = self.backend.get_status()
+        status['timeout'] = self.session_timeout
+        status['sweeper_running'] = bool(self._sweeper and self._sweeper.is_alive()
+                                         and self._sweeper_pid == os.getpid())
+        return status
+    
     def _log_auth_attempt(self, success, ip_address):
         """Log authentication attempt for audit trail"""
         import datetime
@@ -374,12 +471,23 @@ def get_master_password_from_session(session_id):
     return session_manager.get_master_password(session_id)
 
 
+def get_derived_key(session_id, scope, salt, password):
+    """Get cached derived key for this session"""
+    return session_manager.get_derived_key(session_id, scope, salt, password)
+
+
+def cache_derived_key(session_id, scope, salt, password, key):
+    """Cache derived key for this session"""
+    return session_manager.cache_derived_key(session_id, scope, salt, password, key)
+
+
 # For testing
 if __name__ == '__main__':
     print("Session Authentication Module")
     print("=" * 50)
     print(f"Secure Password Manager Available: {HAS_SECURE_PM}")
     print(f"Session Timeout: {SESSION_TIMEOUT_SECONDS} seconds")
+    print(f"Session Backend: {session_manager.backend.name}")
     
     if HAS_SECURE_PM:
         print(f"Password Manager Initialized: {is_initialized()}")
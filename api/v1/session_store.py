@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS Session Store
+
+Backends de armazenamento das sessões do session_auth:
+
+- MemorySessionBackend: dict do processo (um único worker); expiração
+  por min-heap de (expira_em, session_id)
+- SQLiteSessionBackend: arquivo SQLite em tmpfs (/run/brln-api), visível
+  a todos os workers do gunicorn/uvicorn. A senha mestra e as chaves
+  derivadas ficam criptografadas com uma chave derivada do próprio
+  session_id (o arquivo sozinho não revela nada sem o cookie) e cada
+  sessão é uma linha localizada pela chave primária SHA256(session_id)
+- SessionSweeper: thread que dorme até a próxima expiração e remove as
+  sessões abandonadas (antes só eram apagadas quando alguém as acessava)
+
+Escolha do backend: BRLN_SESSION_BACKEND=sqlite|memory (padrão sqlite,
+com queda para memory se o arquivo não puder ser criado).
+"""
+
+import os
+import time
+import json
+import hmac
+import heapq
+import base64
+import hashlib
+import secrets
+import sqlite3
+import threading
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from sqlite_store import SQLiteStore
+
+
+SESSION_BACKEND = os.environ.get('BRLN_SESSION_BACKEND', 'sqlite')
+SESSION_DB_PATH = os.environ.get('BRLN_SESSION_DB', '/run/brln-api/sessions.db')
+# Intervalo mínimo entre gravações de last_access no SQLite (a expiração
+# pode antecipar no máximo esse tanto)
+SESSION_TOUCH_INTERVAL = float(os.environ.get('BRLN_SESSION_TOUCH_INTERVAL', '5'))
+# O sweeper acorda ao menos a cada N segundos (sessões criadas por outros workers)
+SESSION_SWEEP_MAX_INTERVAL = 60
+SESSION_SWEEP_MIN_DELAY = 0.05
+
+
+class MemorySessionBackend:
+    """Sessões no processo atual; não compartilhadas entre workers"""
+
+    name = 'memory'
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sessions = {}
+        # session_id -> {(scope, salt): entrada de chave derivada}
+        self._keys = {}
+        # (expira_em, session_id): uma entrada por sessão, reagendada no
+        # sweep se o last_access avançou desde o push
+        self._heap = []
+        self._stats = {'created': 0, 'destroyed': 0, 'expired': 0, 'sweeps': 0}
+
+    def _remove(self, session_id):
+        """Remove sob self._lock, sobrescrevendo a senha antes"""
+        record = self._sessions.pop(session_id, None)
+        if record is not None:
+            record['master_password'] = secrets.token_bytes(64)
+        keys = self._keys.pop(session_id, None)
+        if keys:
+            keys.clear()
+        return record is not None
+
+    def create(self, session_id, record):
+        with self._lock:
+            self._sessions[session_id] = record
+            self._keys[session_id] = {}
+            heapq.heappush(self._heap, (record['last_access'] + self.timeout, session_id))
+            self._stats['created'] += 1
+
+    def get(self, session_id, touch=True, force_touch=False):
+        """Sessão válida (ou None); touch renova o last_access"""
+        now = time.time()
+        with self._lock:
+            record = self._sessions.get(session_id)
+            if record is None:
+                return None
+            if now - record['last_access'] > self.timeout:
+                self._remove(session_id)
+                self._stats['expired'] += 1
+                return None
+            if touch or force_touch:
+                record['last_access'] = now
+            return record
+
+    def delete(self, session_id):
+        with self._lock:
+            if self._remove(session_id):
+                self._stats['destroyed'] += 1
+
+    def put_key(self, session_id, cache_key, entry):
+        with self._lock:
+            keys = self._keys.get(session_id)
+            if keys is None:
+                return False
+            keys[cache_key] = entry
+            return True
+
+    def get_key(self, session_id, cache_key):
+        with self._lock:
+            return self._keys.get(session_id, {}).get(cache_key)
+
+    def drop_key(self, session_id, cache_key):
+        with self._lock:
+            self._keys.get(session_id, {}).pop(cache_key, None)
+
+    def count_keys(self, session_id):
+        with self._lock:
+            return len(self._keys.get(session_id, {}))
+
+    def next_expiry(self):
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def sweep(self, now):
+        """Remove as sessões vencidas a partir do topo do heap"""
+        removed = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, session_id = heapq.heappop(self._heap)
+                record = self._sessions.get(session_id)
+                if record is None:
+                    continue
+                deadline = record['last_access'] + self.timeout
+                if deadline > now:
+                    heapq.heappush(self._heap, (deadline, session_id))
+                    continue
+                self._remove(session_id)
+                removed += 1
+            self._stats['expired'] += removed
+            self._stats['sweeps'] += 1
+        return removed
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'backend': self.name,
+                'active_sessions': len(self._sessions),
+                'scheduled_expiries': len(self._heap),
+                **self._stats
+            }
+
+
+def _session_hash(session_id):
+    """Chave primária da sessão no arquivo (o session_id em si não é gravado)"""
+    return hashlib.sha256(session_id.encode()).hexdigest()
+
+
+def _session_cipher(session_id):
+    """Fernet com chave derivada do session_id (só quem tem o cookie decifra)"""
+    key = hmac.new(session_id.encode(), b'brln-session-record', hashlib.sha256).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+class _SessionSQLiteStore(SQLiteStore):
+    """SQLiteStore com secure_delete: páginas liberadas são zeradas"""
+
+    def _connect(self):
+        conn = super()._connect()
+        conn.execute('PRAGMA secure_delete=ON')
+        return conn
+
+
+def _session_schema_v1(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_hash TEXT PRIMARY KEY,
+            encrypted_record BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            ip_address TEXT
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS session_keys (
+            session_hash TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            salt BLOB NOT NULL,
+            encrypted_key BLOB NOT NULL,
+            key_check BLOB NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (session_hash, scope, salt)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_session_keys_expires ON session_keys(expires_at)')
+
+SESSION_MIGRATIONS = [
+    (1, 'sessões e chaves derivadas', _session_schema_v1),
+]
+
+
+class SQLiteSessionBackend:
+    """
+    Sessões compartilhadas entre processos em um arquivo SQLite.
+
+    O índice em expires_at faz o papel do min-heap: a próxima expiração é
+    o menor valor do índice e o sweep apaga a faixa vencida de uma vez.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, timeout, path=SESSION_DB_PATH):
+        self.timeout = timeout
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Só o usuário da API lê o arquivo (WAL/SHM herdam a permissão)
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+        self.store = _SessionSQLiteStore(path, pool_size=4)
+        self.store.migrate(SESSION_MIGRATIONS)
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'destroyed': 0, 'expired': 0, 'sweeps': 0, 'touches': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def create(self, session_id, record):
+        encrypted = _session_cipher(session_id).encrypt(
+            json.dumps({'master_password': record['master_password']}).encode())
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('''
+                INSERT OR REPLACE INTO sessions
+                (session_hash, encrypted_record, created_at, last_access, expires_at, ip_address)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (_session_hash(session_id), encrypted, record['created_at'], record['last_access'],
+                  record['last_access'] + self.timeout, record['ip_address']))
+        self._count('created')
+
+    def get(self, session_id, touch=True, force_touch=False):
+        """Sessão válida (ou None); touch renova o last_access a cada SESSION_TOUCH_INTERVAL"""
+        session_hash = _session_hash(session_id)
+        now = time.time()
+        with self.store.transaction() as cursor:
+            cursor.execute('''
+                SELECT encrypted_record, created_at, last_access, ip_address
+                FROM sessions WHERE session_hash = ?
+            ''', (session_hash,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+
+        encrypted, created_at, last_access, ip_address = row
+        if now - last_access > self.timeout:
+            self.delete(session_id)
+            self._count('expired')
+            return None
+        try:
+            master_password = json.loads(_session_cipher(session_id).decrypt(encrypted))['master_password']
+        except (InvalidToken, ValueError, KeyError):
+            return None
+
+        if force_touch or (touch and now - last_access >= SESSION_TOUCH_INTERVAL):
+            with self.store.transaction(immediate=True) as cursor:
+                cursor.execute('''
+                    UPDATE sessions SET last_access = ?, expires_at = ?
+                    WHERE session_hash = ? AND last_access < ?
+                ''', (now, now + self.timeout, session_hash, now))
+            last_access = now
+            self._count('touches')
+
+        return {
+            'master_password': master_password,
+            'created_at': created_at,
+            'last_access': last_access,
+            'ip_address': ip_address
+        }
+
+    def delete(self, session_id):
+        session_hash = _session_hash(session_id)
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('DELETE FROM session_keys WHERE session_hash = ?', (session_hash,))
+            cursor.execute('DELETE FROM sessions WHERE session_hash = ?', (session_hash,))
+            deleted = cursor.rowcount
+        if deleted:
+            self._count('destroyed')
+
+    def put_key(self, session_id, cache_key, entry):
+        scope, salt = cache_key
+        encrypted_key = _session_cipher(session_id).encrypt(entry['key'])
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('''
+                INSERT OR REPLACE INTO session_keys
+                (session_hash, scope, salt, encrypted_key, key_check, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (_session_hash(session_id), scope, salt, encrypted_key, entry['check'], entry['expires_at']))
+        return True
+
+    def get_key(self, session_id, cache_key):
+        scope, salt = cache_key
+        with self.store.transaction() as cursor:
+            cursor.execute('''
+                SELECT encrypted_key, key_check, expires_at FROM session_keys
+                WHERE session_hash = ? AND scope = ? AND salt = ?
+            ''', (_session_hash(session_id), scope, salt))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        try:
+            key = _session_cipher(session_id).decrypt(row[0])
+        except InvalidToken:
+            return None
+        return {'key': key, 'check': row[1], 'expires_at': row[2]}
+
+    def drop_key(self, session_id, cache_key):
+        scope, salt = cache_key
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('DELETE FROM session_keys WHERE session_hash = ? AND scope = ? AND salt = ?',
+                           (_session_hash(session_id), scope, salt))
+
+    def count_keys(self, session_id):
+        with self.store.transaction() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM session_keys WHERE session_hash = ?', (_session_hash(session_id),))
+            return cursor.fetchone()[0]
+
+    def next_expiry(self):
+        with self.store.transaction() as cursor:
+            cursor.execute('SELECT MIN(expires_at) FROM sessions')
+            return cursor.fetchone()[0]
+
+    def sweep(self, now):
+        """Apaga sessões vencidas e chaves vencidas ou órfãs (idempotente entre workers)"""
+        with self.store.transaction(immediate=True) as cursor:
+            cursor.execute('DELETE FROM sessions WHERE expires_at <= ?', (now,))
+            removed = cursor.rowcount
+            cursor.execute('''
+                DELETE FROM session_keys
+                WHERE expires_at <= ? OR session_hash NOT IN (SELECT session_hash FROM sessions)
+            ''', (now,))
+        self._count('expired', removed)
+        self._count('sweeps')
+        return removed
+
+    def get_status(self):
+        with self.store.transaction() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM sessions')
+            active = cursor.fetchone()[0]
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'active_sessions': active,
+            'touch_interval': SESSION_TOUCH_INTERVAL,
+            **stats
+        }
+
+
+class SessionSweeper(threading.Thread):
+    """Dorme até a próxima expiração do backend e remove as sessões vencidas"""
+
+    def __init__(self, backend, max_interval=SESSION_SWEEP_MAX_INTERVAL):
+        super().__init__(name='session-sweeper', daemon=True)
+        self.backend = backend
+        self.max_interval = max_interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._next_wakeup = 0
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                next_expiry = self.backend.next_expiry()
+            except Exception as e:
+                print(f"Aviso: sweeper de sessões: {e}")
+                next_expiry = None
+
+            delay = self.max_interval
+            if next_expiry is not None:
+                delay = min(self.max_interval, max(SESSION_SWEEP_MIN_DELAY, next_expiry - time.time()))
+            self._next_wakeup = time.time() + delay
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+
+            try:
+                self.backend.sweep(time.time())
+            except Exception as e:
+                print(f"Aviso: limpeza de sessões falhou: {e}")
+
+    def schedule(self, deadline):
+        """Nova sessão vence antes do próximo despertar: recalcula o sono"""
+        if deadline < self._next_wakeup:
+            self._wake.set()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+
+def create_backend(timeout, backend=SESSION_BACKEND, path=SESSION_DB_PATH):
+    """Backend configurado; SQLite indisponível cai para memória (um worker só)"""
+    if backend == 'sqlite':
+        try:
+            return SQLiteSessionBackend(timeout, path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Aviso: sessões em SQLite indisponíveis ({e}); usando memória, "
+                  f"válidas apenas neste processo")
+    elif backend != 'memory':
+        print(f"Aviso: BRLN_SESSION_BACKEND={backend} desconhecido; usando memória")
+    return MemorySessionBackend(timeout)
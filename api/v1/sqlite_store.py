@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS SQLite Store
+
+Camada compartilhada de acesso aos bancos SQLite da API (wallets.db e
+lightning_chat.db):
+
+- Conexões reaproveitadas: cada thread usa uma conexão durante a transação e
+  a devolve a um pool ao sair (threads de request do Flask são curtas)
+- WAL, synchronous=NORMAL, busy_timeout e mmap configurados em toda conexão
+- Cache de prepared statements do módulo sqlite3 (cached_statements)
+- Um único context manager de transação (commit/rollback), reentrante na
+  mesma thread
+- Pool descartado após fork (gunicorn), sem reutilizar conexões herdadas
+- Migrações versionadas por PRAGMA user_version
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(64 * 1024 * 1024)))
+SQLITE_CACHED_STATEMENTS = 256
+# Conexões ociosas mantidas por banco
+SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', '8'))
+
+
+class SQLiteStore:
+    """Pool de conexões configuradas para um arquivo SQLite"""
+
+    def __init__(self, path, pool_size=SQLITE_POOL_SIZE):
+        self.path = path
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._stats = {
+            'connections_opened': 0,
+            'transactions': 0,
+            'rollbacks': 0,
+            'busy_errors': 0,
+            'begin_wait_ms_total': 0.0,
+        }
+
+    def _connect(self):
+        """Abre uma conexão nova com os PRAGMAs da API"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None: transações explícitas em transaction(),
+        # leituras fora delas não seguram snapshot do WAL
+        conn = sqlite3.connect(
+            self.path,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=SQLITE_CACHED_STATEMENTS
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+        conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+
+        with self._lock:
+            self._stats['connections_opened'] += 1
+        return conn
+
+    def _check_fork(self):
+        """Após fork, descarta conexões herdadas do processo pai"""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._idle = deque()
+                    self._local = threading.local()
+                    self._pid = os.getpid()
+
+    def _acquire(self):
+        self._check_fork()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Executa um bloco em uma transação e entrega um cursor.
+
+        Commit ao sair sem erro, rollback em exceção. Chamadas aninhadas na
+        mesma thread reutilizam a transação externa. immediate=True pega o
+        lock de escrita já no BEGIN (evita SQLITE_BUSY ao promover leitura
+        para escrita no meio da transação).
+        """
+        self._check_fork()
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is not None:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+
+        conn = self._acquire()
+        local.conn = conn
+        cursor = conn.cursor()
+        try:
+            start = time.perf_counter()
+            try:
+                conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            except sqlite3.OperationalError as e:
+                if 'locked' in str(e) or 'busy' in str(e):
+                    with self._lock:
+                        self._stats['busy_errors'] += 1
+                raise
+            with self._lock:
+                self._stats['begin_wait_ms_total'] += (time.perf_counter() - start) * 1000
+
+            try:
+                yield cursor
+            except BaseException:
+                conn.rollback()
+                with self._lock:
+                    self._stats['rollbacks'] += 1
+                raise
+            conn.commit()
+            with self._lock:
+                self._stats['transactions'] += 1
+        finally:
+            cursor.close()
+            local.conn = None
+            self._release(conn)
+
+    def get_user_version(self):
+        """Versão do schema gravada no arquivo (PRAGMA user_version)"""
+        with self.transaction() as cursor:
+            cursor.execute('PRAGMA user_version')
+            return cursor.fetchone()[0]
+
+    def migrate(self, migrations):
+        """
+        Aplica as migrações pendentes e retorna as versões aplicadas.
+
+        migrations: lista ordenada de (versão, descrição, função(cursor)).
+        Cada passo roda em sua própria transação junto com o novo
+        user_version, então um passo interrompido é repetido por inteiro na
+        próxima inicialização. Banco atualizado: uma única leitura do
+        user_version, sem introspecção de schema.
+        """
+        latest = migrations[-1][0] if migrations else 0
+        if self.get_user_version() >= latest:
+            return []
+
+        applied = []
+        for version, description, step in migrations:
+            with self.transaction(immediate=True) as cursor:
+                # Reler sob o lock de escrita: outro processo pode ter migrado
+                cursor.execute('PRAGMA user_version')
+                if cursor.fetchone()[0] >= version:
+                    continue
+                step(cursor)
+                cursor.execute(f'PRAGMA user_version = {int(version)}')
+            print(f"{os.path.basename(self.path)}: migração v{version} aplicada ({description})")
+            applied.append(version)
+        return applied
+
+    def close(self):
+        """Fecha as conexões ociosas (as em uso fecham ao serem devolvidas)"""
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+            self.pool_size = 0
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def get_status(self):
+        """Estado do pool para /system/health e benchmarks"""
+        with self._lock:
+            stats = dict(self._stats)
+            idle = len(self._idle)
+        stats['begin_wait_ms_total'] = round(stats['begin_wait_ms_total'], 2)
+        return {
+            'path': self.path,
+            'user_version': self.get_user_version(),
+            'idle_connections': idle,
+            'pool_size': self.pool_size,
+            'busy_timeout_ms': SQLITE_BUSY_TIMEOUT_MS,
+            'mmap_size': SQLITE_MMAP_SIZE,
+            **stats
+        }
+
+
+def add_missing_columns(cursor, table, columns):
+    """
+    Adiciona colunas ausentes (bancos anteriores ao versionamento).
+
+    columns: lista de (nome, declaração). Usado só dentro de migrações, que
+    rodam uma vez por banco.
+    """
+    cursor.execute(f"SELECT name FROM pragma_table_info('{table}')")
+    existing = {row[0] for row in cursor.fetchall()}
+    added = []
+    for name, declaration in columns:
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {declaration}')
+            added.append(name)
+    return added
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - serviços systemd
+
+Mapeamento dos serviços do node, estado via D-Bus (SystemdStatusMonitor)
+com fallback para systemctl, e start/stop/restart.
+"""
+
+import subprocess
+import time
+import threading
+
+
+try:
+    from pydbus import SystemBus
+    PYDBUS_AVAILABLE = True
+except ImportError:
+    PYDBUS_AVAILABLE = False
+    print("Warning: pydbus not available, falling back to subprocess for systemd")
+
+# Mapeamento de serviços
+SERVICE_MAPPING = {
+    'lnbits': 'lnbits.service',
+    'thunderhub': 'thunderhub.service',
+    'simple': 'simple-lnwallet.service',
+    'lndg': 'lndg.service',
+    'lndg-controller': 'lndg-controller.service',
+    'lnd': 'lnd.service',
+    'bitcoind': 'bitcoind.service',
+    'elementsd': 'elementsd.service',
+    'bos-telegram': 'bos-telegram.service',
+    'tor': 'tor@default.service',
+    'gotty-fullauto': 'gotty-fullauto.service'
+}
+
+def run_command(command):
+    """Executa um comando shell e retorna o output (usado apenas para CLIs externos)"""
+    try:
+        result = subprocess.run(
+            command,
+            shell=True,
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        return result.stdout.strip(), result.returncode
+    except subprocess.TimeoutExpired:
+        return "", 1
+    except Exception as e:
+        return str(e), 1
+
+class SystemdStatusMonitor:
+    """
+    Cache do ActiveState das units do SERVICE_MAPPING.
+
+    Usa uma única conexão D-Bus: o estado de todas as units vem de uma só
+    chamada ListUnitsByNames e depois é mantido pelos sinais PropertiesChanged,
+    então a leitura no caminho quente não faz nenhum round-trip.
+    Sem pydbus, usa um único 'systemctl is-active' para todas as units.
+    """
+
+    UNIT_IFACE = 'org.freedesktop.systemd1.Unit'
+    # Sem sinais ao vivo o cache é recarregado após N segundos
+    CACHE_TTL = 5
+
+    def __init__(self, unit_names):
+        self.unit_names = list(unit_names)
+        self._states = {}
+        self._path_to_unit = {}
+        self._loaded_at = 0.0
+        self._live = False
+        self._started = False
+        self._bus = None
+        self._systemd = None
+        self._lock = threading.Lock()
+        self._bus_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._subscriptions = []
+
+    def get_bus(self):
+        """Retorna (bus, systemd) da conexão D-Bus compartilhada"""
+        with self._bus_lock:
+            if self._bus is None:
+                self._bus = SystemBus()
+                self._systemd = self._bus.get('.systemd1')
+            return self._bus, self._systemd
+
+    def _reset_bus(self):
+        with self._bus_lock:
+            self._bus = None
+            self._systemd = None
+        with self._lock:
+            self._live = False
+            self._subscriptions = []
+
+    def query(self, unit_names):
+        """
+        Consulta o estado das units em uma única chamada.
+
+        Returns:
+            dict: {unit_name: (active_state, object_path)}
+        """
+        if PYDBUS_AVAILABLE:
+            try:
+                _, systemd = self.get_bus()
+                units = systemd.ListUnitsByNames(list(unit_names))
+                # (name, description, load, active, sub, following, path, ...)
+                return {unit[0]: (unit[3], unit[6]) for unit in units}
+            except Exception as e:
+                print(f"Error getting service status via D-Bus: {e}")
+                self._reset_bus()
+
+        # Fallback: um único systemctl, uma linha por unit na mesma ordem
+        output, code = run_command(f"systemctl is-active {' '.join(unit_names)}")
+        lines = output.splitlines()
+        if len(lines) != len(unit_names):
+            return {}
+        return {name: (state.strip(), None) for name, state in zip(unit_names, lines)}
+
+    def _reload(self):
+        units = self.query(self.unit_names)
+        with self._lock:
+            for name, (state, path) in units.items():
+                self._states[name] = state
+                if path:
+                    self._path_to_unit[path] = name
+            self._loaded_at = time.time()
+
+    def _on_properties_changed(self, sender, object_path, iface, signal, params):
+        """Atualiza o cache a partir de org.freedesktop.DBus.Properties.PropertiesChanged"""
+        interface, changed, invalidated = params
+        if interface != self.UNIT_IFACE:
+            return
+
+        with self._lock:
+            name = self._path_to_unit.get(object_path)
+            if name is None:
+                return
+            if 'ActiveState' in changed:
+                self._states[name] = changed['ActiveState']
+            elif 'ActiveState' in invalidated:
+                # Sem valor no sinal: força recarga na próxima leitura
+                self._loaded_at = 0.0
+
+    def _start_signal_listener(self):
+        """Assina PropertiesChanged das units e roda o main loop GLib em uma thread"""
+        try:
+            from gi.repository import GLib
+        except ImportError:
+            print("Warning: GLib not available, systemd status cache will be polled")
+            return False
+
+        bus, systemd = self.get_bus()
+        # Sem Subscribe() o systemd não emite sinais das units
+        systemd.Subscribe()
+
+        with self._lock:
+            paths = list(self._path_to_unit)
+
+        subscriptions = []
+        for path in paths:
+            subscriptions.append(bus.subscribe(
+                iface='org.freedesktop.DBus.Properties',
+                signal='PropertiesChanged',
+                object=path,
+                signal_fired=self._on_properties_changed
+            ))
+
+        loop_thread = threading.Thread(target=GLib.MainLoop().run, daemon=True, name="SystemdSignalLoop")
+        loop_thread.start()
+
+        with self._lock:
+            self._subscriptions = subscriptions
+        return True
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._init_lock:
+            if self._started:
+                return
+            self._started = True
+            self._reload()
+            if PYDBUS_AVAILABLE and self._path_to_unit:
+                try:
+                    live = self._start_signal_listener()
+                    # Recarrega para não perder mudanças entre a carga e a assinatura
+                    self._reload()
+                    with self._lock:
+                        self._live = live
+                except Exception as e:
+                    print(f"Warning: Could not subscribe to systemd signals: {e}")
+
+    def get_states(self, refresh=False):
+        """Retorna {unit_name: active_state} das units monitoradas"""
+        self._ensure_started()
+
+        with self._lock:
+            fresh = self._live and self._loaded_at > 0
+            fresh = fresh or (time.time() - self._loaded_at < self.CACHE_TTL)
+            if not refresh and fresh and self._states:
+                return dict(self._states)
+
+        self._reload()
+        with self._lock:
+            return dict(self._states)
+
+    def is_active(self, unit_name, refresh=False):
+        """Verifica se uma unit está ativa"""
+        if unit_name in self.unit_names:
+            return self.get_states(refresh=refresh).get(unit_name) == 'active'
+
+        state, _ = self.query([unit_name]).get(unit_name, (None, None))
+        return state == 'active'
+
+
+systemd_monitor = SystemdStatusMonitor(SERVICE_MAPPING.values())
+
+def get_service_status(service_name, use_cache=True):
+    """Verifica se um serviço está rodando usando D-Bus/systemd (cache atualizado por sinais)"""
+    return systemd_monitor.is_active(service_name, refresh=not use_cache)
+
+def manage_systemd_service(service_name, action):
+    """Gerencia um serviço systemd usando D-Bus"""
+    if PYDBUS_AVAILABLE:
+        try:
+            bus, systemd = systemd_monitor.get_bus()
+            unit_path = systemd.GetUnit(service_name)
+            unit = bus.get('.systemd1', unit_path)
+            
+            if action == 'start':
+                unit.Start('replace')
+            elif action == 'stop':
+                unit.Stop('replace')
+            elif action == 'restart':
+                unit.Restart('replace')
+            
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+    
+    # Fallback: usar subprocess com sudo
+    command = f"sudo systemctl {action} {service_name}"
+    output, code = run_command(command)
+    return code == 0, output
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - status do sistema
+
+Snapshot de CPU, RAM, LND, bitcoind, Tor e blockchain amostrado em
+segundo plano (SystemStatusCollector, iniciado na primeira leitura).
+"""
+
+import os
+import psutil
+import time
+import threading
+
+from node_rpc import bitcoin_rpc_client
+from system_services import get_service_status
+from lightning_service import get_lnd_info
+
+
+def fetch_blockchain_info():
+    """getblockchaininfo do Bitcoin Core (RuntimeError se parado ou sem RPC)"""
+    if not get_service_status('bitcoind.service'):
+        raise RuntimeError("Serviço bitcoind não está rodando")
+    
+    info, error = bitcoin_rpc_client.get_blockchain_info()
+    if error or not info:
+        raise RuntimeError(f"Não foi possível obter informações do Bitcoin Core via RPC: {error}")
+    return info
+
+def get_bitcoind_info(info=None):
+    """Obtém informações do Bitcoin Core (info: getblockchaininfo já obtido)"""
+    if info is None:
+        info = fetch_blockchain_info()
+        
+    return {
+        'status': 'running',
+        'blocks': info.get('blocks', 0),
+        'progress': round(info.get('verificationprogress', 0) * 100, 2)
+    }
+
+def get_blockchain_size(info=None):
+    """Obtém o tamanho da blockchain via RPC (size_on_disk; info: getblockchaininfo já obtido)"""
+    if info is None:
+        info = fetch_blockchain_info()
+
+    total_size = info.get('size_on_disk', 0)
+
+    # Converter para formato legível
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if total_size < 1024.0:
+            return f"{total_size:.1f}{unit}"
+        total_size /= 1024.0
+    return f"{total_size:.1f}PB"
+
+# === COLETOR DE STATUS DO SISTEMA ===
+# O status é amostrado em segundo plano para que /system/status não bloqueie
+# um worker do Flask (cpu_percent(interval=1) custava >1s por requisição)
+
+STATUS_SAMPLE_INTERVAL = float(os.getenv('STATUS_SAMPLE_INTERVAL', '5'))
+
+
+class SystemStatusCollector:
+    """Mantém um snapshot com timestamp de CPU, RAM, LND, bitcoind, Tor e blockchain"""
+
+    def __init__(self, interval=STATUS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._snapshot = None
+        self._sampled_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread de amostragem (idempotente)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name="SystemStatusCollector"
+            )
+            self._thread.start()
+
+    def _run(self):
+        # Primeira chamada só inicializa o contador de CPU do psutil
+        psutil.cpu_percent(interval=None)
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Erro no coletor de status: {e}")
+            time.sleep(self.interval)
+
+    def _collect(self):
+        """Coleta todas as métricas (lento: gRPC + RPC do bitcoind)"""
+        # CPU desde a última amostra, sem bloquear
+        cpu_percent = psutil.cpu_percent(interval=None)
+        load_avg = os.getloadavg()
+
+        # RAM
+        ram = psutil.virtual_memory()
+
+        # LND Info (pode gerar exceção)
+        try:
+            lnd_info = get_lnd_info()
+        except Exception as e:
+            lnd_info = {
+                'status': 'error',
+                'error': str(e)
+            }
+
+        # Bitcoin Info e tamanho da blockchain: uma única getblockchaininfo
+        # por amostra (pode gerar exceção)
+        try:
+            chain_info, chain_error = fetch_blockchain_info(), None
+        except Exception as e:
+            chain_info, chain_error = None, str(e)
+
+        if chain_info is not None:
+            bitcoin_info = get_bitcoind_info(chain_info)
+            blockchain_size = get_blockchain_size(chain_info)
+        else:
+            bitcoin_info = {
+                'status': 'error',
+                'error': chain_error
+            }
+            blockchain_size = f"Error: {chain_error}"
+
+        # Tor Status
+        tor_active = get_service_status('tor@default.service')
+
+        return {
+            'cpu': {
+                'usage': round(cpu_percent, 2),
+                'load': f"{load_avg[0]:.2f}, {load_avg[1]:.2f}, {load_avg[2]:.2f}"
+            },
+            'ram': {
+                'used': f"{ram.used / (1024**3):.1f}GB",
+                'total': f"{ram.total / (1024**3):.1f}GB",
+                'percentage': round(ram.percent, 1)
+            },
+            'lnd': lnd_info,
+            'bitcoind': bitcoin_info,
+            'tor': {
+                'status': 'running' if tor_active else 'stopped'
+            },
+            'blockchain': {
+                'size': blockchain_size,
+                'progress': bitcoin_info.get('progress', 0) if bitcoin_info.get('status') != 'error' else 0
+            }
+        }
+
+    def refresh(self):
+        """Coleta um novo snapshot; chamadas concorrentes aguardam a coleta em andamento"""
+        requested_at = time.time()
+        with self._refresh_lock:
+            with self._lock:
+                if self._snapshot is not None and self._sampled_at >= requested_at:
+                    return self._snapshot, self._sampled_at
+
+            snapshot = self._collect()
+            sampled_at = time.time()
+
+            with self._lock:
+                self._snapshot = snapshot
+                self._sampled_at = sampled_at
+            return snapshot, sampled_at
+
+    def get_snapshot(self, max_age=None):
+        """
+        Retorna (snapshot, sampled_at). Se o snapshot for mais antigo que
+        max_age segundos (ou ainda não existir), coleta um novo na hora.
+        """
+        self.start()
+
+        with self._lock:
+            snapshot, sampled_at = self._snapshot, self._sampled_at
+
+        if snapshot is None or (max_age is not None and time.time() - sampled_at > max_age):
+            snapshot, sampled_at = self.refresh()
+
+        return snapshot, sampled_at
+
+
+status_collector = SystemStatusCollector()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - criptografia das wallets
+
+Derivação de chave (descritores do brln_kdf, PBKDF2 legado), limite de
+KDFs simultâneos e cache de chaves por sessão.
+"""
+
+import os
+import hashlib
+import threading
+import base64
+import secrets
+from cryptography.fernet import Fernet
+from flask import g, has_request_context
+
+from api_common import session_cache_derived_key, session_get_derived_key
+
+
+# Descritores de KDF (PBKDF2/scrypt/Argon2id) calibrados por máquina
+try:
+    import brln_kdf
+    HAS_BRLN_KDF = True
+except ImportError as e:
+    HAS_BRLN_KDF = False
+    print(f"Warning: brln_kdf not available, using legacy PBKDF2: {e}")
+
+# === ENCRYPTION HELPER FUNCTIONS ===
+
+# Use same high iteration count as secure_password_manager for consistency
+# (entradas legadas, kdf NULL; novas usam brln_kdf.current_descriptor())
+PBKDF2_ITERATIONS = 500000  # Quantum-resistant iterations (matches secure_password_manager)
+
+# Máximo de derivações PBKDF2 simultâneas (inline ou em job); o resto espera
+KDF_MAX_CONCURRENT = int(os.environ.get('KDF_MAX_CONCURRENT', str(max(1, (os.cpu_count() or 2) // 2))))
+_kdf_semaphore = threading.BoundedSemaphore(KDF_MAX_CONCURRENT)
+
+def current_kdf():
+    """Descritor de KDF para novos segredos (None = PBKDF2 legado)"""
+    return brln_kdf.current_descriptor() if HAS_BRLN_KDF else None
+
+def kdf_needs_upgrade(kdf):
+    """Se o segredo deve ser recriptografado com o descritor atual"""
+    return HAS_BRLN_KDF and brln_kdf.needs_upgrade(kdf)
+
+def derive_key_from_password(password, salt, kdf=None):
+    """
+    Deriva chave de criptografia da senha: SHA256(senha + salt) esticado
+    pelo KDF do descritor (None = PBKDF2 com PBKDF2_ITERATIONS)
+    """
+    password_salt = password.encode() + salt
+    password_hash = hashlib.sha256(password_salt).digest()
+    
+    # hashlib (pbkdf2_hmac/scrypt) e argon2 soltam o GIL durante a
+    # derivação: os outros requests continuam sendo atendidos
+    with _kdf_semaphore:
+        if kdf:
+            if not HAS_BRLN_KDF:
+                raise Exception(f"KDF {kdf} requires brln_kdf")
+            derived = brln_kdf.derive(kdf, password_hash, salt)
+        else:
+            derived = hashlib.pbkdf2_hmac('sha256', password_hash, salt, PBKDF2_ITERATIONS, dklen=32)
+    return base64.urlsafe_b64encode(derived)
+
+def _current_session_id():
+    """Sessão autenticada do request atual (g preenchido por require_auth/optional_auth)"""
+    if not has_request_context():
+        return None
+    return getattr(g, 'session_id', None)
+
+def decrypt_with_session_cache(encrypted_data, password, salt, scope, kdf=None):
+    """
+    Descriptografa reaproveitando a chave derivada em cache na sessão.
+    
+    scope identifica o segredo (wallet_id, carteira TRON...). A chave só é
+    guardada depois de uma descriptografia bem-sucedida e só é reutilizada
+    com a mesma senha; expira com a sessão e some em destroy_session.
+    """
+    session_id = _current_session_id()
+    key = None
+    if session_id and scope:
+        key = session_get_derived_key(session_id, scope, salt, password)
+    
+    cached = key is not None
+    if not cached:
+        key = derive_key_from_password(password, salt, kdf)
+    
+    plaintext = Fernet(key).decrypt(encrypted_data).decode()
+    
+    if session_id and scope and not cached:
+        session_cache_derived_key(session_id, scope, salt, password, key)
+    return plaintext
+
+def encrypt_data(data, password, kdf=None):
+    """Criptografa dados com senha (kdf: descritor a gravar junto do salt)"""
+    try:
+        salt = secrets.token_bytes(32)
+        key = derive_key_from_password(password, salt, kdf)
+        fernet = Fernet(key)
+        encrypted = fernet.encrypt(data.encode())
+        return encrypted, salt
+    except Exception as e:
+        raise Exception(f"Encryption error: {str(e)}")
+
+def decrypt_data(encrypted_data, password, salt, scope=None, kdf=None):
+    """Descriptografa dados com senha (com scope, usa o cache de chaves da sessão)"""
+    try:
+        return decrypt_with_session_cache(encrypted_data, password, salt, scope, kdf)
+    except Exception as e:
+        raise Exception(f"Decryption error: {str(e)}")
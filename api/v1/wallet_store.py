@@ -0,0 +1,1246 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - wallets HD
+
+Schema de wallets.db, WalletManager (BIP39/BIP32, derivação e dono de
+endereços) e integração das wallets com LND/Elements/TRON. O diretório
+/data/brln-wallet e as migrações são aplicados em init_wallet_storage().
+"""
+
+import os
+import subprocess
+import json
+from datetime import datetime
+import hashlib
+import threading
+import base64
+import secrets
+from cryptography.fernet import Fernet
+
+from sqlite_store import SQLiteStore, add_missing_columns
+from wallet_crypto import (
+    PBKDF2_ITERATIONS, current_kdf, decrypt_with_session_cache, derive_key_from_password,
+    kdf_needs_upgrade
+)
+
+
+try:
+    import mnemonic
+    from bip32 import BIP32
+    HAS_WALLET_LIBS = True
+    print("Wallet crypto libraries loaded successfully")
+except ImportError as e:
+    HAS_WALLET_LIBS = False
+    print(f"Warning: Wallet crypto libraries not available: {e}")
+    print("Install with: pip install mnemonic bip32utils")
+
+# Configurações do Wallet HD
+WALLET_DATA_DIR = "/data/brln-wallet"
+WALLET_DB_PATH = os.path.join(WALLET_DATA_DIR, "wallets.db")
+
+# Conexões compartilhadas (WAL, busy_timeout) - ver sqlite_store.py; o
+# arquivo só é aberto na primeira transação
+wallet_db = SQLiteStore(WALLET_DB_PATH)
+
+# Configuração das blockchains suportadas
+SUPPORTED_CHAINS = {
+    'bitcoin': {
+        'name': 'Bitcoin',
+        'symbol': 'BTC',
+        'coin_type': 0,
+        'path': "m/44'/0'/0'/0/0",
+        'api_urls': [
+            'https://mempool.space/api/address/',
+            'https://blockstream.info/api/address/',
+            'https://blockchain.info/q/addressbalance/'
+        ]
+    },
+    'ethereum': {
+        'name': 'Ethereum',
+        'symbol': 'ETH',
+        'coin_type': 60,
+        'path': "m/44'/60'/0'/0/0",
+        'api_urls': [
+            'https://api.etherscan.io/api',
+            'https://eth-mainnet.g.alchemy.com/v2/demo',
+            'https://mainnet.infura.io/v3/9aa3d95b3bc440fa88ea12eaa4456161'
+        ]
+    },
+    'liquid': {
+        'name': 'Liquid Network',
+        'symbol': 'L-BTC',
+        'coin_type': 1776,
+        'path': "m/44'/1776'/0'/0/0",
+        'api_urls': [
+            'https://liquid.network/api/address/',
+            'https://blockstream.info/liquid/api/address/'
+        ]
+    },
+    'tron': {
+        'name': 'TRON',
+        'symbol': 'TRX',
+        'coin_type': 195,
+        'path': "m/44'/195'/0'/0/0",
+        'api_urls': [
+            'https://api.trongrid.io/wallet/getaccount',
+            'https://apilist.tronscanapi.com/api/account'
+        ]
+    },
+    'solana': {
+        'name': 'Solana',
+        'symbol': 'SOL',
+        'coin_type': 501,
+        'path': "m/44'/501'/0'/0'",
+        'api_urls': [
+            'https://api.mainnet-beta.solana.com',
+            'https://rpc.helius.xyz/?api-key=demo'
+        ]
+    }
+}
+
+# === WALLET MANAGEMENT SYSTEM ===
+
+def _wallet_schema_v1(cursor):
+    """Schema base: wallets, cache de endereços e configuração TRON"""
+    # Tabela para armazenar wallets criptografadas
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wallets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            wallet_id TEXT UNIQUE NOT NULL,
+            encrypted_mnemonic BLOB NOT NULL,
+            salt BLOB NOT NULL,
+            has_password BOOLEAN DEFAULT FALSE,
+            metadata TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            last_used DATETIME DEFAULT CURRENT_TIMESTAMP,
+            encrypted_private_keys BLOB,
+            is_system_default BOOLEAN DEFAULT FALSE
+        )
+    ''')
+    
+    # Bancos criados antes do versionamento podem não ter estas colunas
+    added = add_missing_columns(cursor, 'wallets', [
+        ('has_password', 'BOOLEAN DEFAULT FALSE'),
+        ('encrypted_private_keys', 'BLOB'),
+        ('is_system_default', 'BOOLEAN DEFAULT FALSE'),
+    ])
+    for column in added:
+        print(f"Added {column} column to existing wallets table")
+    
+    # Tabela para cache de endereços derivados
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS derived_addresses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            wallet_id TEXT NOT NULL,
+            chain_id TEXT NOT NULL,
+            address TEXT NOT NULL,
+            derivation_path TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(wallet_id, chain_id)
+        )
+    ''')
+    
+    # Tabela para configuração TRON Gas-Free
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tron_config (
+            id INTEGER PRIMARY KEY DEFAULT 1,
+            tron_address TEXT,
+            encrypted_private_key BLOB,
+            salt BLOB,
+            tron_api_url TEXT DEFAULT 'https://api.trongrid.io',
+            tron_api_key TEXT,
+            gasfree_api_key TEXT,
+            gasfree_api_secret TEXT,
+            gasfree_endpoint TEXT DEFAULT 'https://open.gasfree.io/tron/',
+            gasfree_verifying_contract TEXT DEFAULT 'TFFAMLQZybALab4uxHA9RBE7pxhUAjfF3U',
+            gasfree_service_provider TEXT DEFAULT 'TLntW9Z59LYY5KEi9cmwk3PKjQga828ird',
+            usdt_contract_address TEXT DEFAULT 'TR7NHqjeKQxGTCi8z8ZY4pL8otSzgjLj6t',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            CHECK (id = 1)
+        )
+    ''')
+
+def _wallet_schema_v2(cursor):
+    """Wallet padrão do sistema e listagem por uso (list_wallets)"""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_wallets_default_last_used
+        ON wallets(is_system_default DESC, last_used DESC)
+    ''')
+
+def _wallet_schema_v3(cursor):
+    """Vários endereços por chain (receive/change + índice), índice reverso e xpubs de conta"""
+    # UNIQUE(wallet_id, chain_id) impede mais de um endereço por chain: recriar a tabela
+    cursor.execute('''
+        CREATE TABLE derived_addresses_v3 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            wallet_id TEXT NOT NULL,
+            chain_id TEXT NOT NULL,
+            branch INTEGER NOT NULL DEFAULT 0,
+            address_index INTEGER NOT NULL DEFAULT 0,
+            address TEXT NOT NULL,
+            derivation_path TEXT NOT NULL,
+            used BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(wallet_id, chain_id, branch, address_index)
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO derived_addresses_v3 (id, wallet_id, chain_id, address, derivation_path, created_at)
+        SELECT id, wallet_id, chain_id, address, derivation_path, created_at FROM derived_addresses
+    ''')
+    cursor.execute('DROP TABLE derived_addresses')
+    cursor.execute('ALTER TABLE derived_addresses_v3 RENAME TO derived_addresses')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_derived_address ON derived_addresses(address)')
+    
+    # xpub da conta (m/44'/coin'/0') para derivar endereços sem a seed
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wallet_account_keys (
+            wallet_id TEXT NOT NULL,
+            chain_id TEXT NOT NULL,
+            account_path TEXT NOT NULL,
+            xpub TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (wallet_id, chain_id)
+        )
+    ''')
+
+def _wallet_schema_v4(cursor):
+    """Descritor de KDF ao lado de cada salt (NULL = PBKDF2 legado)"""
+    add_missing_columns(cursor, 'wallets', [('kdf', 'TEXT')])
+    add_missing_columns(cursor, 'tron_config', [('kdf', 'TEXT')])
+
+# Migrações do wallets.db (PRAGMA user_version); só acrescentar no final
+WALLET_MIGRATIONS = [
+    (1, 'wallets, derived_addresses e tron_config', _wallet_schema_v1),
+    (2, 'índice de wallet padrão', _wallet_schema_v2),
+    (3, 'endereços por índice e índice reverso', _wallet_schema_v3),
+    (4, 'descritor de KDF', _wallet_schema_v4),
+]
+
+def parse_derivation_path(path):
+    """Converte "m/44'/0'/0'/0/0" em tupla de índices BIP32"""
+    parts = path.split('/')
+    if parts[0] != 'm':
+        raise ValueError(f"Invalid derivation path: {path}")
+    indexes = []
+    for part in parts[1:]:
+        if part[-1:] in ("'", "h", "H"):
+            indexes.append(int(part[:-1]) + 0x80000000)
+        else:
+            indexes.append(int(part))
+    return tuple(indexes)
+
+
+class HDDerivationContext:
+    """
+    Seed BIP39 esticada uma única vez (PBKDF2, 2048 rodadas) por request.
+    
+    Guarda o master BIP32 e cada nó intermediário já derivado (m/44',
+    m/44'/coin'/0', ...): um caminho novo parte do maior prefixo em cache em
+    vez de caminhar desde a raiz. Endereços, chaves privadas e xprv/tprv do
+    mesmo request devem sair do mesmo contexto.
+    """
+    
+    def __init__(self, seed_phrase, passphrase=""):
+        mnemo = mnemonic.Mnemonic("english")
+        self.seed = mnemo.to_seed(seed_phrase, passphrase)
+        self.master = BIP32.from_seed(self.seed)
+        self._nodes = {(): self.master}
+    
+    def node(self, path):
+        """Nó BIP32 do caminho (string ou tupla de índices)"""
+        indexes = parse_derivation_path(path) if isinstance(path, str) else tuple(path)
+        cached = self._nodes.get(indexes)
+        if cached is not None:
+            return cached
+        
+        depth = len(indexes)
+        while indexes[:depth] not in self._nodes:
+            depth -= 1
+        node = self._nodes[indexes[:depth]]
+        
+        for position in range(depth, len(indexes)):
+            index = indexes[position]
+            chaincode, privkey = node.get_extended_privkey_from_path([index])
+            node = BIP32(chaincode, privkey, fingerprint=node.get_fingerprint(),
+                         depth=position + 1, index=index, network=self.master.network)
+            self._nodes[indexes[:position + 1]] = node
+        return node
+    
+    def privkey(self, path):
+        return self.node(path).privkey
+    
+    def pubkey(self, path):
+        return self.node(path).pubkey
+
+
+# Derivação em lote (BIP44: .../account'/branch/index)
+ADDRESS_BRANCHES = {'receive': 0, 'change': 1}
+ADDRESS_GAP_LIMIT = 20
+ADDRESS_BATCH_MAX = 1000
+
+
+def split_account_path(path):
+    """
+    Separa "m/44'/coin'/0'/0/0" em ("m/44'/coin'/0'", branch, índice).
+    
+    Retorna None para caminhos sem branch/índice não-hardened (ex.: Solana),
+    que não podem ser derivados a partir de uma xpub.
+    """
+    indexes = parse_derivation_path(path)
+    if len(indexes) != 5 or any(index >= 0x80000000 for index in indexes[3:]):
+        return None
+    return '/'.join(path.split('/')[:4]), indexes[3], indexes[4]
+
+
+class WalletManager:
+    """Gerenciador de carteiras HD com criptografia e derivação de chaves"""
+    
+    def __init__(self):
+        # Nós de branch (xpub) por wallet/chain/branch, por processo; o dono de
+        # cada endereço vem do índice de derived_addresses
+        self._address_lock = threading.Lock()
+        self._branch_nodes = {}
+    
+    def init_database(self):
+        """Inicializa o banco de dados SQLite para wallets (aplica migrações pendentes)"""
+        wallet_db.migrate(WALLET_MIGRATIONS)
+    
+    def get_db_connection(self):
+        """Get database connection (transação compartilhada de wallet_db)"""
+        return wallet_db.transaction()
+    
+    def generate_secure_entropy(self, word_count=12):
+        """
+        Generate cryptographically secure entropy using OS-provided CSPRNG.
+        
+        Uses secrets.token_bytes() which relies on:
+        - Linux: /dev/urandom (ChaCha20-based CSPRNG)
+        - Windows: CryptGenRandom
+        - macOS: /dev/urandom (Fortuna CSPRNG)
+        
+        No need to mix multiple sources - the OS does this properly.
+        See: https://github.com/bitcoin/bips/blob/master/bip-0039.mediawiki#generating-the-mnemonic
+        
+        Args:
+            word_count: 12 (128-bit) or 24 (256-bit) word mnemonic
+            
+        Returns:
+            bytes: Cryptographically secure random bytes
+        """
+        if word_count not in [12, 24]:
+            raise ValueError("Word count must be 12 or 24")
+            
+        # 12 words = 128 bits = 16 bytes
+        # 24 words = 256 bits = 32 bytes
+        entropy_size = 16 if word_count == 12 else 32
+        
+        try:
+            # secrets.token_bytes() is specifically designed for cryptographic use
+            # It's audited, battle-tested, and follows security best practices
+            entropy = secrets.token_bytes(entropy_size)
+            
+            # Verify we got the correct amount of entropy
+            if len(entropy) != entropy_size:
+                raise ValueError(f"Expected {entropy_size} bytes, got {len(entropy)}")
+                
+            return entropy
+            
+        except Exception as e:
+            # If entropy generation fails, this is a critical error
+            # Do NOT fallback to weak sources - fail loudly
+            raise RuntimeError(f"CRITICAL: Failed to generate secure entropy: {e}")
+    
+    def generate_mnemonic(self, word_count=12):
+        """Gera uma nova seed phrase BIP39 com 12 ou 24 palavras"""
+        if not HAS_WALLET_LIBS:
+            return None, "Wallet libraries not available"
+        
+        if word_count not in [12, 24]:
+            return None, "Word count must be 12 or 24"
+        
+        try:
+            entropy = self.generate_secure_entropy(word_count)
+            mnemo = mnemonic.Mnemonic("english")
+            seed_phrase = mnemo.to_mnemonic(entropy)
+            
+            # Verify word count
+            words = seed_phrase.split()
+            if len(words) != word_count:
+                return None, f"Generated mnemonic has {len(words)} words, expected {word_count}"
+            
+            if not mnemo.check(seed_phrase):
+                return None, "Generated mnemonic failed validation"
+            
+            return seed_phrase, None
+        except Exception as e:
+            return None, f"Error generating mnemonic: {str(e)}"
+    
+    def validate_mnemonic(self, seed_phrase):
+        """Valida uma seed phrase BIP39"""
+        if not HAS_WALLET_LIBS:
+            return False, "Wallet libraries not available"
+        
+        try:
+            mnemo = mnemonic.Mnemonic("english")
+            return mnemo.check(seed_phrase.strip()), None
+        except Exception as e:
+            return False, f"Error validating mnemonic: {str(e)}"
+    
+    def encrypt_mnemonic(self, seed_phrase, password, kdf=None):
+        """Criptografa uma seed phrase usando AES-256 com salt SHA256"""
+        try:
+            import os
+            
+            # Gerar salt aleatório (32 bytes)
+            salt = os.urandom(32)
+            
+            # SHA256(senha + salt) esticado pelo KDF (limitado por KDF_MAX_CONCURRENT)
+            key = derive_key_from_password(password, salt, kdf)
+            
+            # Criptografar mnemonic com AES-256
+            fernet = Fernet(key)
+            encrypted_mnemonic = fernet.encrypt(seed_phrase.encode())
+            
+            return encrypted_mnemonic, salt, None
+        except Exception as e:
+            return None, None, f"Error encrypting mnemonic: {str(e)}"
+    
+    def encrypt_private_keys(self, private_keys_dict, password):
+        """Criptografa as chaves privadas usando AES-256 com salt SHA256"""
+        try:
+            import json
+            import os
+            
+            # Convert private keys dict to JSON string
+            private_keys_json = json.dumps(private_keys_dict)
+            
+            # Generate salt
+            salt = os.urandom(32)
+            
+            # Derive key: SHA256(password + salt) stretched with PBKDF2
+            key = derive_key_from_password(password, salt)
+            
+            # Encrypt private keys
+            fernet = Fernet(key)
+            encrypted_private_keys = fernet.encrypt(private_keys_json.encode())
+            
+            return encrypted_private_keys, salt, None
+        except Exception as e:
+            return None, None, f"Error encrypting private keys: {str(e)}"
+    
+    def decrypt_mnemonic(self, encrypted_mnemonic, salt, password, wallet_id=None, kdf=None):
+        """Descriptografa uma seed phrase usando AES-256 com salt SHA256"""
+        try:
+            # Mesmos parâmetros da criptografia; com wallet_id e sessão
+            # autenticada a chave derivada fica em cache até o fim da sessão
+            scope = f'wallet:{wallet_id}' if wallet_id else None
+            decrypted_mnemonic = decrypt_with_session_cache(encrypted_mnemonic, password, salt, scope, kdf)
+        except Exception as e:
+            return None, f"Error decrypting mnemonic: {str(e)}"
+        
+        if wallet_id and kdf_needs_upgrade(kdf):
+            self.upgrade_wallet_kdf(wallet_id, decrypted_mnemonic, password, salt)
+        return decrypted_mnemonic, None
+    
+    def upgrade_wallet_kdf(self, wallet_id, seed_phrase, password, old_salt):
+        """
+        Migração preguiçosa: recriptografa a seed com o KDF atual após um
+        desbloqueio bem-sucedido. Só grava se o salt não mudou nesse meio
+        tempo; falhas não afetam o desbloqueio.
+        """
+        kdf = current_kdf()
+        encrypted_mnemonic, salt, error = self.encrypt_mnemonic(seed_phrase, password, kdf)
+        if error:
+            print(f"Aviso: KDF da wallet {wallet_id} não atualizado: {error}")
+            return False
+        
+        try:
+            with wallet_db.transaction(immediate=True) as cursor:
+                cursor.execute('''
+                    UPDATE wallets SET encrypted_mnemonic = ?, salt = ?, kdf = ?
+                    WHERE wallet_id = ? AND salt = ?
+                ''', (encrypted_mnemonic, salt, kdf, wallet_id, old_salt))
+                updated = cursor.rowcount > 0
+        except Exception as e:
+            print(f"Aviso: KDF da wallet {wallet_id} não atualizado: {e}")
+            return False
+        
+        if updated:
+            print(f"Wallet {wallet_id}: KDF atualizado para {kdf}")
+        return updated
+    
+    def derive_addresses(self, seed_phrase, passphrase="", context=None):
+        """Deriva endereços para todas as chains suportadas"""
+        if not HAS_WALLET_LIBS:
+            return {}, "Wallet libraries not available"
+        
+        try:
+            # Seed + master BIP32 (reaproveitados se o chamador já tem o contexto)
+            context = context or HDDerivationContext(seed_phrase, passphrase)
+            
+            addresses = {}
+            
+            for chain_id, chain_config in SUPPORTED_CHAINS.items():
+                try:
+                    # Derivar chave para a chain específica
+                    path = chain_config['path']
+                    derived_key = context.privkey(path)
+                    public_key = context.pubkey(path)
+                    
+                    # Gerar endereço baseado na chain
+                    address, error = self._generate_address_for_chain(
+                        chain_id, 
+                        public_key, 
+                        derived_key
+                    )
+                    if error:
+                        raise ValueError(error)
+                    
+                    addresses[chain_id] = {
+                        'address': address,
+                        'path': path,
+                        'chain': chain_config['name'],
+                        'symbol': chain_config['symbol']
+                    }
+                    
+                except Exception as e:
+                    addresses[chain_id] = {
+                        'error': f"Failed to derive {chain_id}: {str(e)}",
+                        'path': chain_config['path'],
+                        'chain': chain_config['name'],
+                        'symbol': chain_config['symbol']
+                    }
+            
+            return addresses, None
+            
+        except Exception as e:
+            return {}, f"Error deriving addresses: {str(e)}"
+    
+    def derive_private_keys(self, seed_phrase, passphrase="", context=None):
+        """Deriva chaves privadas para todas as chains suportadas"""
+        if not HAS_WALLET_LIBS:
+            return {}, "Wallet libraries not available"
+        
+        try:
+            # Seed + master BIP32 (reaproveitados se o chamador já tem o contexto)
+            context = context or HDDerivationContext(seed_phrase, passphrase)
+            
+            private_keys = {}
+            
+            for chain_id, chain_config in SUPPORTED_CHAINS.items():
+                try:
+                    # Derivar chave para a chain específica
+                    path = chain_config['path']
+                    derived_key = context.privkey(path)
+                    
+                    # Convert to hex string
+                    private_key_hex = derived_key.hex()
+                    
+                    private_keys[chain_id] = {
+                        'private_key': private_key_hex,
+                        'path': path,
+                        'chain': chain_config['name'],
+                        'symbol': chain_config['symbol']
+                    }
+                    
+                except Exception as e:
+                    private_keys[chain_id] = {
+                        'error': f"Failed to derive {chain_id}: {str(e)}",
+                        'path': chain_config['path'],
+                        'chain': chain_config['name'],
+                        'symbol': chain_config['symbol']
+                    }
+            
+            return private_keys, None
+            
+        except Exception as e:
+            return {}, f"Error deriving private keys: {str(e)}"
+    
+    def bip39_to_extended_master_key(self, seed_phrase, passphrase="", network="mainnet", context=None):
+        """Converte BIP39 seed para extended master root key (xprv/tprv) para LND"""
+        if not HAS_WALLET_LIBS:
+            return None, "Wallet libraries not available"
+        
+        try:
+            import base58
+            
+            # Seed + master BIP32 (reaproveitados se o chamador já tem o contexto)
+            context = context or HDDerivationContext(seed_phrase, passphrase)
+            seed = context.seed
+            bip32 = context.master
+            
+            # Get extended private key components
+            private_key, chain_code = bip32.get_extended_privkey_from_path('m')
+            
+            # Network-specific version bytes
+            if network.lower() == "testnet":
+                version = b'\x04\x35\x83\x94'  # testnet tprv version
+                prefix = "tprv"
+            else:
+                version = b'\x04\x88\xad\xe4'  # mainnet xprv version
+                prefix = "xprv"
+            
+            # Construct extended key components
+            depth = b'\x00'                      # depth 0 for master key
+            parent_fingerprint = b'\x00\x00\x00\x00'  # no parent for master key
+            child_number = b'\x00\x00\x00\x00'        # child number 0
+            
+            # Build extended key: version + depth + parent_fp + child_num + chain_code + 0x00 + private_key
+            extended_key = version + depth + parent_fingerprint + child_number + chain_code + b'\x00' + private_key
+            
+            # Encode with base58check
+            extended_master_key = base58.b58encode_check(extended_key).decode('utf-8')
+            
+            return {
+                'extended_master_key': extended_master_key,
+                'network': network,
+                'prefix': prefix,
+                'private_key_hex': private_key.hex(),
+                'chain_code_hex': chain_code.hex(),
+                'seed_hex': seed.hex()
+            }, None
+            
+        except ImportError:
+            return None, "base58 library not available"
+        except Exception as e:
+            return None, f"Error converting to extended master key: {str(e)}"
+    
+    def generate_universal_wallet(self, seed_phrase, passphrase="", context=None):
+        """Gera carteira universal com derivações para todas as chains E chaves mestras para LND"""
+        if not HAS_WALLET_LIBS:
+            return {}, "Wallet libraries not available"
+        
+        try:
+            # Uma única derivação da seed para endereços, chaves e xprv/tprv
+            context = context or HDDerivationContext(seed_phrase, passphrase)
+            
+            # Derivar endereços para todas as chains
+            addresses, addr_error = self.derive_addresses(seed_phrase, passphrase, context)
+            if addr_error:
+                return {}, addr_error
+            
+            # Derivar chaves privadas para todas as chains
+            private_keys, privkey_error = self.derive_private_keys(seed_phrase, passphrase, context)
+            if privkey_error:
+                return {}, privkey_error
+            
+            # Gerar extended master keys para LND (mainnet e testnet)
+            mainnet_key, mainnet_error = self.bip39_to_extended_master_key(seed_phrase, passphrase, "mainnet", context)
+            testnet_key, testnet_error = self.bip39_to_extended_master_key(seed_phrase, passphrase, "testnet", context)
+            
+            # Compilar resultado universal
+            result = {
+                'seed_phrase': seed_phrase,
+                'has_passphrase': bool(passphrase),
+                'addresses': addresses,
+                'private_keys': private_keys,
+                'lnd_keys': {
+                    'mainnet': mainnet_key if not mainnet_error else {'error': mainnet_error},
+                    'testnet': testnet_key if not testnet_error else {'error': testnet_error}
+                },
+                'supported_chains': list(SUPPORTED_CHAINS.keys()),
+                'lnd_compatible': not (mainnet_error and testnet_error)
+            }
+            
+            return result, None
+            
+        except Exception as e:
+            return {}, f"Error generating universal wallet: {str(e)}"
+    
+    def _generate_address_for_chain(self, chain_id, public_key, private_key):
+        """Gera endereço específico para cada blockchain; retorna (address, error)"""
+        try:
+            if chain_id == 'bitcoin':
+                return self._generate_bitcoin_address(public_key), None
+            
+            elif chain_id == 'ethereum':
+                return self._generate_ethereum_address(public_key), None
+            
+            elif chain_id == 'liquid':
+                return self._generate_liquid_address(public_key), None
+            
+            elif chain_id == 'tron':
+                return self._generate_tron_address(public_key), None
+            
+            elif chain_id == 'solana':
+                return self._generate_solana_address(public_key), None
+            
+            else:
+                return None, f"Unsupported chain: {chain_id}"
+                
+        except Exception as e:
+            return None, f"Error generating {chain_id} address: {str(e)}"
+    
+    def _generate_bitcoin_address(self, public_key):
+        """Gera endereço Bitcoin (Bech32/P2WPKH)"""
+        try:
+            import base58
+            
+            # SHA256 hash do public key
+            sha256_hash = hashlib.sha256(public_key).digest()
+            
+            # RIPEMD160 hash do SHA256
+            ripe = hashlib.new('ripemd160')
+            ripe.update(sha256_hash)
+            ripemd160_hash = ripe.digest()
+            
+            # Para Bech32 (versão simplificada)
+            # Em produção usar biblioteca específica como python-bitcoinlib
+            
+            # Legacy P2PKH para simplicidade (versão 0x00)
+            versioned_payload = b'\x00' + ripemd160_hash
+            
+            # Checksum SHA256 duplo
+            checksum = hashlib.sha256(hashlib.sha256(versioned_payload).digest()).digest()[:4]
+            
+            # Endereço final
+            address_bytes = versioned_payload + checksum
+            address = base58.b58encode(address_bytes).decode('ascii')
+            
+            return address
+            
+        except Exception as e:
+            raise ValueError(f"Bitcoin address error: {str(e)}") from e
+    
+    def _generate_ethereum_address(self, public_key):
+        """Gera endereço Ethereum"""
+        try:
+            
+            # Remover primeiro byte (0x04) se presente (formato não comprimido)
+            if len(public_key) == 65 and public_key[0] == 0x04:
+                public_key = public_key[1:]
+            
+            # Keccak256 hash do public key
+            keccak = hashlib.sha3_256(public_key)
+            hash_bytes = keccak.digest()
+            
+            # Pegar últimos 20 bytes e adicionar 0x
+            address = '0x' + hash_bytes[-20:].hex()
+            
+            return address
+            
+        except Exception as e:
+            raise ValueError(f"Ethereum address error: {str(e)}") from e
+    
+    def _generate_liquid_address(self, public_key):
+        """Gera endereço Liquid (similar ao Bitcoin mas com prefixo diferente)"""
+        try:
+            import base58
+            
+            # SHA256 hash do public key
+            sha256_hash = hashlib.sha256(public_key).digest()
+            
+            # RIPEMD160 hash do SHA256
+            ripe = hashlib.new('ripemd160')
+            ripe.update(sha256_hash)
+            ripemd160_hash = ripe.digest()
+            
+            # Liquid usa versão diferente (0x39 para mainnet)
+            versioned_payload = b'\x39' + ripemd160_hash
+            
+            # Checksum SHA256 duplo
+            checksum = hashlib.sha256(hashlib.sha256(versioned_payload).digest()).digest()[:4]
+            
+            # Endereço final
+            address_bytes = versioned_payload + checksum
+            address = base58.b58encode(address_bytes).decode('ascii')
+            
+            return address
+            
+        except Exception as e:
+            raise ValueError(f"Liquid address error: {str(e)}") from e
+    
+    def _generate_tron_address(self, public_key):
+        """Gera endereço TRON"""
+        try:
+            import base58
+            
+            # Remover primeiro byte se presente
+            if len(public_key) == 65 and public_key[0] == 0x04:
+                public_key = public_key[1:]
+            
+            # Keccak256 hash do public key
+            keccak = hashlib.sha3_256(public_key)
+            hash_bytes = keccak.digest()
+            
+            # Pegar últimos 20 bytes
+            address_bytes = hash_bytes[-20:]
+            
+            # Adicionar prefixo TRON (0x41)
+            tron_address = b'\x41' + address_bytes
+            
+            # Checksum SHA256 duplo
+            checksum = hashlib.sha256(hashlib.sha256(tron_address).digest()).digest()[:4]
+            
+            # Endereço final com checksum
+            final_address = tron_address + checksum
+            address = base58.b58encode(final_address).decode('ascii')
+            
+            return address
+            
+        except Exception as e:
+            raise ValueError(f"TRON address error: {str(e)}") from e
+    
+    def _generate_solana_address(self, public_key):
+        """Gera endereço Solana"""
+        try:
+            import base58
+            
+            # Para Solana, o public key É o endereço
+            # Usar apenas os primeiros 32 bytes se necessário
+            if len(public_key) > 32:
+                public_key = public_key[:32]
+            
+            # Codificar em Base58
+            address = base58.b58encode(public_key).decode('ascii')
+            
+            return address
+            
+        except Exception as e:
+            raise ValueError(f"Solana address error: {str(e)}") from e
+    
+    def save_wallet(self, wallet_id, encrypted_mnemonic, salt, metadata=None, has_password=True, encrypted_private_keys=None, is_system_default=False, kdf=None):
+        """Salva wallet criptografada no banco"""
+        try:
+            with wallet_db.transaction(immediate=True) as cursor:
+                # If this wallet is being set as system default, unset others
+                if is_system_default:
+                    cursor.execute('''
+                        UPDATE wallets SET is_system_default = FALSE WHERE wallet_id != ?
+                    ''', (wallet_id,))
+            
+                cursor.execute('''
+                    INSERT OR REPLACE INTO wallets 
+                    (wallet_id, encrypted_mnemonic, salt, kdf, has_password, metadata, encrypted_private_keys, is_system_default, last_used)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (wallet_id, encrypted_mnemonic, salt, kdf, has_password, 
+                      json.dumps(metadata) if metadata else None,
+                      encrypted_private_keys, is_system_default,
+                      datetime.now()))
+            
+            return True, None
+            
+        except Exception as e:
+            return False, f"Error saving wallet: {str(e)}"
+    
+    def load_wallet(self, wallet_id):
+        """Carrega wallet do banco"""
+        try:
+            with wallet_db.transaction() as cursor:
+                cursor.execute('''
+                    SELECT encrypted_mnemonic, salt, metadata, kdf 
+                    FROM wallets WHERE wallet_id = ?
+                ''', (wallet_id,))
+            
+                result = cursor.fetchone()
+            
+            if result:
+                encrypted_mnemonic, salt, metadata, kdf = result
+                metadata_dict = json.loads(metadata) if metadata else {}
+                return {
+                    'encrypted_mnemonic': encrypted_mnemonic,
+                    'salt': salt,
+                    'kdf': kdf,
+                    'metadata': metadata_dict
+                }, None
+            else:
+                return None, "Wallet not found"
+                
+        except Exception as e:
+            return None, f"Error loading wallet: {str(e)}"
+    
+    def cache_addresses(self, wallet_id, addresses):
+        """Cache endereços derivados"""
+        try:
+            with wallet_db.transaction(immediate=True) as cursor:
+                for chain_id, address_data in addresses.items():
+                    if 'error' not in address_data:
+                        cursor.execute('''
+                            INSERT OR REPLACE INTO derived_addresses
+                            (wallet_id, chain_id, branch, address_index, address, derivation_path)
+                            VALUES (?, ?, 0, 0, ?, ?)
+                        ''', (wallet_id, chain_id, address_data['address'], address_data['path']))
+            
+            return True, None
+            
+        except Exception as e:
+            return False, f"Error caching addresses: {str(e)}"
+    
+    def get_system_default_wallet(self):
+        """Get the system default wallet"""
+        try:
+            with wallet_db.transaction() as cursor:
+                cursor.execute('''
+                    SELECT wallet_id, encrypted_mnemonic, salt, metadata, has_password, kdf 
+                    FROM wallets WHERE is_system_default = TRUE LIMIT 1
+                ''')
+            
+                result = cursor.fetchone()
+            
+            if result:
+                wallet_id, encrypted_mnemonic, salt, metadata, has_password, kdf = result
+                metadata_dict = json.loads(metadata) if metadata else {}
+                return {
+                    'wallet_id': wallet_id,
+                    'encrypted_mnemonic': encrypted_mnemonic,
+                    'salt': salt,
+                    'kdf': kdf,
+                    'metadata': metadata_dict,
+                    'has_password': bool(has_password)
+                }, None
+            else:
+                return None, "No system default wallet found"
+                
+        except Exception as e:
+            return None, f"Error loading system default wallet: {str(e)}"
+    
+    def set_system_default_wallet(self, wallet_id):
+        """Set a wallet as the system default"""
+        try:
+            with wallet_db.transaction(immediate=True) as cursor:
+                # Check if wallet exists
+                cursor.execute('SELECT COUNT(*) FROM wallets WHERE wallet_id = ?', (wallet_id,))
+                if cursor.fetchone()[0] == 0:
+                    return False, "Wallet not found"
+                
+                # Unset all other defaults
+                cursor.execute('UPDATE wallets SET is_system_default = FALSE')
+                
+                # Set this wallet as default
+                cursor.execute('UPDATE wallets SET is_system_default = TRUE WHERE wallet_id = ?', (wallet_id,))
+            
+            return True, None
+            
+        except Exception as e:
+            return False, f"Error setting system default wallet: {str(e)}"
+    
+    def get_cached_addresses(self, wallet_id):
+        """Recupera endereços do cache (temporário ou banco)"""
+        try:
+            # Primeiro, verificar se existe no cache temporário
+            if hasattr(self, 'temp_wallets') and wallet_id in self.temp_wallets:
+                temp_wallet = self.temp_wallets[wallet_id]
+                return temp_wallet['addresses'], None
+            
+            # Caso contrário, buscar no banco de dados
+            with wallet_db.transaction() as cursor:
+                cursor.execute('''
+                    SELECT chain_id, address, derivation_path
+                    FROM derived_addresses
+                    WHERE wallet_id = ? AND branch = 0 AND address_index = 0
+                ''', (wallet_id,))
+            
+                results = cursor.fetchall()
+            
+            addresses = {}
+            for chain_id, address, derivation_path in results:
+                if chain_id in SUPPORTED_CHAINS:
+                    chain_config = SUPPORTED_CHAINS[chain_id]
+                    addresses[chain_id] = {
+                        'address': address,
+                        'path': derivation_path,
+                        'chain': chain_config['name'],
+                        'symbol': chain_config['symbol']
+                    }
+            
+            if not addresses:
+                return {}, "Wallet not found in cache or database"
+            
+            return addresses, None
+            
+        except Exception as e:
+            return {}, f"Error getting cached addresses: {str(e)}"
+    
+    def cache_account_xpubs(self, wallet_id, context):
+        """Grava a xpub de conta de cada chain derivável por xpub (precisa da seed uma vez)"""
+        try:
+            rows = []
+            for chain_id, chain_config in SUPPORTED_CHAINS.items():
+                parts = split_account_path(chain_config['path'])
+                if parts:
+                    account_path = parts[0]
+                    rows.append((wallet_id, chain_id, account_path, context.node(account_path).get_xpub()))
+            
+            with wallet_db.transaction(immediate=True) as cursor:
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO wallet_account_keys (wallet_id, chain_id, account_path, xpub)
+                    VALUES (?, ?, ?, ?)
+                ''', rows)
+            
+            with self._address_lock:
+                for key in [key for key in self._branch_nodes if key[0] == wallet_id]:
+                    del self._branch_nodes[key]
+            return True, None
+            
+        except Exception as e:
+            return False, f"Error caching account keys: {str(e)}"
+    
+    def _branch_node(self, wallet_id, chain_id, branch):
+        """Nó público .../account'/branch a partir da xpub de conta (em cache)"""
+        key = (wallet_id, chain_id, branch)
+        with self._address_lock:
+            cached = self._branch_nodes.get(key)
+        if cached:
+            return cached
+        
+        with wallet_db.transaction() as cursor:
+            cursor.execute('''
+                SELECT account_path, xpub FROM wallet_account_keys
+                WHERE wallet_id = ? AND chain_id = ?
+            ''', (wallet_id, chain_id))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        
+        account_path, xpub = row
+        account = BIP32.from_xpub(xpub)
+        chaincode, pubkey = account.get_extended_pubkey_from_path([branch])
+        node = BIP32(chaincode, pubkey=pubkey, fingerprint=account.get_fingerprint(),
+                     depth=account.depth + 1, index=branch, network=account.network)
+        cached = (node, f"{account_path}/{branch}")
+        with self._address_lock:
+            self._branch_nodes[key] = cached
+        return cached
+    
+    def derive_address_batch(self, wallet_id, chain_id, branch=0, start=None, count=ADDRESS_GAP_LIMIT):
+        """
+        Deriva `count` endereços de receive/change a partir da xpub de conta.
+        
+        Só CKD pública (não-hardened): não precisa da seed nem de senha. Sem
+        `start`, continua após o maior índice já gravado. Os endereços vão
+        para derived_addresses (índice por endereço).
+        """
+        if not HAS_WALLET_LIBS:
+            return [], "Wallet libraries not available"
+        if chain_id not in SUPPORTED_CHAINS:
+            return [], f"Unsupported chain: {chain_id}"
+        if branch not in ADDRESS_BRANCHES.values():
+            return [], "branch must be 0 (receive) or 1 (change)"
+        if not 0 < count <= ADDRESS_BATCH_MAX:
+            return [], f"count must be between 1 and {ADDRESS_BATCH_MAX}"
+        
+        try:
+            cached = self._branch_node(wallet_id, chain_id, branch)
+            if not cached:
+                return [], f"No account key for {chain_id}; save the wallet again to enable batch derivation"
+            node, branch_path = cached
+            
+            if start is None:
+                with wallet_db.transaction() as cursor:
+                    cursor.execute('''
+                        SELECT MAX(address_index) FROM derived_addresses
+                        WHERE wallet_id = ? AND chain_id = ? AND branch = ?
+                    ''', (wallet_id, chain_id, branch))
+                    last_index = cursor.fetchone()[0]
+                start = 0 if last_index is None else last_index + 1
+            
+            derived = []
+            for index in range(start, start + count):
+                address, error = self._generate_address_for_chain(chain_id, node.get_pubkey_from_path([index]), None)
+                if error:
+                    return [], error
+                derived.append({
+                    'address': address,
+                    'path': f"{branch_path}/{index}",
+                    'branch': branch,
+                    'index': index
+                })
+            
+            with wallet_db.transaction(immediate=True) as cursor:
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO derived_addresses
+                    (wallet_id, chain_id, branch, address_index, address, derivation_path)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(wallet_id, chain_id, branch, item['index'], item['address'], item['path'])
+                      for item in derived])
+            return derived, None
+            
+        except Exception as e:
+            return [], f"Error deriving address batch: {str(e)}"
+    
+    def ensure_address_gap(self, wallet_id, chain_id, branch=0, gap_limit=ADDRESS_GAP_LIMIT):
+        """Garante `gap_limit` endereços não usados após o último usado (BIP44 gap limit)"""
+        try:
+            with wallet_db.transaction() as cursor:
+                cursor.execute('''
+                    SELECT MAX(address_index), MAX(CASE WHEN used THEN address_index END)
+                    FROM derived_addresses
+                    WHERE wallet_id = ? AND chain_id = ? AND branch = ?
+                ''', (wallet_id, chain_id, branch))
+                last_index, last_used = cursor.fetchone()
+            
+            target = (-1 if last_used is None else last_used) + gap_limit
+            next_index = 0 if last_index is None else last_index + 1
+            if next_index > target:
+                return [], None
+            return self.derive_address_batch(wallet_id, chain_id, branch, next_index, target - next_index + 1)
+            
+        except Exception as e:
+            return [], f"Error extending address gap: {str(e)}"
+    
+    def lookup_address(self, address):
+        """Wallet e caminho donos de um endereço (índice por endereço em derived_addresses)"""
+        try:
+            with wallet_db.transaction() as cursor:
+                cursor.execute('''
+                    SELECT wallet_id, chain_id, branch, address_index, derivation_path
+                    FROM derived_addresses WHERE address = ? LIMIT 1
+                ''', (address,))
+                row = cursor.fetchone()
+            if not row:
+                return None, None
+            
+            return {
+                'wallet_id': row[0],
+                'chain': row[1],
+                'branch': row[2],
+                'index': row[3],
+                'path': row[4]
+            }, None
+            
+        except Exception as e:
+            return None, f"Error looking up address: {str(e)}"
+    
+    def mark_address_used(self, address):
+        """Marca o endereço como usado e repõe o gap limit da sua branch"""
+        owner, error = self.lookup_address(address)
+        if error or not owner:
+            return None, error or "Address not found"
+        
+        try:
+            with wallet_db.transaction(immediate=True) as cursor:
+                cursor.execute('UPDATE derived_addresses SET used = TRUE WHERE address = ?', (address,))
+        except Exception as e:
+            return None, f"Error marking address as used: {str(e)}"
+        
+        derived, error = self.ensure_address_gap(owner['wallet_id'], owner['chain'], owner['branch'])
+        if error:
+            return None, error
+        return {'owner': owner, 'derived': derived}, None
+    
+    def export_backup_info(self, wallet_id, password):
+        """
+        Export complete backup information for disaster recovery.
+        
+        This includes everything needed to recover funds if the system is lost:
+        - Encrypted mnemonic (still encrypted for security)
+        - Salt for decryption
+        - All derivation paths used
+        - Metadata about the wallet
+        - Standards used (BIP39/BIP32/BIP44)
+        
+        Args:
+            wallet_id: Wallet identifier
+            password: Password to verify access (optional verification)
+            
+        Returns:
+            dict: Complete backup information
+            str: Error message if any
+        """
+        try:
+            with wallet_db.transaction() as cursor:
+                # Get wallet data
+                cursor.execute('''
+                    SELECT encrypted_mnemonic, salt, metadata, created_at, 
+                           has_password, is_system_default, kdf
+                    FROM wallets WHERE wallet_id = ?
+                ''', (wallet_id,))
+            
+                wallet_result = cursor.fetchone()
+                if not wallet_result:
+                    return None, f"Wallet {wallet_id} not found"
+            
+                encrypted_mnemonic, salt, metadata, created_at, has_password, is_system_default, kdf = wallet_result
+            
+                # Get all derivation paths used
+                cursor.execute('''
+                    SELECT chain_id, address, derivation_path
+                    FROM derived_addresses
+                    WHERE wallet_id = ? AND branch = 0 AND address_index = 0
+                ''', (wallet_id,))
+            
+                derivation_info = []
+                for row in cursor.fetchall():
+                    chain_id, address, path = row
+                    chain_config = SUPPORTED_CHAINS.get(chain_id, {})
+                    derivation_info.append({
+                        'chain': chain_config.get('name', chain_id),
+                        'symbol': chain_config.get('symbol', ''),
+                        'coin_type': chain_config.get('coin_type'),
+                        'address': address,
+                        'derivation_path': path
+                    })
+            
+            # Create comprehensive backup package
+            backup_info = {
+                'wallet_id': wallet_id,
+                'created_at': created_at,
+                'is_system_default': bool(is_system_default),
+                'has_password': bool(has_password),
+                
+                # Critical recovery data
+                'encrypted_mnemonic': base64.b64encode(encrypted_mnemonic).decode('utf-8'),
+                'salt': base64.b64encode(salt).decode('utf-8'),
+                
+                # Standards used
+                'recovery_standards': {
+                    'mnemonic_standard': 'BIP39',
+                    'word_list': 'English',
+                    'key_derivation': 'BIP32',
+                    'path_standard': 'BIP44',
+                    'encryption': 'AES-256 via Fernet',
+                    # Chave = KDF(SHA256(senha + salt), salt), descritor no formato brln_kdf
+                    'kdf': kdf or f'pbkdf2-sha256$i={PBKDF2_ITERATIONS}',
+                    'kdf_input': 'SHA256(password + salt)'
+                },
+                
+                # Derivation paths used
+                'derivation_info': derivation_info,
+                'supported_chains': list(SUPPORTED_CHAINS.keys()),
+                
+                # Metadata
+                'metadata': json.loads(metadata) if metadata else {},
+                
+                # Recovery instructions
+                'recovery_notes': {
+                    'step_1': 'Decrypt encrypted_mnemonic using your password and salt',
+                    'step_2': 'Use BIP39 to convert mnemonic to 512-bit seed (with optional passphrase)',
+                    'step_3': 'Use BIP32 to generate master keys from seed',
+                    'step_4': 'Use BIP44 derivation paths to generate child keys',
+                    'step_5': 'Generate addresses for each chain using derivation_info paths',
+                    'compatible_wallets': [
+                        'This API (preferred)',
+                        'Electrum (Bitcoin only)',
+                        'MyEtherWallet (Ethereum only)',
+                        'Ian Coleman BIP39 Tool (all chains, online)',
+                        'Hardware wallets (Trezor, Ledger)'
+                    ]
+                },
+                
+                'export_timestamp': datetime.now().isoformat(),
+                'export_version': '1.0'
+            }
+            
+            return backup_info, None
+            
+        except Exception as e:
+            return None, f"Error exporting backup info: {str(e)}"
+
+# Singleton para o gerenciador de carteiras
+wallet_manager = WalletManager()
+
+
+def init_wallet_storage():
+    """Cria /data/brln-wallet (dono brln-api) e aplica as migrações de wallets.db"""
+    os.makedirs(WALLET_DATA_DIR, exist_ok=True)
+    
+    # Ensure proper ownership for brln-wallet directory
+    try:
+        subprocess.run(['chown', '-R', 'brln-api:brln-api', WALLET_DATA_DIR], check=False)
+        subprocess.run(['chmod', '750', WALLET_DATA_DIR], check=False)
+    except Exception as e:
+        print(f"Warning: Could not set ownership for {WALLET_DATA_DIR}: {e}")
+    
+    wallet_manager.init_database()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS API - eleição de worker
+
+Tarefas que não podem rodar em paralelo entre os workers do gunicorn
+(ex.: ingestão de keysends) ficam com o processo que segura um flock.
+"""
+
+import os
+import time
+import threading
+import fcntl
+
+
+class WorkerLeader:
+    """
+    Eleição de um único worker para tarefas que não podem rodar em paralelo
+    (a assinatura SubscribeInvoices da ingestão de keysends).
+
+    Cada worker espera em flock(LOCK_EX) numa thread; o kernel solta o lock
+    quando o processo dono sai (reload, crash, max_requests) e um dos outros
+    assume. Sem acesso ao arquivo de lock, o processo assume sozinho.
+    """
+
+    def __init__(self, name, lock_path, on_elected):
+        self.name = name
+        self.lock_path = lock_path
+        self.on_elected = on_elected
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._fd = None
+        self._elected_at = None
+
+    def start(self):
+        """Entra na eleição (idempotente por processo)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._fd = None
+            self._elected_at = None
+            self._thread = threading.Thread(target=self._run, daemon=True, name=f"Leader-{self.name}")
+            self._thread.start()
+
+    def _run(self):
+        try:
+            os.makedirs(os.path.dirname(self.lock_path), mode=0o700, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_CREAT | os.O_RDWR, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except OSError as e:
+            print(f"Aviso: lock {self.lock_path} indisponível ({e}); {self.name} roda neste processo")
+            fd = None
+
+        with self._lock:
+            self._fd = fd
+            self._elected_at = time.time()
+        print(f"{self.name}: worker {os.getpid()} eleito")
+        self.on_elected()
+
+    def get_status(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'leader': self._pid == os.getpid() and self._elected_at is not None,
+                'elected_at': self._elected_at
+            }
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS KDF descriptors and calibration
+
+Every encrypted entry (password manager, wallets.db) stores next to its salt
+a short descriptor of the KDF that produced its key:
+
+    pbkdf2-sha256$i=500000
+    scrypt$n=65536,r=8,p=1
+    argon2id$t=3,m=65536,p=4        (m in KiB, needs argon2-cffi)
+
+An empty/NULL descriptor is a legacy entry: PBKDF2-SHA256, 500,000 iterations.
+New entries use the descriptor from BRLN_KDF, or the one written by
+`brln_kdf.py calibrate --write`, or the legacy default - so existing
+databases keep working and are upgraded lazily on the next unlock.
+
+Usage:
+  brln_kdf.py calibrate [--target-ms 500] [--algorithm argon2id|scrypt|pbkdf2-sha256]
+                        [--max-memory-mb 64] [--write]
+  brln_kdf.py show
+  brln_kdf.py bench <descriptor>
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime
+
+try:
+    from argon2.low_level import hash_secret_raw, Type as Argon2Type
+    HAS_ARGON2 = True
+except ImportError:
+    HAS_ARGON2 = False
+
+LEGACY_DESCRIPTOR = 'pbkdf2-sha256$i=500000'
+KDF_CONFIG_PATH = os.environ.get('BRLN_KDF_CONFIG', '/data/brln-kdf.json')
+
+# Parameter names (in descriptor order) per algorithm
+ALGORITHMS = {
+    'pbkdf2-sha256': ('i',),
+    'scrypt': ('n', 'r', 'p'),
+    'argon2id': ('t', 'm', 'p'),
+}
+
+DEFAULT_TARGET_MS = 500
+DEFAULT_MAX_MEMORY_MB = 64
+
+# Calibration never goes below these, even on slow hardware
+MIN_PBKDF2_ITERATIONS = 210000
+MIN_SCRYPT_N = 2 ** 15
+MIN_ARGON2_TIME_COST = 2
+MIN_ARGON2_MEMORY_KIB = 19 * 1024
+
+
+def parse_descriptor(descriptor):
+    """'scrypt$n=65536,r=8,p=1' -> ('scrypt', {'n': 65536, 'r': 8, 'p': 1})"""
+    algorithm, _, params = (descriptor or LEGACY_DESCRIPTOR).partition('$')
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown KDF: {algorithm}")
+
+    values = {}
+    for item in filter(None, params.split(',')):
+        name, _, value = item.partition('=')
+        values[name] = int(value)
+
+    missing = [name for name in ALGORITHMS[algorithm] if name not in values]
+    if missing:
+        raise ValueError(f"KDF descriptor {descriptor!r} missing {', '.join(missing)}")
+    return algorithm, values
+
+
+def make_descriptor(algorithm, **params):
+    """Inverse of parse_descriptor (parameters in canonical order)"""
+    return f"{algorithm}$" + ','.join(f"{name}={int(params[name])}" for name in ALGORITHMS[algorithm])
+
+
+def normalize(descriptor):
+    """Canonical form, so equal parameters compare equal"""
+    algorithm, params = parse_descriptor(descriptor)
+    return make_descriptor(algorithm, **params)
+
+
+def is_supported(descriptor):
+    """Whether this build can derive keys with the descriptor"""
+    try:
+        algorithm, _ = parse_descriptor(descriptor)
+    except ValueError:
+        return False
+    if algorithm == 'argon2id':
+        return HAS_ARGON2
+    if algorithm == 'scrypt':
+        return hasattr(hashlib, 'scrypt')
+    return True
+
+
+def derive(descriptor, secret, salt, length=32):
+    """Raw key bytes for secret/salt with the KDF described by descriptor"""
+    algorithm, params = parse_descriptor(descriptor)
+    if isinstance(secret, str):
+        secret = secret.encode('utf-8')
+    salt = bytes(salt)
+
+    if algorithm == 'pbkdf2-sha256':
+        return hashlib.pbkdf2_hmac('sha256', secret, salt, params['i'], dklen=length)
+
+    if algorithm == 'scrypt':
+        n, r, p = params['n'], params['r'], params['p']
+        # OpenSSL needs room for V (128*r*(n+2)) and B (128*r*p)
+        maxmem = 128 * r * (n + 2 + p) + (1 << 20)
+        return hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=length)
+
+    if not HAS_ARGON2:
+        raise RuntimeError("argon2id entries need argon2-cffi (pip install argon2-cffi)")
+    return hash_secret_raw(secret, salt, time_cost=params['t'], memory_cost=params['m'],
+                           parallelism=params['p'], hash_len=length, type=Argon2Type.ID)
+
+
+def load_config(path=None):
+    """Calibration written by `calibrate --write` (None if missing/invalid)"""
+    try:
+        with open(path or KDF_CONFIG_PATH) as f:
+            config = json.load(f)
+        parse_descriptor(config['descriptor'])
+        return config
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def current_descriptor():
+    """Descriptor for new entries: BRLN_KDF, calibration file or legacy default"""
+    descriptor = os.environ.get('BRLN_KDF')
+    if not descriptor:
+        config = load_config()
+        descriptor = config['descriptor'] if config else LEGACY_DESCRIPTOR
+
+    if not is_supported(descriptor):
+        print(f"⚠️  KDF {descriptor!r} not available here, using {LEGACY_DESCRIPTOR}", file=sys.stderr)
+        return LEGACY_DESCRIPTOR
+    return normalize(descriptor)
+
+
+def needs_upgrade(descriptor):
+    """Whether an entry should be re-encrypted with the current descriptor"""
+    try:
+        return normalize(descriptor or LEGACY_DESCRIPTOR) != current_descriptor()
+    except ValueError:
+        return False
+
+
+# --- calibration ---
+
+def measure_ms(descriptor, rounds=3):
+    """Best-of-N wall time of one derivation in ms"""
+    best = None
+    for _ in range(rounds):
+        salt = os.urandom(32)
+        start = time.perf_counter()
+        derive(descriptor, b'brln-kdf-calibration', salt)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _calibrate_pbkdf2(target_ms, max_memory_mb):
+    sample = 100000
+    elapsed = measure_ms(make_descriptor('pbkdf2-sha256', i=sample), rounds=2)
+    iterations = int(sample * target_ms / elapsed) // 10000 * 10000
+    return make_descriptor('pbkdf2-sha256', i=max(MIN_PBKDF2_ITERATIONS, iterations))
+
+
+def _calibrate_scrypt(target_ms, max_memory_mb):
+    r = 8
+    max_bytes = max_memory_mb * 1024 * 1024
+    n = MIN_SCRYPT_N
+    elapsed = measure_ms(make_descriptor('scrypt', n=n, r=r, p=1), rounds=2)
+    # Memory first (doubling n), then p for the remaining time
+    while elapsed < target_ms and 128 * r * n * 2 <= max_bytes:
+        n *= 2
+        elapsed = measure_ms(make_descriptor('scrypt', n=n, r=r, p=1), rounds=2)
+    p = max(1, round(target_ms / elapsed)) if elapsed < target_ms else 1
+    return make_descriptor('scrypt', n=n, r=r, p=p)
+
+
+def _calibrate_argon2id(target_ms, max_memory_mb):
+    parallelism = min(4, os.cpu_count() or 1)
+    memory_kib = max(MIN_ARGON2_MEMORY_KIB, max_memory_mb * 1024)
+    per_pass = measure_ms(make_descriptor('argon2id', t=1, m=memory_kib, p=parallelism), rounds=2)
+
+    time_cost = max(MIN_ARGON2_TIME_COST, round(target_ms / per_pass))
+    if per_pass * MIN_ARGON2_TIME_COST > target_ms:
+        # Too slow even at the minimum passes: trade memory for time
+        memory_kib = max(MIN_ARGON2_MEMORY_KIB,
+                         int(memory_kib * target_ms / (per_pass * MIN_ARGON2_TIME_COST)))
+        time_cost = MIN_ARGON2_TIME_COST
+    return make_descriptor('argon2id', t=time_cost, m=memory_kib, p=parallelism)
+
+
+CALIBRATORS = {
+    'pbkdf2-sha256': _calibrate_pbkdf2,
+    'scrypt': _calibrate_scrypt,
+    'argon2id': _calibrate_argon2id,
+}
+
+
+def default_algorithm():
+    """Strongest algorithm available: argon2id > scrypt > pbkdf2-sha256"""
+    if HAS_ARGON2:
+        return 'argon2id'
+    if hasattr(hashlib, 'scrypt'):
+        return 'scrypt'
+    return 'pbkdf2-sha256'
+
+
+def calibrate(target_ms=DEFAULT_TARGET_MS, algorithm=None, max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+    """
+    Pick KDF parameters so one derivation takes about target_ms on this machine.
+
+    Returns dict with descriptor, measured_ms and the inputs used.
+    """
+    algorithm = algorithm or default_algorithm()
+    if not is_supported(make_descriptor(algorithm, **{name: 1 for name in ALGORITHMS[algorithm]})):
+        raise RuntimeError(f"{algorithm} not available on this system")
+
+    descriptor = CALIBRATORS[algorithm](target_ms, max_memory_mb)
+    return {
+        'descriptor': descriptor,
+        'measured_ms': round(measure_ms(descriptor), 1),
+        'target_ms': target_ms,
+        'max_memory_mb': max_memory_mb,
+        'cpu_count': os.cpu_count(),
+        'calibrated_at': datetime.now().isoformat()
+    }
+
+
+def write_config(result, path=None):
+    """Save calibration; descriptors are not secret (0644)"""
+    path = path or KDF_CONFIG_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(result, f, indent=2)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='BRLN-OS KDF calibration')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    calibrate_parser = commands.add_parser('calibrate', help='Measure this machine and pick KDF parameters')
+    calibrate_parser.add_argument('--target-ms', type=int, default=DEFAULT_TARGET_MS)
+    calibrate_parser.add_argument('--algorithm', choices=sorted(ALGORITHMS))
+    calibrate_parser.add_argument('--max-memory-mb', type=int, default=DEFAULT_MAX_MEMORY_MB)
+    calibrate_parser.add_argument('--write', action='store_true', help=f'Save to {KDF_CONFIG_PATH}')
+
+    commands.add_parser('show', help='Show the descriptor used for new entries')
+
+    bench_parser = commands.add_parser('bench', help='Time one derivation')
+    bench_parser.add_argument('descriptor')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'calibrate':
+        print(f"Calibrating {args.algorithm or default_algorithm()} for ~{args.target_ms} ms per unlock...")
+        try:
+            result = calibrate(args.target_ms, args.algorithm, args.max_memory_mb)
+        except RuntimeError as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 1
+        print(f"✓ {result['descriptor']} ({result['measured_ms']} ms)")
+        if result['measured_ms'] > args.target_ms * 1.5:
+            print("⚠️  Above target: minimum security parameters reached on this hardware")
+        if args.write:
+            write_config(result)
+            print(f"✓ Saved to {KDF_CONFIG_PATH} - entries are upgraded on the next unlock")
+        return 0
+
+    if args.command == 'show':
+        config = load_config()
+        print(f"Current: {current_descriptor()}")
+        print(f"Source: {'BRLN_KDF' if os.environ.get('BRLN_KDF') else (KDF_CONFIG_PATH if config else 'legacy default')}")
+        if config:
+            print(f"Calibrated: {config.get('calibrated_at')} ({config.get('measured_ms')} ms)")
+        print(f"argon2id available: {'Yes' if HAS_ARGON2 else 'No (pip install argon2-cffi)'}")
+        return 0
+
+    if args.command == 'bench':
+        try:
+            print(f"{normalize(args.descriptor)}: {measure_ms(args.descriptor):.1f} ms")
+        except (ValueError, RuntimeError) as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 1
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+BRLN-OS Secrets Daemon
+Long-lived local service that answers secure password manager lookups over a
+Unix socket, instead of one `python3 secure_password_manager.py get` process
+(two 500,000-iteration PBKDF2 runs) per secret.
+
+- Master password verified once per session (canary challenge-response);
+  entries with an outdated KDF descriptor are upgraded on unlock
+- Per-entry derived keys kept in memory (mlockall, not dumpable), dropped on
+  lock, idle timeout and shutdown
+- Lookups: one SQLite read + one Fernet decrypt
+- Rotations (store/delete/change-password, also from the CLI) pushed to
+  subscribed clients
+- Only peers running as root or as the daemon's own user are served
+
+Protocol: one JSON object per line.
+  request:  {"op": "get", "service": "elements_rpc_password"}
+  response: {"ok": true, "result": "..."} or {"ok": false, "error": "...", "code": "locked"}
+  push:     {"event": "rotated", "service": "..."} (after {"op": "subscribe"})
+
+Usage: secrets_daemon.py [--socket PATH] [--db PATH]
+Environment: BRLN_MASTER_PASSWORD unlocks at startup (optional)
+"""
+
+import os
+import sys
+import json
+import time
+import stat
+import struct
+import socket
+import signal
+import sqlite3
+import argparse
+import threading
+import socketserver
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import brln_kdf
+import secure_password_manager as spm
+from secure_password_api import SECRETS_SOCKET_PATH
+from cryptography.fernet import Fernet, InvalidToken
+
+# Seconds without lookups before the daemon locks itself (0 = only on 'lock')
+IDLE_TIMEOUT_SECONDS = int(os.environ.get('BRLN_SECRETS_IDLE_TIMEOUT', str(spm.SESSION_TIMEOUT_SECONDS)))
+# How often the database is checked for changes made by other processes
+WATCH_INTERVAL_SECONDS = 0.5
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def harden_process():
+    """Keep secrets out of swap and core dumps (best effort)"""
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        PR_SET_DUMPABLE = 4
+        MCL_CURRENT, MCL_FUTURE = 1, 2
+        libc.prctl(PR_SET_DUMPABLE, 0, 0, 0, 0)
+        if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+            print(f"⚠️  mlockall failed (errno {ctypes.get_errno()}); raise LimitMEMLOCK", file=sys.stderr)
+            return False
+        return True
+    except Exception as e:
+        print(f"⚠️  Could not lock process memory: {e}", file=sys.stderr)
+        return False
+
+
+def _derive_key(job):
+    """Worker: (salt, kdf, master_password) -> derived key"""
+    salt, kdf, master_password = job
+    return spm.derive_key_from_password(master_password, salt, kdf=kdf)
+
+
+class DaemonError(Exception):
+    """Request error returned to the client as {"ok": false, "code": ...}"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class SecretsStore:
+    """Unlocked session state: master password and per-salt Fernet keys"""
+
+    def __init__(self, db_path, idle_timeout=IDLE_TIMEOUT_SECONDS):
+        self.db_path = db_path
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._master_password = None
+        self._last_activity = 0
+        # (salt, kdf) -> Fernet with the key derived from (master password, salt, kdf)
+        self._keys = {}
+        self._stats = {'lookups': 0, 'key_derivations': 0, 'unlocks': 0, 'rotations': 0}
+        # Read connection kept open between lookups (reopened if the file is replaced)
+        self._db_lock = threading.Lock()
+        self._reader = None
+        self._reader_inode = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+        conn.execute('PRAGMA busy_timeout=5000')
+        return conn
+
+    def _read(self, sql, params=()):
+        """Run a read-only query on the shared read connection"""
+        inode = os.stat(self.db_path).st_ino
+        with self._db_lock:
+            if self._reader is None or self._reader_inode != inode:
+                if self._reader is not None:
+                    self._reader.close()
+                self._reader = self._connect()
+                self._reader_inode = inode
+            return self._reader.execute(sql, params).fetchall()
+
+    def _kdf_column(self):
+        """'kdf', or 'NULL' while the database predates KDF descriptors"""
+        rows = self._read("SELECT name FROM pragma_table_info('passwords') WHERE name = 'kdf'")
+        return 'kdf' if rows else 'NULL'
+
+    # --- session ---
+
+    def unlock(self, master_password):
+        if not spm.is_initialized():
+            raise DaemonError('not_initialized', 'Password manager not initialized')
+        if not spm.verify_master_password(master_password, silent=True):
+            raise DaemonError('invalid_password', 'Invalid master password')
+
+        with self._lock:
+            if self._master_password != master_password:
+                self._keys.clear()
+            self._master_password = master_password
+            self._last_activity = time.time()
+            self._stats['unlocks'] += 1
+        # verify_master_password also fills the module session cache
+        spm.clear_session()
+        # Lazy KDF migration (re-encrypted entries get new salts, so the
+        # watcher publishes them as rotations)
+        spm.upgrade_kdf(master_password)
+
+    def lock(self):
+        with self._lock:
+            self._master_password = None
+            self._keys.clear()
+            self._last_activity = 0
+        spm.clear_session()
+
+    def _require_session(self):
+        """Master password of the active session (raises if locked or idle)"""
+        with self._lock:
+            if self._master_password and self.idle_timeout and \
+                    time.time() - self._last_activity > self.idle_timeout:
+                self._master_password = None
+                self._keys.clear()
+            if not self._master_password:
+                raise DaemonError('locked', 'Session locked')
+            self._last_activity = time.time()
+            return self._master_password
+
+    def _fernet(self, master_password, salt, kdf=None):
+        """Fernet for an entry salt/KDF, deriving the key only on first use"""
+        cache_key = (bytes(salt), kdf)
+        with self._lock:
+            fernet = self._keys.get(cache_key)
+        if fernet:
+            return fernet
+
+        # KDF outside the lock: other lookups keep being answered
+        fernet = Fernet(spm.derive_key_from_password(master_password, cache_key[0], kdf=kdf))
+        with self._lock:
+            if self._master_password == master_password:
+                self._keys[cache_key] = fernet
+            self._stats['key_derivations'] += 1
+        return fernet
+
+    # --- operations ---
+
+    def get(self, service_name):
+        master_password = self._require_session()
+        rows = self._read(f'SELECT encrypted_password, salt, {self._kdf_column()} FROM passwords '
+                          f'WHERE service_name = ?', (service_name,))
+        if not rows:
+            raise DaemonError('not_found', f"Service '{service_name}' not found")
+
+        encrypted_password, salt, kdf = rows[0]
+        try:
+            value = self._fernet(master_password, salt, kdf).decrypt(encrypted_password).decode('utf-8')
+        except InvalidToken:
+            raise DaemonError('decrypt_failed', 'Decryption failed - password may be corrupted')
+        with self._lock:
+            self._stats['lookups'] += 1
+        return value
+
+    def get_many(self, service_names):
+        """{service: password or None}; keys missing from the cache are derived across cores"""
+        master_password = self._require_session()
+        service_names = list(dict.fromkeys(service_names))
+        if not service_names:
+            return {}
+        placeholders = ', '.join('?' for _ in service_names)
+        rows = self._read(f'SELECT service_name, encrypted_password, salt, {self._kdf_column()} FROM passwords '
+                          f'WHERE service_name IN ({placeholders})', service_names)
+
+        with self._lock:
+            missing = [(bytes(salt), kdf) for _, _, salt, kdf in rows if (bytes(salt), kdf) not in self._keys]
+        if len(missing) > 1:
+            jobs = [(salt, kdf, master_password) for salt, kdf in missing]
+            derived = spm._run_parallel(_derive_key, jobs)
+            with self._lock:
+                if self._master_password == master_password:
+                    for cache_key, key in zip(missing, derived):
+                        self._keys[cache_key] = Fernet(key)
+                self._stats['key_derivations'] += len(missing)
+
+        results = {name: None for name in service_names}
+        for name, encrypted_password, salt, kdf in rows:
+            try:
+                results[name] = self._fernet(master_password, salt, kdf).decrypt(encrypted_password).decode('utf-8')
+            except InvalidToken:
+                pass
+        with self._lock:
+            self._stats['lookups'] += len(rows)
+        return results
+
+    def store(self, service_name, username, password, description='', port=0, url=''):
+        master_password = self._require_session()
+        salt = spm.generate_salt()
+        kdf = brln_kdf.current_descriptor()
+        encrypted_password = self._fernet(master_password, salt, kdf).encrypt(password.encode('utf-8'))
+        now = datetime.now().isoformat()
+
+        # Adds the kdf column to databases created before descriptors
+        spm.init_database()
+
+        conn = self._connect()
+        try:
+            with conn:
+                updated = conn.execute('''
+                    UPDATE passwords
+                    SET username = ?, encrypted_password = ?, salt = ?, kdf = ?,
+                        description = ?, port = ?, url = ?, updated_at = ?
+                    WHERE service_name = ?
+                ''', (username, encrypted_password, salt, kdf, description, port, url, now, service_name)).rowcount
+                if not updated:
+                    conn.execute('''
+                        INSERT INTO passwords (service_name, username, encrypted_password, salt, kdf,
+                                               description, port, url, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (service_name, username, encrypted_password, salt, kdf,
+                          description, port, url, now, now))
+        finally:
+            conn.close()
+        return True
+
+    def delete(self, service_name):
+        self._require_session()
+        conn = self._connect()
+        try:
+            with conn:
+                deleted = conn.execute('DELETE FROM passwords WHERE service_name = ?', (service_name,)).rowcount
+        finally:
+            conn.close()
+        if not deleted:
+            raise DaemonError('not_found', f"Service '{service_name}' not found")
+        return True
+
+    def list_services(self):
+        if not os.path.exists(self.db_path):
+            return []
+        return [row[0] for row in self._read('SELECT service_name FROM passwords ORDER BY service_name')]
+
+    def versions(self):
+        """{service: (updated_at, salt)} used to detect rotations"""
+        if not os.path.exists(self.db_path):
+            return {}
+        rows = self._read('SELECT service_name, updated_at, salt FROM passwords')
+        return {service: (updated_at, bytes(salt)) for service, updated_at, salt in rows}
+
+    def forget_salts(self, live_salts):
+        """Drop keys of entries that were re-encrypted or deleted"""
+        with self._lock:
+            for cache_key in [cache_key for cache_key in self._keys if cache_key[0] not in live_salts]:
+                del self._keys[cache_key]
+
+    def status(self):
+        with self._lock:
+            session_active = bool(self._master_password) and (
+                not self.idle_timeout or time.time() - self._last_activity <= self.idle_timeout)
+            stats = dict(self._stats)
+            cached_keys = len(self._keys)
+        return {
+            'initialized': spm.is_initialized(),
+            'session_active': session_active,
+            'stored_passwords': len(self.list_services()),
+            'iterations': spm.PBKDF2_ITERATIONS,
+            'kdf': brln_kdf.current_descriptor(),
+            'session_timeout': self.idle_timeout,
+            'cached_keys': cached_keys,
+            **stats
+        }
+
+
+class RotationWatcher(threading.Thread):
+    """Polls the database and pushes rotation events to subscribers"""
+
+    def __init__(self, store):
+        super().__init__(name='secrets-watcher', daemon=True)
+        self.store = store
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._versions = store.versions()
+
+    def subscribe(self, wfile):
+        with self._lock:
+            self._subscribers[wfile] = threading.Lock()
+
+    def unsubscribe(self, wfile):
+        with self._lock:
+            self._subscribers.pop(wfile, None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event):
+        line = (json.dumps(event) + '\n').encode()
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for wfile, write_lock in subscribers:
+            try:
+                with write_lock:
+                    wfile.write(line)
+                    wfile.flush()
+            except (OSError, ValueError):
+                self.unsubscribe(wfile)
+
+    def check(self):
+        with self._check_lock:
+            current = self.store.versions()
+            previous, self._versions = self._versions, current
+
+        rotated = [service for service, version in current.items() if previous.get(service) != version]
+        deleted = previous.keys() - current.keys()
+        for service in rotated:
+            self.publish({'event': 'rotated', 'service': service})
+        for service in deleted:
+            self.publish({'event': 'deleted', 'service': service})
+
+        changed = len(rotated) + len(deleted)
+        if changed:
+            with self.store._lock:
+                self.store._stats['rotations'] += changed
+            self.store.forget_salts({salt for _, salt in current.values()})
+
+    def run(self):
+        last_mtime = None
+        while not self._stopped.wait(WATCH_INTERVAL_SECONDS):
+            try:
+                # Cheap change detection: the main file or its WAL was touched
+                mtime = tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+                              for path in (self.store.db_path, self.store.db_path + '-wal'))
+                if mtime != last_mtime:
+                    last_mtime = mtime
+                    self.check()
+            except Exception as e:
+                print(f"⚠️  Rotation check failed: {e}", file=sys.stderr)
+
+    def stop(self):
+        self._stopped.set()
+
+
+class SecretsRequestHandler(socketserver.StreamRequestHandler):
+    """One client connection; requests are answered in order"""
+
+    def _peer_allowed(self):
+        try:
+            creds = self.request.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+            _, uid, _ = struct.unpack('3i', creds)
+        except (OSError, AttributeError):
+            return False
+        return uid in (0, os.getuid())
+
+    def _send(self, payload):
+        self.wfile.write((json.dumps(payload) + '\n').encode())
+        self.wfile.flush()
+
+    def handle(self):
+        if not self._peer_allowed():
+            self._send({'ok': False, 'error': 'Permission denied', 'code': 'forbidden'})
+            return
+
+        store = self.server.store
+        watcher = self.server.watcher
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+
+                if op == 'subscribe':
+                    self._send({'ok': True, 'result': 'subscribed'})
+                    watcher.subscribe(self.wfile)
+                    try:
+                        # Held open until the client goes away
+                        while self.rfile.readline(MAX_REQUEST_BYTES):
+                            pass
+                    finally:
+                        watcher.unsubscribe(self.wfile)
+                    return
+
+                if op == 'ping':
+                    result = 'pong'
+                elif op == 'status':
+                    result = store.status()
+                    result['subscribers'] = watcher.subscriber_count()
+                elif op == 'unlock':
+                    store.unlock(request.get('master_password') or '')
+                    result = True
+                elif op == 'lock':
+                    store.lock()
+                    result = True
+                elif op == 'get':
+                    result = store.get(request['service'])
+                elif op == 'get_many':
+                    result = store.get_many(request['services'])
+                elif op == 'list':
+                    result = store.list_services()
+                elif op == 'store':
+                    result = store.store(request['service'], request.get('username', 'admin'),
+                                         request['password'], request.get('description', ''),
+                                         int(request.get('port') or 0), request.get('url', ''))
+                    watcher.check()
+                elif op == 'delete':
+                    result = store.delete(request['service'])
+                    watcher.check()
+                else:
+                    raise DaemonError('bad_request', f'Unknown op: {op}')
+
+                self._send({'ok': True, 'result': result})
+            except DaemonError as e:
+                self._send({'ok': False, 'error': str(e), 'code': e.code})
+            except (ValueError, KeyError, TypeError) as e:
+                self._send({'ok': False, 'error': f'Bad request: {e}', 'code': 'bad_request'})
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            except Exception as e:
+                self._send({'ok': False, 'error': str(e), 'code': 'error'})
+
+
+class SecretsServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, store):
+        self.store = store
+        self.watcher = RotationWatcher(store)
+        directory = os.path.dirname(socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o750, exist_ok=True)
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.unlink(socket_path)
+
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, SecretsRequestHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(socket_path, 0o600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BRLN-OS secrets daemon')
+    parser.add_argument('--socket', default=SECRETS_SOCKET_PATH)
+    parser.add_argument('--db', default=spm.PASSWORD_DB_PATH)
+    args = parser.parse_args()
+
+    spm.PASSWORD_DB_PATH = args.db
+    harden_process()
+
+    store = SecretsStore(args.db)
+    env_password = os.environ.pop('BRLN_MASTER_PASSWORD', None)
+    if env_password:
+        try:
+            store.unlock(env_password)
+            print("✓ Session unlocked from BRLN_MASTER_PASSWORD")
+        except DaemonError as e:
+            print(f"✗ {e}", file=sys.stderr)
+
+    server = SecretsServer(args.socket, store)
+    server.watcher.start()
+
+    def shutdown(signum, frame):
+        store.lock()
+        server.watcher.stop()
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    # secure_password_manager installs handlers that only clear its session
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"✓ Secrets daemon listening on {args.socket}")
+    try:
+        server.serve_forever()
+    finally:
+        store.lock()
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,21 @@ Provides Python API for integrating secure password manager into applications
 
 import os
 import sys
+import json
 import time
+import socket
+import threading
 import subprocess
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, Callable
 
 # Path to secure password manager script
 SCRIPT_DIR = Path(__file__).parent
 SECURE_PM_SCRIPT = SCRIPT_DIR / "secure_password_manager.py"
 
+# Unix socket of the secrets daemon (secrets_daemon.py)
+SECRETS_SOCKET_PATH = os.environ.get('BRLN_SECRETS_SOCKET', '/run/brln-secrets/secrets.sock')
+
 # In-memory cache for retrieved passwords
 _password_cache: Dict[str, Tuple[str, float]] = {}
 _cache_ttl: int = 300  # 5 minutes cache TTL (matches session timeout)
@@ -25,23 +31,124 @@ class SecurePasswordManagerError(Exception):
     pass
 
 
+class SecretsDaemonUnavailable(SecurePasswordManagerError):
+    """Secrets daemon socket missing or not answering"""
+    pass
+
+
+class SecretsDaemonClient:
+    """
+    Client for the secrets daemon Unix socket
+    Keeps one connection open and sends one JSON request per line
+    """
+    
+    def __init__(self, socket_path: str = SECRETS_SOCKET_PATH, timeout: float = 10):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock = None
+        self._file = None
+    
+    def available(self) -> bool:
+        """Check if the daemon socket exists"""
+        return os.path.exists(self.socket_path)
+    
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock, sock.makefile('rwb')
+    
+    def _close(self):
+        for resource in (self._file, self._sock):
+            try:
+                if resource:
+                    resource.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+    
+    def request(self, op: str, **params) -> Dict:
+        """
+        Send a request and wait for the reply
+        
+        Returns:
+            Reply dict ({'ok': bool, 'result' | 'error', 'code'})
+            
+        Raises:
+            SecretsDaemonUnavailable: if the daemon cannot be reached
+        """
+        payload = (json.dumps({'op': op, **params}) + '\n').encode()
+        with self._lock:
+            # One retry on a fresh connection (daemon restarted)
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._sock, self._file = self._connect()
+                    self._file.write(payload)
+                    self._file.flush()
+                    line = self._file.readline()
+                    if not line:
+                        raise ConnectionResetError("Secrets daemon closed the connection")
+                    return json.loads(line)
+                except (OSError, ValueError) as e:
+                    self._close()
+                    if attempt:
+                        raise SecretsDaemonUnavailable(f"Secrets daemon not available: {e}")
+    
+    def subscribe(self, callback: Callable[[str, str], None]) -> threading.Thread:
+        """
+        Receive rotation events in a background thread (reconnects automatically)
+        
+        Args:
+            callback: Called as callback(event, service_name)
+        """
+        def listen():
+            delay = 1
+            while True:
+                try:
+                    sock, stream = self._connect()
+                    sock.settimeout(None)
+                    stream.write(b'{"op": "subscribe"}\n')
+                    stream.flush()
+                    stream.readline()  # {"ok": true, "result": "subscribed"}
+                    delay = 1
+                    for line in stream:
+                        event = json.loads(line)
+                        callback(event.get('event'), event.get('service'))
+                except (OSError, ValueError):
+                    pass
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+        
+        thread = threading.Thread(target=listen, name='secrets-rotation-listener', daemon=True)
+        thread.start()
+        return thread
+
+
 class SecurePasswordAPI:
     """
     Python API for secure password manager integration
     Provides methods to retrieve, store, and manage passwords programmatically
     """
     
-    def __init__(self, master_password: Optional[str] = None, cache_enabled: bool = True):
+    def __init__(self, master_password: Optional[str] = None, cache_enabled: bool = True,
+                 use_daemon: bool = True):
         """
         Initialize the Secure Password Manager API
         
         Args:
             master_password: Master password for authentication (optional if set in env)
             cache_enabled: Whether to cache retrieved passwords in memory
+            use_daemon: Use the secrets daemon socket when it is running
+                        (falls back to the CLI subprocess otherwise)
         """
         self.master_password = master_password or os.environ.get('BRLN_MASTER_PASSWORD')
         self.cache_enabled = cache_enabled
         self.script_path = str(SECURE_PM_SCRIPT)
+        self.daemon = SecretsDaemonClient() if use_daemon else None
+        self._rotation_listener = None
         
         # Verify script exists
         if not SECURE_PM_SCRIPT.exists():
@@ -49,6 +156,28 @@ class SecurePasswordAPI:
                 f"Secure password manager script not found at {self.script_path}"
             )
     
+    def _daemon_call(self, op: str, **params) -> Optional[Dict]:
+        """
+        Send a request to the secrets daemon
+        
+        Unlocks the daemon once with our master password if it is locked.
+        
+        Returns:
+            Reply dict, or None if the daemon is not running (use the CLI)
+        """
+        if not self.daemon or not self.daemon.available():
+            return None
+        
+        try:
+            reply = self.daemon.request(op, **params)
+            if not reply.get('ok') and reply.get('code') == 'locked' and self.master_password:
+                unlocked = self.daemon.request('unlock', master_password=self.master_password)
+                if unlocked.get('ok'):
+                    reply = self.daemon.request(op, **params)
+            return reply
+        except SecretsDaemonUnavailable:
+            return None
+    
     def _run_command(self, *args, timeout: int = 10) -> Tuple[bool, str]:
         """
         Run secure password manager command
@@ -90,6 +219,10 @@ class SecurePasswordAPI:
         Returns:
             True if initialized, False otherwise
         """
+        reply = self._daemon_call('status')
+        if reply is not None:
+            return bool(reply.get('ok') and reply['result'].get('initialized'))
+        
         success, output = self._run_command('status')
         if success:
             return 'Initialized: Yes' in output
@@ -112,6 +245,15 @@ class SecurePasswordAPI:
             if cached:
                 return cached
         
+        # Retrieve from secrets daemon (no subprocess, no PBKDF2 per lookup)
+        reply = self._daemon_call('get', service=service_name)
+        if reply is not None:
+            if reply.get('ok'):
+                if self.cache_enabled:
+                    self._add_to_cache(service_name, reply['result'])
+                return reply['result']
+            return None
+        
         # Retrieve from password manager
         success, output = self._run_command('get', service_name)
         
@@ -123,6 +265,47 @@ class SecurePasswordAPI:
         
         return None
     
+    def get_passwords(self, service_names: list, use_cache: bool = True) -> Dict[str, Optional[str]]:
+        """
+        Retrieve several passwords in one call
+        
+        Args:
+            service_names: Names of the services
+            use_cache: Whether to use cached passwords if available
+            
+        Returns:
+            Dictionary {service_name: password or None}
+        """
+        results = {}
+        pending = []
+        for service_name in dict.fromkeys(service_names):
+            cached = self._get_from_cache(service_name) if use_cache and self.cache_enabled else None
+            if cached:
+                results[service_name] = cached
+            else:
+                pending.append(service_name)
+        
+        if not pending:
+            return results
+        
+        reply = self._daemon_call('get_many', services=pending)
+        if reply is not None:
+            fetched = reply['result'] if reply.get('ok') else {}
+        else:
+            # One subprocess for all entries (KDFs run in parallel there)
+            success, output = self._run_command('get-many', *pending, timeout=60)
+            try:
+                fetched = json.loads(output) if output.startswith('{') else {}
+            except ValueError:
+                fetched = {}
+        
+        for service_name in pending:
+            password = fetched.get(service_name)
+            if password and self.cache_enabled:
+                self._add_to_cache(service_name, password)
+            results[service_name] = password
+        return results
+    
     def store_password(
         self, 
         service_name: str, 
@@ -146,6 +329,13 @@ class SecurePasswordAPI:
         Returns:
             True if successful, False otherwise
         """
+        reply = self._daemon_call('store', service=service_name, username=username, password=password,
+                                  description=description, port=port, url=url)
+        if reply is not None:
+            if reply.get('ok') and self.cache_enabled:
+                self._remove_from_cache(service_name)
+            return bool(reply.get('ok'))
+        
         args = [
             'store',
             service_name,
@@ -177,7 +367,11 @@ class SecurePasswordAPI:
         Returns:
             True if successful, False otherwise
         """
-        success, _ = self._run_command('delete', service_name)
+        reply = self._daemon_call('delete', service=service_name)
+        if reply is not None:
+            success = bool(reply.get('ok'))
+        else:
+            success, _ = self._run_command('delete', service_name)
         
         # Clear cache
         if success and self.cache_enabled:
@@ -192,6 +386,10 @@ class SecurePasswordAPI:
         Returns:
             List of service names
         """
+        reply = self._daemon_call('list')
+        if reply is not None:
+            return reply['result'] if reply.get('ok') else []
+        
         success, output = self._run_command('list')
         
         if not success:
@@ -231,7 +429,11 @@ class SecurePasswordAPI:
         old_password = self.master_password
         self.master_password = password
         
-        success, _ = self._run_command('unlock', password)
+        reply = self._daemon_call('unlock', master_password=password)
+        if reply is not None:
+            success = bool(reply.get('ok'))
+        else:
+            success, _ = self._run_command('unlock', password)
         
         # Restore old password if unlock failed
         if not success:
@@ -246,7 +448,11 @@ class SecurePasswordAPI:
         Returns:
             True if successful, False otherwise
         """
-        success, _ = self._run_command('lock')
+        reply = self._daemon_call('lock')
+        if reply is not None:
+            success = bool(reply.get('ok'))
+        else:
+            success, _ = self._run_command('lock')
         
         # Clear all cached passwords
         if success:
@@ -261,6 +467,14 @@ class SecurePasswordAPI:
         Returns:
             Dictionary with status information
         """
+        reply = self._daemon_call('status')
+        if reply is not None:
+            if not reply.get('ok'):
+                return {'initialized': False, 'error': reply.get('error')}
+            status = reply['result']
+            status['daemon'] = True
+            return status
+        
         success, output = self._run_command('status')
         
         if not success:
@@ -290,6 +504,29 @@ class SecurePasswordAPI:
         
         return status
     
+    def subscribe_rotations(self, callback: Optional[Callable[[str, str], None]] = None) -> bool:
+        """
+        Drop cached passwords as soon as the daemon reports a rotation
+        
+        Args:
+            callback: Optional callback(event, service_name) after the cache is cleared
+            
+        Returns:
+            True if listening (daemon enabled), False otherwise
+        """
+        if not self.daemon:
+            return False
+        
+        if self._rotation_listener is None:
+            def on_rotation(event, service_name):
+                if service_name:
+                    self._remove_from_cache(service_name)
+                if callback:
+                    callback(event, service_name)
+            
+            self._rotation_listener = self.daemon.subscribe(on_rotation)
+        return True
+    
     def _get_from_cache(self, service_name: str) -> Optional[str]:
         """Get password from cache if not expired"""
         if service_name in _password_cache:
@@ -307,8 +544,7 @@ class SecurePasswordAPI:
     
     def _remove_from_cache(self, service_name: str):
         """Remove password from cache"""
-        if service_name in _password_cache:
-            del _password_cache[service_name]
+        _password_cache.pop(service_name, None)
     
     def clear_cache(self):
         """Clear all cached passwords"""
@@ -6,6 +6,8 @@ Enhanced security with:
 - Zero local storage of authentication data
 - Per-password unique salts
 - 500,000+ PBKDF2 iterations for quantum-resistant security
+- Per-entry KDF descriptor (PBKDF2/scrypt/Argon2id, see brln_kdf.py),
+  upgraded lazily on unlock
 - In-memory session caching with auto-timeout
 - Challenge-response validation without storing verification data
 """
@@ -20,17 +22,21 @@ import time
 import atexit
 import signal
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from cryptography.fernet import Fernet, InvalidToken
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.backends import default_backend
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import brln_kdf
 
 # Configuration
 PASSWORD_DB_PATH = "/data/brln-secure-passwords.db"
 PBKDF2_ITERATIONS = 500000  # Quantum-resistant iterations
 SESSION_TIMEOUT_SECONDS = 300  # 5 minutes session timeout
 CANARY_VALUE = b"BRLN_SECURE_CANARY_2026"  # Known value for challenge-response
+# Processes used for per-entry PBKDF2 in bulk operations
+KDF_WORKERS = int(os.environ.get('BRLN_KDF_WORKERS', str(os.cpu_count() or 1)))
 
 # In-memory session cache (ephemeral)
 _session_cache = {
@@ -92,38 +98,83 @@ def generate_salt(length=32):
     return os.urandom(length)
 
 
-def derive_key_from_password(master_password, salt, iterations=PBKDF2_ITERATIONS):
+def derive_key_from_password(master_password, salt, iterations=PBKDF2_ITERATIONS, kdf=None):
     """
-    Derive encryption key from master password using PBKDF2-HMAC-SHA256
-    with high iteration count for quantum resistance
+    Derive encryption key from master password.
+    kdf is the entry's descriptor (brln_kdf); None means a legacy entry
+    (PBKDF2-HMAC-SHA256 with the given iterations).
     """
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=salt,
-        iterations=iterations,
-        backend=default_backend()
-    )
-    key = base64.urlsafe_b64encode(kdf.derive(master_password.encode('utf-8')))
-    return key
-
-
-def encrypt_data(data, master_password, salt):
+    descriptor = kdf or brln_kdf.make_descriptor('pbkdf2-sha256', i=iterations)
+    return base64.urlsafe_b64encode(brln_kdf.derive(descriptor, master_password, salt))
+
+
+def encrypt_data(data, master_password, salt, kdf=None):
     """Encrypt data using Fernet with derived key"""
-    key = derive_key_from_password(master_password, salt)
+    key = derive_key_from_password(master_password, salt, kdf=kdf)
     f = Fernet(key)
     if isinstance(data, str):
         data = data.encode('utf-8')
     return f.encrypt(data)
 
 
-def decrypt_data(encrypted_data, master_password, salt):
+def decrypt_data(encrypted_data, master_password, salt, kdf=None):
     """Decrypt data using Fernet with derived key"""
-    key = derive_key_from_password(master_password, salt)
+    key = derive_key_from_password(master_password, salt, kdf=kdf)
     f = Fernet(key)
     return f.decrypt(encrypted_data)
 
 
+def kdf_column(cursor, table):
+    """
+    SQL for the kdf column of a table: 'kdf', or 'NULL' on databases created
+    before descriptors (the API may only have read access to add it)
+    """
+    cursor.execute(f"SELECT name FROM pragma_table_info('{table}')")
+    return 'kdf' if 'kdf' in {row[0] for row in cursor.fetchall()} else 'NULL'
+
+
+def _ensure_kdf_columns(cursor):
+    """Add the kdf descriptor column to databases created before it (NULL = legacy)"""
+    for table in ('canary', 'passwords'):
+        if kdf_column(cursor, table) == 'NULL':
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN kdf TEXT')
+
+
+def _run_parallel(worker, jobs):
+    """
+    Run per-entry KDF work across cores (one PBKDF2 per process at a time).
+    Falls back to sequential for a single job or when no pool is available.
+    """
+    jobs = list(jobs)
+    workers = min(KDF_WORKERS, len(jobs))
+    if workers <= 1:
+        return [worker(job) for job in jobs]
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(worker, jobs))
+    except (OSError, NotImplementedError, BrokenProcessPool) as e:
+        print(f"⚠️  Process pool unavailable ({e}), running sequentially", file=sys.stderr)
+        return [worker(job) for job in jobs]
+
+
+def _decrypt_entry(job):
+    """Worker: (service, encrypted, salt, kdf, master_password) -> (service, password or None)"""
+    service_name, encrypted_password, password_salt, kdf, master_password = job
+    try:
+        return service_name, decrypt_data(encrypted_password, master_password, password_salt, kdf).decode('utf-8')
+    except InvalidToken:
+        return service_name, None
+
+
+def _reencrypt_entry(job):
+    """Worker: decrypt with the old password/KDF, encrypt with the new password, KDF and salt"""
+    entry_id, service_name, encrypted_password, old_salt, old_kdf, old_password, new_password, new_kdf = job
+    decrypted = decrypt_data(encrypted_password, old_password, old_salt, old_kdf)
+    new_salt = generate_salt()
+    return entry_id, service_name, encrypt_data(decrypted, new_password, new_salt, new_kdf), new_salt
+
+
 def init_database():
     """Initialize the secure password database"""
     os.makedirs(os.path.dirname(PASSWORD_DB_PATH), exist_ok=True)
@@ -139,7 +190,8 @@ def init_database():
             id INTEGER PRIMARY KEY CHECK (id = 1),
             encrypted_canary BLOB NOT NULL,
             salt BLOB NOT NULL,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            kdf TEXT
         )
     ''')
     
@@ -155,10 +207,14 @@ def init_database():
             port INTEGER,
             url TEXT,
             created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
+            updated_at TEXT NOT NULL,
+            kdf TEXT
         )
     ''')
     
+    # kdf: descriptor of the entry's key derivation (NULL = legacy PBKDF2)
+    _ensure_kdf_columns(cursor)
+    
     conn.commit()
     conn.close()
     
@@ -200,9 +256,10 @@ def initialize_master_password(master_password):
     
     # Generate unique salt for canary
     canary_salt = generate_salt()
+    canary_kdf = brln_kdf.current_descriptor()
     
     # Encrypt the known canary value with master password
-    encrypted_canary = encrypt_data(CANARY_VALUE, master_password, canary_salt)
+    encrypted_canary = encrypt_data(CANARY_VALUE, master_password, canary_salt, canary_kdf)
     
     conn = sqlite3.connect(PASSWORD_DB_PATH)
     cursor = conn.cursor()
@@ -210,9 +267,9 @@ def initialize_master_password(master_password):
     now = datetime.now().isoformat()
     
     cursor.execute('''
-        INSERT INTO canary (id, encrypted_canary, salt, created_at)
-        VALUES (1, ?, ?, ?)
-    ''', (encrypted_canary, canary_salt, now))
+        INSERT INTO canary (id, encrypted_canary, salt, created_at, kdf)
+        VALUES (1, ?, ?, ?, ?)
+    ''', (encrypted_canary, canary_salt, now, canary_kdf))
     
     conn.commit()
     conn.close()
@@ -241,7 +298,7 @@ def verify_master_password(master_password, silent=False):
     conn = sqlite3.connect(PASSWORD_DB_PATH)
     cursor = conn.cursor()
     
-    cursor.execute('SELECT encrypted_canary, salt FROM canary WHERE id = 1')
+    cursor.execute(f'SELECT encrypted_canary, salt, {kdf_column(cursor, "canary")} FROM canary WHERE id = 1')
     result = cursor.fetchone()
     conn.close()
     
@@ -250,11 +307,11 @@ def verify_master_password(master_password, silent=False):
             print("✗ Canary not found - database may be corrupted", file=sys.stderr)
         return False
     
-    encrypted_canary, canary_salt = result
+    encrypted_canary, canary_salt, canary_kdf = result
     
     try:
         # Attempt to decrypt canary with provided password
-        decrypted = decrypt_data(encrypted_canary, master_password, canary_salt)
+        decrypted = decrypt_data(encrypted_canary, master_password, canary_salt, canary_kdf)
         
         # Verify canary value matches (constant-time comparison)
         if secrets.compare_digest(decrypted, CANARY_VALUE):
@@ -330,9 +387,10 @@ def store_password(service_name, username, password, description="", port=0, url
     
     # Generate unique salt for this password entry
     password_salt = generate_salt()
+    password_kdf = brln_kdf.current_descriptor()
     
     # Encrypt password with unique salt
-    encrypted_password = encrypt_data(password, master_password, password_salt)
+    encrypted_password = encrypt_data(password, master_password, password_salt, password_kdf)
     
     conn = sqlite3.connect(PASSWORD_DB_PATH)
     cursor = conn.cursor()
@@ -348,18 +406,18 @@ def store_password(service_name, username, password, description="", port=0, url
             # Update with new salt and encryption
             cursor.execute('''
                 UPDATE passwords 
-                SET username = ?, encrypted_password = ?, salt = ?, 
+                SET username = ?, encrypted_password = ?, salt = ?, kdf = ?,
                     description = ?, port = ?, url = ?, updated_at = ?
                 WHERE service_name = ?
-            ''', (username, encrypted_password, password_salt, description, port, url, now, service_name))
+            ''', (username, encrypted_password, password_salt, password_kdf, description, port, url, now, service_name))
             print(f"✓ Updated password for '{service_name}'")
         else:
             # Insert new entry
             cursor.execute('''
-                INSERT INTO passwords (service_name, username, encrypted_password, salt, 
+                INSERT INTO passwords (service_name, username, encrypted_password, salt, kdf,
                                        description, port, url, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (service_name, username, encrypted_password, password_salt, 
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (service_name, username, encrypted_password, password_salt, password_kdf,
                   description, port, url, now, now))
             print(f"✓ Stored password for '{service_name}'")
         
@@ -399,7 +457,8 @@ def get_password(service_name, master_password=None):
     conn = sqlite3.connect(PASSWORD_DB_PATH)
     cursor = conn.cursor()
     
-    cursor.execute('SELECT encrypted_password, salt FROM passwords WHERE service_name = ?', (service_name,))
+    cursor.execute(f'SELECT encrypted_password, salt, {kdf_column(cursor, "passwords")} FROM passwords WHERE service_name = ?',
+                   (service_name,))
     result = cursor.fetchone()
     conn.close()
     
@@ -407,11 +466,11 @@ def get_password(service_name, master_password=None):
         print(f"✗ Service '{service_name}' not found", file=sys.stderr)
         return None
     
-    encrypted_password, password_salt = result
+    encrypted_password, password_salt, password_kdf = result
     
     try:
-        # Decrypt using per-password salt
-        decrypted = decrypt_data(encrypted_password, master_password, password_salt)
+        # Decrypt using per-password salt and KDF
+        decrypted = decrypt_data(encrypted_password, master_password, password_salt, password_kdf)
         return decrypted.decode('utf-8')
     except InvalidToken:
         print("✗ Decryption failed - password may be corrupted", file=sys.stderr)
@@ -421,6 +480,61 @@ def get_password(service_name, master_password=None):
         return None
 
 
+def get_passwords(service_names, master_password=None):
+    """
+    Retrieve and decrypt several passwords at once.
+    Master password is verified once; per-entry KDFs run in parallel.
+    
+    Returns dict {service_name: password or None}
+    """
+    service_names = list(dict.fromkeys(service_names))
+    if not service_names:
+        return {}
+    
+    if not os.path.exists(PASSWORD_DB_PATH):
+        print("✗ Password database not found", file=sys.stderr)
+        return {name: None for name in service_names}
+    
+    if not is_initialized():
+        print("✗ Password manager not initialized", file=sys.stderr)
+        return {name: None for name in service_names}
+    
+    # Get or verify master password
+    if master_password:
+        if not verify_master_password(master_password, silent=True):
+            print("✗ Invalid master password", file=sys.stderr)
+            return {name: None for name in service_names}
+    else:
+        master_password = get_master_password()
+        if not master_password:
+            print("✗ Master password required", file=sys.stderr)
+            return {name: None for name in service_names}
+    
+    conn = sqlite3.connect(PASSWORD_DB_PATH)
+    cursor = conn.cursor()
+    
+    placeholders = ', '.join('?' for _ in service_names)
+    cursor.execute(f'SELECT service_name, encrypted_password, salt, {kdf_column(cursor, "passwords")} '
+                   f'FROM passwords WHERE service_name IN ({placeholders})', service_names)
+    rows = cursor.fetchall()
+    conn.close()
+    
+    results = {name: None for name in service_names}
+    jobs = [(name, encrypted_password, password_salt, password_kdf, master_password)
+            for name, encrypted_password, password_salt, password_kdf in rows]
+    for name, password in _run_parallel(_decrypt_entry, jobs):
+        results[name] = password
+        if password is None:
+            print(f"✗ Decryption failed for '{name}' - password may be corrupted", file=sys.stderr)
+    
+    found = {row[0] for row in rows}
+    for name in service_names:
+        if name not in found:
+            print(f"✗ Service '{name}' not found", file=sys.stderr)
+    
+    return results
+
+
 def list_passwords():
     """List all stored services (no passwords shown)"""
     if not os.path.exists(PASSWORD_DB_PATH):
@@ -503,60 +617,123 @@ def change_master_password(old_password, new_password):
         print("✗ New master password must be at least 12 characters", file=sys.stderr)
         return False
     
-    conn = sqlite3.connect(PASSWORD_DB_PATH)
-    cursor = conn.cursor()
+    init_database()
     
     try:
-        # Get all passwords
-        cursor.execute('SELECT id, service_name, encrypted_password, salt FROM passwords')
-        entries = cursor.fetchall()
-        
-        # Re-encrypt each password with new master password
-        for entry_id, service_name, encrypted_pw, old_salt in entries:
-            # Decrypt with old password
-            decrypted = decrypt_data(encrypted_pw, old_password, old_salt)
-            
-            # Generate new salt for this password
-            new_salt = generate_salt()
-            
-            # Re-encrypt with new password and new salt
-            new_encrypted = encrypt_data(decrypted, new_password, new_salt)
-            
-            # Update entry
-            cursor.execute('''
-                UPDATE passwords SET encrypted_password = ?, salt = ?, updated_at = ?
-                WHERE id = ?
-            ''', (new_encrypted, new_salt, datetime.now().isoformat(), entry_id))
-            
+        count = _reencrypt_all(old_password, new_password, brln_kdf.current_descriptor())
+        for service_name in count:
             print(f"  ✓ Re-encrypted '{service_name}'")
         
-        # Update canary with new password
-        new_canary_salt = generate_salt()
-        new_encrypted_canary = encrypt_data(CANARY_VALUE, new_password, new_canary_salt)
-        
-        cursor.execute('''
-            UPDATE canary SET encrypted_canary = ?, salt = ?
-            WHERE id = 1
-        ''', (new_encrypted_canary, new_canary_salt))
-        
-        conn.commit()
-        
         # Update session
         set_session_key(new_password)
         
         print(f"\n✓ Master password changed successfully")
-        print(f"✓ Re-encrypted {len(entries)} password(s)")
+        print(f"✓ Re-encrypted {len(count)} password(s)")
         
         return True
         
     except Exception as e:
-        conn.rollback()
         print(f"✗ Error changing master password: {e}", file=sys.stderr)
         return False
+
+
+def _reencrypt_all(old_password, new_password, new_kdf, only_outdated=False):
+    """
+    Re-encrypt entries (and the canary) with new_password/new_kdf.
+    
+    KDFs run across cores without holding the database lock; all new
+    ciphertexts are written in one transaction, which is aborted if any
+    entry or the canary changed meanwhile (or, when every entry is being
+    re-encrypted, if one was added or removed). Returns the re-encrypted
+    service names.
+    """
+    conn = sqlite3.connect(PASSWORD_DB_PATH)
+    cursor = conn.cursor()
+    
+    try:
+        select_entries = 'SELECT id, service_name, encrypted_password, salt, kdf FROM passwords'
+        select_canary = 'SELECT encrypted_canary, salt, kdf FROM canary WHERE id = 1'
+        cursor.execute(select_entries)
+        entries = cursor.fetchall()
+        cursor.execute(select_canary)
+        canary = cursor.fetchone()
+        
+        if only_outdated:
+            entries = [entry for entry in entries if brln_kdf.needs_upgrade(entry[4])]
+        update_canary = not only_outdated or brln_kdf.needs_upgrade(canary[2])
+        if not entries and not update_canary:
+            return []
+        
+        reencrypted = _run_parallel(_reencrypt_entry, [
+            (entry_id, service_name, encrypted_pw, old_salt, old_kdf, old_password, new_password, new_kdf)
+            for entry_id, service_name, encrypted_pw, old_salt, old_kdf in entries
+        ])
+        
+        if update_canary:
+            new_canary_salt = generate_salt()
+            new_encrypted_canary = encrypt_data(CANARY_VALUE, new_password, new_canary_salt, new_kdf)
+        
+        # All new ciphertexts and the canary in a single transaction
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.execute(select_entries)
+        current = {entry[0]: entry for entry in cursor.fetchall()}
+        changed = any(current.get(entry[0]) != entry for entry in entries)
+        # An entry stored meanwhile would stay under the old password
+        if not only_outdated and set(current) != {entry[0] for entry in entries}:
+            changed = True
+        cursor.execute(select_canary)
+        if cursor.fetchone() != canary:
+            changed = True
+        if changed:
+            raise Exception("Passwords changed during re-encryption, try again")
+        
+        now = datetime.now().isoformat()
+        cursor.executemany('''
+            UPDATE passwords SET encrypted_password = ?, salt = ?, kdf = ?, updated_at = ?
+            WHERE id = ?
+        ''', [(new_encrypted, new_salt, new_kdf, now, entry_id)
+              for entry_id, _, new_encrypted, new_salt in reencrypted])
+        
+        if update_canary:
+            cursor.execute('''
+                UPDATE canary SET encrypted_canary = ?, salt = ?, kdf = ?
+                WHERE id = 1
+            ''', (new_encrypted_canary, new_canary_salt, new_kdf))
+        
+        conn.commit()
+        return [service_name for _, service_name, _, _ in reencrypted]
+    
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         conn.close()
 
 
+def upgrade_kdf(master_password):
+    """
+    Lazy migration: re-encrypt entries whose KDF differs from the current
+    descriptor (calibration/BRLN_KDF). Called after a successful unlock;
+    skipped when the database is read-only for this user.
+    
+    Returns the number of upgraded entries.
+    """
+    if not is_initialized() or not os.access(PASSWORD_DB_PATH, os.W_OK):
+        return 0
+    
+    try:
+        init_database()
+        upgraded = _reencrypt_all(master_password, master_password, brln_kdf.current_descriptor(),
+                                  only_outdated=True)
+    except Exception as e:
+        print(f"⚠️  KDF upgrade skipped: {e}", file=sys.stderr)
+        return 0
+    
+    if upgraded:
+        print(f"✓ Upgraded {len(upgraded)} password(s) to {brln_kdf.current_descriptor()}")
+    return len(upgraded)
+
+
 def reset_database():
     """Reset the entire password database (WARNING: destructive)"""
     if os.path.exists(PASSWORD_DB_PATH):
@@ -573,7 +750,8 @@ def show_status():
     print("\n=== BRLN-OS Secure Password Manager v2 ===")
     print(f"Database: {PASSWORD_DB_PATH}")
     print(f"Initialized: {'Yes' if is_initialized() else 'No'}")
-    print(f"PBKDF2 Iterations: {PBKDF2_ITERATIONS:,}")
+    print(f"PBKDF2 Iterations: {PBKDF2_ITERATIONS:,} (legacy entries)")
+    print(f"KDF for new entries: {brln_kdf.current_descriptor()}")
     print(f"Session Timeout: {SESSION_TIMEOUT_SECONDS} seconds")
     
     session_active = get_session_key() is not None
@@ -588,8 +766,12 @@ def show_status():
         cursor = conn.cursor()
         cursor.execute('SELECT COUNT(*) FROM passwords')
         count = cursor.fetchone()[0]
+        cursor.execute(f'SELECT {kdf_column(cursor, "passwords")}, COUNT(*) FROM passwords GROUP BY 1')
+        kdf_counts = cursor.fetchall()
         conn.close()
         print(f"Stored Passwords: {count}")
+        for kdf, kdf_count in kdf_counts:
+            print(f"  {kdf or 'legacy ' + brln_kdf.LEGACY_DESCRIPTOR}: {kdf_count}")
     
     print("\nSecurity Features:")
     print("  ✓ Zero local storage of master password")
@@ -610,6 +792,7 @@ def unlock_session(master_password=None):
     if master_password:
         if verify_master_password(master_password):
             print(f"✓ Session unlocked for {SESSION_TIMEOUT_SECONDS} seconds")
+            upgrade_kdf(master_password)
             return True
         return False
     
@@ -619,6 +802,7 @@ def unlock_session(master_password=None):
         master_password = getpass.getpass("Enter master password: ")
         if verify_master_password(master_password):
             print(f"✓ Session unlocked for {SESSION_TIMEOUT_SECONDS} seconds")
+            upgrade_kdf(master_password)
             return True
     except (EOFError, KeyboardInterrupt):
         print()
@@ -641,10 +825,12 @@ def main():
         print("  secure_password_manager.py lock")
         print("  secure_password_manager.py store <service> <username> <password> [description] [port] [url] [master_password]")
         print("  secure_password_manager.py get <service> [master_password]")
+        print("  secure_password_manager.py get-many <service> [service ...]")
         print("  secure_password_manager.py list")
         print("  secure_password_manager.py delete <service> [master_password]")
         print("  secure_password_manager.py change-password <old_password> <new_password>")
         print("  secure_password_manager.py status")
+        print("  secure_password_manager.py calibrate-kdf [--target-ms 500] [--algorithm argon2id|scrypt|pbkdf2-sha256] [--write]")
         print("  secure_password_manager.py reset")
         print("")
         print("Environment: Set BRLN_MASTER_PASSWORD to avoid prompts")
@@ -706,6 +892,17 @@ def main():
         else:
             sys.exit(1)
     
+    elif command == "get-many":
+        if len(sys.argv) < 3:
+            print("✗ Usage: get-many <service> [service ...]", file=sys.stderr)
+            sys.exit(1)
+        
+        import json
+        passwords = get_passwords(sys.argv[2:])
+        print(json.dumps(passwords))
+        if not any(passwords.values()):
+            sys.exit(1)
+    
     elif command == "list":
         list_passwords()
     
@@ -739,6 +936,9 @@ def main():
     elif command == "status":
         show_status()
     
+    elif command == "calibrate-kdf":
+        sys.exit(brln_kdf.main(['calibrate', *sys.argv[2:]]))
+    
     elif command == "reset":
         confirm = input("⚠️  This will DELETE ALL stored passwords. Type 'yes' to confirm: ")
         if confirm.lower() == 'yes':
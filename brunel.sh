@@ -298,7 +298,7 @@ configure_api_service() {
     
     # Reload systemd and enable service
     sudo systemctl daemon-reload
-    sudo systemctl enable brln-api
+    sudo systemctl enable brln-secrets brln-api
     
     echo -e "${GREEN}✅ Serviço API configurado${NC}"
 }
@@ -37,8 +37,19 @@ document.addEventListener('DOMContentLoaded', function() {
   initializePage();
   setupEventListeners();
   
-  // Atualizar dados a cada 30 segundos
-  setInterval(updateAllData, 30000);
+  // Saldo on-chain e novos blocos chegam pelo stream de eventos; recarrega só quando algo muda
+  const refreshOnChange = (state, event) => {
+    if (event.type === 'diff') updateAllData();
+  };
+  const stream = window.BRLNEvents && BRLNEvents.subscribe({
+    balances: refreshOnChange,
+    blocks: refreshOnChange
+  });
+  
+  if (!stream) {
+    // Navegador sem EventSource: atualizar dados a cada 30 segundos
+    setInterval(updateAllData, 30000);
+  }
 });
 
 function initializePage() {
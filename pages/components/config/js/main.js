@@ -139,22 +139,26 @@ async function loadServicesStatus() {
     const data = await response.json();
     console.log('Dados dos serviços:', data);
     
-    if (data.services) {
-      Object.keys(data.services).forEach(service => {
-        const checkbox = document.getElementById(`${service}-button`);
-        if (checkbox) {
-          console.log(`Atualizando ${service}: ${data.services[service]}`);
-          checkbox.checked = data.services[service];
-        } else {
-          console.warn(`Checkbox não encontrado para o serviço: ${service}`);
-        }
-      });
-    }
+    renderServicesStatus(data);
   } catch (error) {
     console.error('Erro ao carregar status dos serviços:', error);
   }
 }
 
+// Atualizar checkboxes dos serviços (usado pelo fetch e pelo stream de eventos)
+function renderServicesStatus(data) {
+  if (data.services) {
+    Object.keys(data.services).forEach(service => {
+      const checkbox = document.getElementById(`${service}-button`);
+      if (checkbox) {
+        checkbox.checked = data.services[service];
+      } else {
+        console.warn(`Checkbox não encontrado para o serviço: ${service}`);
+      }
+    });
+  }
+}
+
 // Check LND installation status
 async function checkLNDInstallation() {
   try {
@@ -297,41 +301,7 @@ async function loadSystemStatus() {
     }
     const data = await response.json();
     
-    // Atualizar CPU
-    const cpuElement = document.getElementById('cpu');
-    if (data.cpu) {
-      cpuElement.textContent = `CPU: ${data.cpu.usage}% | Load: ${data.cpu.load}`;
-      cpuElement.style.background = data.cpu.usage > 80 ? '#ff4444' : '#90EE90';
-    }
-    
-    // Atualizar RAM
-    const ramElement = document.getElementById('ram');
-    if (data.ram) {
-      ramElement.textContent = `RAM: ${data.ram.used} / ${data.ram.total} (${data.ram.percentage}%)`;
-      ramElement.style.background = data.ram.percentage > 80 ? '#ff4444' : '#90EE90';
-    }
-    
-    // Atualizar LND
-    const lndElement = document.getElementById('lnd');
-    if (data.lnd) {
-      lndElement.textContent = `LND: ${data.lnd.status} | Synced: ${data.lnd.synced ? 'Sim' : 'Não'}`;
-      lndElement.style.background = data.lnd.status === 'running' ? '#90EE90' : '#ff4444';
-    }
-    
-    // Atualizar Bitcoind
-    const bitcoindElement = document.getElementById('bitcoind');
-    if (data.bitcoind) {
-      bitcoindElement.textContent = `Bitcoind: ${data.bitcoind.status} | Blocks: ${data.bitcoind.blocks}`;
-      bitcoindElement.style.background = data.bitcoind.status === 'running' ? '#90EE90' : '#ff4444';
-    }
-
-    // Atualizar Blockchain
-    const blockchainElement = document.getElementById('blockchain');
-    if (data.blockchain) {
-      blockchainElement.textContent = `Blockchain: ${data.blockchain.size} | Progress: ${data.blockchain.progress}%`;
-      blockchainElement.style.background = data.blockchain.progress >= 99.9 ? '#90EE90' : '#FFD700';
-    }
-    
+    renderSystemStatus(data);
   } catch (error) {
     console.error('Erro ao carregar status do sistema:', error);
     document.getElementById('cpu').textContent = 'CPU: Erro ao carregar';
@@ -342,6 +312,44 @@ async function loadSystemStatus() {
   }
 }
 
+// Atualizar painel de status (usado pelo fetch e pelo stream de eventos)
+function renderSystemStatus(data) {
+  // Atualizar CPU
+  const cpuElement = document.getElementById('cpu');
+  if (data.cpu) {
+    cpuElement.textContent = `CPU: ${data.cpu.usage}% | Load: ${data.cpu.load}`;
+    cpuElement.style.background = data.cpu.usage > 80 ? '#ff4444' : '#90EE90';
+  }
+  
+  // Atualizar RAM
+  const ramElement = document.getElementById('ram');
+  if (data.ram) {
+    ramElement.textContent = `RAM: ${data.ram.used} / ${data.ram.total} (${data.ram.percentage}%)`;
+    ramElement.style.background = data.ram.percentage > 80 ? '#ff4444' : '#90EE90';
+  }
+  
+  // Atualizar LND
+  const lndElement = document.getElementById('lnd');
+  if (data.lnd) {
+    lndElement.textContent = `LND: ${data.lnd.status} | Synced: ${data.lnd.synced ? 'Sim' : 'Não'}`;
+    lndElement.style.background = data.lnd.status === 'running' ? '#90EE90' : '#ff4444';
+  }
+  
+  // Atualizar Bitcoind
+  const bitcoindElement = document.getElementById('bitcoind');
+  if (data.bitcoind) {
+    bitcoindElement.textContent = `Bitcoind: ${data.bitcoind.status} | Blocks: ${data.bitcoind.blocks}`;
+    bitcoindElement.style.background = data.bitcoind.status === 'running' ? '#90EE90' : '#ff4444';
+  }
+
+  // Atualizar Blockchain
+  const blockchainElement = document.getElementById('blockchain');
+  if (data.blockchain) {
+    blockchainElement.textContent = `Blockchain: ${data.blockchain.size} | Progress: ${data.blockchain.progress}%`;
+    blockchainElement.style.background = data.blockchain.progress >= 99.9 ? '#90EE90' : '#FFD700';
+  }
+}
+
 // Password Manager Backup Functions
 async function loadBackupInfo() {
   try {
@@ -453,11 +461,17 @@ document.addEventListener('DOMContentLoaded', async function() {
   loadSystemStatus();
   loadBackupInfo();
   
-  // Atualizar status a cada 10 segundos
-  setInterval(loadSystemStatus, 10000);
+  // Status do sistema e dos serviços chegam pelo stream de eventos (só quando mudam)
+  const stream = window.BRLNEvents && BRLNEvents.subscribe({
+    services: renderServicesStatus,
+    status: renderSystemStatus
+  });
   
-  // Atualizar status dos serviços a cada 5 segundos
-  setInterval(loadServicesStatus, 5000);
+  if (!stream) {
+    // Navegador sem EventSource: volta ao polling
+    setInterval(loadSystemStatus, 10000);
+    setInterval(loadServicesStatus, 5000);
+  }
   
   // Atualizar backup info a cada 30 segundos
   setInterval(loadBackupInfo, 30000);
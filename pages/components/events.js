@@ -0,0 +1,184 @@
+// Cliente do stream de eventos da API BRLN-OS (/api/v1/events)
+// Mantém o estado de cada tópico aplicando os diffs (JSON Merge Patch) enviados pelo servidor
+//
+// Uma conexão por aba: o EventSource fica na janela principal (main.html) com a união
+// dos tópicos, e as páginas dos iframes (cabeçalho e conteúdo) assinam por ela. Sem
+// HTTP/2, cada stream ocupa uma das 6 conexões por host do navegador e uma thread da API.
+
+(function (global) {
+  const EVENTS_URL = '/api/v1/events';
+  const RECONNECT_DELAY_MS = 1000;  // espera a próxima página assinar antes de reabrir o stream
+
+  // Aplica um JSON Merge Patch (RFC 7386): null remove a chave, objetos são mesclados
+  function mergePatch(target, patch) {
+    if (patch === null || typeof patch !== 'object' || Array.isArray(patch)) {
+      return patch;
+    }
+
+    const result = (target && typeof target === 'object' && !Array.isArray(target)) ? { ...target } : {};
+    Object.keys(patch).forEach(key => {
+      if (patch[key] === null) {
+        delete result[key];
+      } else {
+        result[key] = mergePatch(result[key], patch[key]);
+      }
+    });
+    return result;
+  }
+
+  // Stream compartilhado pelos assinantes desta janela; reaberto quando a união dos tópicos muda
+  function createHub() {
+    const subscribers = new Map();  // id -> handlers
+    const states = {};
+    let nextId = 1;
+    let source = null;
+    let openTopics = [];
+    let timer = null;
+    let timerDue = 0;
+
+    function wantedTopics() {
+      const topics = new Set();
+      subscribers.forEach(handlers => Object.keys(handlers).forEach(topic => topics.add(topic)));
+      return Array.from(topics).sort();
+    }
+
+    function deliver(handlers, topic, event) {
+      const handler = handlers[topic];
+      if (!handler) {
+        return;
+      }
+      try {
+        handler(states[topic], event);
+      } catch (error) {
+        console.error(`Erro ao processar evento ${topic}:`, error);
+      }
+    }
+
+    function connect() {
+      timer = null;
+      const topics = wantedTopics();
+      if (topics.join(',') === openTopics.join(',')) {
+        return;
+      }
+
+      if (source) {
+        source.close();
+        source = null;
+      }
+      Object.keys(states).forEach(topic => {
+        if (!topics.includes(topic)) {
+          delete states[topic];
+        }
+      });
+      openTopics = topics;
+      if (!topics.length) {
+        return;
+      }
+
+      source = new EventSource(`${EVENTS_URL}?topics=${topics.join(',')}`, { withCredentials: true });
+      topics.forEach(topic => {
+        source.addEventListener(topic, (message) => {
+          const event = JSON.parse(message.data);
+          states[topic] = event.type === 'snapshot' ? event.data : mergePatch(states[topic], event.data);
+          subscribers.forEach(handlers => deliver(handlers, topic, event));
+        });
+      });
+
+      // O EventSource reconecta sozinho e o servidor reenvia o snapshot
+      source.onerror = () => {
+        console.log('Stream de eventos desconectado, reconectando...');
+      };
+    }
+
+    // Agenda connect(); um pedido mais urgente antecipa o que já estava agendado
+    function schedule(delay) {
+      const due = Date.now() + delay;
+      if (timer && timerDue <= due) {
+        return;
+      }
+      clearTimeout(timer);
+      timerDue = due;
+      timer = setTimeout(connect, delay);
+    }
+
+    function subscribe(handlers) {
+      const id = nextId++;
+      subscribers.set(id, handlers);
+
+      const topics = Object.keys(handlers);
+      if (topics.some(topic => !openTopics.includes(topic))) {
+        schedule(0);
+      }
+
+      // Tópicos já abertos: entrega o último estado como snapshot
+      setTimeout(() => {
+        topics.forEach(topic => {
+          if (subscribers.get(id) === handlers && openTopics.includes(topic) && states[topic] !== undefined) {
+            deliver(handlers, topic, { topic, type: 'snapshot', data: states[topic] });
+          }
+        });
+      }, 0);
+
+      return id;
+    }
+
+    function unsubscribe(id) {
+      if (subscribers.delete(id)) {
+        schedule(RECONNECT_DELAY_MS);
+      }
+    }
+
+    return { subscribe, unsubscribe };
+  }
+
+  let localHub = null;
+
+  // Hub desta janela (criado no primeiro uso)
+  function hub() {
+    if (!localHub) {
+      localHub = createHub();
+    }
+    return localHub;
+  }
+
+  // Hub da janela principal quando esta página está num iframe da mesma origem
+  function sharedHub() {
+    try {
+      if (global.top !== global && global.top.BRLNEvents && global.top.BRLNEvents.hub) {
+        return global.top.BRLNEvents.hub();
+      }
+    } catch (error) {
+      // Janela principal de outra origem
+    }
+    return hub();
+  }
+
+  // Assina tópicos do stream; handlers = { topico: function(estado, evento) }
+  // Retorna null se o navegador não suporta EventSource (a página deve usar polling)
+  function subscribe(handlers) {
+    if (!('EventSource' in global)) {
+      return null;
+    }
+
+    const target = sharedHub();
+    let id = target.subscribe(handlers);
+
+    // A página sai do iframe: remove os handlers do stream compartilhado
+    global.addEventListener('pagehide', () => {
+      target.unsubscribe(id);
+    });
+    global.addEventListener('pageshow', (event) => {
+      if (event.persisted) {
+        id = target.subscribe(handlers);
+      }
+    });
+
+    return {
+      close() {
+        target.unsubscribe(id);
+      }
+    };
+  }
+
+  global.BRLNEvents = { subscribe, mergePatch, hub };
+})(window);
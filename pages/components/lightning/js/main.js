@@ -14,11 +14,21 @@ document.addEventListener('DOMContentLoaded', function() {
   initializePage();
   setupEventListeners();
   
-  // Atualizar dados a cada 10 segundos
-  setInterval(updateAllData, 10000);
+  // Saldo, canais, peers e mensagens chegam pelo stream de eventos (só quando mudam)
+  const stream = window.BRLNEvents && BRLNEvents.subscribe({
+    balances: (state) => state.lightning && renderLightningBalance(state.lightning),
+    channels: (state) => {
+      if (state.channels) renderChannels(state.channels);
+      if (state.peers) renderPeers(state.peers);
+    },
+    chat: renderChatNotifications
+  });
   
-  // Verificar novas mensagens a cada 5 segundos
-  setInterval(checkNewMessages, 5000);
+  if (!stream) {
+    // Navegador sem EventSource: volta ao polling
+    setInterval(updateAllData, 10000);
+    setInterval(checkNewMessages, 5000);
+  }
   
   // Carregar conversas do localStorage
   loadConversationsFromStorage();
@@ -78,16 +88,7 @@ async function updateLightningBalance() {
     if (!response.ok) throw new Error('Erro ao buscar saldo Lightning');
     
     const data = await response.json();
-    
-    if (data.status === 'success') {
-      document.getElementById('lightningBalance').textContent = 
-        `${parseInt(data.balance || 0).toLocaleString()} sats`;
-      document.getElementById('pendingBalance').textContent = 
-        `${parseInt(data.pending_open_balance || 0).toLocaleString()} sats pendente`;
-    } else {
-      document.getElementById('lightningBalance').textContent = 'Erro ao carregar';
-      document.getElementById('pendingBalance').textContent = '';
-    }
+    renderLightningBalance(data);
   } catch (error) {
     console.error('Erro ao buscar saldo Lightning:', error);
     document.getElementById('lightningBalance').textContent = 'Erro ao carregar';
@@ -95,31 +96,25 @@ async function updateLightningBalance() {
   }
 }
 
+function renderLightningBalance(data) {
+  if (data.status === 'success') {
+    document.getElementById('lightningBalance').textContent = 
+      `${parseInt(data.balance || 0).toLocaleString()} sats`;
+    document.getElementById('pendingBalance').textContent = 
+      `${parseInt(data.pending_open_balance || 0).toLocaleString()} sats pendente`;
+  } else {
+    document.getElementById('lightningBalance').textContent = 'Erro ao carregar';
+    document.getElementById('pendingBalance').textContent = '';
+  }
+}
+
 async function updateChannels() {
   try {
     const response = await fetch(`${API_BASE_URL}/lightning/channels`);
     if (!response.ok) throw new Error('Erro ao buscar canais');
     
     const data = await response.json();
-    const container = document.getElementById('channelsContainer');
-    
-    if (data.status === 'success' && data.channels && data.channels.channels) {
-      const channels = data.channels.channels;
-      
-      if (channels.length === 0) {
-        container.innerHTML = `
-          <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
-            Nenhum canal encontrado
-          </div>`;
-      } else {
-        container.innerHTML = channels.map(channel => createChannelHTML(channel)).join('');
-      }
-    } else {
-      container.innerHTML = `
-        <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
-          ${data.error || 'Erro ao carregar canais'}
-        </div>`;
-    }
+    renderChannels(data);
   } catch (error) {
     console.error('Erro ao buscar canais:', error);
     document.getElementById('channelsContainer').innerHTML = `
@@ -135,36 +130,62 @@ async function updatePeers() {
     if (!response.ok) throw new Error('Erro ao buscar peers');
     
     const data = await response.json();
-    const container = document.getElementById('peersContainer');
+    renderPeers(data);
+  } catch (error) {
+    console.error('Erro ao buscar peers:', error);
+    document.getElementById('peersConnected').textContent = 'Erro';
+    document.getElementById('peersContainer').innerHTML = `
+      <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
+        Erro ao carregar peers
+      </div>`;
+  }
+}
+
+function renderChannels(data) {
+  const container = document.getElementById('channelsContainer');
+  
+  if (data.status === 'success' && data.channels && data.channels.channels) {
+    const channels = data.channels.channels;
     
-    if (data.status === 'success' && data.peers) {
-      const peers = data.peers;
-      
-      // Atualizar contador de peers no saldo
-      document.getElementById('peersConnected').textContent = 
-        `${peers.length} peers`;
-      
-      if (peers.length === 0) {
-        container.innerHTML = `
-          <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
-            Nenhum peer conectado
-          </div>`;
-      } else {
-        container.innerHTML = peers.map(peer => createPeerHTML(peer)).join('');
-      }
+    if (channels.length === 0) {
+      container.innerHTML = `
+        <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
+          Nenhum canal encontrado
+        </div>`;
     } else {
-      document.getElementById('peersConnected').textContent = '0 peers';
+      container.innerHTML = channels.map(channel => createChannelHTML(channel)).join('');
+    }
+  } else {
+    container.innerHTML = `
+      <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
+        ${data.error || 'Erro ao carregar canais'}
+      </div>`;
+  }
+}
+
+function renderPeers(data) {
+  const container = document.getElementById('peersContainer');
+  
+  if (data.status === 'success' && data.peers) {
+    const peers = data.peers;
+    
+    // Atualizar contador de peers no saldo
+    document.getElementById('peersConnected').textContent = 
+      `${peers.length} peers`;
+    
+    if (peers.length === 0) {
       container.innerHTML = `
         <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
-          ${data.error || 'Erro ao carregar peers'}
+          Nenhum peer conectado
         </div>`;
+    } else {
+      container.innerHTML = peers.map(peer => createPeerHTML(peer)).join('');
     }
-  } catch (error) {
-    console.error('Erro ao buscar peers:', error);
-    document.getElementById('peersConnected').textContent = 'Erro';
-    document.getElementById('peersContainer').innerHTML = `
+  } else {
+    document.getElementById('peersConnected').textContent = '0 peers';
+    container.innerHTML = `
       <div style="width: 100%; text-align: center; padding: 40px; color: #666; font-style: italic;">
-        Erro ao carregar peers
+        ${data.error || 'Erro ao carregar peers'}
       </div>`;
   }
 }
@@ -520,11 +541,8 @@ async function checkNewMessages() {
     const response = await fetch(`${API_BASE_URL}/lightning/chat/notifications`);
     if (response.ok) {
       const data = await response.json();
-      if (data.status === 'success' && data.unread_count > 0) {
-        // Notificar o header se há mensagens novas
-        if (parent && parent.notifyLightningMessage) {
-          parent.notifyLightningMessage();
-        }
+      if (data.status === 'success') {
+        renderChatNotifications(data);
       }
     }
   } catch (error) {
@@ -532,6 +550,15 @@ async function checkNewMessages() {
   }
 }
 
+function renderChatNotifications(data) {
+  if (data.unread_count > 0) {
+    // Notificar o header se há mensagens novas
+    if (parent && parent.notifyLightningMessage) {
+      parent.notifyLightningMessage();
+    }
+  }
+}
+
 // Função para adicionar mensagem recebida (será chamada pelo sistema de notificações)
 function addReceivedMessage(nodeId, message, timestamp) {
   let conversation = conversations.get(nodeId);
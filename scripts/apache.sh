@@ -241,6 +241,8 @@ setup_ssl_proxy_config() {
     ProxyRequests Off
 
     # API Endpoints - Proxy to port 2121
+    # Event stream (SSE): flush each event immediately
+    ProxyPass /api/v1/events http://localhost:2121/api/v1/events flushpackets=on
     ProxyPass /api/ http://localhost:2121/api/
     ProxyPassReverse /api/ http://localhost:2121/api/
 
@@ -436,6 +438,8 @@ setup_basic_proxy() {
     ProxyRequests Off
     
     # API Proxy
+    # Event stream (SSE): flush each event immediately
+    ProxyPass /api/v1/events http://localhost:2121/api/v1/events flushpackets=on
     ProxyPass /api/ http://localhost:2121/api/
     ProxyPassReverse /api/ http://localhost:2121/api/
     
@@ -488,6 +492,8 @@ setup_apache_ssl() {
     ProxyRequests Off
     
     # API Proxy
+    # Event stream (SSE): flush each event immediately
+    ProxyPass /api/v1/events http://localhost:2121/api/v1/events flushpackets=on
     ProxyPass /api/ http://localhost:2121/api/
     ProxyPassReverse /api/ http://localhost:2121/api/
     
@@ -362,7 +362,6 @@ except ImportError as e:
     echo -e "${GREEN}🎉 Protocol buffer generation completed successfully!${NC}"
     echo -e "${BLUE}📁 Generated files are located in: $API_DIR${NC}"
     echo -e "${YELLOW}💡 You may need to restart services that use these files:${NC}"
-    echo -e "${YELLOW}    sudo systemctl restart messager-monitor${NC}"
     echo -e "${YELLOW}    sudo systemctl restart brln-api${NC}"
     
 else
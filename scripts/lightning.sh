@@ -361,36 +361,17 @@ setup_lightning_monitor() {
     sudo systemctl enable lightning-monitor
   fi
   
-  # Create and enable messager-monitor service for keysend notifications
-  echo -e "${BLUE}💬 Configurando Lightning Messager Monitor (Keysend)...${NC}"
+  # Keysends recebidos agora são ingeridos pela própria brln-api (SubscribeInvoices);
+  # remover o antigo messager-monitor em instalações existentes
   source "$SCRIPT_DIR/scripts/services.sh"
-  create_messager_monitor_service
-  
-  # Reload systemd and enable service
-  sudo systemctl daemon-reload
-  sudo systemctl enable messager-monitor.service
-  
-  # Start messager-monitor service
-  echo -e "${BLUE}▶️  Iniciando serviço de notificações...${NC}"
-  sudo systemctl start messager-monitor.service
-  
-  # Wait a moment and check status
-  sleep 2
-  
-  if systemctl is-active --quiet messager-monitor.service; then
-    echo -e "${GREEN}✓ Serviço messager-monitor iniciado${NC}"
-    echo -e "${GREEN}✓ Notificações de mensagens Lightning ativas${NC}"
-  else
-    echo -e "${YELLOW}⚠ Verificar status: sudo systemctl status messager-monitor${NC}"
-  fi
+  remove_messager_monitor_service
   
   echo -e "${GREEN}✅ Lightning Monitor configurado!${NC}"
   echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
   echo -e "${CYAN}💬 Monitor de Mensagens Lightning${NC}"
   echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
-  echo -e "${CYAN}📊 Endpoint API: POST /api/v1/lightning/chat/keysends/check${NC}"
-  echo -e "${CYAN}🔍 Status: sudo systemctl status messager-monitor${NC}"
-  echo -e "${CYAN}📋 Logs: sudo journalctl -fu messager-monitor${NC}"
+  echo -e "${CYAN}📊 Ingestão de keysends: integrada à brln-api (GET /api/v1/lightning/chat/keysends/status)${NC}"
+  echo -e "${CYAN}📋 Logs: sudo journalctl -fu brln-api${NC}"
   echo -e "${CYAN}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 }
 
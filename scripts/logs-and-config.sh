@@ -16,7 +16,6 @@ declare -A SERVICE_CONFIG=(
     ["peerswapd"]="peerswap:/home/peerswap/.peerswap/peerswap.conf:PeerSwap daemon configuration"
     ["psweb"]="peerswap:/home/peerswap/.peerswap/psweb.conf:PeerSwap Web UI configuration"
     ["brln-api"]="brln-api:${BRLN_OS_DIR}/api/v1/app.py,/data/brln-wallet/:BRLN-OS API configuration and data"
-    ["messager-monitor"]="brln-api:${BRLN_OS_DIR}/api/v1/messager_monitor_grpc.py:Lightning message monitor configuration"
     ["gotty-fullauto"]="root:${BRLN_OS_DIR}/scripts/menu.sh:Terminal web interface script"
     ["bos-telegram"]="$atual_user:/home/$atual_user/.bos/:Balance of Satoshis Telegram bot credentials"
     ["thunderhub"]="$atual_user:/home/$atual_user/thunderhub/thubConfig.yaml:ThunderHub configuration"
@@ -231,6 +231,8 @@ create_ssl_site() {
     ProxyRequests Off
     
     # Lightning API
+    # Event stream (SSE): flush each event immediately
+    ProxyPass /api/v1/events http://localhost:2121/api/v1/events flushpackets=on
     ProxyPass /api/ http://localhost:2121/api/
     ProxyPassReverse /api/ http://localhost:2121/api/
     
@@ -347,7 +349,16 @@ verify_frontend_status() {
 maintain_api_services() {
     echo -e "${GREEN}🔧 Mantendo serviços da API...${NC}"
     
-    local api_services=("brln-api" "messager-monitor")
+    local api_services=("brln-api")
+    
+    # messager-monitor foi substituído pela ingestão de keysends dentro da brln-api
+    if [[ -f /etc/systemd/system/messager-monitor.service ]]; then
+        echo -e "${BLUE}🧹 Removendo serviço legado messager-monitor...${NC}"
+        sudo systemctl stop messager-monitor.service 2>/dev/null || true
+        sudo systemctl disable messager-monitor.service 2>/dev/null || true
+        sudo rm -f /etc/systemd/system/messager-monitor.service
+        sudo systemctl daemon-reload
+    fi
     
     for service in "${api_services[@]}"; do
         echo -e "${BLUE}🔍 Verificando serviço: $service${NC}"
@@ -449,7 +460,7 @@ update_api_requirements() {
 verify_api_services() {
     echo -e "${BLUE}🔍 Verificando status dos serviços da API...${NC}"
     
-    local api_services=("brln-api" "messager-monitor")
+    local api_services=("brln-api")
     
     for service in "${api_services[@]}"; do
         if sudo systemctl is-active --quiet "$service"; then
@@ -570,7 +581,7 @@ EXEMPLOS:
 
 SERVIÇOS GERENCIADOS:
   Frontend:          Apache Web Server, páginas HTML/CSS/JS
-  API:               brln-api, messager-monitor
+  API:               brln-api
   Boltz Backend:     boltz-backend (atomic swaps)
   Conflitos:         Remove conflitos entre Nginx/Apache
 
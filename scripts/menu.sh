@@ -100,7 +100,7 @@ run_services_manager() {
       echo ""
       echo -e "${BLUE}Serviços disponíveis:${NC}"
       echo "bitcoind, lnd, elementsd, peerswapd, psweb, brln-api,"
-      echo "gotty, bos-telegram, thunderhub, lnbits, lndg, lndg-controller, messager-monitor"
+      echo "gotty, bos-telegram, thunderhub, lnbits, lndg, lndg-controller"
       echo ""
       echo -n "Digite o nome do serviço: "
       read service_name
@@ -113,7 +113,7 @@ run_services_manager() {
       echo ""
       echo -e "${BLUE}📊 Status dos serviços BRLN-OS:${NC}"
       echo ""
-      services=("bitcoind" "lnd" "elementsd" "peerswapd" "psweb" "brln-api" "gotty-fullauto" "bos-telegram" "thunderhub" "lnbits" "lndg" "lndg-controller" "messager-monitor")
+      services=("bitcoind" "lnd" "elementsd" "peerswapd" "psweb" "brln-api" "gotty-fullauto" "bos-telegram" "thunderhub" "lnbits" "lndg" "lndg-controller")
       for service in "${services[@]}"; do
         status=$(systemctl is-active "$service" 2>/dev/null || echo "not-found")
         case "$status" in
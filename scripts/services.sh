@@ -228,21 +228,58 @@ create_brln_api_service() {
     local api_dir="/home/brln-api/api/v1"
     local scripts_dir="/home/brln-api/scripts"
     
+    # Secrets daemon: answers password manager lookups over a Unix socket
+    sudo tee /etc/systemd/system/brln-secrets.service > /dev/null << EOF
+[Unit]
+Description=BRLN-OS Secrets Daemon
+After=network.target
+
+[Service]
+Type=simple
+User=brln-api
+Group=brln-api
+ExecStart=/home/brln-api/venv/bin/python3 /home/brln-api/brln-tools/secrets_daemon.py
+Restart=always
+RestartSec=5
+RuntimeDirectory=brln-secrets
+RuntimeDirectoryMode=0750
+Environment=BRLN_SECRETS_SOCKET=/run/brln-secrets/secrets.sock
+
+# Keep derived keys out of swap (mlockall)
+LimitMEMLOCK=infinity
+LimitCORE=0
+NoNewPrivileges=true
+PrivateTmp=true
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
     sudo tee /etc/systemd/system/brln-api.service > /dev/null << EOF
 [Unit]
 Description=BRLN-OS API gRPC - Comando Central
-After=network.target lnd.service
+After=network.target lnd.service brln-secrets.service
+Wants=brln-secrets.service
 
 [Service]
 Type=simple
 User=brln-api
 Group=brln-api
 WorkingDirectory=${api_dir}
-ExecStart=/home/brln-api/venv/bin/python3 ${api_dir}/app.py
+# gunicorn with several workers (see gunicorn.conf.py); reload = graceful worker restart
+ExecStart=/home/brln-api/venv/bin/gunicorn -c ${api_dir}/gunicorn.conf.py app:app
+ExecReload=/bin/kill -HUP \$MAINPID
+KillMode=mixed
+TimeoutStopSec=40
 Restart=always
 RestartSec=10
 Environment=PYTHONPATH=${api_dir}
 Environment=BITCOIN_NETWORK=${BITCOIN_NETWORK:-mainnet}
+# State shared by all API workers: sessions, rate limits, jobs, keysend leader lock
+# (tmpfs, removed when the service stops)
+RuntimeDirectory=brln-api
+RuntimeDirectoryMode=0700
+Environment=BRLN_SESSION_DB=/run/brln-api/sessions.db
 
 # Security - NoNewPrivileges=false required for sudo to run expect scripts as lnd user
 NoNewPrivileges=false
@@ -460,44 +497,20 @@ EOF
     echo -e "${GREEN}✅ lndg-controller.service created${NC}"
 }
 
-# Function to create messager-monitor.service
-create_messager_monitor_service() {
-    echo -e "${YELLOW}💬 Creating messager-monitor.service...${NC}"
-    
-    # Determine the correct paths based on current setup
-    local brln_os_dir
-    if [[ -n "${BRLN_OS_DIR:-}" ]]; then
-        brln_os_dir="$BRLN_OS_DIR"
-    elif [[ -d "/home/admin/brln-os" ]]; then
-        brln_os_dir="/home/admin/brln-os"
-    else
-        brln_os_dir="/root/brln-os"
+# Function to remove the legacy messager-monitor.service
+# (keysends are now ingested inside brln-api via SubscribeInvoices)
+remove_messager_monitor_service() {
+    if [[ ! -f /etc/systemd/system/messager-monitor.service ]]; then
+        return 0
     fi
-    
-    sudo tee /etc/systemd/system/messager-monitor.service > /dev/null << EOF
-[Unit]
-Description=Lightning Messager Monitor
-After=lnd.service
-Requires=lnd.service
 
-[Service]
-WorkingDirectory=${brln_os_dir}/api/v1
-ExecStart=/home/brln-api/venv/bin/python3 ${brln_os_dir}/api/v1/messager_monitor_grpc.py
-User=brln-api
-Group=brln-api
-Restart=always
-RestartSec=10
-Environment=PYTHONPATH=${brln_os_dir}/api/v1
-
-# Security
-NoNewPrivileges=true
-PrivateTmp=true
+    echo -e "${YELLOW}💬 Removing legacy messager-monitor.service...${NC}"
+    sudo systemctl stop messager-monitor.service 2>/dev/null || true
+    sudo systemctl disable messager-monitor.service 2>/dev/null || true
+    sudo rm -f /etc/systemd/system/messager-monitor.service
+    sudo systemctl daemon-reload
 
-[Install]
-WantedBy=multi-user.target
-EOF
-
-    echo -e "${GREEN}✅ messager-monitor.service created${NC}"
+    echo -e "${GREEN}✅ messager-monitor.service removed (keysend ingestion runs in brln-api)${NC}"
 }
 
 # Function to create brln-background-install.service
@@ -585,7 +598,7 @@ create_all_services() {
     create_lnbits_service
     create_lndg_service
     create_lndg_controller_service
-    create_messager_monitor_service
+    remove_messager_monitor_service
     
     echo ""
     echo -e "${GREEN}✅ All services created successfully!${NC}"
@@ -633,14 +646,11 @@ create_service() {
         lndg-controller)
             create_lndg_controller_service
             ;;
-        messager-monitor|messager)
-            create_messager_monitor_service
-            ;;
         *)
             echo -e "${RED}❌ Unknown service: $service_name${NC}"
             echo -e "${YELLOW}Available services:${NC}"
             echo "  bitcoind, lnd, elementsd, peerswapd, psweb, brln-api,"
-            echo "  gotty, bos-telegram, thunderhub, lnbits, lndg, lndg-controller, messager-monitor"
+            echo "  gotty, bos-telegram, thunderhub, lnbits, lndg, lndg-controller"
             return 1
             ;;
     esac
@@ -673,7 +683,6 @@ Available Services:
   lnbits                 LNbits Lightning wallet
   lndg                   Lightning Network Dashboard
   lndg-controller        LNDG backend controller
-  messager-monitor       Lightning message monitor
 
 Examples:
   $0 all                 # Create all services
@@ -694,7 +703,6 @@ list_services() {
     echo ""
     echo -e "${GREEN}Application Services:${NC}"
     echo "  • brln-api - BRLN-OS API service"
-    echo "  • messager-monitor - Lightning message monitor"
     echo "  • peerswapd - PeerSwap daemon"
     echo "  • psweb - PeerSwap Web UI"
     echo ""
@@ -750,7 +758,7 @@ export -f create_thunderhub_service
 export -f create_lnbits_service
 export -f create_lndg_service
 export -f create_lndg_controller_service
-export -f create_messager_monitor_service
+export -f remove_messager_monitor_service
 export -f create_all_services
 export -f create_service
 
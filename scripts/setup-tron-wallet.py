@@ -11,13 +11,17 @@ import secrets
 from pathlib import Path
 from getpass import getpass
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.backends import default_backend
 import base64
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'api' / 'v1'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'brln-tools'))
+
+try:
+    import brln_kdf
+    HAS_BRLN_KDF = True
+except ImportError:
+    HAS_BRLN_KDF = False
 
 try:
     from mnemonic import Mnemonic
@@ -32,41 +36,54 @@ except ImportError:
 # Paths
 WALLET_DB_PATH = "/data/brln-wallet/wallets.db"
 
-def derive_key_from_password(password: str, salt: bytes) -> bytes:
-    """Deriva uma chave de criptografia a partir de uma senha"""
-    kdf = PBKDF2HMAC(
-        algorithm=hashes.SHA256(),
-        length=32,
-        salt=salt,
-        iterations=100000,
-        backend=default_backend()
-    )
-    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
-
-def encrypt_data(data: str, password: str, salt: bytes = None) -> tuple:
+# Entradas sem descritor (kdf NULL): mesmo PBKDF2 da API
+PBKDF2_ITERATIONS = 500000
+
+def derive_key_from_password(password: str, salt: bytes, kdf: str = None) -> bytes:
+    """Deriva a chave como a API: KDF(SHA256(senha + salt), salt)"""
+    password_hash = hashlib.sha256(password.encode() + salt).digest()
+    if kdf:
+        if not HAS_BRLN_KDF:
+            raise RuntimeError(f"KDF {kdf} requires brln-tools/brln_kdf.py")
+        derived = brln_kdf.derive(kdf, password_hash, salt)
+    else:
+        derived = hashlib.pbkdf2_hmac('sha256', password_hash, salt, PBKDF2_ITERATIONS, dklen=32)
+    return base64.urlsafe_b64encode(derived)
+
+def current_kdf() -> str:
+    """Descritor de KDF para novos segredos (None = PBKDF2 legado)"""
+    return brln_kdf.current_descriptor() if HAS_BRLN_KDF else None
+
+def encrypt_data(data: str, password: str, salt: bytes = None, kdf: str = None) -> tuple:
     """Criptografa dados usando a senha fornecida"""
     if salt is None:
-        salt = secrets.token_bytes(16)
+        salt = secrets.token_bytes(32)
     
-    key = derive_key_from_password(password, salt)
+    key = derive_key_from_password(password, salt, kdf)
     f = Fernet(key)
     encrypted = f.encrypt(data.encode())
     return encrypted, salt
 
-def decrypt_data(encrypted_data: bytes, password: str, salt: bytes) -> str:
+def decrypt_data(encrypted_data: bytes, password: str, salt: bytes, kdf: str = None) -> str:
     """Descriptografa dados usando a senha fornecida"""
-    key = derive_key_from_password(password, salt)
+    key = derive_key_from_password(password, salt, kdf)
     f = Fernet(key)
     return f.decrypt(encrypted_data).decode()
 
+def has_kdf_column(cursor, table: str) -> bool:
+    """Banco já migrado pela API (coluna kdf, wallets.db v4)"""
+    cursor.execute(f"SELECT name FROM pragma_table_info('{table}')")
+    return 'kdf' in {row[0] for row in cursor.fetchall()}
+
 def get_system_wallet_mnemonic(password: str) -> str:
     """Obtém a mnemonic do wallet do sistema"""
     try:
         conn = sqlite3.connect(WALLET_DB_PATH)
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT encrypted_mnemonic, salt FROM wallets 
+        kdf_column = 'kdf' if has_kdf_column(cursor, 'wallets') else 'NULL'
+        cursor.execute(f"""
+            SELECT encrypted_mnemonic, salt, {kdf_column} FROM wallets 
             WHERE is_system_default = 1 
             LIMIT 1
         """)
@@ -79,10 +96,10 @@ def get_system_wallet_mnemonic(password: str) -> str:
             print("Please create a system wallet first using the HD Wallet interface")
             return None
         
-        encrypted_mnemonic, salt = result
+        encrypted_mnemonic, salt, kdf = result
         
         # Decrypt mnemonic
-        mnemonic = decrypt_data(encrypted_mnemonic, password, salt)
+        mnemonic = decrypt_data(encrypted_mnemonic, password, salt, kdf)
         return mnemonic
         
     except Exception as e:
@@ -128,12 +145,14 @@ def derive_tron_address(mnemonic: str) -> tuple:
 def save_tron_config(address: str, private_key: str, password: str):
     """Salva configuração TRON no banco de dados"""
     try:
-        # Encrypt private key
-        encrypted_key, salt = encrypt_data(private_key, password)
-        
         conn = sqlite3.connect(WALLET_DB_PATH)
         cursor = conn.cursor()
         
+        # Encrypt private key (descritor só é gravado em bancos já migrados)
+        store_kdf = has_kdf_column(cursor, 'tron_config')
+        kdf = current_kdf() if store_kdf else None
+        encrypted_key, salt = encrypt_data(private_key, password, kdf=kdf)
+        
         # Check if config exists
         cursor.execute("SELECT id FROM tron_config WHERE id = 1")
         exists = cursor.fetchone()
@@ -152,6 +171,8 @@ def save_tron_config(address: str, private_key: str, password: str):
                 (id, tron_address, encrypted_private_key, salt)
                 VALUES (1, ?, ?, ?)
             """, (address, encrypted_key, salt))
+        if store_kdf:
+            cursor.execute("UPDATE tron_config SET kdf = ? WHERE id = 1", (kdf,))
         
         conn.commit()
         conn.close()